@@ -25,14 +25,30 @@ from system.Manager_Setting import *
 from system.Struct_IO import *
 from system.Struct_env_info import *
 from system.Thread_Conda import *
+from system.Watcher_Conda_Env import CondaEnvWatcher
+from system.Coordinator_Refresh import RefreshCoordinator
+from system.Reader_Dist_Info import read_pyinstaller_dist_info
+from system.Index_Interpreter import InterpreterIndex
+from system.Schema_Pyinstaller_Option import OptionSchemaManager
+from system.Loader_Pyinstaller_Struct import PyinstallerStructLoader
+from system.Loader_Spec_File import SpecFileLoader
+from system.History_Pyinstaller_Struct import PyinstallerStructHistory
+from system.Manager_Project_File import ProjectFileManager, ProjectFileError, PROJECT_EXTENSION, PROJECT_BINARY_EXTENSION
 from system.Thread_Pip_Install import *
+from system.Thread_Pyinstaller_Build import ThreadPyinstallerBuild
+from system.Planner_Build_Command import plan_build_command
+from system.Cache_Build_Result import BuildResultCache
+from system.Manager_Workpath import WorkpathManager
+from system.Profiler_Build_Phase import BuildProfileHistory, format_profile, format_comparison
+from system.Cache_Path_Stat import PathStatCache
+from system.Watcher_Path_Stat import PathStatWatcher
 from system.Filter_Mouse import *
 from tools.wait_thread import *
 from tools.try_except_log import try_except_log
 
 
-from PyQt5.QtWidgets import QFileDialog, QMessageBox, QPushButton, QDialog, QListWidget, QHBoxLayout, QPushButton, QVBoxLayout, QSizePolicy, QFrame, QSpacerItem, QInputDialog, QLabel, QCheckBox, QRadioButton, QListWidgetItem, QTextBrowser, QMainWindow, QTableWidgetItem, QHeaderView, QTableWidget, QMenu, QAction, QTabWidget, QWidget, QScrollArea, QLineEdit, QComboBox, QGroupBox, QGridLayout, QProgressBar, QApplication, QButtonGroup
-from PyQt5.QtGui import QTextCursor, QDesktopServices, QIcon, QPixmap
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QPushButton, QDialog, QListWidget, QHBoxLayout, QPushButton, QVBoxLayout, QSizePolicy, QFrame, QSpacerItem, QInputDialog, QLabel, QCheckBox, QRadioButton, QListWidgetItem, QTextBrowser, QMainWindow, QTableWidgetItem, QHeaderView, QTableWidget, QMenu, QAction, QTabWidget, QWidget, QScrollArea, QLineEdit, QComboBox, QGroupBox, QGridLayout, QProgressBar, QApplication, QButtonGroup, QShortcut
+from PyQt5.QtGui import QTextCursor, QDesktopServices, QIcon, QPixmap, QKeySequence
 from PyQt5.QtCore import Qt, QUrl, QByteArray, QSize, QItemSelectionModel, QEventLoop, QEvent, QObject
 # import pygetwindow as gw
 
@@ -52,8 +68,29 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
         self.app_workspace_path = APP_WORKSPACE_PATH
         self.setting_manager = SettingManager(self.app_workspace_path)
         self.setting = self.setting_manager.setting_data
+        # 解释器索引为单例, 在此按设置配置 venv 文件夹, 之后创建的 ExecutorInfoManager 等使用者共用该配置
+        InterpreterIndex().set_venv_dir_list(self.setting['venv_dirs'])
         self.installer_manager = Struct_IO()
         self.installer = self.installer_manager.struct_data
+        # 参数历史: 撤销/重做, 以及 "打开时的参数"(双击重置) 与 "默认参数"(长按重置) 两个标记
+        self.installer_history = PyinstallerStructHistory(self.installer)
+        self.installer_history.set_mark('opened')
+        self.installer_history.set_mark('default', PyinstallerStructLoader().read_command(App.DEFAULT_INSTALLER_COMMANDLINE).snapshot())
+        self.project_file_manager = ProjectFileManager()
+        self.thread_build = None
+        # 当前打包的结构化日志事件(PyinstallerLogEvent), 由打包线程成批发送
+        self.build_event_list = []
+        # 路径状态只读取缓存, 由线程池异步检查, 文件夹变化时自动更新; path_option_validity 为 {结构名称: True / False / None(检查中)}
+        self.path_stat_cache = PathStatCache()
+        self.path_stat_watcher = PathStatWatcher()
+        self.path_stat_watcher.signal_path_changed.connect(self.on_path_stat_changed)
+        self.path_option_validity = {}
+        self.pending_specified_python_path = ''
+        """ 等待异步检查的指定环境解释器路径, 检查完成后重新更新指定环境 """
+        # 打包结果缓存: 入口文件, 导入闭包, 输入文件, 参数与环境均未变化时直接恢复上次的打包结果
+        self.build_cache = BuildResultCache(self.app_workspace_path, self.setting['build_cache_max_size_mb'] * 1024 ** 2)
+        # 未指定 --workpath 时, 每个项目使用固定的工作文件夹, 选项变化时才清空, 重复打包时 PyInstaller 的增量缓存生效
+        self.workpath_manager = WorkpathManager(self.app_workspace_path)
         # self.language = LanguageManager(PATH_APP_FOLDER)
         self.message = MessageNotification(self, position='bottom', offset=100, move_in_point=(None, '50'), hold_duration=4000)
         self.clipboard = QApplication.clipboard()
@@ -63,12 +100,18 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
         self.env_struct_sys = StructEnvInfo('sys')
         self.env_struct_conda = StructEnvInfo('conda')
 
-        self.timer_check_install = QTimer()
-        self.timer_check_install.timeout.connect(self.check_all_env_installed)
-        self.timer_check_install.start(1000)
-        self.timer_check_env = QTimer()
-        self.timer_check_env.timeout.connect(self.check_conda_env)
-        self.timer_check_env.start(2000)
+        # pyinstaller 安装状态由 RefreshCoordinator 统一刷新: 只读取 dist-info 元数据, 状态变化时才更新显示, 窗口最小化/隐藏时延长刷新间隔
+        self.env_install_state = None
+        self.refresh_coordinator = RefreshCoordinator()
+        self.refresh_coordinator.register('env_install_state', self.collect_env_install_state, 1000)
+        self.refresh_coordinator.subscribe('env_install_state', self.on_env_install_state_refreshed)
+        self.refresh_coordinator.watch_window(self)
+        # 选项模式按 PyInstaller 版本缓存, 在刷新安装状态的线程中预先生成, 切换环境时只查找内存
+        self.option_schema_manager = OptionSchemaManager()
+        # conda 环境由文件监视驱动, 不再每 2 秒启动一次检测线程
+        self.conda_env_watcher = CondaEnvWatcher()
+        self.conda_env_watcher.signal_env_list_changed.connect(self.check_conda_env)
+        self.conda_env_watcher.signal_env_content_changed.connect(self.check_conda_env)
 
     def init_ui(self):
         self.init_ui_frame()
@@ -199,6 +242,7 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
         self.pb_page_setting.clicked.connect(self.page_change)
         self.pb_open_output_folder.clicked.connect(self.open_output_folder)
         self.pb_output_command.clicked.connect(self.print_command_line)
+        self.pb_launch.clicked.connect(self.launch_build)
         # 命令行字体大小
         self.tb_command_display.signal_font_size.connect(self.record_font_change_in_tb_command_line)
         self.tb_console.signal_font_size.connect(self.record_font_change_in_tb_console)
@@ -212,6 +256,10 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
         self.rb_env_conda.clicked.connect(self.update_env_conda_specified)
         self.rb_env_builtin.clicked.connect(self.select_python_env)
         self.le_env_specified_path_page_setting_env.textChanged.connect(self.update_env_specified)
+        # 参数撤销/重做, 输入框获得焦点时优先由输入框处理
+        QShortcut(QKeySequence.Undo, self, self.undo_parameters)
+        QShortcut(QKeySequence.Redo, self, self.redo_parameters)
+        QShortcut(QKeySequence.Save, self, self.save_project_file)
 
     def eventFilter(self, obj, event):
         if event.type() == QEvent.MouseButtonDblClick and obj is not None:
@@ -269,10 +317,55 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
         return 'style="fill:'.join(string_list)
 
     def update_installer_display_info(self):
-        """ 显示安装器信息 """
+        """ 显示安装器信息, 同时记录参数历史 """
+        self.installer_history.record()
         self.update_table_widget_installer_info()
         self.update_command_display()
         self.update_options_display()
+        self.update_path_option_validity()
+
+    def update_path_option_validity(self, *args):
+        """ 
+        更新各路径选项的有效性, 只读取缓存, 不访问文件系统
+
+        应用:
+        与 self.path_stat_watcher(PathStatWatcher).signal_path_changed 信号连接
+        """
+        self.path_option_validity = self.path_stat_cache.get_validity(self.installer.get_input_path_dict(self.get_build_cwd()))
+        # 预先检查输出路径, 打开输出文件夹时只读取缓存; 外部列表文件由 PathStatWatcher 监视, 变化时在 on_path_stat_changed() 中重新读取
+        self.path_stat_cache.request(self.get_output_path_list() + self.installer.get_list_file_list())
+
+    def on_path_stat_changed(self, path_list: list):
+        """ 
+        路径状态变化: 更新路径选项的有效性, 重新读取变化的外部列表文件, 并重新处理等待检查结果的指定环境与执行器
+
+        参数:
+        - path_list (list): 状态变化的规范化路径
+
+        应用:
+        与 self.path_stat_watcher(PathStatWatcher).signal_path_changed 信号连接
+        """
+        self.update_path_option_validity()
+        changed_set = set(path_list)
+        if changed_list_file_list := [path for path in self.installer.get_list_file_list() if os.path.normpath(path) in changed_set]:
+            if self.installer.refresh_list_files(changed_list_file_list):
+                self.update_command_display()
+        if self.pending_specified_python_path and os.path.normpath(self.pending_specified_python_path) in changed_set:
+            self.update_env_specified()
+        elif self.env_struct_current.path_pyinstaller and os.path.normpath(self.env_struct_current.path_pyinstaller) in changed_set:
+            self.update_command_display()
+
+    def get_output_path_list(self) -> list:
+        """ 输出文件夹与输出的 exe 文件路径, 未指定输出文件夹时为空列表 """
+        output_folder_path = self.installer.output_folder_path.command_args
+        if not output_folder_path:
+            return []
+        return [output_folder_path, os.path.join(output_folder_path, self.installer.output_file_name.command_args+'.exe')]
+
+    def get_build_cwd(self) -> str:
+        """ 打包的执行目录: 入口文件所在文件夹, 未指定入口文件时为当前工作目录 """
+        python_file_path = self.installer.python_file_path.command_args
+        return os.path.dirname(os.path.abspath(python_file_path)) if python_file_path else os.getcwd()
 
     def update_table_widget_installer_info(self):
         """ 更新安装器信息 """
@@ -333,7 +426,7 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
     def update_command_display(self):
         """ 更新命令显示 """
         self.tb_command_display.clear()
-        command_line = self.installer.get_command_line(self.env_struct_current.path_pyinstaller)
+        command_line = self.installer.get_command_line(self.env_struct_current.path_pyinstaller, isBlocking=False)
         if command_line:
             self.tb_command_display.set_text(command_line)
 
@@ -438,13 +531,17 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
             widget.clear()
 
     def open_output_folder(self):
-        """ 打开输出文件夹 """
+        """ 打开输出文件夹. 路径状态只读取缓存(由 update_path_option_validity() 预先检查), 尚未检查完成时提示稍后再试 """
         try:
             exe_path = os.path.join(self.installer.output_folder_path.command_args, self.installer.output_file_name.command_args+'.exe')
-            if os.path.exists(exe_path):
+            exe_stat = self.path_stat_cache.get(exe_path)
+            folder_stat = self.path_stat_cache.get(self.installer.output_folder_path.command_args)
+            if exe_stat is not None and exe_stat.isExists:
                 Popen(['explorer', '/select,', os.path.normpath(exe_path)], creationflags=CREATE_NO_WINDOW)  # 注意这里如果不norm一下, 会找不到路径
-            elif os.path.exists(self.installer.output_folder_path.command_args):
+            elif folder_stat is not None and folder_stat.isDir:
                 Popen(['explorer', os.path.normpath(self.installer.output_folder_path.command_args)], creationflags=CREATE_NO_WINDOW)
+            elif self.installer.output_folder_path.command_args and (exe_stat is None or folder_stat is None):
+                self.message.notification('正在检查输出文件夹, 请稍后再试')
             else:
                 self.message.notification(f'输出文件夹不存在: {self.installer.output_folder_path.command_args}')
                 self.tb_console.append_text(f'输出文件夹不存在: {self.installer.output_folder_path.command_args}')
@@ -466,6 +563,93 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
             self.tb_console.append_text(f'[{time.localtime()}]\n命令行已打印到: {output_file_path}')
             self.message.notification(f'命令行已打印到', open_file_path=output_file_path)
 
+    def launch_build(self):
+        """ 
+        执行打包. 参数列表直接传给子进程, 命令行超过系统限制时自动改用生成的 spec 文件
+
+        执行目录见 get_build_cwd(). 输入路径在打包线程中并发检查. 启用打包结果缓存时, 环境键由当前解释器, PyInstaller 的版本与 site-packages 在打包线程中生成;
+        启用工作文件夹管理且未指定 --workpath 时, 使用 WorkpathManager 分配的项目工作文件夹
+        """
+        if self.thread_build is not None and self.thread_build.isRunning():
+            self.message.notification('正在打包')
+            return
+        if not self.installer.python_file_path.command_args:
+            self.message.notification('未指定入口文件')
+            return
+        if self.installer.set_implement_path(self.env_struct_current.path_pyinstaller, isBlocking=False) is None:
+            self.message.notification('正在检查执行器路径, 请稍后再试')
+            return
+        # 外部列表文件的原地修改不一定触发文件夹监视, 打包前重新检查一次
+        self.installer.refresh_list_files()
+        workpath_manager = None
+        if self.setting['managed_workpath_enabled'] and not self.installer.workpath_option.command_args:
+            workpath_manager = self.workpath_manager
+        try:
+            build_command = plan_build_command(self.installer, self.get_build_cwd(), workpath_manager=workpath_manager)
+        except OSError:
+            self.tb_console.append_text(format_exc())
+            self.message.notification('无法生成 spec 文件')
+            return
+        if build_command.isSpecFallback:
+            self.tb_console.append_text(
+                f'命令行长度 {build_command.command_length} 超过限制 {build_command.command_limit}, 改用 spec 文件: {build_command.spec_path}\n')
+        build_cache = None
+        environment = ()
+        if self.setting['build_cache_enabled']:
+            build_cache = self.build_cache
+            pyinstaller_version = dict(self.env_install_state or ()).get(self.env_struct_current.path_python, '')
+            environment = (self.env_struct_current.path_pyinstaller or '', self.env_struct_current.version, pyinstaller_version)
+        self.tb_console.append_text(f'[{time.strftime("%H:%M:%S")}] 开始打包\n')
+        self.build_event_list = []
+        self.thread_build = ThreadPyinstallerBuild(build_command, build_cache, environment)
+        self.thread_build.signal_textbrowser_build.connect(self.tb_console.append_text)
+        self.thread_build.signal_build_events.connect(self.build_event_list.extend)
+        self.thread_build.signal_finished.connect(self.on_build_finished)
+        self.thread_build.start()
+
+    def on_build_finished(self, return_code: int):
+        """ 
+        打包结束
+
+        参数:
+        - return_code (int): 进程返回码
+
+        应用:
+        与 self.thread_build(ThreadPyinstallerBuild).signal_finished 信号连接
+        """
+        # 输出文件夹在打包中被创建或替换, 重新检查
+        self.path_stat_cache.request(self.get_output_path_list(), isForce=True)
+        log_parser = self.thread_build.log_parser
+        if log_parser.warning_count or log_parser.error_count:
+            self.tb_console.append_text(f'警告 {log_parser.warning_count} 条, 错误 {log_parser.error_count} 条\n')
+        if log_parser.missing_module_list:
+            self.tb_console.append_text(f'不存在的模块: {", ".join(log_parser.missing_module_list)}\n')
+        if build_profile := self.thread_build.build_profile:
+            self.tb_console.append_text(format_profile(build_profile))
+            for regression in self.thread_build.regression_list:
+                self.tb_console.append_text(f'耗时增加: {regression}\n')
+            self.show_build_profile_comparison(build_profile.project_key)
+        if return_code == 0:
+            self.tb_console.append_text(f'[{time.strftime("%H:%M:%S")}] 打包完成\n')
+            self.message.notification('打包完成')
+        else:
+            self.tb_console.append_text(f'[{time.strftime("%H:%M:%S")}] 打包失败, 返回码: {return_code}\n')
+            self.message.notification('打包失败')
+
+    def show_build_profile_comparison(self, project_key: str, count: int = None):
+        """ 
+        在控制台中显示项目最近几次打包的阶段耗时对比
+
+        参数:
+        - project_key (str): 项目键, 见 BuildProfile.project_key
+        - count (int): 对比的次数, 默认为设置中的 build_profile_compare_count, 不足 2 次时不显示
+        """
+        if count is None:
+            count = self.setting['build_profile_compare_count']
+        profile_list = BuildProfileHistory().get_recent(project_key, count)
+        if len(profile_list) >= 2:
+            self.tb_console.append_text(format_comparison(profile_list))
+
     def record_font_change_in_tb_console(self, font_size):
         """
         记录控制台显示字体大小
@@ -661,7 +845,14 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
         if (python_path.startswith('"') and python_path.endswith('"')) or (python_path.startswith("'") and python_path.endswith("'")):
             python_path = python_path[1:-1]
             self.le_env_specified_path_page_setting_env.setText(python_path)
-        if os.path.exists(python_path) and python_path.endswith('python.exe'):
+        self.pending_specified_python_path = ''
+        path_stat = self.path_stat_cache.get(python_path) if python_path.endswith('python.exe') else None
+        if python_path.endswith('python.exe') and path_stat is None:
+            # 路径检查完成后由 on_path_stat_changed() 再次更新
+            self.pending_specified_python_path = python_path
+            self.lb_env_specified_hint_info_page_setting_env.setText('<正在检查路径>')
+            return
+        if path_stat is not None and path_stat.isFile:
             self.env_struct_specified.env_name = '<指定环境>'
             self.env_struct_specified.path_python = python_path
             self.env_struct_specified.path_pyinstaller = find_pyinstaller_path(python_path)
@@ -717,6 +908,30 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
         self.update_env_specified_without_select_python_env()
         self.select_python_env()
 
+    def collect_env_install_state(self) -> tuple:
+        """
+        获取各环境的 pyinstaller 安装状态, 在线程池中运行, 不访问控件.
+        出现未缓存的 pyinstaller 版本时, 顺带生成该版本的选项模式(每个版本只启动一次进程)
+
+        返回:
+            tuple: ((python路径, pyinstaller版本), ...), 依次为 系统, 指定路径, conda 环境
+        """
+        path_list = [self.env_struct_sys.path_python, self.env_struct_specified.path_python, self.env_struct_conda.path_python]
+        state = tuple((path, read_pyinstaller_dist_info(path).get('pyinstaller_version', '') if path else '') for path in path_list)
+        for path, pyinstaller_version in state:
+            if pyinstaller_version and not self.option_schema_manager.has(pyinstaller_version):
+                self.option_schema_manager.load(path, pyinstaller_version)
+        return state
+
+    def on_env_install_state_refreshed(self, state: tuple) -> None:
+        """
+        RefreshCoordinator 的刷新结果, 状态变化时更新所有显示
+        """
+        if state is None or state == self.env_install_state:
+            return
+        self.env_install_state = state
+        self.check_all_env_installed()
+
     def check_all_env_installed(self):
         """
         更新所有显示, 并更新当前环境显示
@@ -772,9 +987,17 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
             self.env_struct_current.version = ''
             self.env_struct_current.path_error = False
 
+        self.update_option_schema()
         self.update_env_current_display_and_para()
         # self.update_installer_display_info()
 
+    def update_option_schema(self):
+        """
+        按当前环境的 pyinstaller 版本切换选项模式, 只查找内存, 未缓存时使用内置模式
+        """
+        pyinstaller_version = dict(self.env_install_state or ()).get(self.env_struct_current.path_python, '')
+        self.installer.set_option_schema(self.option_schema_manager.get(pyinstaller_version))
+
     def set_env_specified_path(self):
         file_path = QFileDialog.getOpenFileName(self, '选择Python解释器', os.path.expanduser("~"), 'Python解释器 (python.exe)')[0]
         if file_path:
@@ -812,12 +1035,91 @@ class PyToExeUI(Ui_MainWindow, QMainWindow):
             self.lb_env_current_check_install_page_base.setStyleSheet('background-color: rgb(200, 0, 0); color: rgb(200, 200, 200);')
 
     def reset_parameters_double_click(self):
-        print('双击')
-        # 双击完成重置到打开时的命令行参数
+        """ 双击重置到打开时的命令行参数, 可撤销 """
+        if self.installer_history.restore_mark('opened'):
+            self.update_installer_display_info()
 
     def reset_parameters_long_pressed(self):
-        print('长按')
-        # 长按完成重置到默认命令行参数
+        """ 长按重置到默认命令行参数, 可撤销 """
+        if self.installer_history.restore_mark('default'):
+            self.update_installer_display_info()
+
+    def undo_parameters(self):
+        if self.installer_history.undo():
+            self.update_installer_display_info()
+
+    def redo_parameters(self):
+        if self.installer_history.redo():
+            self.update_installer_display_info()
+
+    def save_project_file(self):
+        """ 保存项目文件, 含全部参数与当前环境, 打开时不需要重新解析命令行 """
+        file_filter = f'Project Files (*{PROJECT_EXTENSION})'
+        if self.project_file_manager.isBinaryAvailable():
+            file_filter += f';; Binary Project Files (*{PROJECT_BINARY_EXTENSION})'
+        default_name = (self.installer.output_file_name.command_args or 'project') + PROJECT_EXTENSION
+        file_path = QFileDialog.getSaveFileName(self, '保存项目', os.path.join(self.app_workspace_path, default_name), file_filter)[0]
+        if not file_path:
+            return
+        try:
+            self.project_file_manager.save(file_path, self.installer, self.get_env_current_info())
+        except (OSError, ProjectFileError) as e:
+            self.message.notification(f'项目保存失败: {e}')
+            return
+        self.message.notification('项目已保存', open_file_path=file_path)
+
+    def get_env_current_info(self) -> dict:
+        """ 当前环境信息, 用于保存到项目文件 """
+        env_type = 'builtin'
+        if self.rb_env_specified.isChecked():
+            env_type = 'specified'
+        elif self.rb_env_sys.isChecked():
+            env_type = 'sys'
+        elif self.rb_env_conda.isChecked():
+            env_type = 'conda'
+        return {
+            'type': env_type,
+            'env_name': self.env_struct_current.env_name,
+            'path_python': self.env_struct_current.path_python,
+            'path_pyinstaller': self.env_struct_current.path_pyinstaller,
+            'version': self.env_struct_current.version,
+        }
+
+    def select_env_from_info(self, environment: dict) -> bool:
+        """
+        按项目文件中的环境信息选择环境
+
+        返回:
+            bool: 是否找到对应环境
+        """
+        env_type = environment.get('type')
+        path_python = environment.get('path_python') or ''
+        # 路径尚未检查时先按存在处理, 检查完成后不存在则由 update_env_specified() 改用系统默认路径
+        path_stat = self.path_stat_cache.get(path_python) if path_python else None
+        if env_type == 'specified' and path_python and (path_stat is None or path_stat.isFile):
+            self.rb_env_specified.setChecked(True)
+            self.le_env_specified_path_page_setting_env.setText(path_python)
+            self.update_env_specified()
+            return True
+        if env_type == 'sys':
+            self.rb_env_sys.setChecked(True)
+            self.update_env_sys()
+            return True
+        if env_type == 'conda':
+            column_python_path = 2
+            for row in range(self.tbwdg_env_conda.rowCount()):
+                item = self.tbwdg_env_conda.item(row, column_python_path)
+                if item and item.text() == path_python:
+                    self.rb_env_conda.setChecked(True)
+                    self.tbwdg_env_conda.setCurrentCell(row, 0)
+                    self.update_env_conda_specified()
+                    return True
+            return False
+        if env_type == 'builtin':
+            self.rb_env_builtin.setChecked(True)
+            self.select_python_env()
+            return True
+        return False
 
     def reset_parameters(self, flag: str):
         if flag == 'doublePressed':
@@ -0,0 +1,91 @@
+"""
+批量打包命令行入口, 不启动 GUI
+
+用法:
+    python batch_build.py <workspace> <manifest.json> [-j N] [-v] [--no-cache] [-p] [--history N]
+
+- workspace: 日志与缓存所在文件夹, 与 main.py 的第一个参数一致
+- manifest.json: 清单文件, 格式见 system/Runner_Batch_Build.py
+- -j N: 同时运行的 PyInstaller 进程数, 默认使用清单中的设置或 CPU 数
+- -v: 输出每个任务的 PyInstaller 输出, 默认只输出状态(完整输出保存在各任务工作文件夹的 build.log 中)
+- --no-cache: 不使用打包结果缓存(缓存位于 workspace 下的 .build_cache), 总是重新打包
+- -p: 输出每个任务的阶段耗时. 与上一次相比明显变慢的阶段总是输出
+- --history N: 结束后输出每个任务最近 N 次打包的阶段耗时对比
+
+全部任务成功时返回 0, 否则返回 1
+"""
+import os
+import sys
+import argparse
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='PyToExe batch build')
+    parser.add_argument('workspace')
+    parser.add_argument('manifest')
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('-p', '--profile', action='store_true')
+    parser.add_argument('--history', type=int, default=0)
+    return parser.parse_args()
+
+
+# const.Const_Parameter 在导入时会切换工作目录并读取 sys.argv[1] 作为 workspace, 需先解析命令行, 将路径转换为绝对路径.
+# 只转换 workspace 与 manifest, 选项的值(如 -j 4)保持不变
+_args = parse_args()
+_args.workspace = os.path.abspath(_args.workspace)
+_args.manifest = os.path.abspath(_args.manifest)
+sys.argv[1:] = [_args.workspace]
+
+import threading
+
+from system.Runner_Batch_Build import BatchBuildRunner, BatchJobStatus, BatchManifestError
+from system.Cache_Build_Result import BuildResultCache
+from system.Profiler_Build_Phase import BuildProfileHistory, format_profile, format_comparison, get_project_key
+
+
+def main(args: argparse.Namespace) -> int:
+    try:
+        runner = BatchBuildRunner.from_manifest(args.manifest, args.jobs, None if args.no_cache else BuildResultCache())
+    except BatchManifestError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print_lock = threading.Lock()
+    job_count = len(runner.job_list)
+    finished_list = []
+
+    def on_status(job):
+        with print_lock:
+            if job.status == BatchJobStatus.RUNNING:
+                print(f'[{job.name}] running')
+                return
+            finished_list.append(job)
+            message = f' ({job.message})' if job.message else ''
+            print(f'[{len(finished_list)}/{job_count}] [{job.name}] {job.status} in {job.elapsed:.1f}s{message}')
+            if args.profile and job.build_profile is not None:
+                print(format_profile(job.build_profile), end='')
+            for regression in job.regression_list:
+                print(f'[{job.name}] 耗时增加: {regression}')
+
+    def on_output(job, line):
+        with print_lock:
+            print(f'[{job.name}] {line}')
+
+    try:
+        job_list = runner.run(on_status, on_output if args.verbose else None)
+    except KeyboardInterrupt:
+        return 1
+    if args.history > 0:
+        for job in job_list:
+            if job.build_command is not None:
+                project_key = get_project_key(job.build_command.output_base_path)
+                print(format_comparison(BuildProfileHistory().get_recent(project_key, args.history)), end='')
+    failed_list = [job for job in job_list if job.status != BatchJobStatus.SUCCEEDED]
+    for job in failed_list:
+        print(f'failed: {job.name} -> {job.log_path}', file=sys.stderr)
+    return 1 if failed_list else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(_args))
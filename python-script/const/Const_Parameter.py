@@ -80,6 +80,11 @@ class SettingEnum(StaticEnum):
         'auto_open_printed_command_line_file': [bool, True],
         'style_sheet': [dict, {}],
         'synchron_vers': [bool, True],
+        'venv_dirs': [list, []],
+        'build_cache_enabled': [bool, True],
+        'build_cache_max_size_mb': [int, 4096],
+        'managed_workpath_enabled': [bool, True],
+        'build_profile_compare_count': [int, 5],
     }
 
 
@@ -97,37 +102,6 @@ class Log(StaticEnum):
     LogGroup = LoggerGroup(APP_WORKSPACE_PATH, files_limit=__files_num, exclude_logs=[CRITICAL])
 
 
-class Pyinstaller(StaticEnum):
-
-    class CmdArgsCategory:
-        LIST_SWITCH = [
-            '--strip', '-s', '--noupx', '--disable-windowed-traceback', '--uac-admin', '--uac-uiaccess',
-            '--argv-emulation', '--bootloader-ignore-signals', '--noconfirm', '-y', '--clean'
-        ]
-        DICT_STATE_WITH_PARAMS = {
-            '--debug': ['all', 'imports', 'bootloader', 'noarchive'],
-            '-d': [],
-            '--python-option': [],
-            '--hide-console': [],
-            '--target-architecture': [],
-            '--target-arch': [],
-            '--log-level': []
-        }
-        DICT_STATE_WITHOUT_PARAMS = {
-            '--onefile': ['--onefile', '--onedir'],
-            '--console': ['--console', '--nowindowed', '--windowed', '--noconsole', '-c', '-w']
-        }
-        LIST_SINGLE = [
-            '--specpath', '--contents-directory', '--version-file', '--manifest', '-m', '--osx-bundle-identifier', '--codesign-identity',
-            '--osx-entitlements-file', '--runtime-tmpdir', '--workpath', '--upx-dir', '--splash', '--name', '--distpath'
-        ]
-        LIST_MULTI = [
-            '--paths', '-p', '--hidden-import', '--hiddenimport', '--collect-submodules', '--collect-data', '--collect-datas',
-            '--collect-binaries', '--collect-all', '--copy-metadata', '--recursive-copy-metadata', '--additional-hooks-dir', '--runtime-hook',
-            '--exclude-module', '--upx-exclude', '--icon', '-i', '--resource', '-r', '--add-data', '--add-binary'
-        ]  # 包含两类 MultiInfoStruct, RelPathStruct 都是属于可以重复调用的
-
-
 class App(EnumConst):
     WORKSPACE_PATH: str = detemine_workspace_path()
     OS: str = detect_system()
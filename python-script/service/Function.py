@@ -53,10 +53,11 @@ class FunctionUI(PyToExeUI):
 
     def set_input_py_file_path(self):
         file_path = QFileDialog.getOpenFileName(
-            self, '选择输入文件', self.app_workspace_path, """Accepted Files (*.py *.pyw *.pyd *.spec *.txt *.ocl);; 
+            self, '选择输入文件', self.app_workspace_path, """Accepted Files (*.py *.pyw *.pyd *.spec *.txt *.ocl *.ptproj *.ptprojb);; 
             Python Files (*.py *.pyw *.pyd *.spec);; 
             Text Files (*.txt);; 
-            Output Command Line Files (*.ocl)""")[0]
+            Output Command Line Files (*.ocl);; 
+            Project Files (*.ptproj *.ptprojb)""")[0]
         folder_path = ''
         output_file_name = ''
         if not file_path:
@@ -73,6 +74,11 @@ class FunctionUI(PyToExeUI):
                 folder_path = self.installer.output_folder_path.command_args
             if self.installer.output_file_name.command:
                 output_file_name = self.installer.output_file_name.command_args
+            self.installer_history.set_mark('opened')
+        elif file_path.endswith('.spec'):
+            self.import_spec_file(file_path)
+        elif file_path.endswith((PROJECT_EXTENSION, PROJECT_BINARY_EXTENSION)):
+            self.open_project_file(file_path)
 
         # self.le_input_py_file_path.setText(file_path)
         # self.app_workspace_path = os.path.dirname(file_path)
@@ -93,6 +99,30 @@ class FunctionUI(PyToExeUI):
         # 更新安装器信息
         self.update_installer_display_info()
 
+    def import_spec_file(self, file_path: str) -> None:
+        """ 静态导入 .spec 文件中的参数, 不执行 spec 中的代码, 无法导入的动态内容显示在控制台 """
+        result = SpecFileLoader(self.installer.option_schema).read_file(file_path)
+        if result.snapshot is None:
+            self.message.notification('文件错误, 无法解析 spec 文件')
+            return
+        self.installer.restore(result.snapshot)
+        self.installer_history.set_mark('opened')
+        if result.skipped_list:
+            self.tb_console.append_text(f'[{time.localtime()}]\n{file_path} 中以下内容未导入:\n' + '\n'.join(str(item) for item in result.skipped_list))
+            self.message.notification(f'spec 文件中有 {len(result.skipped_list)} 处动态内容未导入')
+
+    def open_project_file(self, file_path: str) -> None:
+        """ 打开项目文件, 直接恢复结构快照并选择保存时的环境 """
+        try:
+            project_file = self.project_file_manager.load(file_path)
+            project_file.apply(self.installer)
+        except (OSError, ProjectFileError) as e:
+            self.message.notification(f'项目读取失败: {e}')
+            return
+        self.installer_history.set_mark('opened')
+        if not self.select_env_from_info(project_file.environment):
+            self.message.notification('未找到项目保存时的环境, 请重新选择')
+
     def set_input_file(self, file_path: str):
         if os.path.exists(file_path) and file_path.endswith(('.ocl', '.txt')):
             hasError = self.installer_manager.read_file(file_path)
@@ -121,10 +151,10 @@ class FunctionUI(PyToExeUI):
 
         self.le_input_py_file_path.setText(file_path)
         self.app_workspace_path = os.path.dirname(file_path)
-        self.original_installer = self.installer.copy()
+        self.installer_history.set_mark('opened')
         # 写配置文件
         self.installer.python_file_path.set_args(file_path)
-        self.setting['last_command'] = self.installer.get_command_line(self.env_struct_current.path_pyinstaller)
+        self.setting['last_command'] = self.installer.get_command_line(self.env_struct_current.path_pyinstaller, isBlocking=False)
         if not self.cb_lock_output_folder.isChecked():
             if not folder_path:
                 folder_path = os.path.dirname(file_path)
@@ -0,0 +1,495 @@
+"""
+打包结果缓存
+
+以打包输入的指纹为键保存 dist 中的打包结果, 输入未变化时直接恢复, 不重新打包.
+
+指纹包含:
+- 入口文件及其本地导入闭包(入口文件夹与 --paths 中可找到的模块, 不含 site-packages)的内容
+- 输入路径(--add-data / --add-binary 的源路径, 图标, 版本文件, 钩子等)中全部文件的内容
+- 影响打包结果的参数(不含 --distpath, --workpath, --noconfirm, --clean, --log-level 等构建选项, 含 --upx-dir)与执行目录
+- 未使用 --noupx 时, --upx-dir 中或(未指定时) PATH 中的 upx 可执行文件的内容
+- 解释器与 PyInstaller 的版本, 以及 site-packages 中已安装的包(环境键)
+
+文件内容的哈希值按 (路径, 大小, 修改时间) 在内存中缓存, 同一进程中未修改的文件只读取一次.
+缓存超过大小上限时按最近使用时间淘汰.
+
+类:
+- BuildResultCache: 打包结果缓存(单例)
+
+函数:
+- get_site_packages_key(implement_path: str) -> str: 生成 site-packages 的键
+- get_environment_key(implement_path: str, python_version: str = '', pyinstaller_version: str = '') -> str: 生成环境键
+"""
+import os
+import ast
+import glob
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+from system.Reader_Dist_Info import read_pyinstaller_dist_info, find_site_packages_list
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+FINGERPRINT_VERSION: int = 4
+""" 指纹的计算方式或缓存条目的格式变化时递增, 使旧的缓存失效 """
+BUILD_CACHE_FOLDER_NAME: str = '.build_cache'
+BUILD_CACHE_INDEX_NAME: str = 'index.json'
+DEFAULT_MAX_SIZE: int = 4 * 1024 ** 3
+""" 默认大小上限 4 GiB """
+_HASH_CHUNK_SIZE: int = 1024 * 1024
+CLEAN_ARGUMENT: str = '--clean'
+NOUPX_ARGUMENT: str = '--noupx'
+UPX_DIR_STRUCT_NAME: str = 'upx_dir'
+SCRIPT_STRUCT_NAME: str = 'python_file_path'
+IMPORT_PATH_STRUCT_NAME: str = 'imports_paths'
+_SOURCE_EXTENSIONS: tuple = ('.py', '.pyw')
+
+
+def get_site_packages_key(implement_path: str) -> str:
+    """
+    生成 site-packages 的键, 安装, 升级或卸载包后随之变化. 只读取文件夹与 dist-info/egg-info/.pth 的名称与修改时间, 不读取文件内容
+
+    参数:
+    - implement_path(str): 执行器路径, pyinstaller(位于 Scripts / bin 中)或 python 解释器
+
+    返回:
+    - str: sha256 十六进制字符串, 未找到 site-packages 时返回 ''
+    """
+    entry_list = []
+    for site_packages in find_site_packages_list(implement_path):
+        try:
+            entry_list.append([site_packages, os.stat(site_packages).st_mtime_ns])
+            with os.scandir(site_packages) as it:
+                for entry in it:
+                    if entry.name.endswith(('.dist-info', '.egg-info', '.pth')):
+                        entry_list.append([entry.name, entry.stat().st_mtime_ns])
+        except OSError:
+            continue
+    if not entry_list:
+        return ''
+    content = json.dumps(sorted(entry_list), ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def get_environment_key(implement_path: str, python_version: str = '', pyinstaller_version: str = '') -> str:
+    """
+    生成环境键, 解释器, PyInstaller 或 site-packages 中的包变化后环境键随之变化
+
+    参数:
+    - implement_path(str): 执行器路径, pyinstaller 或 python 解释器
+    - python_version(str): python 版本, 未知时为空
+    - pyinstaller_version(str): PyInstaller 版本, 为空且执行器为解释器时从 dist-info 读取
+
+    返回:
+    - str: 如 'E:\\Python311\\python.exe|3.11.7|6.3.0|1700000000000000000|103192|<site-packages 的键>',
+      未指定执行器(使用 PATH 中的 pyinstaller)或找不到 site-packages(无法确认依赖是否变化)时返回 ''
+    """
+    if not implement_path:
+        return ''
+    site_packages_key = get_site_packages_key(implement_path)
+    if not site_packages_key:
+        return ''
+    if not pyinstaller_version and os.path.basename(implement_path).lower().startswith('python'):
+        pyinstaller_version = read_pyinstaller_dist_info(implement_path).get('pyinstaller_version', '')
+    try:
+        st = os.stat(implement_path)
+    except OSError:
+        st = None
+    stat_key = f'{st.st_mtime_ns}|{st.st_size}' if st else ''
+    return f'{implement_path}|{python_version}|{pyinstaller_version}|{stat_key}|{site_packages_key}'
+
+
+class BuildResultCache(object):
+    """
+    打包结果缓存(单例), 线程安全
+
+    参数:
+    - exe_folder_path(str): 缓存文件夹所在路径, 默认为 APP_WORKSPACE_PATH
+    - max_size(int): 大小上限(字节), 默认 4 GiB
+
+    属性:
+    - cache_folder_path(str): 缓存文件夹路径
+    - max_size(int): 大小上限(字节)
+    - statistics(dict): 统计 {'hit_count', 'miss_count', 'store_count', 'eviction_count', 'entry_count', 'total_size'}
+
+    方法:
+    - set_max_size(max_size: int) -> None: 设置大小上限, 超出时立即淘汰
+    - fingerprint(build_command: BuildCommand, environment_key: str) -> str: 计算指纹, 读取全部输入文件, 应在工作线程中调用
+    - lookup(build_command: BuildCommand) -> tuple[str, str]: 计算指纹并尝试恢复, 应在工作线程中调用
+    - restore(key: str, output_base_path: str) -> str: 命中时将结果恢复到 dist 中, 返回恢复的路径, 未命中返回 ''
+    - store(key: str, output_base_path: str) -> bool: 保存打包结果
+    - clear() -> None: 清空缓存, 保留统计
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, exe_folder_path: str = APP_WORKSPACE_PATH, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__cache_folder_path: str = os.path.join(exe_folder_path, BUILD_CACHE_FOLDER_NAME)
+        self.__index_path: str = os.path.join(self.__cache_folder_path, BUILD_CACHE_INDEX_NAME)
+        self.__max_size: int = max_size
+        self.__lock = threading.RLock()
+        self.__file_hash_dict: dict = {}
+        """ 路径 -> (大小, 修改时间, sha256) """
+        self.__import_dict: dict = {}
+        """ 源文件路径 -> (大小, 修改时间, [(模块名称, 相对导入层级)]) """
+        self.__index: dict = self.__load_index()
+
+    @property
+    def cache_folder_path(self) -> str:
+        return self.__cache_folder_path
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def statistics(self) -> dict:
+        with self.__lock:
+            statistics = dict(self.__index['statistics'])
+            statistics['entry_count'] = len(self.__index['entries'])
+            statistics['total_size'] = sum(entry['size'] for entry in self.__index['entries'].values())
+            return statistics
+
+    def set_max_size(self, max_size: int) -> None:
+        with self.__lock:
+            self.__max_size = max_size
+            if self.__evict():
+                self.__save_index()
+
+    def fingerprint(self, build_command, environment_key: str) -> str:
+        """
+        计算打包输入的指纹
+
+        参数:
+        - build_command(BuildCommand): 打包命令, 使用其中的 fingerprint_argument_list 与 input_path_dict
+        - environment_key(str): 环境键, 见 get_environment_key()
+
+        返回:
+        - str: sha256 十六进制字符串
+        """
+        path_dict: dict = build_command.input_path_dict
+        file_set = set()
+        for name, path_list in path_dict.items():
+            # --paths 只用于查找导入的模块, 由导入闭包覆盖, 不展开整个文件夹
+            if name in (IMPORT_PATH_STRUCT_NAME, SCRIPT_STRUCT_NAME):
+                continue
+            for path in path_list:
+                file_set.update(self.__expand_input_path(path))
+        for script_path in path_dict.get(SCRIPT_STRUCT_NAME, ()):
+            file_set.update(self.__iter_import_closure(script_path, path_dict.get(IMPORT_PATH_STRUCT_NAME, [])))
+        # 未指定 --upx-dir 时 PyInstaller 使用 PATH 中的 upx, 安装或更换 upx 同样改变打包结果
+        if NOUPX_ARGUMENT not in build_command.fingerprint_argument_list and UPX_DIR_STRUCT_NAME not in path_dict:
+            if upx_path := shutil.which('upx'):
+                file_set.add(upx_path)
+        file_list = [(os.path.normcase(path), self.__hash_file(path)) for path in sorted(file_set)]
+        content = json.dumps([FINGERPRINT_VERSION, environment_key, build_command.cwd, build_command.fingerprint_argument_list, file_list],
+                             ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def lookup(self, build_command) -> tuple:
+        """
+        计算指纹并尝试恢复打包结果. 未设置环境键或命令中含 --clean 时不使用缓存
+
+        参数:
+        - build_command(BuildCommand): 打包命令
+
+        返回:
+        - tuple[str, str]: (指纹, 恢复的路径). 不使用缓存时指纹为 '', 未命中时路径为 ''
+        """
+        if not build_command.environment_key or CLEAN_ARGUMENT in build_command.argv or not build_command.output_base_path:
+            return '', ''
+        key = self.fingerprint(build_command, build_command.environment_key)
+        return key, self.restore(key, build_command.output_base_path)
+
+    def restore(self, key: str, output_base_path: str) -> str:
+        """
+        命中时将缓存的结果复制到 dist 中, 已存在的同名结果会被替换
+
+        参数:
+        - key(str): 指纹
+        - output_base_path(str): 结果路径(不含扩展名), 如 'E:\\test\\dist\\main'
+
+        返回:
+        - str: 恢复的第一个路径, 如 'E:\\test\\dist\\main.exe', 未命中时返回 ''. 同一输出名称的全部结果(如 macOS 上的 main 与 main.app)都会被恢复
+        """
+        with self.__lock:
+            entry = self.__index['entries'].get(key)
+            name_list = entry.get('name_list') if entry is not None else None
+            if not name_list or not all(os.path.exists(os.path.join(self.__cache_folder_path, key, name)) for name in name_list):
+                if entry is not None:
+                    del self.__index['entries'][key]
+                self.__index['statistics']['miss_count'] += 1
+                self.__save_index()
+                return ''
+        output_folder = os.path.dirname(output_base_path)
+        target_list = [os.path.join(output_folder, name) for name in name_list]
+        try:
+            # 同一输出名称的其他结果(如上次打包留下的 .app)一并删除, dist 中只保留缓存的结果
+            for path in _find_output(output_base_path):
+                if path not in target_list:
+                    _remove_path(path)
+            os.makedirs(output_folder, exist_ok=True)
+            for name, target_path in zip(name_list, target_list):
+                source_path = os.path.join(self.__cache_folder_path, key, name)
+                _remove_path(target_path)
+                if os.path.isdir(source_path):
+                    shutil.copytree(source_path, target_path, symlinks=True)
+                else:
+                    shutil.copy2(source_path, target_path)
+        except OSError:
+            lg.exception(f'恢复打包缓存失败: {key[:16]} -> {output_base_path}')
+            with self.__lock:
+                self.__index['statistics']['miss_count'] += 1
+                self.__save_index()
+            return ''
+        with self.__lock:
+            entry['last_used'] = time.time()
+            entry['hit_count'] = entry.get('hit_count', 0) + 1
+            self.__index['statistics']['hit_count'] += 1
+            self.__save_index()
+        lg.info(f'命中打包缓存: {key[:16]} -> {", ".join(target_list)}')
+        return target_list[0]
+
+    def store(self, key: str, output_base_path: str) -> bool:
+        """
+        保存打包结果. 先复制到临时文件夹再重命名, 并发保存同一指纹时只保留一份.
+        同一输出名称的全部结果一起保存, 如 macOS 窗口程序的单文件夹打包同时生成 dist/main 与 dist/main.app
+
+        参数:
+        - key(str): 指纹
+        - output_base_path(str): 结果路径(不含扩展名), 查找 无扩展名(文件或文件夹) / .exe / .app
+
+        返回:
+        - bool: 是否已保存, 结果不存在或超过大小上限时为 False
+        """
+        source_list = _find_output(output_base_path)
+        if not source_list:
+            return False
+        size = sum(_get_size(source_path) for source_path in source_list)
+        if size > self.__max_size:
+            lg.info(f'打包结果超过缓存上限, 不保存: {output_base_path}')
+            return False
+        name_list = [os.path.basename(source_path) for source_path in source_list]
+        entry_folder = os.path.join(self.__cache_folder_path, key)
+        temp_folder = f'{entry_folder}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            _remove_path(temp_folder)
+            os.makedirs(temp_folder)
+            for source_path, name in zip(source_list, name_list):
+                if os.path.isdir(source_path):
+                    shutil.copytree(source_path, os.path.join(temp_folder, name), symlinks=True)
+                else:
+                    shutil.copy2(source_path, os.path.join(temp_folder, name))
+            _remove_path(entry_folder)
+            os.replace(temp_folder, entry_folder)
+        except OSError:
+            lg.exception(f'保存打包缓存失败: {output_base_path}')
+            _remove_path(temp_folder)
+            return False
+        with self.__lock:
+            now = time.time()
+            self.__index['entries'][key] = {'name_list': name_list, 'size': size, 'created': now, 'last_used': now, 'hit_count': 0}
+            self.__index['statistics']['store_count'] += 1
+            self.__evict(key)
+            self.__save_index()
+        lg.info(f'已保存打包缓存: {key[:16]} <- {", ".join(source_list)}')
+        return True
+
+    def clear(self) -> None:
+        with self.__lock:
+            for key in list(self.__index['entries']):
+                _remove_path(os.path.join(self.__cache_folder_path, key))
+            self.__index['entries'].clear()
+            self.__save_index()
+
+    def __evict(self, keep_key: str = '') -> bool:
+        """ 按最近使用时间淘汰, 直到总大小不超过上限. keep_key 为刚保存的条目, 不淘汰 """
+        entry_dict: dict = self.__index['entries']
+        total_size = sum(entry['size'] for entry in entry_dict.values())
+        isEvicted = False
+        for key in sorted(entry_dict, key=lambda k: entry_dict[k]['last_used']):
+            if total_size <= self.__max_size:
+                break
+            if key == keep_key:
+                continue
+            total_size -= entry_dict.pop(key)['size']
+            _remove_path(os.path.join(self.__cache_folder_path, key))
+            self.__index['statistics']['eviction_count'] += 1
+            isEvicted = True
+        return isEvicted
+
+    def __expand_input_path(self, path: str) -> list:
+        """ 输入路径 -> 文件列表, 文件夹展开为其中的全部文件, 含通配符的路径按通配符匹配 """
+        if any(char in path for char in '*?['):
+            path_list = glob.glob(path)
+        else:
+            path_list = [path]
+        file_list = []
+        for item in path_list:
+            if os.path.isdir(item):
+                for folder, _, file_name_list in os.walk(item):
+                    file_list.extend(os.path.join(folder, file_name) for file_name in file_name_list)
+            else:
+                file_list.append(item)
+        return file_list
+
+    def __hash_file(self, path: str) -> str | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self.__lock:
+            cached = self.__file_hash_dict.get(path)
+        if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+            return cached[2]
+        sha256 = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                while chunk := f.read(_HASH_CHUNK_SIZE):
+                    sha256.update(chunk)
+        except OSError:
+            return None
+        digest = sha256.hexdigest()
+        with self.__lock:
+            self.__file_hash_dict[path] = (st.st_size, st.st_mtime_ns, digest)
+        return digest
+
+    def __iter_import_closure(self, script_path: str, import_root_list: list):
+        """
+        入口文件的本地导入闭包, 只查找入口文件夹与 import_root_list 中的模块, 找不到的模块(标准库, site-packages)忽略.
+        只能分析静态 import 语句, importlib 等动态导入不在闭包中
+        """
+        root_list = [os.path.dirname(os.path.abspath(script_path))] + [root for root in import_root_list if root]
+        pending_list = [os.path.abspath(script_path)]
+        visited_set = set()
+        while pending_list:
+            source_path = pending_list.pop()
+            if source_path in visited_set:
+                continue
+            visited_set.add(source_path)
+            yield source_path
+            for module_name, level in self.__read_imports(source_path):
+                if level:
+                    # 相对导入: 从当前文件所在包向上 level - 1 层
+                    base_folder = os.path.dirname(source_path)
+                    for _ in range(level - 1):
+                        base_folder = os.path.dirname(base_folder)
+                    search_list = [base_folder]
+                else:
+                    search_list = root_list
+                for module_path in _resolve_module(module_name, search_list):
+                    if module_path not in visited_set:
+                        pending_list.append(module_path)
+
+    def __read_imports(self, source_path: str) -> list:
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return []
+        with self.__lock:
+            cached = self.__import_dict.get(source_path)
+        if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+            return cached[2]
+        try:
+            with open(source_path, 'rb') as f:
+                tree = ast.parse(f.read(), source_path)
+        except (OSError, SyntaxError, ValueError):
+            return []
+        import_list = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                import_list.extend((alias.name, 0) for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                module_name = node.module or ''
+                if module_name or node.level:
+                    import_list.append((module_name, node.level))
+                # from package import module
+                import_list.extend((f'{module_name}.{alias.name}' if module_name else alias.name, node.level)
+                                   for alias in node.names if alias.name != '*')
+        with self.__lock:
+            self.__import_dict[source_path] = (st.st_size, st.st_mtime_ns, import_list)
+        return import_list
+
+    def __load_index(self) -> dict:
+        index = {'entries': {}, 'statistics': {'hit_count': 0, 'miss_count': 0, 'store_count': 0, 'eviction_count': 0}}
+        if not os.path.exists(self.__index_path):
+            return index
+        try:
+            with open(self.__index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            lg.exception('读取打包缓存索引失败')
+            return index
+        if isinstance(data, dict) and isinstance(data.get('entries'), dict):
+            index['entries'] = data['entries']
+            index['statistics'].update(data.get('statistics') or {})
+        return index
+
+    def __save_index(self) -> None:
+        try:
+            os.makedirs(self.__cache_folder_path, exist_ok=True)
+            temp_path = f'{self.__index_path}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.__index, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.__index_path)
+        except OSError:
+            lg.exception('保存打包缓存索引失败')
+
+
+def _resolve_module(module_name: str, search_list: list) -> list:
+    """ 模块名称 -> 本地源文件列表, 包含路径上各级包的 __init__.py """
+    part_list = [part for part in module_name.split('.') if part]
+    for root in search_list:
+        path_list = []
+        folder = root
+        for index, part in enumerate(part_list):
+            package_init = os.path.join(folder, part, '__init__.py')
+            if os.path.isfile(package_init):
+                path_list.append(package_init)
+                folder = os.path.join(folder, part)
+                continue
+            for extension in _SOURCE_EXTENSIONS:
+                module_path = os.path.join(folder, part + extension)
+                if os.path.isfile(module_path):
+                    path_list.append(module_path)
+                    break
+            break
+        if path_list:
+            return path_list
+    return []
+
+
+def _find_output(output_base_path: str) -> list:
+    """ 同一输出名称的全部打包结果, 按 无扩展名 / .exe / .app 的顺序 """
+    return [path for path in (output_base_path, f'{output_base_path}.exe', f'{output_base_path}.app') if os.path.lexists(path)]
+
+
+def _get_size(path: str) -> int:
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    size = 0
+    for folder, _, file_name_list in os.walk(path):
+        for file_name in file_name_list:
+            file_path = os.path.join(folder, file_name)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
+
+
+def _remove_path(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.lexists(path):
+        os.remove(path)
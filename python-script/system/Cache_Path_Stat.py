@@ -0,0 +1,272 @@
+"""
+路径状态缓存
+
+所有路径类选项与解释器路径的 stat 结果集中缓存在内存中, GUI 线程只读取缓存, 不访问文件系统.
+- 未知路径由 get() 提交到线程池异步检查, 结果通过监听器通知(在工作线程中调用, 由 PathStatWatcher 转到主线程)
+- 路径失效由 PathStatWatcher 监视所在文件夹驱动, 不定期轮询
+- 打包前的检查由 preflight() 并发执行, 总耗时取决于最慢的一次 stat, 适合网络路径(SMB/NFS)
+
+类:
+- PathStat: 单个路径的状态
+- PathStatCache: 路径状态缓存(单例)
+"""
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+
+class PathStat(object):
+    """
+    单个路径的状态
+
+    属性:
+    - path(str): 路径
+    - isExists(bool): 是否存在
+    - isFile(bool): 是否为文件
+    - isDir(bool): 是否为文件夹
+    - mtime(float): 修改时间
+    - size(int): 文件大小
+    """
+    __slots__ = ('path', 'isExists', 'isFile', 'isDir', 'mtime', 'size')
+
+    def __init__(self, path: str, isExists: bool = False, isFile: bool = False, isDir: bool = False, mtime: float = 0.0, size: int = 0) -> None:
+        self.path: str = path
+        self.isExists: bool = isExists
+        self.isFile: bool = isFile
+        self.isDir: bool = isDir
+        self.mtime: float = mtime
+        self.size: int = size
+
+    @classmethod
+    def from_path(cls, path: str) -> 'PathStat':
+        """ 访问文件系统获取状态, 路径不存在或无法访问时 isExists 为 False """
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return cls(path)
+        return cls(path, True, stat.S_ISREG(st.st_mode), stat.S_ISDIR(st.st_mode), st.st_mtime, st.st_size)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PathStat):
+            return NotImplemented
+        return (self.path, self.isExists, self.isFile, self.isDir, self.mtime, self.size) == \
+            (other.path, other.isExists, other.isFile, other.isDir, other.mtime, other.size)
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.isExists, self.mtime, self.size))
+
+    def __repr__(self) -> str:
+        return f'PathStat({self.path!r}, isExists={self.isExists}, isFile={self.isFile}, isDir={self.isDir})'
+
+
+class PathStatCache(object):
+    """
+    路径状态缓存(单例), 线程安全
+
+    参数:
+    - max_worker_count(int): 异步检查与并发预检的最大线程数, 网络路径的 stat 主要耗时在等待, 默认 8
+
+    属性:
+    - path_list(list): 已缓存的路径
+    - pending_count(int): 等待异步检查的路径数
+
+    方法:
+    - get(path: str) -> PathStat | None: 只读取内存, 未知路径提交异步检查并返回 None
+    - stat(path: str) -> PathStat: 读取缓存, 未知路径同步检查, 用于工作线程或只检查一次的场景
+    - request(path_list: list, isForce: bool = False) -> None: 提交异步检查, isForce 为 False 时跳过已缓存的路径
+    - invalidate(path_list: list = None) -> None: 使缓存失效, 不指定路径时清空全部缓存
+    - preflight(path_list: list, timeout: float = None) -> dict: 并发重新检查全部路径, 返回 {路径: PathStat}
+    - get_validity(path_dict: dict) -> dict: 由 {选项名称: [路径]} 得到 {选项名称: 是否全部存在}, 不访问文件系统
+    - add_listener(callback) -> None: 添加状态变化监听器, callback(path_list) 在工作线程中调用
+    - remove_listener(callback) -> None: 移除监听器
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, max_worker_count: int = 8) -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__lock = threading.Lock()
+        self.__stat_dict: dict = {}
+        """ 规范化路径 -> PathStat """
+        self.__pending_set: set = set()
+        """ 已提交异步检查但未完成的规范化路径 """
+        self.__listener_list: list = []
+        self.__executor = ThreadPoolExecutor(max_workers=max(1, max_worker_count), thread_name_prefix='PathStatCache')
+
+    @property
+    def path_list(self) -> list:
+        with self.__lock:
+            return list(self.__stat_dict)
+
+    @property
+    def pending_count(self) -> int:
+        with self.__lock:
+            return len(self.__pending_set)
+
+    def get(self, path: str) -> PathStat | None:
+        """
+        只读取内存, 可在 GUI 线程中调用. 未知路径提交异步检查, 检查完成后通知监听器
+
+        参数:
+        - path(str): 路径
+
+        返回:
+        - PathStat | None: 缓存的状态, 未知时为 None
+        """
+        if not path:
+            return None
+        key = _normalize(path)
+        with self.__lock:
+            path_stat = self.__stat_dict.get(key)
+        if path_stat is None:
+            self.request([key])
+        return path_stat
+
+    def stat(self, path: str) -> PathStat:
+        """
+        读取缓存, 未知路径同步检查并写入缓存
+
+        参数:
+        - path(str): 路径
+
+        返回:
+        - PathStat: 状态
+        """
+        key = _normalize(path)
+        with self.__lock:
+            path_stat = self.__stat_dict.get(key)
+        if path_stat is None:
+            path_stat = PathStat.from_path(key)
+            self.__store({key: path_stat})
+        return path_stat
+
+    def request(self, path_list: list, isForce: bool = False) -> None:
+        """
+        提交异步检查, 正在检查中的路径不会重复提交
+
+        参数:
+        - path_list(list[str]): 路径列表
+        - isForce(bool): 是否重新检查已缓存的路径
+        """
+        key_list = []
+        with self.__lock:
+            for path in path_list:
+                if not path:
+                    continue
+                key = _normalize(path)
+                if key in self.__pending_set or (not isForce and key in self.__stat_dict):
+                    continue
+                self.__pending_set.add(key)
+                key_list.append(key)
+        for key in key_list:
+            self.__executor.submit(self.__stat_async, key)
+
+    def invalidate(self, path_list: list = None) -> None:
+        """
+        使缓存失效, 下一次 get() 时重新检查
+
+        参数:
+        - path_list(list[str]): 路径列表, 为 None 时清空全部缓存
+        """
+        with self.__lock:
+            if path_list is None:
+                self.__stat_dict.clear()
+                return
+            for path in path_list:
+                self.__stat_dict.pop(_normalize(path), None)
+
+    def preflight(self, path_list: list, timeout: float = None) -> dict:
+        """
+        并发重新检查全部路径并写入缓存, 不使用已缓存的结果. 阻塞直到全部完成, 应在工作线程中调用
+
+        参数:
+        - path_list(list[str]): 路径列表
+        - timeout(float): 超时时间(秒), 超时未完成的路径视为不存在, 默认不限制
+
+        返回:
+        - dict: {路径: PathStat}, 键为传入的原始路径
+        """
+        key_dict = {path: _normalize(path) for path in path_list if path}
+        future_dict = {key: self.__executor.submit(PathStat.from_path, key) for key in set(key_dict.values())}
+        wait(future_dict.values(), timeout=timeout)
+        stat_dict = {}
+        for key, future in future_dict.items():
+            if future.done() and future.exception() is None:
+                stat_dict[key] = future.result()
+            else:
+                lg.warning(f'路径检查超时: {key}')
+                future.cancel()
+        self.__store(stat_dict)
+        return {path: stat_dict.get(key) or PathStat(key) for path, key in key_dict.items()}
+
+    def get_validity(self, path_dict: dict) -> dict:
+        """
+        计算各选项的有效性, 只读取内存, 未知路径提交异步检查
+
+        参数:
+        - path_dict(dict): {选项名称: [路径]}, 如 PyinstallerStruct.get_input_path_dict() 的结果
+
+        返回:
+        - dict: {选项名称: True(全部存在) / False(存在不存在的路径) / None(尚未检查完成)}
+        """
+        validity_dict = {}
+        for name, path_list in path_dict.items():
+            validity = True
+            for path in path_list:
+                path_stat = self.get(path)
+                if path_stat is None:
+                    validity = None
+                elif not path_stat.isExists:
+                    validity = False
+                    break
+            validity_dict[name] = validity
+        return validity_dict
+
+    def add_listener(self, callback) -> None:
+        with self.__lock:
+            if callback not in self.__listener_list:
+                self.__listener_list.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        with self.__lock:
+            if callback in self.__listener_list:
+                self.__listener_list.remove(callback)
+
+    def __stat_async(self, key: str) -> None:
+        path_stat = PathStat.from_path(key)
+        with self.__lock:
+            self.__pending_set.discard(key)
+        self.__store({key: path_stat})
+
+    def __store(self, stat_dict: dict) -> None:
+        """ 写入缓存, 状态变化的路径通知监听器 """
+        changed_list = []
+        with self.__lock:
+            for key, path_stat in stat_dict.items():
+                if self.__stat_dict.get(key) != path_stat:
+                    changed_list.append(key)
+                self.__stat_dict[key] = path_stat
+            listener_list = list(self.__listener_list)
+        if not changed_list:
+            return
+        for callback in listener_list:
+            try:
+                callback(changed_list)
+            except Exception:
+                lg.exception('路径状态监听器执行失败')
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(os.path.expanduser(path))
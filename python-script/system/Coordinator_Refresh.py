@@ -0,0 +1,241 @@
+import time
+
+from const.Const_Parameter import *
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QEvent, QRunnable, QThreadPool, QThread
+
+lg: Logger = Log.DataManager
+
+
+class _RefreshRunner(QRunnable):
+    """ 在线程池中执行刷新任务, 结果通过协调器的内部信号返回主线程 """
+
+    def __init__(self, coordinator: 'RefreshCoordinator', key: str, func):
+        super().__init__()
+        self.__coordinator = coordinator
+        self.__key = key
+        self.__func = func
+
+    def run(self):
+        try:
+            result = self.__func()
+        except Exception:
+            lg.exception(f'刷新任务执行失败: {self.__key}')
+            result = None
+        self.__coordinator._signal_job_finished.emit(self.__key, result)
+
+
+class RefreshCoordinator(QObject):
+    """
+    环境刷新协调器(单例)
+
+    统一管理所有环境相关的刷新任务, 代替各处独立的定时器.
+    - 单飞: 同一任务同时只有一个在执行, 执行期间的重复请求会被合并, 完成后最多补执行一次
+    - 分发: 任务结果在主线程中分发给所有订阅者
+    - 可见性退避: 窗口最小化或隐藏(如最小化到托盘)时, 定期任务的间隔乘以 hidden_factor; 窗口恢复显示时立即刷新一次
+
+    参数:
+    - hidden_factor(float): 窗口不可见时定期任务间隔的倍数, 为 0 时暂停定期任务, 默认 30
+    - max_thread_count(int): 执行刷新任务的最大线程数, 默认 2
+
+    信号:
+    - signal_visibility_changed(bool): 窗口可见性变化, 参数为是否可见
+
+    属性:
+    - isVisible(bool): 窗口是否可见
+    - running_count(int): 正在执行的任务数
+
+    方法:
+    - register(key: str, func, interval_ms: int = 0) -> None: 注册刷新任务, func 在线程池中执行, 其返回值分发给订阅者
+    - unregister(key: str) -> None: 注销刷新任务
+    - subscribe(key: str, callback) -> None: 订阅任务结果, callback(result) 在主线程中调用
+    - unsubscribe(key: str, callback) -> None: 取消订阅
+    - request(key: str) -> None: 请求立即执行, 可在任意线程调用
+    - watch_window(window: QWidget) -> None: 监视窗口的显示/隐藏/最小化
+    - set_visible(isVisible: bool) -> None: 手动设置可见性
+    - stop() -> None: 停止定期刷新
+    """
+    signal_visibility_changed = pyqtSignal(bool)
+    _signal_job_finished = pyqtSignal(str, object)
+    """ 内部信号, 任务在线程池中完成后, 在主线程中分发结果 """
+    _signal_request = pyqtSignal(str)
+    """ 内部信号, 其他线程的请求转到主线程处理 """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, hidden_factor: float = 30, max_thread_count: int = 2) -> None:
+        if self.__isInitialized:
+            return
+        super().__init__()
+        self.__isInitialized = True
+        self.__hidden_factor: float = hidden_factor
+        self.__isVisible: bool = True
+        self.__window = None
+        self.__job_dict: dict = {}
+        """ 键 -> {'func': 函数, 'interval': 间隔(秒), 'last_time': 上一次完成时间, 'isRunning': 是否执行中, 'isRerun': 是否需要补执行} """
+        self.__subscriber_dict: dict = {}
+        """ 键 -> 订阅者回调列表 """
+        self.__thread_pool = QThreadPool()
+        self.__thread_pool.setMaxThreadCount(max(1, max_thread_count))
+        self.__thread_pool.setExpiryTimeout(10000)
+        self._signal_job_finished.connect(self.__on_job_finished)
+        self._signal_request.connect(self.request)
+        self.__timer_tick = QTimer(self)
+        self.__timer_tick.setInterval(250)
+        self.__timer_tick.timeout.connect(self.__tick)
+        self.__timer_tick.start()
+
+    @property
+    def isVisible(self) -> bool:
+        return self.__isVisible
+
+    @property
+    def running_count(self) -> int:
+        return sum(1 for job in self.__job_dict.values() if job['isRunning'])
+
+    def register(self, key: str, func, interval_ms: int = 0) -> None:
+        """
+        注册刷新任务, 已注册的任务将被替换
+
+        参数:
+        - key(str): 任务键
+        - func: 无参数函数, 在线程池中执行, 返回值分发给订阅者. 不可访问界面控件
+        - interval_ms(int): 定期执行间隔(毫秒), 为 0 时只在请求时执行
+        """
+        interval = max(0, interval_ms) / 1000
+        self.__job_dict[key] = {
+            'func': func,
+            'interval': interval,
+            'last_time': time.monotonic(),
+            'isRunning': False,
+            'isRerun': False,
+        }
+
+    def unregister(self, key: str) -> None:
+        """
+        注销刷新任务, 执行中的任务完成后不再分发结果
+
+        参数:
+        - key(str): 任务键
+        """
+        self.__job_dict.pop(key, None)
+        self.__subscriber_dict.pop(key, None)
+
+    def subscribe(self, key: str, callback) -> None:
+        """
+        订阅任务结果
+
+        参数:
+        - key(str): 任务键
+        - callback: 回调函数, 参数为任务返回值, 在主线程中调用
+        """
+        callback_list: list = self.__subscriber_dict.setdefault(key, [])
+        if callback not in callback_list:
+            callback_list.append(callback)
+
+    def unsubscribe(self, key: str, callback) -> None:
+        """
+        取消订阅
+
+        参数:
+        - key(str): 任务键
+        - callback: 回调函数
+        """
+        callback_list: list = self.__subscriber_dict.get(key, [])
+        if callback in callback_list:
+            callback_list.remove(callback)
+
+    def request(self, key: str) -> None:
+        """
+        请求立即执行, 可在任意线程调用. 任务执行中时合并为一次补执行
+
+        参数:
+        - key(str): 任务键
+        """
+        if QThread.currentThread() is not self.thread():
+            self._signal_request.emit(key)
+            return
+        job: dict = self.__job_dict.get(key)
+        if job is None:
+            return
+        if job['isRunning']:
+            job['isRerun'] = True
+            return
+        self.__start_job(key, job)
+
+    def watch_window(self, window) -> None:
+        """
+        监视窗口的显示/隐藏/最小化, 据此调整定期任务的间隔
+
+        参数:
+        - window(QWidget): 主窗口
+        """
+        if self.__window is not None:
+            self.__window.removeEventFilter(self)
+        self.__window = window
+        window.installEventFilter(self)
+        self.set_visible(window.isVisible() and not window.isMinimized())
+
+    def set_visible(self, isVisible: bool) -> None:
+        """
+        设置可见性. 从不可见变为可见时, 立即执行所有定期任务
+
+        参数:
+        - isVisible(bool): 窗口是否可见
+        """
+        if isVisible == self.__isVisible:
+            return
+        self.__isVisible = isVisible
+        self.signal_visibility_changed.emit(isVisible)
+        if isVisible:
+            for key, job in list(self.__job_dict.items()):
+                if job['interval'] > 0:
+                    self.request(key)
+
+    def stop(self) -> None:
+        """ 停止定期刷新, 程序关闭时调用 """
+        self.__timer_tick.stop()
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self.__window and event.type() in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange):
+            self.set_visible(obj.isVisible() and not obj.isMinimized())
+        return super().eventFilter(obj, event)
+
+    def __start_job(self, key: str, job: dict) -> None:
+        job['isRunning'] = True
+        job['isRerun'] = False
+        self.__thread_pool.start(_RefreshRunner(self, key, job['func']))
+
+    def __on_job_finished(self, key: str, result) -> None:
+        job: dict = self.__job_dict.get(key)
+        if job is None:
+            return
+        job['isRunning'] = False
+        job['last_time'] = time.monotonic()
+        for callback in list(self.__subscriber_dict.get(key, [])):
+            try:
+                callback(result)
+            except Exception:
+                lg.exception(f'刷新结果分发失败: {key}')
+        if job['isRerun']:
+            self.__start_job(key, job)
+
+    def __current_interval(self, interval: float) -> float:
+        if self.__isVisible:
+            return interval
+        if self.__hidden_factor <= 0:
+            return float('inf')
+        return interval * self.__hidden_factor
+
+    def __tick(self) -> None:
+        now = time.monotonic()
+        for key, job in list(self.__job_dict.items()):
+            if job['interval'] <= 0 or job['isRunning']:
+                continue
+            # 每次检查时按当前可见性计算间隔, 可见性变化后立即生效
+            if now - job['last_time'] >= self.__current_interval(job['interval']):
+                self.__start_job(key, job)
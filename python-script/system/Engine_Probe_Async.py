@@ -0,0 +1,184 @@
+import asyncio
+import threading
+
+from system.Probe_Interpreter import PROBE_SCRIPT, CREATION_FLAGS, parse_probe_output
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class AsyncProbeEngine(QObject):
+    """
+    asyncio 并发探测引擎
+
+    在独立线程中运行 asyncio 事件循环, 所有解释器的探测同时进行, 总耗时取决于最慢的一次探测, 而不是 N/线程数 轮串行探测.
+    单次探测有超时限制, 超时后终止进程, 不会长期占用资源. 探测结果按批次通过 Qt 信号发送到主线程.
+
+    参数:
+    - max_concurrency(int): 最大并发探测数, 默认 16
+    - probe_timeout(float): 单次探测超时时间(秒), 默认 30
+    - batch_interval(float): 结果批量发送间隔(秒), 默认 0.2
+
+    信号:
+    - signal_probe_results(dict): 批量探测结果, 键为探测键(一般为解释器路径), 值为探测结果, 探测失败/超时为空字典
+
+    属性:
+    - pending_count(int): 等待并发名额的探测数
+    - running_count(int): 正在运行的探测数
+
+    方法:
+    - submit(key: str, python_path: str) -> None: 提交探测, 相同键的探测正在进行时忽略
+    - cancel(key: str) -> None: 取消探测, 如环境已被删除
+    - shutdown() -> None: 取消所有探测并停止事件循环, 程序关闭时调用
+    """
+    signal_probe_results = pyqtSignal(dict)
+
+    def __init__(self, max_concurrency: int = 16, probe_timeout: float = 30, batch_interval: float = 0.2):
+        super().__init__()
+        self.__max_concurrency: int = max(1, max_concurrency)
+        self.__probe_timeout: float = probe_timeout
+        self.__batch_interval: float = batch_interval
+        self.__task_dict: dict = {}
+        """ 探测键 -> asyncio.Task, 只在事件循环线程中访问 """
+        self.__result_dict: dict = {}
+        """ 等待批量发送的结果, 只在事件循环线程中访问 """
+        self.__isFlushScheduled: bool = False
+        self.__running_count: int = 0
+        self.__lock = threading.Lock()
+        self.__loop = asyncio.new_event_loop()
+        self.__semaphore: asyncio.Semaphore = None
+        self.__thread_loop = threading.Thread(target=self.__run_loop, name='AsyncProbeEngine', daemon=True)
+        self.__thread_loop.start()
+
+    @property
+    def pending_count(self) -> int:
+        with self.__lock:
+            return len(self.__task_dict) - self.__running_count
+
+    @property
+    def running_count(self) -> int:
+        with self.__lock:
+            return self.__running_count
+
+    def submit(self, key: str, python_path: str) -> None:
+        """
+        提交探测, 线程安全
+
+        参数:
+        - key(str): 探测键, 结果以此为键返回
+        - python_path(str): 解释器路径
+        """
+        if self.__loop.is_closed():
+            return
+        self.__loop.call_soon_threadsafe(self.__create_task, key, python_path)
+
+    def cancel(self, key: str) -> None:
+        """
+        取消探测, 线程安全. 被取消的探测不会返回结果
+
+        参数:
+        - key(str): 探测键
+        """
+        if self.__loop.is_closed():
+            return
+        self.__loop.call_soon_threadsafe(self.__cancel_task, key)
+
+    def shutdown(self) -> None:
+        """ 取消所有探测并停止事件循环, 正在运行的探测进程将被终止 """
+        if self.__loop.is_closed() or not self.__loop.is_running():
+            return
+        future = asyncio.run_coroutine_threadsafe(self.__cancel_all(), self.__loop)
+        try:
+            future.result(timeout=5)
+        except Exception:
+            pass
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread_loop.join(timeout=5)
+
+    def __run_loop(self) -> None:
+        asyncio.set_event_loop(self.__loop)
+        self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        try:
+            self.__loop.run_forever()
+        finally:
+            self.__loop.close()
+
+    def __create_task(self, key: str, python_path: str) -> None:
+        if key in self.__task_dict:
+            return
+        task = self.__loop.create_task(self.__probe(key, python_path))
+        task.add_done_callback(lambda _task: self.__remove_task(key, _task))
+        with self.__lock:
+            self.__task_dict[key] = task
+
+    def __remove_task(self, key: str, task: asyncio.Task) -> None:
+        # 使用完成回调移除, 尚未开始运行就被取消的任务也能正确移除
+        with self.__lock:
+            if self.__task_dict.get(key) is task:
+                del self.__task_dict[key]
+
+    def __cancel_task(self, key: str) -> None:
+        task: asyncio.Task = self.__task_dict.get(key)
+        if task is not None:
+            task.cancel()
+        self.__result_dict.pop(key, None)
+
+    async def __cancel_all(self) -> None:
+        task_list = list(self.__task_dict.values())
+        for task in task_list:
+            task.cancel()
+        await asyncio.gather(*task_list, return_exceptions=True)
+
+    async def __probe(self, key: str, python_path: str) -> None:
+        async with self.__semaphore:
+            with self.__lock:
+                self.__running_count += 1
+            try:
+                probe_data = await self.__run_probe_process(python_path)
+            finally:
+                with self.__lock:
+                    self.__running_count -= 1
+        self.__add_result(key, probe_data)
+
+    async def __run_probe_process(self, python_path: str) -> dict:
+        """ 启动探测进程, 超时或被取消时终止进程 """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                python_path, '-c', PROBE_SCRIPT, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL, creationflags=CREATION_FLAGS)
+        except OSError:
+            return {}
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=self.__probe_timeout)
+        except asyncio.TimeoutError:
+            await self.__kill_process(process)
+            return {}
+        except asyncio.CancelledError:
+            await self.__kill_process(process)
+            raise
+        return parse_probe_output(stdout.decode('utf-8', errors='replace'))
+
+    async def __kill_process(self, process: asyncio.subprocess.Process) -> None:
+        """ 终止进程并等待退出, 避免残留僵尸进程 """
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        try:
+            # 子进程派生的孙进程可能仍占用管道, 等待时间有限
+            await asyncio.wait_for(process.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            pass
+
+    def __add_result(self, key: str, probe_data: dict) -> None:
+        self.__result_dict[key] = probe_data
+        if self.__isFlushScheduled:
+            return
+        self.__isFlushScheduled = True
+        self.__loop.call_later(self.__batch_interval, self.__flush_results)
+
+    def __flush_results(self) -> None:
+        self.__isFlushScheduled = False
+        if not self.__result_dict:
+            return
+        result_dict = self.__result_dict
+        self.__result_dict = {}
+        self.signal_probe_results.emit(result_dict)
@@ -0,0 +1,319 @@
+"""
+spec 文件生成
+
+将 PyinstallerStruct 中的选项写成等价的 .spec 文件, 用于命令行超过系统长度限制时(如大量 --add-data / --hidden-import)改用 spec 文件执行.
+生成的内容与 PyInstaller 的 makespec 一致, 相对路径按执行目录转换为绝对路径, 因此 spec 文件可以放在缓存文件夹中.
+
+spec 文件以选项的哈希值命名并缓存, 选项不变时直接复用已生成的文件.
+
+只能在命令行中使用的构建选项(--distpath, --workpath, --noconfirm, --upx-dir, --clean, --log-level)不写入 spec 文件, 由 BUILD_STRUCT_NAMES 列出.
+与 makespec 一致, 在 macOS 上生成窗口程序(--windowed)时写入 BUNDLE, 输出 <name>.app.
+"""
+import os
+import json
+import hashlib
+
+from system.Struct_Pyinstaller import *
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+GENERATOR_VERSION: int = 2
+""" 生成内容变化时递增, 使旧的缓存文件失效 """
+SPEC_CACHE_FOLDER_NAME: str = '.spec_cache'
+
+BUILD_STRUCT_NAMES: tuple = ('output_folder_path', 'workpath_option', 'noconfirm_option', 'upx_dir', 'clean_cache', 'log_level')
+""" 使用 spec 文件时仍需在命令行中传递的结构 """
+IGNORED_STRUCT_NAMES: tuple = ('specpath',)
+""" spec 文件中没有对应项的结构: specpath 只决定 spec 文件的位置 """
+
+class SpecFileGenerator(object):
+    """
+    spec 文件生成器(单例)
+
+    参数:
+    - exe_folder_path(str): 缓存文件夹所在路径, 默认为 APP_WORKSPACE_PATH
+
+    属性:
+    - cache_folder_path(str): 缓存文件夹路径
+
+    方法:
+    - options_hash(pyinstaller_struct: PyinstallerStruct, cwd: str) -> str: 计算写入 spec 文件的选项的哈希值
+    - render(pyinstaller_struct: PyinstallerStruct, cwd: str, os_type: str = None) -> str: 生成 spec 文件内容
+    - generate(pyinstaller_struct: PyinstallerStruct, cwd: str, folder_path: str = '') -> str: 生成或复用 spec 文件, 返回文件路径
+    - get_build_argument_list(pyinstaller_struct: PyinstallerStruct, work_path: str = '') -> list: 使用 spec 文件时的命令行参数
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, exe_folder_path: str = APP_WORKSPACE_PATH) -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__cache_folder_path: str = os.path.join(exe_folder_path, SPEC_CACHE_FOLDER_NAME)
+
+    @property
+    def cache_folder_path(self) -> str:
+        return self.__cache_folder_path
+
+    def options_hash(self, pyinstaller_struct: PyinstallerStruct, cwd: str) -> str:
+        """
+        计算写入 spec 文件的选项的哈希值, 包含执行目录(相对路径按执行目录转换)与生成器版本
+
+        参数:
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - cwd(str): 执行目录
+
+        返回:
+        - str: sha256 十六进制字符串
+        """
+        option_list = []
+        for item in pyinstaller_struct.struct_sequence:
+            if item.name in BUILD_STRUCT_NAMES or item.name in IGNORED_STRUCT_NAMES:
+                continue
+            arguments = item.arguments
+            if arguments:
+                option_list.append((item.name, arguments))
+        content = json.dumps([GENERATOR_VERSION, os.path.abspath(cwd), option_list], ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def generate(self, pyinstaller_struct: PyinstallerStruct, cwd: str, folder_path: str = '') -> str:
+        """
+        生成 spec 文件, 相同选项的文件已存在时直接返回. 先写入临时文件再替换, 避免并发执行时读到不完整的文件
+
+        参数:
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - cwd(str): 执行目录, 用于转换相对路径
+        - folder_path(str): spec 文件所在文件夹, 默认为缓存文件夹
+
+        返回:
+        - str: spec 文件路径, 如 '<APP_WORKSPACE_PATH>/.spec_cache/main-1a2b3c4d5e6f7a8b.spec'
+        """
+        folder_path = folder_path or self.__cache_folder_path
+        options_hash = self.options_hash(pyinstaller_struct, cwd)
+        spec_path = os.path.join(folder_path, f'{_get_name(pyinstaller_struct)}-{options_hash[:16]}.spec')
+        if os.path.isfile(spec_path):
+            lg.debug(f'复用 spec 文件: {spec_path}')
+            return spec_path
+        content = self.render(pyinstaller_struct, cwd)
+        os.makedirs(folder_path, exist_ok=True)
+        temp_path = f'{spec_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, spec_path)
+        lg.info(f'已生成 spec 文件: {spec_path}')
+        return spec_path
+
+    def get_build_argument_list(self, pyinstaller_struct: PyinstallerStruct, work_path: str = '') -> list:
+        """
+        使用 spec 文件时仍需传递的命令行参数. 未指定 --workpath 时按 spec 文件名决定的默认值不同于命令行, 这里补充为 build/<name>, 与直接使用命令行时一致
+
+        参数:
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - work_path(str): 结构中未指定 --workpath 时使用的工作文件夹, 为空时使用 build/<name>
+
+        返回:
+        - list[str]: 如 ['--distpath=E:\\dist', '--noconfirm']
+        """
+        argument_list = []
+        for name in BUILD_STRUCT_NAMES:
+            argument_list.extend(getattr(pyinstaller_struct, name).arguments)
+        if not pyinstaller_struct.workpath_option.command_args:
+            argument_list.append(f'--workpath={work_path or os.path.join("build", _get_name(pyinstaller_struct))}')
+        return argument_list
+
+    def render(self, pyinstaller_struct: PyinstallerStruct, cwd: str, os_type: str = None) -> str:
+        """
+        生成 spec 文件内容, 结构与 PyInstaller makespec 的模板一致
+
+        参数:
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - cwd(str): 执行目录, 用于转换相对路径
+        - os_type(str): 执行打包的系统, 见 OsType, 默认为当前系统. 为 macOS 且为窗口程序时写入 BUNDLE
+
+        返回:
+        - str: spec 文件内容
+        """
+        s = pyinstaller_struct
+
+        def absolute(path: str) -> str:
+            return path if not path or os.path.isabs(path) else os.path.normpath(os.path.join(cwd, path))
+
+        def single(item: SingleInfoStruct, isPath: bool = False):
+            value = item.command_args
+            if not value:
+                return None
+            return absolute(value) if isPath else value
+
+        datas = [(absolute(src), dest) for src, dest in map(split_source_dest, s.add_file_folder_data.expanded_args)]
+        binaries = [(absolute(src), dest) for src, dest in map(split_source_dest, s.add_binary_data.expanded_args)]
+        hiddenimports = s.hidden_import.expanded_args
+
+        # 与 makespec 的 Preamble 一致, 由 PyInstaller.utils.hooks 在分析前收集
+        hook_import_list = []
+        preamble_list = []
+        for name, function, target in (
+                ('collect_data', 'collect_data_files', 'datas'),
+                ('collect_binaries', 'collect_dynamic_libs', 'binaries'),
+                ('collect_submodules', 'collect_submodules', 'hiddenimports')):
+            for package in getattr(s, name).expanded_args:
+                preamble_list.append(f'{target} += {function}({package!r})')
+                if function not in hook_import_list:
+                    hook_import_list.append(function)
+        for package in s.copy_metadata.expanded_args:
+            preamble_list.append(f'datas += copy_metadata({package!r})')
+        for package in s.recursive_copy_metadata.expanded_args:
+            preamble_list.append(f'datas += copy_metadata({package!r}, recursive=True)')
+        if s.copy_metadata.expanded_args or s.recursive_copy_metadata.expanded_args:
+            hook_import_list.append('copy_metadata')
+        for package in s.collect_all.expanded_args:
+            preamble_list.append(f'tmp_ret = collect_all({package!r})')
+            preamble_list.append('datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]')
+        if s.collect_all.expanded_args:
+            hook_import_list.append('collect_all')
+
+        debug_state = s.debug_mode.current_state
+        isDebug = debug_state in ('all', 'bootloader')
+        isNoarchive = debug_state in ('all', 'noarchive')
+        option_list = [(s.python_option.current_state, None, 'OPTION')] if s.python_option.current_state else []
+        if debug_state in ('all', 'imports'):
+            option_list.append(('v', None, 'OPTION'))
+
+        isOnedir = s.output_methode.current_state not in ('--onefile', '-F')
+        isConsole = s.console_window_control.current_state not in ('--windowed', '--noconsole', '-w')
+        isUpx = not s.noupx_option.isOn
+        isStrip = s.strip_option.isOn
+        name = _get_name(s)
+        icon = [icon if icon in ('NONE', 'hook') else absolute(icon) for icon in s.add_icon.expanded_args]
+        # FILE[,TYPE[,NAME[,LANGUAGE]]], 只转换文件部分
+        resources = [','.join([absolute(part) if index == 0 else part for index, part in enumerate(resource.split(','))])
+                     for resource in s.add_resource.expanded_args]
+        manifest = single(s.add_xml_file)
+        if manifest and not manifest.lstrip().startswith('<'):
+            manifest = absolute(manifest)
+        splash = single(s.add_splash_screen, True)
+        script = single(s.python_file_path, True)
+
+        line_list = ['# -*- mode: python ; coding: utf-8 -*-',
+                     f'# Generated by PyToExe, options hash: {self.options_hash(s, cwd)[:16]}']
+        if hook_import_list:
+            line_list.append(f'from PyInstaller.utils.hooks import {", ".join(hook_import_list)}')
+        line_list += [
+            '',
+            f'datas = {datas!r}',
+            f'binaries = {binaries!r}',
+            f'hiddenimports = {hiddenimports!r}',
+        ]
+        line_list += preamble_list
+        line_list += [
+            '',
+            '',
+            'a = Analysis(',
+            f'    {[script] if script else []!r},',
+            f'    pathex={[absolute(path) for path in s.imports_paths.expanded_args]!r},',
+            '    binaries=binaries,',
+            '    datas=datas,',
+            '    hiddenimports=hiddenimports,',
+            f'    hookspath={[absolute(path) for path in s.additional_hooks_dir.expanded_args]!r},',
+            '    hooksconfig={},',
+            f'    runtime_hooks={[absolute(path) for path in s.runtime_hook.expanded_args]!r},',
+            f'    excludes={s.exclude_module.expanded_args!r},',
+            f'    noarchive={isNoarchive!r},',
+            ')',
+            'pyz = PYZ(a.pure)',
+        ]
+        if splash:
+            line_list += [
+                'splash = Splash(',
+                f'    {splash!r},',
+                '    binaries=a.binaries,',
+                '    datas=a.datas,',
+                '    text_pos=None,',
+                '    text_size=12,',
+                '    minify_script=True,',
+                '    always_on_top=True,',
+                ')',
+            ]
+        line_list += ['', 'exe = EXE(', '    pyz,', '    a.scripts,']
+        if not isOnedir:
+            line_list += ['    a.binaries,', '    a.datas,']
+        if splash:
+            line_list.append('    splash,')
+            if not isOnedir:
+                line_list.append('    splash.binaries,')
+        line_list.append(f'    {option_list!r},')
+        if isOnedir:
+            line_list.append('    exclude_binaries=True,')
+        exe_keyword_list = [
+            ('name', name),
+            ('debug', isDebug),
+            ('bootloader_ignore_signals', s.ignore_signals.isOn),
+            ('strip', isStrip),
+            ('upx', isUpx),
+        ]
+        if not isOnedir:
+            exe_keyword_list += [('upx_exclude', s.upx_exclude.expanded_args), ('runtime_tmpdir', single(s.runtime_tmpdir))]
+        exe_keyword_list += [
+            ('console', isConsole),
+            ('disable_windowed_traceback', s.disable_traceback.isOn),
+            ('argv_emulation', s.argv_emulation.isOn),
+            ('target_arch', s.target_architecture.current_state or None),
+            ('codesign_identity', single(s.codesign_identity)),
+            ('entitlements_file', single(s.osx_entitlements_file, True)),
+        ]
+        # 以下参数只在设置时写入, 保持与旧版本 PyInstaller 的兼容
+        for keyword, value in (
+                ('hide_console', s.hide_console.current_state),
+                ('contents_directory', single(s.contents_directory)),
+                ('icon', icon),
+                ('version', single(s.version_file, True)),
+                ('manifest', manifest),
+                ('resources', resources),
+                ('uac_admin', s.uac_admin_apply.isOn),
+                ('uac_uiaccess', s.uac_uiaccess.isOn)):
+            if value:
+                exe_keyword_list.append((keyword, value))
+        line_list += [f'    {keyword}={value!r},' for keyword, value in exe_keyword_list]
+        line_list.append(')')
+        if isOnedir:
+            line_list += [
+                'coll = COLLECT(',
+                '    exe,',
+                '    a.binaries,',
+                '    a.datas,',
+            ]
+            if splash:
+                line_list.append('    splash.binaries,')
+            line_list += [
+                f'    strip={isStrip!r},',
+                f'    upx={isUpx!r},',
+                f'    upx_exclude={s.upx_exclude.expanded_args!r},',
+                f'    name={name!r},',
+                ')',
+            ]
+        if (App.OS if os_type is None else os_type) == OsType.MACOS and not isConsole:
+            # 与 makespec 一致: 图标只取第一个, 未指定时由 PyInstaller 使用默认图标
+            line_list += [
+                'app = BUNDLE(',
+                f'    {"coll" if isOnedir else "exe"},',
+                f'    name={name + ".app"!r},',
+                f'    icon={icon[0] if icon else None!r},',
+                f'    bundle_identifier={single(s.osx_bundle_identifier)!r},',
+                ')',
+            ]
+        line_list.append('')
+        return '\n'.join(line_list)
+
+
+def _get_name(pyinstaller_struct: PyinstallerStruct) -> str:
+    """ 与命令行一致: 未指定 --name 时使用脚本文件名 """
+    name = pyinstaller_struct.output_file_name.command_args
+    if name:
+        return name
+    script = pyinstaller_struct.python_file_path.command_args
+    return os.path.splitext(os.path.basename(script))[0] if script else 'main'
@@ -0,0 +1,130 @@
+from collections import deque
+
+from system.Struct_Pyinstaller import PyinstallerStruct
+
+
+class PyinstallerStructHistory(object):
+    """
+    pyinstaller结构历史记录
+
+    以 PyinstallerStruct.snapshot() 记录撤销/重做历史. 快照之间共用未变更结构的数据, 记录一次快照只需生成变更过的结构的元组,
+    因此即使含有数千个 hidden-import, 记录与恢复的开销也只与变更的结构有关. 撤销记录数量有上限, 超出时丢弃最早的记录.
+
+    另外可保存命名快照(标记), 如 "打开时的参数", "默认参数", 恢复标记同样可以撤销.
+
+    参数:
+    - pyinstaller_struct(PyinstallerStruct): 记录的结构
+    - max_count(int): 最大撤销记录数, 默认 200
+
+    属性:
+    - can_undo(bool): 是否可以撤销
+    - can_redo(bool): 是否可以重做
+
+    方法:
+    - record() -> bool: 记录当前状态, 与上一次记录一致时不记录
+    - undo() -> bool: 撤销
+    - redo() -> bool: 重做
+    - set_mark(name: str, snapshot: tuple = None) -> None: 保存标记, 不指定快照时保存当前状态
+    - has_mark(name: str) -> bool: 是否存在标记
+    - restore_mark(name: str) -> bool: 恢复到标记, 可撤销
+    - clear() -> None: 清空撤销/重做记录, 保留标记
+    """
+
+    def __init__(self, pyinstaller_struct: PyinstallerStruct, max_count: int = 200) -> None:
+        self.__pyinstaller_struct: PyinstallerStruct = pyinstaller_struct
+        self.__undo_deque: deque = deque(maxlen=max(1, max_count))
+        self.__redo_list: list = []
+        self.__mark_dict: dict = {}
+        self.__current: tuple = pyinstaller_struct.snapshot()
+        """ 最近一次记录的快照 """
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.__undo_deque) or self.__pyinstaller_struct.snapshot() != self.__current
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.__redo_list)
+
+    def record(self) -> bool:
+        """
+        记录当前状态, 与上一次记录一致时不记录. 记录新状态后清空重做记录
+
+        返回:
+        - bool: 是否记录
+        """
+        snapshot = self.__pyinstaller_struct.snapshot()
+        # 快照之间共用未变更的元素, 元组比较时相同对象直接跳过, 开销与结构数量相关, 与数据量无关
+        if snapshot == self.__current:
+            return False
+        self.__undo_deque.append(self.__current)
+        self.__current = snapshot
+        self.__redo_list.clear()
+        return True
+
+    def undo(self) -> bool:
+        """
+        撤销, 尚未记录的修改会先记录, 因此也可以撤销
+
+        返回:
+        - bool: 是否撤销
+        """
+        self.record()
+        if not self.__undo_deque:
+            return False
+        self.__redo_list.append(self.__current)
+        self.__current = self.__undo_deque.pop()
+        self.__pyinstaller_struct.restore(self.__current)
+        return True
+
+    def redo(self) -> bool:
+        """
+        重做, 撤销后有新的修改时无法重做
+
+        返回:
+        - bool: 是否重做
+        """
+        if self.record() or not self.__redo_list:
+            return False
+        self.__undo_deque.append(self.__current)
+        self.__current = self.__redo_list.pop()
+        self.__pyinstaller_struct.restore(self.__current)
+        return True
+
+    def set_mark(self, name: str, snapshot: tuple = None) -> None:
+        """
+        保存标记
+
+        参数:
+        - name(str): 标记名, 如 'opened', 'default'
+        - snapshot(tuple): 快照, 为 None 时保存当前状态
+        """
+        self.__mark_dict[name] = snapshot if snapshot is not None else self.__pyinstaller_struct.snapshot()
+
+    def has_mark(self, name: str) -> bool:
+        return name in self.__mark_dict
+
+    def restore_mark(self, name: str) -> bool:
+        """
+        恢复到标记, 恢复前记录当前状态, 因此可以撤销
+
+        参数:
+        - name(str): 标记名
+
+        返回:
+        - bool: 是否有变化
+        """
+        snapshot = self.__mark_dict.get(name)
+        if snapshot is None:
+            return False
+        self.record()
+        if snapshot == self.__current:
+            return False
+        self.__pyinstaller_struct.restore(snapshot)
+        return self.record()
+
+    def clear(self) -> None:
+        """ 清空撤销/重做记录, 以当前状态作为起点, 保留标记 """
+        self.__undo_deque.clear()
+        self.__redo_list.clear()
+        self.__current = self.__pyinstaller_struct.snapshot()
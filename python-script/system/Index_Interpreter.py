@@ -0,0 +1,292 @@
+import os
+import re
+import json
+import threading
+
+from system.Reader_Conda_Env import read_conda_env_list, find_python_executable
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+_USER_PATH = os.path.expanduser('~')
+_DEFAULT_VENV_DIR_LIST = [
+    os.path.join(_USER_PATH, '.virtualenvs'),
+    os.path.join(_USER_PATH, '.local', 'share', 'virtualenvs'),
+]
+""" virtualenvwrapper 与 pipenv 的默认环境文件夹 """
+_POSIX_PYTHON_PATTERN = re.compile(r'^python(3(\.\d+)?)?$')
+_INDEX_VERSION = 1
+
+
+class InterpreterRecord(object):
+    """
+    解释器索引记录
+
+    参数:
+    - name(str): 名称, conda 环境为环境名, 其余为 '来源:标识', 如 'pyenv:3.11.7', 'venv:myproject', 'path:/usr/bin/python3'
+    - source(str): 来源, 'conda', 'pyenv', 'venv', 'path' 之一
+    - env_path(str): 环境路径(prefix)
+    - python_path(str): 解释器路径
+
+    属性:
+    - name(str), source(str), env_path(str), python_path(str)
+    - key(str): 去重键, venv 为环境文件夹的真实路径, 其余为解释器的真实路径
+
+    方法:
+    - to_dict() -> dict: 转换为字典, 用于持久化
+    - from_dict(data: dict) -> InterpreterRecord: 由字典创建(类方法)
+    """
+    __slots__ = ('__name', '__source', '__env_path', '__python_path')
+
+    def __init__(self, name: str, source: str, env_path: str, python_path: str):
+        self.__name: str = name
+        self.__source: str = source
+        self.__env_path: str = env_path
+        self.__python_path: str = python_path
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def source(self) -> str:
+        return self.__source
+
+    @property
+    def env_path(self) -> str:
+        return self.__env_path
+
+    @property
+    def python_path(self) -> str:
+        return self.__python_path
+
+    @property
+    def key(self) -> str:
+        # venv 中的解释器一般是指向基础解释器的符号链接, 需以环境文件夹区分, 否则会与基础解释器合并
+        for folder in (os.path.dirname(self.__python_path), os.path.dirname(os.path.dirname(self.__python_path))):
+            if os.path.isfile(os.path.join(folder, 'pyvenv.cfg')):
+                return os.path.normcase(os.path.realpath(folder))
+        return os.path.normcase(os.path.realpath(self.__python_path))
+
+    def to_dict(self) -> dict:
+        return {'name': self.__name, 'source': self.__source, 'env_path': self.__env_path, 'python_path': self.__python_path}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'InterpreterRecord':
+        return cls(data.get('name', ''), data.get('source', ''), data.get('env_path', ''), data.get('python_path', ''))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, InterpreterRecord) and self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        return hash((self.__name, self.__source, self.__env_path, self.__python_path))
+
+    def __repr__(self) -> str:
+        return f'InterpreterRecord({self.__name!r}, {self.__source!r}, {self.__python_path!r})'
+
+
+class InterpreterIndex(object):
+    """
+    解释器索引(单例)
+
+    跨平台查找本机的 python 解释器, 不启动任何进程. 查找范围:
+    - conda/mamba: 各 conda 根目录及其环境(read_conda_env_list)
+    - pyenv: $PYENV_ROOT/versions/* (pyenv-win 为 ~/.pyenv/pyenv-win/versions/*)
+    - venv: 配置的环境文件夹, 以及 ~/.virtualenvs, ~/.local/share/virtualenvs. 文件夹本身是 venv, 或其子文件夹是 venv 均可
+    - PATH: Windows 下为 python.exe, Linux/MacOS 下为 python, python3, python3.X
+
+    同一解释器按真实路径去重, 优先级为 conda > pyenv > venv > PATH. 索引持久化到磁盘, 下次启动时可先使用上一次的结果.
+
+    参数:
+    - exe_folder_path(str): 索引文件所在文件夹路径, 默认为 APP_WORKSPACE_PATH
+    - index_name(str): 索引文件名, 默认为 '.interpreter_index'
+
+    属性:
+    - record_list(list): 当前索引记录列表(InterpreterRecord)
+    - local_python_path(str): PATH 中第一个解释器的路径, 即命令行中直接执行 python 时使用的解释器
+    - venv_dir_list(list): 配置的 venv 文件夹列表
+    - watch_folder_list(list): 需要监视的文件夹列表(pyenv versions 文件夹及 venv 文件夹), 其内容变化时应重新查找
+
+    方法:
+    - set_venv_dir_list(venv_dir_list: list) -> None: 设置 venv 文件夹列表
+    - scan() -> list: 重新查找解释器, 更新并持久化索引, 返回记录列表
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, exe_folder_path: str = APP_WORKSPACE_PATH, index_name: str = '.interpreter_index') -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__index_path: str = os.path.join(exe_folder_path, index_name)
+        self.__lock = threading.Lock()
+        self.__venv_dir_list: list = []
+        self.__record_list: list = []
+        self.__local_python_path: str = ''
+        self.__load_index_file()
+
+    @property
+    def record_list(self) -> list:
+        with self.__lock:
+            return list(self.__record_list)
+
+    @property
+    def local_python_path(self) -> str:
+        with self.__lock:
+            return self.__local_python_path
+
+    @property
+    def venv_dir_list(self) -> list:
+        with self.__lock:
+            return list(self.__venv_dir_list)
+
+    @property
+    def watch_folder_list(self) -> list:
+        folder_list = self.__pyenv_versions_dir_list() + self.venv_dir_list + _DEFAULT_VENV_DIR_LIST
+        return [folder for folder in folder_list if os.path.isdir(folder)]
+
+    def set_venv_dir_list(self, venv_dir_list: list) -> None:
+        """
+        设置 venv 文件夹列表, 在下一次 scan() 时生效
+
+        参数:
+        - venv_dir_list(list): 文件夹列表, 每个文件夹本身是 venv, 或其子文件夹是 venv
+        """
+        with self.__lock:
+            self.__venv_dir_list = [os.path.normpath(os.path.expanduser(path)) for path in venv_dir_list if path]
+
+    def scan(self) -> list:
+        """
+        重新查找解释器, 更新索引, 有变化时写入磁盘
+
+        返回:
+        - list: InterpreterRecord 列表, 按 conda, pyenv, venv, PATH 的顺序排列
+        """
+        path_record_list = self.__scan_path()
+        candidate_list = self.__scan_conda() + self.__scan_pyenv() + self.__scan_venv() + path_record_list
+        record_list = []
+        seen_set = set()
+        for record in candidate_list:
+            key = record.key
+            if key in seen_set:
+                continue
+            seen_set.add(key)
+            record_list.append(record)
+        local_python_path = path_record_list[0].python_path if path_record_list else ''
+        with self.__lock:
+            if record_list == self.__record_list and local_python_path == self.__local_python_path:
+                return list(record_list)
+            self.__record_list = record_list
+            self.__local_python_path = local_python_path
+        self.__save_index_file()
+        return list(record_list)
+
+    def __scan_conda(self) -> list:
+        result = []
+        for env_name, env_path in read_conda_env_list():
+            python_path = find_python_executable(env_path)
+            if python_path:
+                result.append(InterpreterRecord(env_name, 'conda', env_path, python_path))
+        return result
+
+    def __pyenv_versions_dir_list(self) -> list:
+        pyenv_root = os.environ.get('PYENV_ROOT', '') or os.path.join(_USER_PATH, '.pyenv')
+        return [os.path.join(pyenv_root, 'versions'), os.path.join(pyenv_root, 'pyenv-win', 'versions')]
+
+    def __scan_pyenv(self) -> list:
+        result = []
+        for versions_dir in self.__pyenv_versions_dir_list():
+            try:
+                entry_list = sorted(os.scandir(versions_dir), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            for entry in entry_list:
+                if not entry.is_dir():
+                    continue
+                python_path = find_python_executable(entry.path)
+                if python_path:
+                    result.append(InterpreterRecord(f'pyenv:{entry.name}', 'pyenv', os.path.normpath(entry.path), python_path))
+        return result
+
+    def __scan_venv(self) -> list:
+        result = []
+        for venv_dir in self.venv_dir_list + _DEFAULT_VENV_DIR_LIST:
+            if os.path.isfile(os.path.join(venv_dir, 'pyvenv.cfg')):
+                env_path_list = [venv_dir]
+            else:
+                try:
+                    env_path_list = sorted(entry.path for entry in os.scandir(venv_dir)
+                                           if entry.is_dir() and os.path.isfile(os.path.join(entry.path, 'pyvenv.cfg')))
+                except OSError:
+                    continue
+            for env_path in env_path_list:
+                python_path = find_python_executable(env_path)
+                if python_path:
+                    result.append(InterpreterRecord(f'venv:{os.path.basename(env_path)}', 'venv', os.path.normpath(env_path), python_path))
+        return result
+
+    def __scan_path(self) -> list:
+        result = []
+        seen_set = set()
+        for folder in os.environ.get('PATH', '').split(os.pathsep):
+            # 跳过 Windows 应用商店的 python 占位程序, 以及 pyenv/asdf 的 shims 转发脚本(实际解释器已由 pyenv 查找)
+            if not folder or 'WindowsApps' in folder:
+                continue
+            folder = os.path.normpath(os.path.expandvars(folder))
+            if os.path.basename(folder) == 'shims':
+                continue
+            if os.path.normcase(folder) in seen_set:
+                continue
+            seen_set.add(os.path.normcase(folder))
+            for python_path in self.__find_python_in_folder(folder):
+                env_path = os.path.dirname(python_path) if os.name == 'nt' else os.path.dirname(os.path.dirname(python_path))
+                result.append(InterpreterRecord(f'path:{python_path}', 'path', env_path, python_path))
+        return result
+
+    def __find_python_in_folder(self, folder: str) -> list:
+        """ 查找 PATH 中某个文件夹下的解释器, 按 python, python3, python3.X 的顺序排列 """
+        if os.name == 'nt':
+            python_path = os.path.join(folder, 'python.exe')
+            return [python_path] if os.path.isfile(python_path) else []
+        try:
+            name_list = [entry.name for entry in os.scandir(folder) if _POSIX_PYTHON_PATTERN.match(entry.name)]
+        except OSError:
+            return []
+        name_list.sort(key=lambda name: (len(name), name))
+        return [os.path.join(folder, name) for name in name_list
+                if os.path.isfile(os.path.join(folder, name)) and os.access(os.path.join(folder, name), os.X_OK)]
+
+    def __load_index_file(self) -> None:
+        """ 加载索引文件, 文件损坏或版本不一致时忽略 """
+        if not os.path.exists(self.__index_path):
+            return
+        try:
+            with open(self.__index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            lg.warning('解释器索引文件损坏, 已忽略')
+            return
+        if not isinstance(data, dict) or data.get('version') != _INDEX_VERSION:
+            return
+        self.__record_list = [InterpreterRecord.from_dict(item) for item in data.get('records', []) if isinstance(item, dict)]
+        self.__local_python_path = data.get('local_python_path', '')
+
+    def __save_index_file(self) -> None:
+        with self.__lock:
+            data = {
+                'version': _INDEX_VERSION,
+                'local_python_path': self.__local_python_path,
+                'records': [record.to_dict() for record in self.__record_list],
+            }
+        temp_path = f'{self.__index_path}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.__index_path)
+        except OSError:
+            lg.exception('解释器索引写入失败')
@@ -1,29 +1,107 @@
+import typing
 
-
-import platform
 from system.Struct_Pyinstaller import *
+from system.Schema_Pyinstaller_Option import OptionSchemaManager, PyinstallerOptionSchema, OptionRecord
+from system.Tokenizer_Command_Line import default_dialect, detect_dialect, iter_logical_lines, split_command_line, split_commands
 from const.Const_Parameter import *
 
 lg: Logger = Log.DataManager
 
 
+class PyinstallerCommandJob(object):
+    """
+    命令文件中的一个 pyinstaller 任务
+
+    参数:
+    - index(int): 在文件中的序号, 从 0 开始
+    - line_number(int): 命令起始行号, 从 1 开始
+    - path_configurations(tuple): 该命令之前的 set/export PATH 配置
+    - implement_path(str): 执行器路径, 不存在时为空字符串
+    - command(str): 命令所在的逻辑行(已合并续行), 同一行可能含有多条命令
+    - snapshot(tuple): 解析结果, PyinstallerStruct.snapshot() 格式
+    - option_schema(PyinstallerOptionSchema): 解析时使用的选项模式
+
+    属性:
+    - index, line_number, path_configurations, implement_path, command, snapshot, option_schema
+
+    方法:
+    - create_struct() -> PyinstallerStruct: 以解析结果创建新的结构
+    """
+    __slots__ = ('__index', '__line_number', '__path_configurations', '__implement_path', '__command', '__snapshot', '__option_schema')
+
+    def __init__(self, index: int, line_number: int, path_configurations: tuple, implement_path: str, command: str, snapshot: tuple, option_schema: PyinstallerOptionSchema) -> None:
+        self.__index: int = index
+        self.__line_number: int = line_number
+        self.__path_configurations: tuple = tuple(path_configurations)
+        self.__implement_path: str = implement_path
+        self.__command: str = command
+        self.__snapshot: tuple = snapshot
+        self.__option_schema: PyinstallerOptionSchema = option_schema
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def line_number(self) -> int:
+        return self.__line_number
+
+    @property
+    def path_configurations(self) -> tuple:
+        return self.__path_configurations
+
+    @property
+    def implement_path(self) -> str:
+        return self.__implement_path
+
+    @property
+    def command(self) -> str:
+        return self.__command
+
+    @property
+    def snapshot(self) -> tuple:
+        return self.__snapshot
+
+    @property
+    def option_schema(self) -> PyinstallerOptionSchema:
+        return self.__option_schema
+
+    def create_struct(self) -> PyinstallerStruct:
+        """ 以解析结果创建新的结构, 任务本身只保存快照, 200 个任务也不会同时持有 200 个结构 """
+        pyinstaller_struct = PyinstallerStruct()
+        pyinstaller_struct.set_option_schema(self.__option_schema)
+        pyinstaller_struct.restore(self.__snapshot)
+        return pyinstaller_struct
+
+    def __repr__(self) -> str:
+        return f'PyinstallerCommandJob(index={self.__index}, line_number={self.__line_number}, implement_path={self.__implement_path!r})'
+
+
 class PyinstallerStructLoader:
 
-    def __init__(self) -> None:
-        self.__path_configurations_set: set = set()
+    def __init__(self, option_schema: PyinstallerOptionSchema = None) -> None:
+        self.__path_configuration_dict: dict = {}
+        """ 有序去重的 PATH 配置 """
         self.__system_tpye: str = App.OS
+        self.__option_schema: PyinstallerOptionSchema = option_schema or OptionSchemaManager().builtin_schema
         self.__pyinstaller_struct: PyinstallerStruct = PyinstallerStruct()
+        self.__pyinstaller_struct.set_option_schema(self.__option_schema)
         self.__implement_path: str = ''
         self.__pyinstaller_command: str = ''
 
     @property
     def path_configurations(self) -> list:
-        return list(self.__path_configurations_set)
+        return list(self.__path_configuration_dict)
 
     @property
     def pyinstaller_struct(self) -> PyinstallerStruct:
         return self.__pyinstaller_struct.copy()
 
+    @property
+    def pyinstaller_snapshot(self) -> tuple:
+        """ 读取结果的快照, 不拷贝结构, 可直接用于 PyinstallerStruct.restore() """
+        return self.__pyinstaller_struct.snapshot()
+
     @property
     def pyinstaller_command(self) -> str:
         return self.__pyinstaller_command
@@ -32,47 +110,167 @@ class PyinstallerStructLoader:
     def implement_path(self) -> str:
         return self.__implement_path
 
+    @property
+    def option_schema(self) -> PyinstallerOptionSchema:
+        return self.__option_schema
+
+    def set_option_schema(self, option_schema: PyinstallerOptionSchema) -> None:
+        """ 设置选项模式, 如当前环境的 PyInstaller 版本对应的模式, 为 None 时使用内置模式 """
+        self.__option_schema = option_schema or OptionSchemaManager().builtin_schema
+        self.__pyinstaller_struct.set_option_schema(self.__option_schema)
+
     def read_file(self, file_path) -> tuple:
-        self.__read_file_in_lines(file_path)
-        lg.trace(f'path_configurations: {self.path_configurations}\npyinstaller_struct: {self.pyinstaller_struct}')
+        """
+        读取命令文件中的第一个 pyinstaller 命令, 读到后即停止读取文件
+
+        返回:
+        - tuple: (path_configurations, implement_path, pyinstaller_struct)
+        """
+        self.__path_configuration_dict.clear()
+        self.__implement_path = ''
+        self.__pyinstaller_command = ''
+        with self.__pyinstaller_struct.batch():
+            self.__pyinstaller_struct.clear()
+            job_iterator = self.iter_jobs(file_path)
+            job: PyinstallerCommandJob | None = next(job_iterator, None)
+            job_iterator.close()
+            if job is not None:
+                self.__pyinstaller_struct.restore(job.snapshot)
+                self.__path_configuration_dict = dict.fromkeys(job.path_configurations)
+                self.__implement_path = job.implement_path
+                self.__pyinstaller_command = job.command
+        lg.trace(f'path_configurations: {self.path_configurations}\npyinstaller_struct: {self.__pyinstaller_struct}')
         return self.path_configurations, self.implement_path, self.pyinstaller_struct
 
-    def read_command(self, command: str) -> PyinstallerStruct:
-        self.__pyinstaller_struct.clear()
-        self.__parse_pyinstaller_command(command_line_list=command.split())
+    def read_jobs(self, file_path: str) -> list:
+        """
+        读取命令文件中的全部 pyinstaller 命令, 如含有多个打包目标的 .bat/.sh/.ocl 构建脚本
+
+        参数:
+        - file_path(str): 文件路径
+
+        返回:
+        - list[PyinstallerCommandJob]: 按文件中的顺序排列的任务
+        """
+        return list(self.iter_jobs(file_path))
+
+    def iter_jobs(self, file_path: str, dialect: str = None) -> typing.Iterator['PyinstallerCommandJob']:
+        """
+        逐行读取命令文件, 每读到一个 pyinstaller 命令生成一个任务. 文件以流的方式读取, 停止迭代后不再继续读取
+
+        参数:
+        - file_path(str): 文件路径
+        - dialect(str): 方言, 为 None 时根据扩展名与文件内容判断
+
+        生成:
+        - PyinstallerCommandJob: 任务, 含有该命令之前的 set/export PATH 配置
+        """
+        path_configuration_dict: dict = {}
+        index = 0
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if dialect is None:
+                dialect = detect_dialect(file_path, f.read(4096))
+                f.seek(0)
+            for line_number, logical_line in iter_logical_lines(f, dialect):
+                for argv in split_commands(split_command_line(logical_line, dialect)):
+                    if argv[0].lstrip('@').lower() in ('set', 'export'):
+                        if path_configuration := self.__parse_env_path(argv):
+                            path_configuration_dict[path_configuration] = None
+                        continue
+                    invocation = self.__split_invocation(argv)
+                    if invocation is None:
+                        continue
+                    implement_path, command_argv = invocation
+                    yield PyinstallerCommandJob(
+                        index=index,
+                        line_number=line_number,
+                        path_configurations=tuple(path_configuration_dict),
+                        implement_path=implement_path,
+                        command=logical_line,
+                        snapshot=self.__parse_to_snapshot(command_argv),
+                        option_schema=self.__option_schema,
+                    )
+                    index += 1
+
+    def set_base_path(self, path: str) -> None:
+        """
+        设置解析 --add-data / --add-binary 时计算相对路径的基准文件夹, 为空时使用当前工作目录
+
+        参数:
+        - path(str): 基准文件夹, 一般为命令的执行目录
+        """
+        self.__pyinstaller_struct.set_base_path(path)
+
+    def read_command(self, command: str, dialect: str = None) -> PyinstallerStruct:
+        """
+        解析 pyinstaller 参数字符串, 如 '--onefile --console --clean'
+
+        参数:
+        - command(str): 参数字符串
+        - dialect(str): 方言, 为 None 时使用当前系统的默认方言
+        """
+        self.read_arguments(split_command_line(command, dialect or default_dialect()))
         return self.pyinstaller_struct
 
+    def read_arguments(self, argv: list) -> tuple:
+        """
+        解析已拆分的 pyinstaller 参数列表, 不经过字符串拆分, 如 ['--onefile', '--name=demo', 'main.py']
+
+        参数:
+        - argv(list[str]): 参数列表, 不含引号
+
+        返回:
+        - tuple: 解析结果的快照, 不拷贝结构
+        """
+        return self.__parse_to_snapshot(argv)
+
     def __call__(self, file_path, *args, **kwds):
         return self.read_file(file_path)
 
-    def __read_file_in_lines(self, file_path) -> list:
-        self.__path_configurations_set.clear()
-        self.__pyinstaller_struct.clear()
-        with open(file_path,  'r', encoding='utf-8') as f:
-            line = f.readline().strip()
-            while line:
-                if line.startswith(('set ', 'export ')):
-                    self.__parse_and_set_env_path(line)
-                # 这里有一个特性, 只会存在一个pyinstaller命令, 且只读取第一个命令:
-                elif (
-                    line.startswith(('pyinstaller ', 'PyInstaller ')) or
-                    ('pyinstaller ' in line.lower()) or
-                    'pyinstaller.exe' in line
-                ):
-                    self.__get_cmd_data(line)
-                    break
-                line = f.readline()
-
-    def __parse_and_set_env_path(self, line_str: str) -> None:
-        """
-        解析并设置环境变量路径
-        line_str 示例:
-        Windows: set PATH=C:\\Users\\username\\miniconda3\\envs\\envsname\\Library\\bin;%PATH%
-        Linux:   export PATH="Users/username/miniconda3/envs/envsname/Library/bin:$PATH"
-        MacOs:   export PATH="$HOME/miniconda3/envs/envsname/Library/bin:$PATH" 
-        """
-        cmd_line: str = line_str.strip().replace('\\', '/').split(' ')[1]
-        path: str = cmd_line.split('=')[1].strip('"')
+    def __parse_to_snapshot(self, argv: list) -> tuple:
+        """ 使用内部结构解析参数并返回快照, 多个任务共用同一个结构, 快照之间共用未变更的数据 """
+        with self.__pyinstaller_struct.batch():
+            self.__pyinstaller_struct.clear()
+            self.__parse_pyinstaller_command(argv)
+        return self.__pyinstaller_struct.snapshot()
+
+    def __split_invocation(self, argv: list) -> tuple | None:
+        """
+        在一条命令中查找 pyinstaller 调用, 支持 pyinstaller, pyinstaller.exe, python -m PyInstaller, py -m PyInstaller, 
+        以及 call, start 等前缀
+
+        返回:
+        - tuple[str, list] | None: (执行器路径, pyinstaller 参数列表), 执行器路径不存在时为空字符串. 不是 pyinstaller 命令时返回 None
+        """
+        for index, token in enumerate(argv):
+            name: str = os.path.basename(token.replace('\\', '/')).lower()
+            if name.endswith('.exe'):
+                name = name[:-4]
+            if name == 'pyinstaller':
+                rest_index = index + 1
+            elif (name == 'py' or name.startswith('python')) and [item.lower() for item in argv[index + 1:index + 3]] == ['-m', 'pyinstaller']:
+                rest_index = index + 3
+            else:
+                continue
+            implement_path = token.replace('\\', '/')
+            if not os.path.exists(implement_path):
+                implement_path = ''
+            return implement_path, argv[rest_index:]
+        return None
+
+    def __parse_env_path(self, argv: list) -> str:
+        """
+        解析 PATH 环境变量语句, 非 PATH 变量或路径不存在时返回空字符串
+        argv 示例(已去除引号):
+        Windows: ['set', 'PATH=C:\\Users\\username\\miniconda3\\envs\\envsname\\Library\\bin;%PATH%']
+        Linux:   ['export', 'PATH=Users/username/miniconda3/envs/envsname/Library/bin:$PATH']
+        MacOs:   ['export', 'PATH=$HOME/miniconda3/envs/envsname/Library/bin:$PATH']
+        """
+        # cmd 的 set 语句等号之后的内容均为值, 含空格的路径可能被拆分
+        name, separator, path = ' '.join(argv[1:]).partition('=')
+        if not separator or name.strip().upper() != 'PATH':
+            return ''
+        path = path.strip().strip('"').replace('\\', '/')
         # 处理路径开头
         user_path = os.path.expanduser('~')
         if '$HOME' in path:
@@ -84,149 +282,50 @@ class PyinstallerStructLoader:
         path = path.replace(':$PATH', '').replace(';%PATH%', '')
         # 验证路径是否存在
         if not os.path.exists(os.path.normpath(path)):
-            return
+            return ''
         # 添加开头和结尾
         if self.__system_tpye == OsType.WINDOWS:
-            path = f'set PATH="{path};%PATH%"'.replace('\\', '/')
+            return f'set PATH="{path};%PATH%"'.replace('\\', '/')
         elif self.__system_tpye == OsType.LINUX or self.__system_tpye == OsType.MACOS:
-            path = f'export PATH="{path}:$PATH"'.replace('\\', '/')
-        else:
-            path = ''
-        self.__path_configurations_set.add(path)
-
-    def __split_implement_and_cmd(self, line_str_list: list) -> tuple:
-        implement_path = ''
-        flag_start = False  # 标记是否是 pyinstaller 命令的开始, 不含执行器的部分
-        while len(line_str_list) > 0:
-            item = self.__get_next_param(line_str_list)
-            if 'python.exe' in item or 'pyinstaller.exe' in item or 'pyinstaller' in item.lower() in ['python', 'pyinstaller']:
-                # 注意: 此处可能是pyinstaller.exe 或 python.exe 或者就直接是 python 或者 pyinstaller
-                flag_start = True
-                temp_path = item.replace('\\', '/').replace('"', '')
-                if os.path.exists(temp_path):
-                    implement_path = temp_path
-                continue
-            elif not flag_start:
-                continue
-            if item in ['-m', 'PyInstaller', 'pyinstaller']:
-                continue
-            else:
-                line_str_list.insert(0, item)
-                break
-        return implement_path, line_str_list
+            return f'export PATH="{path}:$PATH"'.replace('\\', '/')
+        return ''
 
-    def __get_next_param(self, cmd_data: list) -> str:
+    def __parse_pyinstaller_command(self, command_line_list: list):
         """
-        获取下个参数, 针对带有双引号的参数, 如:  "C:/test folder with space/test.py"
+        解析 pyinstaller 命令参数(已按方言拆分并去除引号). 选项类别及是否带参数由选项模式决定, 参数的应用方式由对应结构的类型决定
         """
-        if len(cmd_data) == 0:
-            return ''
-        param: str = cmd_data.pop(0)
-        flag_stop = False
-        if param.startswith('"') or '="' in param:
-            param_list = [param]
-            if not param.endswith('"'):
-                while len(cmd_data) > 0:
-                    if cmd_data[0].endswith('"'):
-                        flag_stop = True
-                    temp_param = cmd_data.pop(0)
-                    param_list.append(temp_param)
-                    if flag_stop:
-                        break
-            param = ' '.join(param_list)
-        return param
-
-    def __get_cmd_data(self, line_str: str) -> None:
-        line_str_list: list = line_str.strip().split(' ')
-        self.__implement_path, self.__command_line = self.__split_implement_and_cmd(line_str_list)
-        self.__parse_pyinstaller_command(self.__command_line)
-
-    def __parse_pyinstaller_command(self, command_line_list: list):
         try:
-            while len(command_line_list) > 0:
-                param_phrase = self.__get_next_param(command_line_list)
-                # 含有 = 的参数;  RelPathStruct | MultiInfoStruct | SingleInfoStruct
-                if '=' in param_phrase:
-                    param_name, param_value = param_phrase.split('=', 1)
-                    struct:  RelPathStruct | MultiInfoStruct | SingleInfoStruct | None = self.__pyinstaller_struct.find_struct_from_option(param_name)
-                    if struct is None:
-                        lg.debug(f'未找到对应参数 {param_name}')
-                        continue
-                    if param_name in Pyinstaller.CmdArgsCategory.LIST_MULTI:
-                        # RelPathStruct | MultiInfoStruct
-                        struct: RelPathStruct | MultiInfoStruct
-                        struct.append_args(param_value)
-                    else:
-                        # SingleInfoStruct
-                        struct: SingleInfoStruct
-                        struct.set_args(param_value)
-                # StateStruct 带参数
-                elif param_phrase in Pyinstaller.CmdArgsCategory.DICT_STATE_WITH_PARAMS:
-                    param_name = param_phrase
-                    struct:   StateStruct | None = self.__pyinstaller_struct.find_struct_from_option(param_name)
-                    if struct is None:
-                        lg.debug(f'未找到对应参数 {param_name}')
-                        continue
-                    parm_state = self.__get_next_param(command_line_list)
-                    struct.set_state(parm_state)
-                # StateStruct 不带参数
-                elif param_phrase in Pyinstaller.CmdArgsCategory.DICT_STATE_WITHOUT_PARAMS['--onefile'] or param_phrase in Pyinstaller.CmdArgsCategory.DICT_STATE_WITHOUT_PARAMS['--console']:
-                    param_name = param_phrase
-                    if param_phrase in Pyinstaller.CmdArgsCategory.DICT_STATE_WITHOUT_PARAMS['--onefile']:
-                        option_key = '--onefile'
-                    else:
-                        option_key = '--console'
-                    struct:   StateStruct | None = self.__pyinstaller_struct.find_struct_from_option(option_key)
-                    if struct is None:
-                        lg.debug(f'未找到对应参数 {param_name}')
-                        continue
-                    struct: StateStruct
-                    struct.set_state(param_phrase)
-                # SwitchStruct
-                elif param_phrase in Pyinstaller.CmdArgsCategory.LIST_SWITCH:
-                    param_name = param_phrase
-                    struct:   SwitchStruct | None = self.__pyinstaller_struct.find_struct_from_option(param_name)
-                    if struct is None:
-                        lg.debug(f'未找到对应参数 {param_name}')
-                        continue
-                    else:
-                        struct.set_on()
-                else:
-                    param_name = param_phrase.strip('"')
+            param_iterator = iter(command_line_list)
+            for param_phrase in param_iterator:
+                param_name, separator, param_value = param_phrase.partition('=')
+                record: OptionRecord | None = self.__option_schema.find(param_name) if param_name.startswith('-') else None
+                if record is None:
                     # 针对 执行文件
-                    if param_name.endswith(('.py', 'pyw', 'pyd', '.spec')):
-                        struct:   SingleInfoStruct | None = self.__pyinstaller_struct.find_struct_from_option('')
-                        if struct is None:
-                            lg.debug(f'未找到对应参数 {param_name}')
-                            continue
-                        struct.set_args(param_phrase)
-                    # 以下针对非标准写法, 比如需要写 "=", 但是没有写的情况
-                    # StateStruct 带参数
-                    elif param_name in Pyinstaller.CmdArgsCategory.DICT_STATE_WITH_PARAMS:
-                        struct:   StateStruct | None = self.__pyinstaller_struct.find_struct_from_option(option_key)
-                        if struct is None:
-                            lg.debug(f'未找到对应参数 {param_name}')
-                            continue
-                        parm_state = self.__get_next_param(command_line_list)
-                        struct.set_state(parm_state)
-                    # SingleInfoStruct
-                    elif param_name in Pyinstaller.CmdArgsCategory.LIST_SINGLE:
-                        struct: SingleInfoStruct | None | None = self.__pyinstaller_struct.find_struct_from_option(param_phrase)
-                        if struct is None:
-                            lg.debug(f'未找到对应参数 {param_name}')
-                            continue
-                        parm_arg = self.__get_next_param(command_line_list)
-                        struct.set_args(parm_arg)
-                    # RelPathStruct | MultiInfoStruct
-                    elif param_name in Pyinstaller.CmdArgsCategory.LIST_MULTI:
-                        struct: RelPathStruct | MultiInfoStruct | None = self.__pyinstaller_struct.find_struct_from_option(param_phrase)
-                        if struct is None:
-                            lg.debug(f'未找到对应参数 {param_name}')
-                            continue
-                        parm_arg = self.__get_next_param(command_line_list)
-                        struct.append_args(parm_arg)
-                    else:
-                        lg.debug(f'未找到对应参数 "{param_name}"({param_phrase})')
+                    if param_phrase.endswith(('.py', '.pyw', '.pyd', '.spec')):
+                        struct: SingleInfoStruct | None = self.__pyinstaller_struct.find_struct_from_option('')
+                        if struct is not None:
+                            struct.set_args(param_phrase)
                         continue
+                    lg.debug(f'未找到对应参数 "{param_phrase}"')
+                    continue
+                # 带参数的选项兼容 "--name value" 与 "--name=value" 两种写法
+                if record.takes_value and not separator:
+                    param_value = next(param_iterator, '')
+                struct: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct | None = self.__pyinstaller_struct.find_struct_from_option(param_name)
+                if struct is None:
+                    lg.debug(f'未找到对应参数 {param_name}({record.kind})')
+                    continue
+                self.__apply_option(struct, param_name, param_value)
         except:
             lg.exception('命令解析异常')
+
+    def __apply_option(self, struct: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct, option: str, value: str) -> None:
+        if isinstance(struct, SwitchStruct):
+            struct.set_on()
+        elif isinstance(struct, StateStruct):
+            # 不带参数的状态结构, 以选项本身作为状态, 如 --onefile
+            struct.set_state(value if struct.isWithOption else option)
+        elif isinstance(struct, (RelPathStruct, MultiInfoStruct)):
+            struct.append_args(value)
+        elif isinstance(struct, SingleInfoStruct):
+            struct.set_args(value)
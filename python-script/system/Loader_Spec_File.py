@@ -0,0 +1,675 @@
+"""
+.spec 文件导入
+
+以 AST 静态分析 .spec 文件, 不执行其中的任何代码. 将 Analysis, PYZ, EXE, COLLECT, MERGE, Splash 调用中的字面量参数
+转换为 pyinstaller 命令行参数, 再由 PyinstallerStructLoader 解析为 PyinstallerStruct. 无法静态求值的内容(函数调用, 条件语句,
+循环, f-string 等)不会导入, 并记录在 SpecImportResult.skipped_list 中.
+包含多个 Analysis 的多程序 spec 只导入第一个程序, 之后的 Analysis, EXE 等调用记录为未导入.
+
+支持的字面量:
+- 常量, list, tuple, set, dict
+- 模块顶层以字面量赋值的变量, 以及对其的 += 操作
+- 字符串与列表的 + 运算
+- os.path.join, os.path.dirname, os.path.basename 等纯字符串函数
+- PyInstaller 注入的 SPECPATH, SPEC 变量
+
+类:
+- SpecSkippedItem: 未导入的内容
+- SpecImportResult: 导入结果
+- SpecFileLoader: .spec 文件导入器
+"""
+import ast
+import os
+import re
+import typing
+
+from system.Loader_Pyinstaller_Struct import PyinstallerStructLoader
+from system.Schema_Pyinstaller_Option import PyinstallerOptionSchema
+from system.Struct_Pyinstaller import PyinstallerStruct
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+_DRIVE_PATH_PATTERN = re.compile(r'^[a-zA-Z]:[/\\]')
+""" 以盘符开头的 Windows 绝对路径, 在其他系统上导入时保持不变, 不拼接到 spec 文件夹 """
+
+
+class SpecSkippedItem(object):
+    """
+    未导入的内容
+
+    参数:
+    - line_number(int): 行号
+    - construct(str): 内容, 如 'Analysis(datas)', 'If'
+    - reason(str): 原因
+
+    属性:
+    - line_number, construct, reason
+    """
+    __slots__ = ('__line_number', '__construct', '__reason')
+
+    def __init__(self, line_number: int, construct: str, reason: str) -> None:
+        self.__line_number: int = line_number
+        self.__construct: str = construct
+        self.__reason: str = reason
+
+    @property
+    def line_number(self) -> int:
+        return self.__line_number
+
+    @property
+    def construct(self) -> str:
+        return self.__construct
+
+    @property
+    def reason(self) -> str:
+        return self.__reason
+
+    def __str__(self) -> str:
+        return f'第 {self.__line_number} 行 {self.__construct}: {self.__reason}'
+
+    def __repr__(self) -> str:
+        return f'SpecSkippedItem({self.__line_number}, {self.__construct!r}, {self.__reason!r})'
+
+
+class SpecImportResult(object):
+    """
+    .spec 文件导入结果
+
+    参数:
+    - file_path(str): 文件路径
+    - arguments(tuple): 转换得到的 pyinstaller 参数, 不含引号
+    - snapshot(tuple): 解析结果, PyinstallerStruct.snapshot() 格式, 文件无法解析时为 None
+    - skipped_list(tuple): 未导入的内容, SpecSkippedItem 列表
+    - option_schema(PyinstallerOptionSchema): 解析时使用的选项模式
+
+    属性:
+    - file_path, arguments, snapshot, skipped_list, option_schema
+    - isComplete(bool): 是否全部导入, 没有跳过的内容
+
+    方法:
+    - create_struct() -> PyinstallerStruct | None: 以解析结果创建新的结构
+    """
+    __slots__ = ('__file_path', '__arguments', '__snapshot', '__skipped_list', '__option_schema')
+
+    def __init__(self, file_path: str, arguments: tuple, snapshot: tuple | None, skipped_list: tuple, option_schema: PyinstallerOptionSchema) -> None:
+        self.__file_path: str = file_path
+        self.__arguments: tuple = tuple(arguments)
+        self.__snapshot: tuple | None = snapshot
+        self.__skipped_list: tuple = tuple(skipped_list)
+        self.__option_schema: PyinstallerOptionSchema = option_schema
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    @property
+    def arguments(self) -> tuple:
+        return self.__arguments
+
+    @property
+    def snapshot(self) -> tuple | None:
+        return self.__snapshot
+
+    @property
+    def skipped_list(self) -> tuple:
+        return self.__skipped_list
+
+    @property
+    def option_schema(self) -> PyinstallerOptionSchema:
+        return self.__option_schema
+
+    @property
+    def isComplete(self) -> bool:
+        return self.__snapshot is not None and not self.__skipped_list
+
+    def create_struct(self) -> PyinstallerStruct | None:
+        if self.__snapshot is None:
+            return None
+        pyinstaller_struct = PyinstallerStruct()
+        pyinstaller_struct.set_option_schema(self.__option_schema)
+        pyinstaller_struct.restore(self.__snapshot)
+        return pyinstaller_struct
+
+    def __repr__(self) -> str:
+        return f'SpecImportResult({self.__file_path!r}, arguments={len(self.__arguments)}, skipped={len(self.__skipped_list)})'
+
+
+class _DynamicValue(Exception):
+    """ 无法静态求值 """
+
+
+class _SpecObject(object):
+    """ spec 中 Analysis 等调用的结果, 作为其他调用的位置参数时不需要求值 """
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+
+def _call_name(node: ast.Call) -> str:
+    """ 调用的函数名, 如 'Analysis', 'os.path.join', 无法确定时为空字符串 """
+    part_list = []
+    function = node.func
+    while isinstance(function, ast.Attribute):
+        part_list.append(function.attr)
+        function = function.value
+    if not isinstance(function, ast.Name):
+        return ''
+    part_list.append(function.id)
+    return '.'.join(reversed(part_list))
+
+
+def _describe(node: ast.AST) -> str:
+    if isinstance(node, ast.Call):
+        return f'{_call_name(node) or type(node.func).__name__}()'
+    return type(node).__name__
+
+
+def _switch(option: str) -> typing.Callable:
+    """ 值为 True 时添加选项 """
+    def convert(value, resolve_path) -> list:
+        if not isinstance(value, bool):
+            raise TypeError('应为 bool')
+        return [option] if value else []
+    return convert
+
+
+def _inverse_switch(option: str) -> typing.Callable:
+    """ 值为 False 时添加选项, 如 upx=False 对应 --noupx """
+    def convert(value, resolve_path) -> list:
+        if not isinstance(value, bool):
+            raise TypeError('应为 bool')
+        return [] if value else [option]
+    return convert
+
+
+def _single(option: str, isPath: bool = False) -> typing.Callable:
+    def convert(value, resolve_path) -> list:
+        if value is None or value == '':
+            return []
+        if not isinstance(value, str):
+            raise TypeError('应为 str')
+        return [f'{option}={resolve_path(value) if isPath else value}']
+    return convert
+
+
+def _multi(option: str, isPath: bool = False) -> typing.Callable:
+    def convert(value, resolve_path) -> list:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, (list, tuple, set)) or not all(isinstance(item, str) for item in value):
+            raise TypeError('应为 str 或 str 列表')
+        return [f'{option}={resolve_path(item) if isPath else item}' for item in value]
+    return convert
+
+
+def _toc(option: str) -> typing.Callable:
+    """ datas, binaries 等 (源路径, 目标目录) 列表 """
+    def convert(value, resolve_path) -> list:
+        if value is None:
+            return []
+        if not isinstance(value, (list, tuple)):
+            raise TypeError('应为 (源路径, 目标目录) 列表')
+        argument_list = []
+        for item in value:
+            if not isinstance(item, (list, tuple)) or len(item) < 2 or not all(isinstance(part, str) for part in item[:2]):
+                raise TypeError('应为 (源路径, 目标目录) 列表')
+            argument_list.append(f'{option}={resolve_path(item[0])}:{item[1] or "."}')
+        return argument_list
+    return convert
+
+
+def _console(value, resolve_path) -> list:
+    if not isinstance(value, bool):
+        raise TypeError('应为 bool')
+    return ['--console'] if value else ['--windowed']
+
+
+def _debug_bootloader(value, resolve_path) -> list:
+    if not isinstance(value, bool):
+        raise TypeError('应为 bool')
+    return ['--debug=bootloader'] if value else []
+
+
+def _debug_noarchive(value, resolve_path) -> list:
+    if not isinstance(value, bool):
+        raise TypeError('应为 bool')
+    return ['--debug=noarchive'] if value else []
+
+
+def _ignore(value, resolve_path) -> list:
+    return []
+
+
+def _unsupported(reason: str, default_list: tuple = (None, False, {}, [])) -> typing.Callable:
+    """ 没有对应命令行选项的参数, 为默认值时忽略, 否则记录为未导入 """
+    def convert(value, resolve_path) -> list:
+        if value in default_list:
+            return []
+        raise TypeError(reason)
+    return convert
+
+
+ANALYSIS_KEYWORD_DICT: dict = {
+    'pathex': _multi('--paths', True),
+    'binaries': _toc('--add-binary'),
+    'datas': _toc('--add-data'),
+    'hiddenimports': _multi('--hidden-import'),
+    'hookspath': _multi('--additional-hooks-dir', True),
+    'runtime_hooks': _multi('--runtime-hook', True),
+    'excludes': _multi('--exclude-module'),
+    'noarchive': _debug_noarchive,
+    'scripts': _ignore,
+    'hooksconfig': _unsupported('没有对应的命令行选项'),
+    'module_collection_mode': _unsupported('没有对应的命令行选项'),
+    'cipher': _unsupported('PyInstaller 6 已移除字节码加密', (None,)),
+    'win_no_prefer_redirects': _ignore,
+    'win_private_assemblies': _ignore,
+}
+""" Analysis 关键字参数与命令行选项的对应关系 """
+
+EXE_KEYWORD_DICT: dict = {
+    'name': _single('--name'),
+    'console': _console,
+    'icon': _multi('--icon', True),
+    'debug': _debug_bootloader,
+    'strip': _switch('--strip'),
+    'upx': _inverse_switch('--noupx'),
+    'upx_exclude': _multi('--upx-exclude'),
+    'runtime_tmpdir': _single('--runtime-tmpdir'),
+    'disable_windowed_traceback': _switch('--disable-windowed-traceback'),
+    'argv_emulation': _switch('--argv-emulation'),
+    'target_arch': _single('--target-arch'),
+    'codesign_identity': _single('--codesign-identity'),
+    'entitlements_file': _single('--osx-entitlements-file', True),
+    'uac_admin': _switch('--uac-admin'),
+    'uac_uiaccess': _switch('--uac-uiaccess'),
+    'version': _single('--version-file', True),
+    'manifest': _single('--manifest', True),
+    'resources': _multi('--resource'),
+    'contents_directory': _single('--contents-directory'),
+    'hide_console': _single('--hide-console'),
+    'bootloader_ignore_signals': _switch('--bootloader-ignore-signals'),
+    'exclude_binaries': _ignore,
+    'embed_manifest': _ignore,
+}
+""" EXE 关键字参数与命令行选项的对应关系 """
+
+COLLECT_KEYWORD_DICT: dict = {
+    'name': _ignore,
+    'strip': _switch('--strip'),
+    'upx': _inverse_switch('--noupx'),
+    'upx_exclude': _multi('--upx-exclude'),
+}
+""" COLLECT 关键字参数与命令行选项的对应关系, name 为输出文件夹名, 通常与 EXE 相同 """
+
+PYZ_KEYWORD_DICT: dict = {
+    'name': _ignore,
+    'cipher': ANALYSIS_KEYWORD_DICT['cipher'],
+}
+
+SPLASH_KEYWORD_DICT: dict = {
+    'image_file': _single('--splash', True),
+}
+
+PROGRAM_CALL_NAMES: tuple = ('Analysis', 'PYZ', 'EXE', 'COLLECT', 'Splash', 'BUNDLE')
+""" 每个程序各调用一次的函数, 多程序 spec 中只导入第一次调用 """
+
+PURE_FUNCTION_DICT: dict = {
+    'os.path.join': os.path.join,
+    'os.path.dirname': os.path.dirname,
+    'os.path.basename': os.path.basename,
+    'os.path.splitext': os.path.splitext,
+    'os.path.normpath': os.path.normpath,
+    'str': str,
+}
+""" 可静态求值的纯函数, 结果只与参数有关 """
+
+
+class _SpecEvaluator(object):
+    """ 遍历一个 .spec 文件的 AST, 生成 pyinstaller 参数与未导入的内容 """
+
+    def __init__(self, file_path: str) -> None:
+        self.__spec_folder_path: str = os.path.dirname(os.path.abspath(file_path))
+        self.__namespace: dict = {
+            'SPECPATH': self.__spec_folder_path,
+            'SPEC': os.path.abspath(file_path),
+            'block_cipher': None,
+        }
+        self.__dynamic_reason_dict: dict = {}
+        """ 以非字面量赋值的变量名: 原因 """
+        self.__argument_list: list = []
+        self.__skipped_list: list = []
+        self.__script_list: list = []
+        self.__call_count_dict: dict = {}
+        """ PROGRAM_CALL_NAMES 中的函数名: 调用次数 """
+        self.__hasCollect: bool = False
+        self.__hasExe: bool = False
+
+    @property
+    def argument_list(self) -> list:
+        argument_list = []
+        if self.__hasExe:
+            argument_list.append('--onedir' if self.__hasCollect else '--onefile')
+        return argument_list + self.__argument_list + self.__script_list[:1]
+
+    @property
+    def skipped_list(self) -> list:
+        return self.__skipped_list
+
+    def visit_module(self, tree: ast.Module) -> None:
+        for node in tree.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom, ast.Pass)):
+                continue
+            if isinstance(node, ast.Expr):
+                if isinstance(node.value, ast.Constant):
+                    continue
+                if isinstance(node.value, ast.Call) and self.__visit_spec_call(node.value):
+                    continue
+                self.__skip(node, _describe(node.value), '未执行的表达式')
+                continue
+            if isinstance(node, ast.Assign):
+                self.__visit_assign(node)
+                continue
+            if isinstance(node, ast.AugAssign):
+                self.__visit_aug_assign(node)
+                continue
+            self.__skip(node, type(node).__name__, '未执行的语句')
+
+    def __visit_assign(self, node: ast.Assign) -> None:
+        name_list = [target.id for target in node.targets if isinstance(target, ast.Name)]
+        if len(name_list) != len(node.targets):
+            self.__skip(node, _describe(node.targets[0]), '仅支持以变量名赋值')
+            return
+        if isinstance(node.value, ast.Call) and self.__visit_spec_call(node.value):
+            for name in name_list:
+                self.__bind(name, _SpecObject(_call_name(node.value)))
+            return
+        try:
+            value = self.__evaluate(node.value)
+        except _DynamicValue as e:
+            # 变量未被 spec 调用使用时不影响导入, 使用时再记录
+            for name in name_list:
+                self.__dynamic_reason_dict[name] = f'变量 {name} 来自第 {node.lineno} 行: {e}'
+                self.__namespace.pop(name, None)
+            return
+        for name in name_list:
+            self.__bind(name, value)
+
+    def __visit_aug_assign(self, node: ast.AugAssign) -> None:
+        if not isinstance(node.target, ast.Name) or not isinstance(node.op, ast.Add):
+            self.__skip(node, _describe(node.target), '仅支持变量的 += 操作')
+            return
+        name = node.target.id
+        try:
+            self.__bind(name, self.__evaluate(ast.Name(id=name, ctx=ast.Load())) + self.__evaluate(node.value))
+        except (_DynamicValue, TypeError) as e:
+            self.__dynamic_reason_dict[name] = f'变量 {name} 来自第 {node.lineno} 行: {e}'
+            self.__namespace.pop(name, None)
+
+    def __bind(self, name: str, value) -> None:
+        self.__namespace[name] = value
+        self.__dynamic_reason_dict.pop(name, None)
+
+    def __visit_spec_call(self, node: ast.Call) -> bool:
+        """ 处理 Analysis 等调用, 不是 spec 调用时返回 False """
+        name = _call_name(node)
+        if name in PROGRAM_CALL_NAMES:
+            count = self.__call_count_dict[name] = self.__call_count_dict.get(name, 0) + 1
+            if count > 1:
+                # 后续程序的参数会覆盖第一个程序的名称, 控制台等设置
+                self.__skip(node, name, f'多程序 spec 仅导入第一个程序, 忽略第 {count} 个 {name}')
+                return True
+        if name == 'Analysis':
+            self.__visit_analysis(node)
+        elif name == 'EXE':
+            self.__hasExe = True
+            self.__visit_positional_toc(node)
+            self.__visit_keywords(node, name, EXE_KEYWORD_DICT)
+        elif name == 'COLLECT':
+            self.__hasCollect = True
+            self.__visit_positional_toc(node)
+            self.__visit_keywords(node, name, COLLECT_KEYWORD_DICT)
+        elif name == 'PYZ':
+            self.__visit_positional_toc(node)
+            self.__visit_keywords(node, name, PYZ_KEYWORD_DICT)
+        elif name == 'Splash':
+            if node.args:
+                self.__apply(node.args[0], 'Splash(image_file)', SPLASH_KEYWORD_DICT['image_file'])
+            self.__visit_keywords(node, name, SPLASH_KEYWORD_DICT, isStrict=False)
+        elif name == 'MERGE':
+            self.__skip(node, 'MERGE', '多程序共享依赖无法以单个命令行表示')
+        elif name == 'BUNDLE':
+            self.__visit_keywords(node, name, {'bundle_identifier': _single('--osx-bundle-identifier')}, isStrict=False)
+        else:
+            return False
+        return True
+
+    def __visit_analysis(self, node: ast.Call) -> None:
+        scripts_node = node.args[0] if node.args else next((keyword.value for keyword in node.keywords if keyword.arg == 'scripts'), None)
+        if scripts_node is not None:
+            try:
+                script_list = self.__evaluate(scripts_node)
+                if isinstance(script_list, str):
+                    script_list = [script_list]
+                if not isinstance(script_list, (list, tuple)) or not all(isinstance(item, str) for item in script_list):
+                    raise _DynamicValue('应为 str 列表')
+                self.__script_list.extend(self.__resolve_path(item) for item in script_list)
+                if len(self.__script_list) > 1:
+                    self.__skip(scripts_node, 'Analysis(scripts)', f'仅导入第一个脚本, 忽略 {len(self.__script_list) - 1} 个')
+            except _DynamicValue as e:
+                self.__skip(scripts_node, 'Analysis(scripts)', str(e))
+        for index, arg_node in enumerate(node.args[1:], 1):
+            self.__skip(arg_node, f'Analysis(位置参数 {index})', '仅支持关键字参数')
+        self.__visit_keywords(node, 'Analysis', ANALYSIS_KEYWORD_DICT)
+
+    def __visit_positional_toc(self, node: ast.Call) -> None:
+        """
+        EXE, COLLECT, PYZ 的位置参数通常为 a.scripts, a.binaries 等引用, 不需要导入.
+        字面量列表中的 ('v', None, 'OPTION') 为 python 选项, 对应 --python-option
+        """
+        for arg_node in node.args:
+            if isinstance(arg_node, (ast.Name, ast.Attribute)):
+                continue
+            # 嵌套的 spec 调用, 如 EXE(PYZ(a.pure), ...)
+            if isinstance(arg_node, ast.Call) and self.__visit_spec_call(arg_node):
+                continue
+            try:
+                value = self.__evaluate(arg_node)
+            except _DynamicValue as e:
+                self.__skip(arg_node, f'{_call_name(node)}(位置参数)', str(e))
+                continue
+            if isinstance(value, _SpecObject):
+                continue
+            for item in value if isinstance(value, (list, tuple)) else ():
+                if isinstance(item, (list, tuple)) and len(item) == 3 and item[2] == 'OPTION' and isinstance(item[0], str):
+                    self.__argument_list.append(f'--python-option={item[0]}')
+
+    def __visit_keywords(self, node: ast.Call, call_name: str, converter_dict: dict, isStrict: bool = True) -> None:
+        for keyword in node.keywords:
+            construct = f'{call_name}({keyword.arg})'
+            if keyword.arg is None:
+                self.__skip(keyword.value, f'{call_name}(**)', '未展开的关键字参数')
+                continue
+            converter = converter_dict.get(keyword.arg)
+            if converter is None:
+                if isStrict:
+                    self.__skip(keyword.value, construct, '没有对应的命令行选项')
+                continue
+            self.__apply(keyword.value, construct, converter)
+
+    def __apply(self, value_node: ast.AST, construct: str, converter: typing.Callable) -> None:
+        """ 求值并转换为命令行参数. 列表中部分元素无法求值时, 导入其余元素并记录无法求值的元素 """
+        try:
+            value = self.__evaluate(value_node) if converter is _ignore else self.__evaluate_elements(value_node, construct)
+        except _DynamicValue as e:
+            self.__skip(value_node, construct, str(e))
+            return
+        try:
+            self.__argument_list.extend(converter(value, self.__resolve_path))
+        except TypeError as e:
+            self.__skip(value_node, construct, str(e))
+
+    def __evaluate_elements(self, node: ast.AST, construct: str):
+        """
+        逐个元素求值列表, 元组以及它们相加的结果(如 hidden + [f'mod{x}']), 无法求值的元素或加数记录后跳过, 其余照常导入.
+        其他节点整体求值
+
+        异常:
+        - _DynamicValue: 整体无法求值, 如两个加数都无法求值, 或加数不是列表与元组
+        """
+        if isinstance(node, (ast.List, ast.Tuple)):
+            value = []
+            for element in node.elts:
+                try:
+                    value.append(self.__evaluate(element))
+                except _DynamicValue as e:
+                    self.__skip(element, construct, str(e))
+            return tuple(value) if isinstance(node, ast.Tuple) else value
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            value_list = []
+            error_list = []
+            for operand in (node.left, node.right):
+                try:
+                    value_list.append(self.__evaluate_elements(operand, construct))
+                except _DynamicValue as e:
+                    error_list.append((operand, e))
+            if error_list and not (value_list and isinstance(value_list[0], (list, tuple))):
+                raise error_list[0][1]
+            for operand, e in error_list:
+                self.__skip(operand, construct, str(e))
+            if len(value_list) == 1:
+                return value_list[0]
+            try:
+                return value_list[0] + value_list[1]
+            except TypeError as e:
+                raise _DynamicValue(str(e))
+        return self.__evaluate(node)
+
+    def __evaluate(self, node: ast.AST):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.List):
+            return [self.__evaluate(element) for element in node.elts]
+        if isinstance(node, ast.Tuple):
+            return tuple(self.__evaluate(element) for element in node.elts)
+        if isinstance(node, ast.Set):
+            return {self.__evaluate(element) for element in node.elts}
+        if isinstance(node, ast.Dict):
+            if None in node.keys:
+                raise _DynamicValue('未展开的字典')
+            return {self.__evaluate(key): self.__evaluate(value) for key, value in zip(node.keys, node.values)}
+        if isinstance(node, ast.Name):
+            if node.id in self.__namespace:
+                return self.__namespace[node.id]
+            raise _DynamicValue(self.__dynamic_reason_dict.get(node.id, f'未定义的变量 {node.id}'))
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            try:
+                return self.__evaluate(node.left) + self.__evaluate(node.right)
+            except TypeError as e:
+                raise _DynamicValue(str(e))
+        if isinstance(node, ast.Call):
+            function = PURE_FUNCTION_DICT.get(_call_name(node))
+            if function is None or node.keywords:
+                raise _DynamicValue(f'调用 {_describe(node)}')
+            try:
+                return function(*[self.__evaluate(arg) for arg in node.args])
+            except TypeError as e:
+                raise _DynamicValue(str(e))
+        raise _DynamicValue(f'非字面量 {_describe(node)}')
+
+    def __resolve_path(self, path: str) -> str:
+        """ spec 中的相对路径以 spec 文件所在文件夹为基准 """
+        if not path or path == 'NONE':
+            return path
+        if _DRIVE_PATH_PATTERN.match(path):
+            return os.path.normpath(path)
+        return os.path.normpath(os.path.join(self.__spec_folder_path, path))
+
+    def __skip(self, node: ast.AST, construct: str, reason: str) -> None:
+        self.__skipped_list.append(SpecSkippedItem(getattr(node, 'lineno', 0), construct, reason))
+
+
+class SpecFileLoader(object):
+    """
+    .spec 文件导入器, 静态分析, 不执行 spec 中的代码
+
+    参数:
+    - option_schema(PyinstallerOptionSchema): 选项模式, 为 None 时使用内置模式
+
+    属性:
+    - option_schema(PyinstallerOptionSchema): 选项模式
+
+    方法:
+    - read_file(file_path: str) -> SpecImportResult: 导入 .spec 文件
+    - read_source(source: str, file_path: str) -> SpecImportResult: 导入 .spec 文件内容
+    - iter_files(file_path_list: Iterable[str]) -> Iterator[SpecImportResult]: 批量导入, 共用同一个解析结构
+    """
+
+    def __init__(self, option_schema: PyinstallerOptionSchema = None) -> None:
+        self.__struct_loader: PyinstallerStructLoader = PyinstallerStructLoader(option_schema)
+
+    @property
+    def option_schema(self) -> PyinstallerOptionSchema:
+        return self.__struct_loader.option_schema
+
+    def set_option_schema(self, option_schema: PyinstallerOptionSchema) -> None:
+        self.__struct_loader.set_option_schema(option_schema)
+
+    def read_file(self, file_path: str) -> SpecImportResult:
+        """
+        导入 .spec 文件
+
+        参数:
+        - file_path(str): 文件路径
+
+        返回:
+        - SpecImportResult: 导入结果, 文件无法读取或存在语法错误时 snapshot 为 None
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                source = f.read()
+        except OSError as e:
+            lg.warning(f'spec 文件读取失败: {file_path}, {e}')
+            return SpecImportResult(file_path, (), None, (SpecSkippedItem(0, 'file', str(e)),), self.option_schema)
+        return self.read_source(source, file_path)
+
+    def read_source(self, source: str | bytes, file_path: str) -> SpecImportResult:
+        """
+        导入 .spec 文件内容
+
+        参数:
+        - source(str | bytes): 文件内容
+        - file_path(str): 文件路径, 用于解析相对路径
+
+        返回:
+        - SpecImportResult: 导入结果
+        """
+        try:
+            tree = ast.parse(source, filename=file_path)
+        except (SyntaxError, ValueError) as e:
+            lg.warning(f'spec 文件语法错误: {file_path}, {e}')
+            return SpecImportResult(file_path, (), None, (SpecSkippedItem(getattr(e, 'lineno', 0) or 0, 'file', f'语法错误: {e}'),), self.option_schema)
+        evaluator = _SpecEvaluator(file_path)
+        evaluator.visit_module(tree)
+        argument_list = evaluator.argument_list
+        snapshot = self.__struct_loader.read_arguments(argument_list)
+        if evaluator.skipped_list:
+            lg.debug(f'spec 文件 {file_path} 中有 {len(evaluator.skipped_list)} 处内容未导入: ' + '; '.join(str(item) for item in evaluator.skipped_list))
+        return SpecImportResult(file_path, tuple(argument_list), snapshot, tuple(evaluator.skipped_list), self.option_schema)
+
+    def iter_files(self, file_path_list: typing.Iterable[str]) -> typing.Iterator[SpecImportResult]:
+        """
+        批量导入, 如导入工作区中的全部 .spec 文件
+
+        参数:
+        - file_path_list(Iterable[str]): 文件路径
+
+        生成:
+        - SpecImportResult: 导入结果
+        """
+        for file_path in file_path_list:
+            yield self.read_file(file_path)
@@ -1,14 +1,19 @@
 
 import os
-import time
 import threading
-import subprocess
 
 from DToolslib import *
 
 from system.Struct_Pyinstaller import *
+from system.Manager_Probe_Cache import ProbeCacheManager
+from system.Engine_Probe_Async import AsyncProbeEngine
+from system.Scheduler_Probe import ProbeScheduler
+from system.Coordinator_Refresh import RefreshCoordinator
+from system.Watcher_Conda_Env import CondaEnvWatcher
+from system.Index_Interpreter import InterpreterIndex, InterpreterRecord
+from system.Reader_Dist_Info import read_pyinstaller_dist_info
 from const.Const_Parameter import *
-from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QTimer, QThreadPool
+from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, QCoreApplication
 
 
 class ExecutorInfoStruct(QObject):
@@ -23,6 +28,13 @@ class ExecutorInfoStruct(QObject):
         pyinstaller_path (str, optional): pyinstaller路径 默认: ''
         pyinstaller_version (str, optional): pyinstaller版本 默认: ''
 
+    属性(只读, 由探测结果更新):
+        implementation (str): python实现, 如 'CPython'
+        platform (str): 平台, 如 'win32'
+        prefix (str): sys.prefix
+        site_packages (list): site-packages 文件夹列表
+        pyinstaller_entry_point (str): pyinstaller 入口, 如 'PyInstaller.__main__:_console_script_run'
+
     信号: 
         signal_update_data (pyqtSignal(dict)): 更新数据信号, 如果数据更改, 则将通过信号通知其他组件
 
@@ -33,6 +45,7 @@ class ExecutorInfoStruct(QObject):
         set_python_version(python_version: str): 设置python版本
         set_pyinstaller_path(pyinstaller_path: str): 设置pyinstaller路径
         set_pyinstaller_version(pyinstaller_version: str): 设置pyinstaller版本
+        update_from_probe(probe_data: dict): 根据探测结果更新数据, 只发射一次信号
         clear(): 清除所有数据
         clear_pyinstaller(): 清除pyinstaller数据
     """
@@ -46,6 +59,11 @@ class ExecutorInfoStruct(QObject):
         self.__python_version: str = python_version
         self.__pyinstaller_path: str = pyinstaller_path
         self.__pyinstaller_version: str = pyinstaller_version
+        self.__implementation: str = ''
+        self.__platform: str = ''
+        self.__prefix: str = ''
+        self.__site_packages: list = []
+        self.__pyinstaller_entry_point: str = ''
 
     @property
     def name(self) -> str:
@@ -71,6 +89,26 @@ class ExecutorInfoStruct(QObject):
     def pyinstaller_version(self) -> str:
         return self.__pyinstaller_version
 
+    @property
+    def implementation(self) -> str:
+        return self.__implementation
+
+    @property
+    def platform(self) -> str:
+        return self.__platform
+
+    @property
+    def prefix(self) -> str:
+        return self.__prefix
+
+    @property
+    def site_packages(self) -> list:
+        return list(self.__site_packages)
+
+    @property
+    def pyinstaller_entry_point(self) -> str:
+        return self.__pyinstaller_entry_point
+
     @property
     def info_list(self) -> list:
         return [self.__name, self.__python_path, self.__python_version, self.__pyinstaller_path, self.__pyinstaller_version]
@@ -114,6 +152,27 @@ class ExecutorInfoStruct(QObject):
         self.__pyinstaller_version = pyinstaller_version
         self.signal_update_data.emit()
 
+    def update_from_probe(self, probe_data: dict) -> None:
+        """
+        根据探测结果更新 python 相关数据(不含 pyinstaller 路径/版本), 数据有变更时只发射一次信号
+
+        参数:
+            probe_data (dict): probe_interpreter() 的返回值
+        """
+        new_values = (
+            probe_data.get('python_version', ''),
+            probe_data.get('implementation', ''),
+            probe_data.get('platform', ''),
+            probe_data.get('prefix', ''),
+            list(probe_data.get('site_packages', [])),
+            probe_data.get('pyinstaller_entry_point', ''),
+        )
+        old_values = (self.__python_version, self.__implementation, self.__platform, self.__prefix, self.__site_packages, self.__pyinstaller_entry_point)
+        if new_values == old_values:
+            return
+        (self.__python_version, self.__implementation, self.__platform, self.__prefix, self.__site_packages, self.__pyinstaller_entry_point) = new_values
+        self.signal_update_data.emit()
+
     def clear(self) -> None:
         if self.__path == '' and self.__python_path == '' and self.__python_version == '' and self.__pyinstaller_path == '' and self.__pyinstaller_version == '':
             return
@@ -122,6 +181,11 @@ class ExecutorInfoStruct(QObject):
         self.__python_version = ''
         self.__pyinstaller_path = ''
         self.__pyinstaller_version = ''
+        self.__implementation = ''
+        self.__platform = ''
+        self.__prefix = ''
+        self.__site_packages = []
+        self.__pyinstaller_entry_point = ''
         self.signal_update_data.emit()
 
     def clear_pyinstaller(self) -> None:
@@ -143,232 +207,346 @@ class TaskRunner(QRunnable):
         self.__call_back_func(*self.__args, **self.__kwargs)
 
 
+_REFRESH_KEY_INTERPRETERS = 'interpreters'
+_HIDDEN_INTERVAL_FACTOR = 30
+
+
 class ExecutorInfoManager(QObject):
     """
     执行器信息管理类
 
     运行逻辑: 
 
-    初始化时, 将获取 本地python 的信息, 包括pyinstaller, 同时获取 conda 环境列表, 并获取每个环境中的pyinstaller信息
+    初始化时, 由 InterpreterIndex 获取本机解释器列表(PATH, conda/mamba, pyenv, venv, 按真实路径去重), 并获取每个解释器中的pyinstaller信息.
+    启动时先使用上一次持久化的索引, 随后重新查找, 只增删有变化的环境
+
+    每个解释器只启动一次进程(PROBE_SCRIPT), 一次性获取 python版本, 实现, 平台, site-packages, pyinstaller版本及入口
+
+    探测结果会写入 ProbeCacheManager 持久化缓存, 解释器及其 site-packages 未变更时直接读取缓存, 不再启动进程
 
-    此后将只循环获取 conda 环境列表, 如果列表与原来的相同, 则不更新 self.__conda_struct_dict ,并获取每个环境中的pyinstaller信息
+    缓存未命中的探测交给 AsyncProbeEngine 并发执行, 单次探测有超时限制, 结果批量返回主线程后统一更新, 环境被删除或程序关闭时取消探测
 
-    同时对所有的 pyinstaller 进行检查, 如果存在则初始化的一段时间进行更新, 但之后的version检查则按照一段时间间隔进行
+    探测何时派发由 ProbeScheduler 决定: 同一解释器的请求合并, 当前选中的环境优先, 各环境定期复查(先检查缓存指纹),
+    结果未变化的环境复查间隔指数增长
+
+    解释器列表的查找由 RefreshCoordinator 统一执行, 同时到达的多次请求只执行一次; 窗口不可见时, 定期复查的间隔随之延长
+
+    此后不再轮询, 由 CondaEnvWatcher 监视 environments.txt, envs 文件夹, pyenv/venv 文件夹, 各环境的 conda-meta 以及 site-packages:
+    - 环境列表变化时, 重新查找解释器, 只增删有变化的环境
+    - 环境内容变化时, 只重新检测对应环境的 python 与 pyinstaller 信息
 
     指定的环境则通过外部调用检查, 这个部分放在UI中, 如果选定了指定的环境, 则每隔一段时间调用检查一次
 
     - 信号发射有节流机制，或时间大于指定时间，或请求发送次数超过最大次数，才会发送信号
 
     参数: 
+        probe_concurrency: 最大并发探测数, 默认 16
+        probe_timeout: 单次探测超时时间(秒), 默认 30
+        venv_dir_list: venv 文件夹列表, 即设置中的 venv_dirs, 为 None 时使用 InterpreterIndex 当前的设置(GUI 启动时已按设置配置)
+
+    属性:
         executor_struct_dict: 执行器信息字典
+        probe_pending_count: 等待派发的探测数
+        probe_running_count: 正在运行的探测数
 
     信号: 
         signal_update_GUI: 更新GUI信号
 
     方法：
         set_special_env: 设置指定的环境
+        set_current_env: 设置当前选中的环境, 其探测优先派发
+        set_venv_dirs: 设置 venv 文件夹列表并重新查找
+        shutdown: 取消所有探测, 程序关闭时调用
 
     """
     signal_update_GUI = pyqtSignal()
-
-    def __init__(self):
+    _signal_watch_paths_changed = pyqtSignal()
+    """ 内部信号, 环境列表或探测结果变化后, 在主线程中刷新文件监视路径 """
+    _signal_request_probe = pyqtSignal(str, bool)
+    """ 内部信号, 在主线程中将解释器加入调度, 参数为 (解释器路径, 是否立即探测) """
+    _signal_cancel_probe = pyqtSignal(str)
+    """ 内部信号, 在主线程中取消探测并移出调度 """
+
+    def __init__(self, probe_concurrency: int = 16, probe_timeout: float = 30, venv_dir_list: list = None):
         super().__init__()
-        self.__conda_struct_dict = {}
-        self.__conda_env_compare_list = ''
-        self.__init_end_time = time.time()+6
-        self.__pyinstaller_version_detection_interval = 10
+        self.__env_struct_dict = {}
+        """ 索引中除本地解释器外的环境, 键为 InterpreterRecord.name """
+        self.__env_compare_list: list = []
+        self.__special_pyinstaller_path: str = ''
         self.__emit_signal_interval = 1
         """ 信号发射最小时间间隔, 阻止信号高频发射 """
         self.__emit_signal_index = 0
         self.__emit_signal_index_max = 30
         """ 信号发射最小次数间隔, 阻止信号高频发射 """
 
+        self.__probe_cache = ProbeCacheManager()
+        self.__interpreter_index = InterpreterIndex()
+        if venv_dir_list is not None:
+            self.__interpreter_index.set_venv_dir_list(venv_dir_list)
         self.__local_struct = ExecutorInfoStruct(name='local')
         self.__special_struct = ExecutorInfoStruct(name='special')
-        self.__thread_pool_conda = QThreadPool()
-        """ 检测 conda 环境中的 pyinstaller, 由于conda环境较多, 所以单独使用线程池 """
-        self.__thread_pool_conda.setMaxThreadCount(4)
-        self.__thread_pool_conda.setExpiryTimeout(5000)
+        self.__probe_engine = AsyncProbeEngine(max_concurrency=probe_concurrency, probe_timeout=probe_timeout)
+        """ 缓存未命中时的并发探测, 代替原先的 conda 线程池 """
+        self.__probe_engine.signal_probe_results.connect(self.__on_probe_results)
+        self.__probe_scheduler = ProbeScheduler(max_running=probe_concurrency)
+        self.__probe_scheduler.signal_probe_due.connect(self.__on_probe_due)
+        self._signal_request_probe.connect(self.__schedule_probe)
+        self._signal_cancel_probe.connect(self.__cancel_probe)
         self.__thread_pool_normal = QThreadPool()
         self.__thread_pool_normal.setMaxThreadCount(3)
         self.__thread_pool_normal.setExpiryTimeout(10000)
-        self.__create_tast_detect_local_env()
-        self.__create_tast_detect_conda_env()
-        self.__timer_polling_conda = QTimer()
-        self.__timer_polling_conda.timeout.connect(self.__create_task_detect_conda_polling)
-        self.__timer_polling_conda.start(2000)
+        self.__conda_env_watcher = CondaEnvWatcher()
+        self.__refresh_coordinator = RefreshCoordinator()
+        self.__refresh_coordinator.register(_REFRESH_KEY_INTERPRETERS, self.__detect_interpreters)
+        self.__refresh_coordinator.signal_visibility_changed.connect(self.__on_visibility_changed)
+        self.__conda_env_watcher.signal_env_list_changed.connect(self.__create_tast_detect_interpreters)
+        self.__conda_env_watcher.signal_env_content_changed.connect(self.__detect_changed_env)
+        self._signal_watch_paths_changed.connect(self.__refresh_watch_paths)
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
         self.__timer_emit_signal = threading.Timer(self.__emit_signal_interval, self.__emit_signal_update_GUI)
+        # 先使用上一次持久化的索引, 随后重新查找
+        self.__apply_interpreter_records(self.__interpreter_index.record_list, self.__interpreter_index.local_python_path)
+        self.__create_tast_detect_interpreters()
 
     @property
     def executor_struct_dict(self):
         temp = {
             'local': self.__local_struct,
             'special': self.__special_struct,
-            **self.__conda_struct_dict
+            **self.__env_struct_dict
         }
         return temp
 
+    @property
+    def probe_pending_count(self) -> int:
+        return self.__probe_scheduler.pending_count
+
+    @property
+    def probe_running_count(self) -> int:
+        return self.__probe_scheduler.running_count
+
+    def set_current_env(self, name: str) -> None:
+        """
+        设置当前选中的环境, 其探测始终优先派发
+
+        参数:
+            name: 环境名, 如 'local', 'special' 或 conda 环境名, 为空时取消优先
+        """
+        struct: ExecutorInfoStruct = self.executor_struct_dict.get(name)
+        self.__probe_scheduler.set_priority_key(struct.python_path if struct is not None else '')
+
+    def set_venv_dirs(self, venv_dir_list: list) -> None:
+        """
+        设置 venv 文件夹列表并重新查找解释器
+
+        参数:
+            venv_dir_list: 文件夹列表, 每个文件夹本身是 venv, 或其子文件夹是 venv
+        """
+        self.__interpreter_index.set_venv_dir_list(venv_dir_list)
+        self.__create_tast_detect_interpreters()
+
     def set_special_env(self, python_path: str, pyinstaller_path: str = '') -> None:
         if not os.path.exists(python_path):
             self.__special_struct.clear()
             return
         self.__create_tast_detect_special_env(python_path, pyinstaller_path)
 
+    def shutdown(self) -> None:
+        """ 取消所有探测并停止探测引擎, 同时将缓存写入磁盘 """
+        self.__refresh_coordinator.stop()
+        self.__probe_scheduler.stop()
+        self.__probe_engine.shutdown()
+        self.__probe_cache.flush()
+
     # @Inner_Decorators.time_counter
     def __detect_special_env(self, python_path: str, pyinstaller_path: str) -> None:
+        self.__special_pyinstaller_path = pyinstaller_path
         if python_path != self.__special_struct.python_path:
             self.__special_struct.clear()
-            cmdline: str = f'{python_path} --version'
-            python_version_process = subprocess.Popen(cmdline, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            python_version: str = python_version_process.stdout.read().strip().lower().replace('python ', '')
             self.__special_struct.set_path(os.path.dirname(python_path))
             self.__special_struct.set_python_path(python_path)
-            self.__special_struct.set_python_version(python_version)
-        self.__detect_pyinstaller(self.__special_struct, pyinstaller_path)
+        self.__request_probe(self.__special_struct)
 
     # @Inner_Decorators.time_counter
-    def __detect_local_python(self) -> None:
-        """
-        用于获取本地 python 路径和版本
-
-        self.__local_struct 将会自动更新, 更新内容为 `path`, `python_path`, `python_version`
-        """
-        cmdline: str = f'where python'
-        python_path_process = subprocess.Popen(cmdline, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        python_path: str = python_path_process.stdout.read().strip().split('\n')[0]
-        cmdline: str = f'{python_path} --version'
-        python_version_process = subprocess.Popen(cmdline, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        python_version: str = python_version_process.stdout.read().strip().lower().replace('python ', '')
-        python_folder_path: str = os.path.dirname(python_path)
-        self.__local_struct.clear()
-        self.__local_struct.set_path(python_folder_path)
-        self.__local_struct.set_python_path(python_path)
-        self.__local_struct.set_python_version(python_version)
-        self.__detect_pyinstaller(self.__local_struct)
-        return
+    def __detect_local_python(self, python_path: str) -> None:
+        """
+        用于设置本地 python 路径(PATH 中的第一个解释器), 版本等信息由 self.__request_probe() 获取
+
+        self.__local_struct 将会自动更新, 更新内容为 `path`, `python_path`
+        """
+        if not python_path:
+            self.__local_struct.clear()
+            return
+        if python_path != self.__local_struct.python_path:
+            self.__local_struct.clear()
+            self.__local_struct.set_path(os.path.dirname(python_path))
+            self.__local_struct.set_python_path(python_path)
+        self.__request_probe(self.__local_struct)
 
     # @Inner_Decorators.time_counter
-    def __detect_conda_env(self) -> None:
+    def __detect_interpreters(self) -> None:
+        """
+        用于检测本机解释器列表, 包括本地 python, conda/mamba, pyenv 以及 venv
+
+        列表由 InterpreterIndex 直接读取文件系统得到, 不启动任何进程
+
+        self.__env_struct_dict 将会自动更新, 其内元素 struct 赋值内容为 `path`, `python_path`, 其余信息由 self.__request_probe() 获取
         """
-        用于检测当前conda环境列表, 包含对python路径的检测
+        record_list = self.__interpreter_index.scan()
+        self.__apply_interpreter_records(record_list, self.__interpreter_index.local_python_path)
+        self.__probe_cache.flush()
 
-        self.__conda_struct_dict 将会自动更新, 其内元素 struct 赋值内容为 `path`, `python_path`, `python_version`
+    def __apply_interpreter_records(self, record_list: list, local_python_path: str) -> None:
         """
-        cmdline: str = f'conda env list'
-        conda_env_list_process = subprocess.Popen(cmdline, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        conda_env_list: list = conda_env_list_process.stdout.read().strip().replace('*', '').split('\n')
-        if conda_env_list == self.__conda_env_compare_list:
+        根据索引记录增删环境, 只处理有变化的环境
+
+        参数:
+            record_list: InterpreterRecord 列表
+            local_python_path: 本地 python 路径
+        """
+        self.__detect_local_python(local_python_path)
+        env_list: list = [(record.name, record.env_path, record.python_path) for record in record_list]
+        if env_list == self.__env_compare_list:
             # 如果没有变化, 则直接返回, 避免重复检测
             return
-        add_list, del_list = self.__compare_list(self.__conda_env_compare_list, conda_env_list)
-        self.__conda_env_compare_list: list = conda_env_list
+        add_list, del_list = self.__compare_list(self.__env_compare_list, env_list)
+        self.__env_compare_list: list = env_list
         flag_del = False
         flag_add = False
 
         # 删除环境
-        for env in del_list:
-            env: str
-            if env.startswith('#'):
-                continue
-            env_name, env_path = env.split()
-            if env_name in self.__conda_struct_dict:
-                del self.__conda_struct_dict[env_name]
+        for env_name, env_path, python_path in del_list:
+            if env_name in self.__env_struct_dict:
+                struct: ExecutorInfoStruct = self.__env_struct_dict.pop(env_name)
+                if struct.python_path and not self.__find_structs_by_python_path(struct.python_path):
+                    self._signal_cancel_probe.emit(struct.python_path)
                 flag_del = True
 
         # 添加环境
-        for env in add_list:
-            env: str
-            if env.startswith('#'):
-                continue
-            env_name, env_path = env.split()
+        for env_name, env_path, python_path in add_list:
             struct = ExecutorInfoStruct(name=env_name, path=env_path)
             struct.signal_update_data.connect(self.__schedule_signal_update_GUI)
-            self.__conda_struct_dict[env_name] = struct
+            self.__env_struct_dict[env_name] = struct
             flag_add = True
-            self.__detect_conda_python_path(struct)
+            struct.set_python_path(python_path)
+            self.__request_probe(struct)
 
         # 通知外部更新
         if flag_add or flag_del:
             self.__schedule_signal_update_GUI()
+            self._signal_watch_paths_changed.emit()
 
-        return
-
-    # @Inner_Decorators.time_counter
-    def __detect_conda_python_path(self, struct: ExecutorInfoStruct) -> None:
+    def __request_probe(self, struct: ExecutorInfoStruct) -> None:
         """
-        检测conda环境下的python路径, 并设置到 struct 中. 修改值 `python_path`, `python_version`
+        请求获取解释器信息. 缓存命中时直接更新 struct, 否则提交到 ProbeScheduler 排队, 结果由 self.__on_probe_results() 统一处理.
+        两种情况下解释器都会加入定期复查
+
+        参数:
+            struct: ExecutorInfoStruct 对象
         """
-        python_path = ''
-        if App.OS == OsType.WINDOWS:
-            python_path = os.path.join(struct.path, 'python.exe')
-        elif App.OS == OsType.LINUX or App.OS == OsType.MACOS:
-            python_path = os.path.join(struct.path, 'python.exe')
-        if not python_path:
+        if not struct.python_path:
+            struct.clear()
+            return
+        cache_data = self.__probe_cache.get(struct.python_path)
+        if cache_data and 'python_version' in cache_data:
+            self.__apply_probe_data(struct, cache_data)
+            self._signal_request_probe.emit(struct.python_path, False)
             return
-        cmdline: str = f'{python_path} --version'
-        python_version_process = subprocess.Popen(cmdline, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        python_version: str = python_version_process.stdout.read().strip().lower().replace('python ', '')
-        struct.set_python_path(python_path)
-        struct.set_python_version(python_version)
-        return
+        self._signal_request_probe.emit(struct.python_path, True)
+
+    def __schedule_probe(self, python_path: str, isForced: bool) -> None:
+        """
+        在主线程中将解释器加入定期复查, 需要时提交立即探测请求
+
+        参数:
+            python_path: 解释器路径
+            isForced: 是否立即探测
+        """
+        self.__probe_scheduler.register(python_path)
+        if isForced:
+            self.__probe_scheduler.request(python_path)
+
+    def __cancel_probe(self, python_path: str) -> None:
+        """ 在主线程中取消探测并移出调度 """
+        self.__probe_scheduler.unregister(python_path)
+        self.__probe_engine.cancel(python_path)
+
+    def __on_probe_due(self, due_list: list) -> None:
+        """
+        处理调度器派发的探测. 强制请求直接提交到 AsyncProbeEngine;
+        定期复查先检查缓存指纹, 指纹未变化时直接报告未变化, 不启动进程
+
+        参数:
+            due_list: 元素为 (解释器路径, 是否为强制请求)
+        """
+        for python_path, isForced in due_list:
+            if not isForced:
+                cache_data = self.__probe_cache.get(python_path)
+                if cache_data and 'python_version' in cache_data:
+                    self.__probe_scheduler.finish(python_path, False)
+                    continue
+            self.__probe_engine.submit(python_path, python_path)
+
+    def __on_probe_results(self, result_dict: dict) -> None:
+        """
+        处理 AsyncProbeEngine 批量返回的探测结果, 在主线程中运行
+
+        参数:
+            result_dict: 解释器路径 -> 探测结果, 探测失败/超时为空字典
+        """
+        for python_path, probe_data in result_dict.items():
+            if probe_data:
+                self.__probe_cache.update(python_path, **probe_data)
+            isChanged = False
+            for struct in self.__find_structs_by_python_path(python_path):
+                old_info_list = struct.info_list
+                self.__apply_probe_data(struct, probe_data)
+                isChanged = isChanged or struct.info_list != old_info_list
+            self.__probe_scheduler.finish(python_path, isChanged)
+        self.__probe_cache.flush()
+        self.__refresh_watch_paths()
+
+    def __apply_probe_data(self, struct: ExecutorInfoStruct, probe_data: dict) -> None:
+        """
+        根据探测结果更新 struct, 包括 python 信息以及 pyinstaller 路径和版本.
+        pyinstaller 信息优先读取 dist-info 元数据, 只有元数据中找不到时才使用探测进程的结果
+
+        参数:
+            struct: ExecutorInfoStruct 对象
+            probe_data: 探测结果
+        """
+        if probe_data:
+            dist_data = read_pyinstaller_dist_info(struct.python_path, probe_data.get('site_packages') or None)
+            probe_data = {**probe_data, **{key: value for key, value in dist_data.items() if value}}
+        struct.update_from_probe(probe_data)
+        pyinstaller_path = self.__special_pyinstaller_path if struct is self.__special_struct else ''
+        self.__detect_pyinstaller(struct, probe_data, pyinstaller_path)
+
+    def __find_structs_by_python_path(self, python_path: str) -> list:
+        """ 获取使用该解释器的所有 struct """
+        return [struct for struct in list(self.executor_struct_dict.values()) if struct.python_path == python_path]
 
     # @Inner_Decorators.time_counter
-    def __detect_pyinstaller(self, struct: ExecutorInfoStruct, pyinstaller_path: str = '') -> None:
+    def __detect_pyinstaller(self, struct: ExecutorInfoStruct, probe_data: dict, pyinstaller_path: str = '') -> None:
         """
-        检查 pyinstaller 是否存在, 如果存在则设置路径和版本, 项目修改值 `pyinstaller_path`, `pyinstaller_version`
+        根据探测结果检查 pyinstaller 是否存在, 如果存在则设置路径和版本, 项目修改值 `pyinstaller_path`, `pyinstaller_version`
 
         参数:
             struct: ExecutorInfoStruct 对象
+            probe_data: 探测结果
             pyinstaller_path: pyinstaller 可执行文件路径, 改参数主要是给 special_struct 用的
         """
-        if not struct.python_path:
-            struct.clear()
+        if not probe_data.get('pyinstaller_version'):
+            struct.clear_pyinstaller()
             return
-        current = os.path.dirname(struct.python_path)
-        current_path = os.path.join(current, 'pyinstaller.exe')
-        current_bin_path = os.path.join(current, 'bin', 'pyinstaller.exe')
-        current_script_path = os.path.join(current, 'Scripts', 'pyinstaller.exe')
-        parent = os.path.dirname(current)
-        parent_path = os.path.join(parent, 'pyinstaller.exe')
-        parent_bin_path = os.path.join(parent, 'bin', 'pyinstaller.exe')
-        parent_script_path = os.path.join(parent, 'Scripts', 'pyinstaller.exe')
-        if (
-            pyinstaller_path and isinstance(pyinstaller_path, str) and
-            os.path.exists(pyinstaller_path)
-        ):
-            pyinstaller_path = pyinstaller_path
-        elif os.path.exists(current_path):
-            pyinstaller_path = current_path
-        elif os.path.exists(current_bin_path):
-            pyinstaller_path = current_bin_path
-        elif os.path.exists(current_script_path):
-            pyinstaller_path = current_script_path
-        elif os.path.exists(parent_path):
-            pyinstaller_path = parent_path
-        elif os.path.exists(parent_bin_path):
-            pyinstaller_path = parent_bin_path
-        elif os.path.exists(parent_script_path):
-            pyinstaller_path = parent_script_path
-        current_time = int(time.time())
+        if not (pyinstaller_path and isinstance(pyinstaller_path, str) and os.path.exists(pyinstaller_path)):
+            pyinstaller_path = probe_data.get('pyinstaller_path', '')
         if pyinstaller_path == '':
             struct.clear_pyinstaller()
             return
-        if current_time % self.__pyinstaller_version_detection_interval != 0 and current_time > self.__init_end_time:
-            return
-        cmdline: str = f'{struct.python_path} -m PyInstaller --version'
-        pyinstaller_version_process = subprocess.Popen(cmdline, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        pyinstaller_version: str = pyinstaller_version_process.stdout.read().strip()
-        if 'No module' in pyinstaller_version:
-            pyinstaller_version = ''
         struct.set_pyinstaller_path(pyinstaller_path)
-        struct.set_pyinstaller_version(pyinstaller_version)
-
-    def __create_tast_detect_local_env(self) -> None:
-        """
-        用于检测本地 python 环境, 任务在线程池中执行 self.__thread_pool_normal
-        """
-        task = TaskRunner(self.__detect_local_python)
-        self.__thread_pool_normal.start(task)
+        struct.set_pyinstaller_version(probe_data['pyinstaller_version'])
 
     def __create_tast_detect_special_env(self, python_path: str, pyinstaller_path: str) -> None:
         """
@@ -377,35 +555,54 @@ class ExecutorInfoManager(QObject):
         task = TaskRunner(self.__detect_special_env, python_path, pyinstaller_path)
         self.__thread_pool_normal.start(task)
 
-    def __create_tast_detect_conda_env(self) -> None:
+    def __create_tast_detect_interpreters(self) -> None:
         """
-        用于创建检查 conda 环境任务, 任务在线程池中运行 self.__thread_pool_normal
+        用于请求检测解释器列表, 任务由 RefreshCoordinator 在线程池中执行, 执行期间的重复请求会被合并
         """
-        task = TaskRunner(self.__detect_conda_env)
-        self.__thread_pool_normal.start(task)
+        self.__refresh_coordinator.request(_REFRESH_KEY_INTERPRETERS)
 
-    def __create_task_detect_conda_pyinstaller(self) -> None:
+    def __on_visibility_changed(self, isVisible: bool) -> None:
         """
-        用于创建检查 conda 中 pyinstaller 的任务, 任务在线程池中运行 self.__thread_pool_conda
-        """
-        task_list = [TaskRunner(self.__detect_pyinstaller, struct) for struct in self.__conda_struct_dict.values()]
-        for task in task_list:
-            self.__thread_pool_conda.start(task)
+        窗口可见性变化时调整定期复查间隔, 窗口不可见时复查间隔延长
 
-    def __create_task_detect_pyinstaller_polling(self) -> None:
+        参数:
+            isVisible: 窗口是否可见
         """
-        用于创建检查所有环境中 pyinstaller 的任务, 任务在线程池中运行 self.__thread_pool_normal
+        self.__probe_scheduler.set_interval_factor(1 if isVisible else _HIDDEN_INTERVAL_FACTOR)
+
+    def __detect_changed_env(self, env_path_list: list) -> None:
         """
-        task_list = [TaskRunner(self.__detect_pyinstaller, struct) for struct in self.executor_struct_dict.values()]
-        for task in task_list:
-            self.__thread_pool_conda.start(task)
+        重新检测内容发生变化的环境, 由 CondaEnvWatcher 触发.
+        解释器本身未变化时(如 pip 安装), 只重新读取 pyinstaller 的 dist-info 元数据, 不启动进程;
+        解释器已变化或元数据中找不到 pyinstaller 时, 对应缓存失效后重新提交探测
 
-    def __create_task_detect_conda_polling(self) -> None:
+        参数:
+            env_path_list: 发生变化的环境路径列表
+        """
+        env_path_set = {os.path.normcase(os.path.normpath(env_path)) for env_path in env_path_list}
+        for struct in list(self.executor_struct_dict.values()):
+            struct: ExecutorInfoStruct
+            if not struct.path or os.path.normcase(os.path.normpath(struct.path)) not in env_path_set:
+                continue
+            dist_data = read_pyinstaller_dist_info(struct.python_path, struct.site_packages or None)
+            # 元数据中找不到 pyinstaller 时(已卸载, 或以其他方式安装), 由探测进程确认
+            if not (dist_data and self.__probe_cache.refresh(struct.python_path, **dist_data)):
+                self.__probe_cache.invalidate(struct.python_path)
+            self.__request_probe(struct)
+        self.__probe_cache.flush()
+
+    def __refresh_watch_paths(self) -> None:
         """
-        用于创建conda检查路径任务, 任务在线程池中运行 self.__thread_pool_conda
+        刷新 CondaEnvWatcher 的监视路径, 包括各环境, pyenv/venv 文件夹以及所有环境的 site-packages, 在主线程中运行
         """
-        self.__create_tast_detect_conda_env()
-        self.__create_task_detect_pyinstaller_polling()
+        self.__conda_env_watcher.set_list_paths(self.__interpreter_index.watch_folder_list)
+        self.__conda_env_watcher.refresh_watch_paths([struct.path for struct in list(self.__env_struct_dict.values())])
+        extra_path_dict = {}
+        for struct in list(self.executor_struct_dict.values()):
+            struct: ExecutorInfoStruct
+            if struct.path and struct.site_packages:
+                extra_path_dict[struct.path] = struct.site_packages
+        self.__conda_env_watcher.set_extra_paths(extra_path_dict)
 
     def __compare_list(self, list_old, list_new) -> tuple:
         """
@@ -0,0 +1,185 @@
+import os
+import json
+import threading
+
+from system.Reader_Dist_Info import find_site_packages_list
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+
+class ProbeCacheManager(object):
+    """
+    解释器探测缓存管理器(单例)
+
+    将 python 版本, pyinstaller 版本, pyinstaller 路径等探测结果持久化到磁盘, 避免每次启动/轮询都重新启动进程进行探测.
+    缓存以解释器路径为键, 以解释器文件的 mtime/size/inode 以及 site-packages 文件夹的 mtime 作为指纹,
+    指纹不一致时缓存自动失效.
+
+    参数:
+    - exe_folder_path(str): 缓存文件所在文件夹路径, 默认为 APP_WORKSPACE_PATH
+    - cache_name(str): 缓存文件名, 默认为 '.probe_cache'
+
+    方法:
+    - get(python_path: str) -> dict | None: 获取有效缓存, 指纹不一致或不存在时返回 None
+    - update(python_path: str, **data) -> None: 更新缓存数据, 同时刷新指纹
+    - refresh(python_path: str, **data) -> bool: 解释器本身未变化时, 保留已有数据并刷新指纹
+    - invalidate(python_path: str = '') -> None: 使缓存失效, 不指定路径时清空全部缓存
+    - flush() -> None: 将缓存写入磁盘, 仅在数据有变更时写入
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, exe_folder_path: str = APP_WORKSPACE_PATH, cache_name: str = '.probe_cache') -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__cache_path: str = os.path.join(exe_folder_path, cache_name)
+        self.__lock = threading.RLock()
+        self.__isDirty: bool = False
+        self.__cache_data: dict = self.__load_cache_file()
+
+    @property
+    def cache_path(self) -> str:
+        return self.__cache_path
+
+    def get(self, python_path: str) -> dict | None:
+        """
+        获取有效缓存
+
+        参数:
+        - python_path(str): 解释器路径
+
+        返回:
+        - dict | None: 缓存数据的副本, 如 {'python_version': '3.11.7', 'pyinstaller_version': '6.3.0', 'pyinstaller_path': '...'}
+        """
+        if not python_path:
+            return None
+        with self.__lock:
+            entry: dict = self.__cache_data.get(python_path)
+            if entry is None:
+                return None
+            if entry.get('fingerprint') != self.__fingerprint(python_path):
+                # 解释器或 site-packages 已变更, 缓存失效
+                del self.__cache_data[python_path]
+                self.__isDirty = True
+                return None
+            return dict(entry.get('data', {}))
+
+    def update(self, python_path: str, **data) -> None:
+        """
+        更新缓存数据, 同时刷新指纹. 解释器不存在时不记录
+
+        参数:
+        - python_path(str): 解释器路径
+        - data: 需要记录的数据, 如 python_version='3.11.7'
+        """
+        if not python_path:
+            return
+        fingerprint = self.__fingerprint(python_path)
+        if fingerprint is None:
+            return
+        with self.__lock:
+            entry: dict = self.__cache_data.get(python_path)
+            if entry is None or entry.get('fingerprint') != fingerprint:
+                entry = {'fingerprint': fingerprint, 'data': {}}
+                self.__cache_data[python_path] = entry
+            if all(entry['data'].get(key) == value for key, value in data.items()):
+                return
+            entry['data'].update(data)
+            self.__isDirty = True
+
+    def refresh(self, python_path: str, **data) -> bool:
+        """
+        解释器文件本身未变化(仅 site-packages 变化, 如 pip 安装)时, 保留已有数据, 合并新数据并刷新指纹.
+        解释器文件已变化时缓存失效, 需要重新探测
+
+        参数:
+        - python_path(str): 解释器路径
+        - data: 需要合并的数据, 如 pyinstaller_version='6.3.0'
+
+        返回:
+        - bool: 是否刷新成功
+        """
+        fingerprint = self.__fingerprint(python_path) if python_path else None
+        if fingerprint is None:
+            return False
+        with self.__lock:
+            entry: dict = self.__cache_data.get(python_path)
+            if entry is None:
+                return False
+            if entry.get('fingerprint', [])[:3] != fingerprint[:3]:
+                del self.__cache_data[python_path]
+                self.__isDirty = True
+                return False
+            entry['fingerprint'] = fingerprint
+            entry['data'].update(data)
+            self.__isDirty = True
+            return True
+
+    def invalidate(self, python_path: str = '') -> None:
+        """
+        使缓存失效
+
+        参数:
+        - python_path(str): 解释器路径, 为空时清空全部缓存
+        """
+        with self.__lock:
+            if not python_path:
+                if self.__cache_data:
+                    self.__cache_data.clear()
+                    self.__isDirty = True
+                return
+            if self.__cache_data.pop(python_path, None) is not None:
+                self.__isDirty = True
+
+    def flush(self) -> None:
+        """ 将缓存写入磁盘, 仅在数据有变更时写入 """
+        with self.__lock:
+            if not self.__isDirty:
+                return
+            temp_path = f'{self.__cache_path}.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.__cache_data, f, indent=2, ensure_ascii=False)
+                os.replace(temp_path, self.__cache_path)
+                self.__isDirty = False
+            except OSError:
+                lg.exception('探测缓存写入失败')
+
+    def __load_cache_file(self) -> dict:
+        """ 加载缓存文件, 文件损坏时返回空缓存 """
+        if not os.path.exists(self.__cache_path):
+            return {}
+        try:
+            with open(self.__cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except (json.JSONDecodeError, OSError):
+            lg.warning('探测缓存文件损坏, 已忽略')
+        return {}
+
+    def __fingerprint(self, python_path: str) -> list | None:
+        """
+        生成解释器指纹, 包括解释器文件的 mtime/size/inode, 以及 site-packages 文件夹的 mtime
+
+        返回:
+        - list | None: 如 [1700000000000000000, 102400, 12345, [['.../site-packages', 1700000000000000000]]], 解释器不存在时返回 None
+        """
+        try:
+            stat = os.stat(python_path)
+        except OSError:
+            return None
+        site_packages_list = []
+        for site_packages in find_site_packages_list(python_path):
+            try:
+                site_packages_list.append([site_packages, os.stat(site_packages).st_mtime_ns])
+            except OSError:
+                continue
+        return [stat.st_mtime_ns, stat.st_size, stat.st_ino, site_packages_list]
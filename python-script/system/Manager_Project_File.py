@@ -0,0 +1,313 @@
+"""
+项目文件
+
+项目文件保存完整的 PyinstallerStruct 数据(含 RelPathStruct 的显示路径)与选定的环境, 读取时直接恢复各结构的快照, 不经过命令行字符串的拆分与解析.
+
+文件由两条记录组成:
+1. 头部: 格式标识, 版本, 环境, 执行器路径, 各结构的参数数量
+2. 数据: 各结构的快照, 以结构名称为键
+
+JSON 格式(.ptproj)每条记录占一行; msgpack 格式(.ptprojb)为连续的两个对象, 需要安装 msgpack.
+只读取头部时(如最近项目列表)不会解析数据记录, 数据记录在第一次使用时读取.
+
+类:
+- ProjectFile: 项目文件, 数据记录延迟读取
+- ProjectFileManager: 项目文件读写
+"""
+import os
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from system.Struct_Pyinstaller import *
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+PROJECT_FORMAT: str = 'PyToExe.project'
+PROJECT_VERSION: int = 1
+""" 项目文件版本, 数据布局变化时递增, 并在 MIGRATION_DICT 中添加迁移函数 """
+PROJECT_EXTENSION: str = '.ptproj'
+PROJECT_BINARY_EXTENSION: str = '.ptprojb'
+
+SNAPSHOT_FIELD_DICT: dict = {
+    SwitchStruct: ('args', 'command', 'isOn'),
+    StateStruct: ('args', 'command', 'current_state', 'state_command'),
+    SingleInfoStruct: ('args', 'command'),
+    MultiInfoStruct: ('args', 'command', 'list_files'),
+    RelPathStruct: ('args', 'command', 'list_files', 'display'),
+}
+""" 各类结构的快照字段, 与 _capture() 的顺序一致, 不含第一个元素 command_option(由结构本身决定, 不保存) """
+
+
+MIGRATION_DICT: dict = {}
+"""
+版本迁移, {旧版本: 迁移函数}, 迁移函数参数为 (header, body), 返回升级一个版本后的 (header, body).
+body 为 None 时表示只迁移头部. 读取时从文件版本依次迁移到 PROJECT_VERSION
+"""
+
+
+class ProjectFileError(Exception):
+    """ 项目文件格式错误 """
+
+
+class ProjectFile(object):
+    """
+    项目文件, 读取时只解析头部, 数据记录在第一次调用 get_snapshot() / apply() 时读取
+
+    参数:
+    - file_path(str): 文件路径
+    - header(dict): 头部记录, 已迁移到当前版本
+    - body(dict): 数据记录, 为 None 时延迟读取
+
+    属性:
+    - file_path(str): 文件路径
+    - version(int): 文件原始版本
+    - environment(dict): 环境, 键为 type, env_name, path_python, path_pyinstaller, version
+    - implement_path(str): 执行器路径
+    - summary(dict): {结构名称: 参数数量}, 不需要读取数据记录
+    - isLoaded(bool): 数据记录是否已读取
+
+    方法:
+    - get_snapshot(pyinstaller_struct: PyinstallerStruct) -> tuple: 生成与该结构对应的快照
+    - apply(pyinstaller_struct: PyinstallerStruct) -> None: 恢复到结构, 只发射一次信号
+    """
+
+    def __init__(self, file_path: str, header: dict, body: dict = None, version: int = PROJECT_VERSION) -> None:
+        self.__file_path: str = file_path
+        self.__header: dict = header
+        self.__body: dict | None = body
+        self.__version: int = version
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    @property
+    def environment(self) -> dict:
+        return dict(self.__header.get('environment') or {})
+
+    @property
+    def implement_path(self) -> str:
+        return self.__header.get('implement_path', '')
+
+    @property
+    def summary(self) -> dict:
+        return dict(self.__header.get('summary') or {})
+
+    @property
+    def isLoaded(self) -> bool:
+        return self.__body is not None
+
+    def get_snapshot(self, pyinstaller_struct: PyinstallerStruct) -> tuple:
+        """
+        生成与结构对应的快照, 文件中不存在的结构使用空数据
+
+        参数:
+        - pyinstaller_struct(PyinstallerStruct): 目标结构, 用于确定结构顺序与选项
+
+        返回:
+        - tuple: 可用于 PyinstallerStruct.restore() 的快照
+        """
+        option_dict: dict = self.__load_body().get('options', {})
+        snapshot_list = []
+        for item in pyinstaller_struct.struct_sequence:
+            item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
+            entry = option_dict.get(item.name)
+            if entry is None:
+                snapshot_list.append(ProjectFileManager.blank_snapshot(item))
+                continue
+            snapshot_list.append(_decode_entry(item, entry))
+        return tuple(snapshot_list)
+
+    def apply(self, pyinstaller_struct: PyinstallerStruct) -> None:
+        pyinstaller_struct.restore(self.get_snapshot(pyinstaller_struct))
+
+    def __load_body(self) -> dict:
+        if self.__body is None:
+            self.__body = ProjectFileManager().read_body(self.__file_path, self.__version)
+        return self.__body
+
+    def __repr__(self) -> str:
+        return f'ProjectFile({self.__file_path!r}, version={self.__version}, isLoaded={self.isLoaded})'
+
+
+def _encode_entry(item: BasicStruct) -> dict:
+    """ 结构快照 -> 可序列化的字典 """
+    field_tuple = SNAPSHOT_FIELD_DICT[type(item)]
+    entry = {}
+    for field, value in zip(field_tuple, item.snapshot()[1:]):
+        entry[field] = list(value) if isinstance(value, tuple) else value
+    return entry
+
+
+def _decode_entry(item: BasicStruct, entry: dict) -> tuple:
+    """ 可序列化的字典 -> 结构快照, 列表转换为元组, 与 _capture() 一致 """
+    blank = ProjectFileManager.blank_snapshot(item)
+    field_tuple = SNAPSHOT_FIELD_DICT[type(item)]
+    value_list = [item.command_option]
+    for index, field in enumerate(field_tuple, 1):
+        value = entry.get(field, blank[index])
+        value_list.append(tuple(value) if isinstance(value, list) else value)
+    return tuple(value_list)
+
+
+class ProjectFileManager(object):
+    """
+    项目文件读写
+
+    方法:
+    - save(file_path: str, pyinstaller_struct: PyinstallerStruct, environment: dict = None) -> None: 保存项目, 格式由扩展名决定
+    - load(file_path: str) -> ProjectFile: 读取项目头部, 数据记录延迟读取
+    - read_body(file_path: str, version: int) -> dict: 读取数据记录
+    - isBinaryAvailable() -> bool: 是否可以使用 msgpack 格式
+    """
+    __instance = None
+    __blank_snapshot_dict: dict = {}
+    """ {结构类型: 空快照的数据部分}, 空结构的快照除 command_option 外与结构无关 """
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+        return cls.__instance
+
+    @staticmethod
+    def isBinaryAvailable() -> bool:
+        return msgpack is not None
+
+    @classmethod
+    def blank_snapshot(cls, item: BasicStruct) -> tuple:
+        """ 结构清空后的快照 """
+        struct_type = type(item)
+        if struct_type not in cls.__blank_snapshot_dict:
+            blank_struct = struct_type('blank', '--blank', False) if struct_type is StateStruct else struct_type('blank', '--blank')
+            cls.__blank_snapshot_dict[struct_type] = blank_struct.snapshot()[1:]
+        return (item.command_option,) + cls.__blank_snapshot_dict[struct_type]
+
+    def save(self, file_path: str, pyinstaller_struct: PyinstallerStruct, environment: dict = None) -> None:
+        """
+        保存项目, 扩展名为 .ptprojb 时使用 msgpack 格式, 否则使用 JSON 格式. 先写入临时文件再替换, 写入失败时不破坏原文件
+
+        参数:
+        - file_path(str): 文件路径
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - environment(dict): 环境, 如 {'type': 'conda', 'env_name': ..., 'path_python': ..., 'path_pyinstaller': ..., 'version': ...}
+        """
+        option_dict = {}
+        summary = {}
+        for item in pyinstaller_struct.struct_sequence:
+            item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
+            if item.snapshot() == self.blank_snapshot(item):
+                continue
+            option_dict[item.name] = _encode_entry(item)
+            summary[item.name] = len(item.command_args) if isinstance(item.command_args, list) else 1
+        header = {
+            'format': PROJECT_FORMAT,
+            'version': PROJECT_VERSION,
+            'environment': environment or {},
+            'implement_path': pyinstaller_struct.implement_path,
+            'summary': summary,
+        }
+        body = {'options': option_dict}
+        temp_path = f'{file_path}.tmp'
+        if self.__isBinary(file_path):
+            if msgpack is None:
+                raise ProjectFileError('未安装 msgpack, 无法保存二进制项目文件')
+            with open(temp_path, 'wb') as f:
+                f.write(msgpack.packb(header, use_bin_type=True))
+                f.write(msgpack.packb(body, use_bin_type=True))
+        else:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                # 每条记录一行, 读取头部时只需读取第一行
+                f.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+                f.write(json.dumps(body, ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+        os.replace(temp_path, file_path)
+        lg.info(f'项目已保存: {file_path}')
+
+    def load(self, file_path: str) -> ProjectFile:
+        """
+        读取项目头部, 数据记录在第一次使用时读取
+
+        参数:
+        - file_path(str): 文件路径
+
+        返回:
+        - ProjectFile: 项目文件
+
+        异常:
+        - ProjectFileError: 格式错误或版本高于当前程序支持的版本
+        """
+        if self.__isBinary(file_path):
+            if msgpack is None:
+                raise ProjectFileError('未安装 msgpack, 无法读取二进制项目文件')
+            with open(file_path, 'rb') as f:
+                header = next(iter(msgpack.Unpacker(f, raw=False)), None)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                line = f.readline()
+            header = self.__loads_json(line)
+        version = self.__check_header(header)
+        header, _ = self.__migrate(header, None, version)
+        return ProjectFile(file_path, header, version=version)
+
+    def read_body(self, file_path: str, version: int) -> dict:
+        """
+        读取数据记录并迁移到当前版本
+
+        参数:
+        - file_path(str): 文件路径
+        - version(int): 文件版本, 由头部获取
+
+        返回:
+        - dict: 数据记录
+        """
+        if self.__isBinary(file_path):
+            if msgpack is None:
+                raise ProjectFileError('未安装 msgpack, 无法读取二进制项目文件')
+            with open(file_path, 'rb') as f:
+                unpacker = msgpack.Unpacker(f, raw=False)
+                header = next(unpacker, None)
+                body = next(unpacker, None)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                header = self.__loads_json(f.readline())
+                body = self.__loads_json(f.readline())
+        if not isinstance(body, dict):
+            raise ProjectFileError(f'项目文件缺少数据记录: {file_path}')
+        _, body = self.__migrate(header, body, version)
+        return body
+
+    def __isBinary(self, file_path: str) -> bool:
+        return file_path.lower().endswith(PROJECT_BINARY_EXTENSION)
+
+    def __loads_json(self, line: str) -> dict | None:
+        try:
+            return json.loads(line) if line.strip() else None
+        except json.JSONDecodeError as e:
+            raise ProjectFileError(f'项目文件格式错误: {e}')
+
+    def __check_header(self, header: dict | None) -> int:
+        if not isinstance(header, dict) or header.get('format') != PROJECT_FORMAT:
+            raise ProjectFileError('不是项目文件')
+        version = header.get('version')
+        if not isinstance(version, int) or version > PROJECT_VERSION:
+            raise ProjectFileError(f'项目文件版本 {version} 高于当前支持的版本 {PROJECT_VERSION}')
+        return version
+
+    def __migrate(self, header: dict, body: dict | None, version: int) -> tuple:
+        while version < PROJECT_VERSION:
+            migrate = MIGRATION_DICT.get(version)
+            if migrate is None:
+                raise ProjectFileError(f'缺少项目文件版本 {version} 的迁移')
+            header, body = migrate(header, body)
+            version += 1
+        return header, body
@@ -0,0 +1,139 @@
+"""
+工作文件夹(--workpath)管理
+
+PyInstaller 在 --workpath 中保存 Analysis, PYZ 等步骤的缓存, 重复打包时只重新处理变化的部分.
+选项变化后旧的工作文件夹可能产生错误的结果, 因此用户常勾选 --clean, 但这同时丢弃了全部缓存.
+
+WorkpathManager 为每个项目(执行目录 + 输出名称)分配固定的工作文件夹, 并在其旁边记录选项的哈希值:
+- 选项未变化时保留工作文件夹, PyInstaller 的增量缓存生效
+- 选项(影响打包结果的参数, 执行器, 执行目录)变化时, 打包前自动清空工作文件夹
+
+文件内容的变化由 PyInstaller 自身检测, 不计入哈希值.
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+from system.Struct_Pyinstaller import *
+from system.Generator_Spec_File import BUILD_STRUCT_NAMES
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+WORKPATH_VERSION: int = 1
+""" 哈希值的计算方式变化时递增, 使旧的工作文件夹被清空 """
+WORKPATH_FOLDER_NAME: str = '.workpath'
+WORKPATH_MARKER_SUFFIX: str = '.options'
+
+
+class WorkpathManager(object):
+    """
+    工作文件夹管理器(单例)
+
+    参数:
+    - exe_folder_path(str): 工作文件夹根目录所在路径, 默认为 APP_WORKSPACE_PATH
+
+    属性:
+    - root_folder_path(str): 工作文件夹根目录
+
+    方法:
+    - options_hash(pyinstaller_struct: PyinstallerStruct, cwd: str) -> str: 计算决定工作文件夹是否可复用的哈希值, 需先调用 set_implement_path()
+    - get_workpath(pyinstaller_struct: PyinstallerStruct, cwd: str) -> str: 项目的工作文件夹路径, 不访问文件系统
+    - prepare(work_path: str, options_hash: str) -> bool: 打包前调用, 哈希值变化时清空工作文件夹, 返回是否已清空
+    - clear() -> None: 删除全部工作文件夹
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, exe_folder_path: str = APP_WORKSPACE_PATH) -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__root_folder_path: str = os.path.join(exe_folder_path, WORKPATH_FOLDER_NAME)
+        self.__lock = threading.Lock()
+
+    @property
+    def root_folder_path(self) -> str:
+        return self.__root_folder_path
+
+    def options_hash(self, pyinstaller_struct: PyinstallerStruct, cwd: str) -> str:
+        """
+        计算决定工作文件夹是否可复用的哈希值. 构建选项(--distpath, --workpath, --noconfirm, --clean, --log-level 等)不影响中间结果, 不计入
+
+        参数:
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - cwd(str): 执行目录
+
+        返回:
+        - str: sha256 十六进制字符串
+        """
+        argument_list = [argument for item in pyinstaller_struct.get_struct_list()
+                         if item.name not in BUILD_STRUCT_NAMES for argument in item.arguments]
+        content = json.dumps([WORKPATH_VERSION, pyinstaller_struct.get_implement_argument_list(), os.path.normcase(cwd), argument_list],
+                             ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get_workpath(self, pyinstaller_struct: PyinstallerStruct, cwd: str) -> str:
+        """
+        项目的工作文件夹路径, 同一执行目录与输出名称总是得到同一路径
+
+        参数:
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - cwd(str): 执行目录
+
+        返回:
+        - str: 如 'E:\\PyToExe\\.workpath\\main-3f2a9c0d1e4b'
+        """
+        name = pyinstaller_struct.output_file_name.command_args
+        if not name:
+            script = pyinstaller_struct.python_file_path.command_args
+            name = os.path.splitext(os.path.basename(script))[0] if script else 'main'
+        project_key = hashlib.sha256(f'{os.path.normcase(os.path.abspath(cwd))}|{name}'.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.__root_folder_path, f'{name}-{project_key}')
+
+    def prepare(self, work_path: str, options_hash: str) -> bool:
+        """
+        打包前调用, 哈希值与上次不同时清空工作文件夹并记录新的哈希值. 可能删除大量文件, 应在工作线程中调用
+
+        参数:
+        - work_path(str): 工作文件夹路径
+        - options_hash(str): options_hash() 的返回值
+
+        返回:
+        - bool: 是否已清空. 哈希值未变化, 或首次使用且文件夹不存在时为 False
+        """
+        marker_path = work_path.rstrip('\\/') + WORKPATH_MARKER_SUFFIX
+        with self.__lock:
+            try:
+                with open(marker_path, 'r', encoding='utf-8') as f:
+                    previous_hash = f.read().strip()
+            except OSError:
+                previous_hash = ''
+            if previous_hash == options_hash:
+                return False
+            isCleared = False
+            if os.path.isdir(work_path):
+                # 首次使用(无记录)的非空文件夹同样无法确认来源, 一并清空
+                shutil.rmtree(work_path, ignore_errors=True)
+                isCleared = True
+                lg.info(f'打包选项已变化, 清空工作文件夹: {work_path}')
+            try:
+                os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+                temp_path = f'{marker_path}.tmp'
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(options_hash)
+                os.replace(temp_path, marker_path)
+            except OSError:
+                lg.exception(f'无法记录工作文件夹的选项: {marker_path}')
+            return isCleared
+
+    def clear(self) -> None:
+        with self.__lock:
+            shutil.rmtree(self.__root_folder_path, ignore_errors=True)
@@ -0,0 +1,216 @@
+"""
+PyInstaller 日志解析
+
+将 PyInstaller 的输出行解析为结构化事件. PyInstaller 的日志格式为 '<启动后的毫秒数> <级别>: <内容>', 如:
+    4521 INFO: Building PYZ (ZlibArchive) E:\\test\\build\\main\\PYZ-00.pyz
+    5012 WARNING: Hidden import "foo" not found!
+
+产生的事件:
+- 阶段事件: 进入新的打包阶段时产生一次(阶段见 PyinstallerPhase)
+- 消息事件: WARNING 及以上级别的行, 附带警告类型与相关的模块名称
+
+INFO / DEBUG 行只用于判断阶段, 不产生事件.
+
+类:
+- PyinstallerPhase: 打包阶段
+- PyinstallerWarningKind: 警告类型
+- PyinstallerLogEvent: 日志事件
+- PyinstallerLogParser: 日志解析器, 记录当前阶段
+"""
+import re
+import time
+
+
+class PyinstallerPhase(object):
+    """
+    打包阶段, 按 PyInstaller 的执行顺序排列. 钩子加载与模块依赖图交替进行, 阶段可能多次切换
+
+    - STARTUP: 启动, 读取参数与 spec 文件
+    - HOOKS: 加载与执行模块钩子
+    - ANALYSIS: Analysis 步骤(检查缓存, 查找 Python 共享库等)
+    - MODULE_GRAPH: 构建模块依赖图, 分析入口文件与导入的模块
+    - BINARY_SCAN: 二进制依赖扫描(动态库, ctypes)
+    - PYZ: 生成 PYZ 归档
+    - PKG: 生成 PKG 归档
+    - EXE: 生成可执行文件
+    - COLLECT: 收集到输出文件夹(单文件夹模式)
+    - UPX: UPX 压缩
+    - COMPLETE: 打包完成
+    """
+    STARTUP = 'startup'
+    HOOKS = 'hooks'
+    ANALYSIS = 'analysis'
+    MODULE_GRAPH = 'module_graph'
+    BINARY_SCAN = 'binary_scan'
+    PYZ = 'pyz'
+    PKG = 'pkg'
+    EXE = 'exe'
+    COLLECT = 'collect'
+    UPX = 'upx'
+    COMPLETE = 'complete'
+
+    SEQUENCE: tuple = (STARTUP, HOOKS, ANALYSIS, MODULE_GRAPH, BINARY_SCAN, PYZ, PKG, EXE, COLLECT, UPX, COMPLETE)
+
+
+class PyinstallerWarningKind(object):
+    """
+    警告类型
+
+    - HIDDEN_IMPORT_NOT_FOUND: --hidden-import 指定的模块不存在
+    - MODULE_NOT_FOUND: 导入的模块不存在
+    - LIBRARY_NOT_FOUND: 二进制依赖不存在
+    - COLLECT_FAILED: collect_submodules / collect_data_files 等失败
+    - FILE_NOT_FOUND: --add-data / --add-binary 的文件不存在
+    - OTHER: 其他
+    """
+    HIDDEN_IMPORT_NOT_FOUND = 'hidden_import_not_found'
+    MODULE_NOT_FOUND = 'module_not_found'
+    LIBRARY_NOT_FOUND = 'library_not_found'
+    COLLECT_FAILED = 'collect_failed'
+    FILE_NOT_FOUND = 'file_not_found'
+    OTHER = 'other'
+
+
+_LOG_LINE_PATTERN = re.compile(r'^\s*(?:(\d+)\s+)?(TRACE|DEBUG|INFO|WARNING|WARN|DEPRECATION|ERROR|CRITICAL|FATAL):\s?(.*)$')
+_MESSAGE_LEVELS: tuple = ('WARNING', 'WARN', 'DEPRECATION', 'ERROR', 'CRITICAL', 'FATAL')
+
+# 按顺序匹配, 靠前的优先
+_PHASE_PATTERN_LIST: tuple = (
+    (PyinstallerPhase.COMPLETE, re.compile(r'^Build complete!')),
+    (PyinstallerPhase.UPX, re.compile(r'^(Executing\b.*\bupx\b|Compressing\b.*\bUPX\b|.*\bwith UPX\b)', re.IGNORECASE)),
+    (PyinstallerPhase.COLLECT, re.compile(r'^(checking COLLECT|Building COLLECT)')),
+    (PyinstallerPhase.EXE, re.compile(r'^(checking EXE|Building EXE|Copying bootloader EXE|Copying icon|Copying version information|'
+                                      r'Copying \d+ resources|Embedding manifest|Appending PKG archive|Fixing EXE headers|Rewriting the executable)')),
+    (PyinstallerPhase.PKG, re.compile(r'^(checking PKG|Building PKG)')),
+    (PyinstallerPhase.PYZ, re.compile(r'^(checking PYZ|Building PYZ)')),
+    (PyinstallerPhase.BINARY_SCAN, re.compile(r'^(Looking for dynamic libraries|Looking for ctypes DLLs|Performing binary vs\. data reclassification|'
+                                              r'Looking for eggs)')),
+    (PyinstallerPhase.HOOKS, re.compile(r'^(Loading module hook|Processing (pre-find module path|pre-safe import module|standard module) hook|'
+                                        r'Processing module hooks|Caching module graph hooks|Running hook)')),
+    (PyinstallerPhase.MODULE_GRAPH, re.compile(r'^(Initializing module dependency graph|Caching module dependency graph|Analyzing |'
+                                               r'Including run-time hook)')),
+    (PyinstallerPhase.ANALYSIS, re.compile(r'^(checking Analysis|Building Analysis|Running Analysis|Looking for Python shared library|'
+                                           r'Extending PYTHONPATH)')),
+    (PyinstallerPhase.STARTUP, re.compile(r'^PyInstaller: \d')),
+)
+
+_WARNING_PATTERN_LIST: tuple = (
+    (PyinstallerWarningKind.HIDDEN_IMPORT_NOT_FOUND, re.compile(r'^Hidden import [\'"]([^\'"]+)[\'"] not found')),
+    (PyinstallerWarningKind.LIBRARY_NOT_FOUND, re.compile(r'^(?:Library not found|lib not found|Cannot find)\b:?\s*(?:could not resolve\s*)?[\'"]?([^\'"\s,]+)')),
+    (PyinstallerWarningKind.COLLECT_FAILED, re.compile(r'^(?:Failed to collect|collect_\w+ - .*?(?:failed|not a package)).*?[\'"]([^\'"]+)[\'"]')),
+    (PyinstallerWarningKind.FILE_NOT_FOUND, re.compile(r'^Unable to find [\'"]([^\'"]+)[\'"] when adding binary and data files')),
+    (PyinstallerWarningKind.MODULE_NOT_FOUND, re.compile(r'(?:module|package) (?:named )?[\'"]([^\'"]+)[\'"] (?:not found|could not be found|is not installed)',
+                                                         re.IGNORECASE)),
+)
+
+
+class PyinstallerLogEvent(object):
+    """
+    日志事件
+
+    属性:
+    - kind(str): 'phase' 阶段事件; 'message' 消息事件
+    - phase(str): 产生事件时的阶段, 阶段事件中为新的阶段
+    - level(str): 日志级别, 如 'INFO', 'WARNING'
+    - message(str): 日志内容, 不含时间与级别
+    - elapsed_ms(int | None): 日志中记录的启动后的毫秒数, 无法解析时为 None
+    - timestamp(float): 解析时的时间(time.time())
+    - warning_kind(str): 警告类型, 见 PyinstallerWarningKind, 阶段事件中为 ''
+    - module_name(str): 警告相关的模块, 库或文件名称, 无时为 ''
+    """
+    __slots__ = ('kind', 'phase', 'level', 'message', 'elapsed_ms', 'timestamp', 'warning_kind', 'module_name')
+
+    PHASE = 'phase'
+    MESSAGE = 'message'
+
+    def __init__(self, kind: str, phase: str, level: str, message: str, elapsed_ms: int | None, timestamp: float,
+                 warning_kind: str = '', module_name: str = '') -> None:
+        self.kind: str = kind
+        self.phase: str = phase
+        self.level: str = level
+        self.message: str = message
+        self.elapsed_ms: int | None = elapsed_ms
+        self.timestamp: float = timestamp
+        self.warning_kind: str = warning_kind
+        self.module_name: str = module_name
+
+    def __repr__(self) -> str:
+        if self.kind == self.PHASE:
+            return f'PyinstallerLogEvent(phase={self.phase!r}, elapsed_ms={self.elapsed_ms})'
+        return f'PyinstallerLogEvent({self.level}, {self.warning_kind!r}, {self.module_name!r}, phase={self.phase!r})'
+
+
+class PyinstallerLogParser(object):
+    """
+    日志解析器, 逐行解析并记录当前阶段. 每次打包使用一个新的实例
+
+    属性:
+    - phase(str): 当前阶段, 尚未进入任何阶段时为 ''
+    - warning_count(int): WARNING 级别的行数
+    - error_count(int): ERROR 及以上级别的行数
+    - missing_module_list(list[str]): 不存在的模块(含 --hidden-import 指定的模块), 有序去重
+
+    方法:
+    - parse_line(line: str) -> list[PyinstallerLogEvent]: 解析一行(不含换行符)
+    """
+
+    def __init__(self) -> None:
+        self.__phase: str = ''
+        self.__warning_count: int = 0
+        self.__error_count: int = 0
+        self.__missing_module_dict: dict = {}
+
+    @property
+    def phase(self) -> str:
+        return self.__phase
+
+    @property
+    def warning_count(self) -> int:
+        return self.__warning_count
+
+    @property
+    def error_count(self) -> int:
+        return self.__error_count
+
+    @property
+    def missing_module_list(self) -> list:
+        return list(self.__missing_module_dict)
+
+    def parse_line(self, line: str) -> list:
+        """
+        解析一行
+
+        参数:
+        - line(str): 输出行, 不含换行符
+
+        返回:
+        - list[PyinstallerLogEvent]: 事件列表, 非日志格式的行(如钩子中 print 的内容)返回空列表
+        """
+        match = _LOG_LINE_PATTERN.match(line)
+        if match is None:
+            return []
+        elapsed_text, level, message = match.groups()
+        elapsed_ms = int(elapsed_text) if elapsed_text else None
+        timestamp = time.time()
+        event_list = []
+        for phase, pattern in _PHASE_PATTERN_LIST:
+            if pattern.match(message):
+                if phase != self.__phase:
+                    self.__phase = phase
+                    event_list.append(PyinstallerLogEvent(PyinstallerLogEvent.PHASE, phase, level, message, elapsed_ms, timestamp))
+                break
+        if level in _MESSAGE_LEVELS:
+            if level in ('WARNING', 'WARN', 'DEPRECATION'):
+                self.__warning_count += 1
+            else:
+                self.__error_count += 1
+            warning_kind, module_name = PyinstallerWarningKind.OTHER, ''
+            for kind, pattern in _WARNING_PATTERN_LIST:
+                if warning_match := pattern.search(message):
+                    warning_kind, module_name = kind, warning_match.group(1)
+                    break
+            if warning_kind in (PyinstallerWarningKind.HIDDEN_IMPORT_NOT_FOUND, PyinstallerWarningKind.MODULE_NOT_FOUND):
+                self.__missing_module_dict[module_name] = None
+            event_list.append(PyinstallerLogEvent(PyinstallerLogEvent.MESSAGE, self.__phase, level, message, elapsed_ms, timestamp,
+                                                  warning_kind, module_name))
+        return event_list
@@ -0,0 +1,198 @@
+"""
+打包命令规划
+
+根据当前系统的命令行长度限制决定打包方式:
+- 命令行未超过限制时, 直接使用 PyinstallerStruct 生成的参数列表
+- 超过限制时(Windows 为 32767 个字符, 其他系统为 ARG_MAX 减去环境变量占用的空间), 改用 SpecFileGenerator 生成的 spec 文件, 命令行中只保留构建选项
+
+参数列表直接传给 subprocess(不经过 shell), 因此不受 cmd.exe 8191 个字符的限制.
+
+指定 WorkpathManager 时, 工作文件夹(--workpath)按项目固定并记录选项的哈希值, 选项不变时 PyInstaller 的增量缓存可以复用.
+"""
+import os
+import sys
+import subprocess
+
+from system.Struct_Pyinstaller import *
+from system.Generator_Spec_File import SpecFileGenerator, BUILD_STRUCT_NAMES
+from system.Cache_Path_Stat import PathStatCache
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+WINDOWS_COMMAND_LINE_LIMIT: int = 32767
+""" CreateProcess 的 lpCommandLine 最大长度, 含结尾的空字符 """
+POSIX_ARG_MAX_DEFAULT: int = 131072
+""" 无法获取 SC_ARG_MAX 时使用的值 """
+POSIX_ARG_STRLEN_LIMIT: int = 131072
+""" Linux 单个参数的最大长度(MAX_ARG_STRLEN) """
+POSIX_RESERVED_SIZE: int = 4096
+""" 为子进程启动时追加的环境变量等预留的空间 """
+FINGERPRINT_BUILD_STRUCT_NAMES: tuple = ('upx_dir',)
+""" 不写入 spec 文件但改变打包结果的构建选项, 计入 fingerprint_argument_list """
+
+
+class BuildCommand(object):
+    """
+    打包命令
+
+    属性:
+    - argv(list): 参数列表, 第一个元素为执行器
+    - cwd(str): 执行目录
+    - spec_path(str): 使用的 spec 文件路径, 未使用时为 ''
+    - isSpecFallback(bool): 是否因命令行过长改用 spec 文件
+    - command_length(int): 直接使用参数列表时的命令行长度
+    - command_limit(int): 当前系统的命令行长度限制
+    - input_path_dict(dict): 打包前需要检查的输入路径, {结构名称: [路径]}
+    - fingerprint_argument_list(list): 影响打包结果的参数列表, 不含执行器与构建选项(--upx-dir 除外), 用于 BuildResultCache
+    - output_base_path(str): 打包结果路径(不含扩展名), 如 'E:\\test\\dist\\main'
+    - environment_key(str): 解释器与 PyInstaller 的环境键, 由调用方设置, 为空时不使用打包结果缓存
+    - work_path(str): 由 WorkpathManager 管理的工作文件夹, 未管理时为 ''
+    - work_options_hash(str): 工作文件夹对应的选项哈希值, 打包前传给 WorkpathManager.prepare()
+    """
+    __slots__ = ('argv', 'cwd', 'spec_path', 'isSpecFallback', 'command_length', 'command_limit', 'input_path_dict',
+                 'fingerprint_argument_list', 'output_base_path', 'environment_key', 'work_path', 'work_options_hash')
+
+    def __init__(self, argv: list, cwd: str, spec_path: str = '', command_length: int = 0, command_limit: int = 0, input_path_dict: dict = None,
+                 fingerprint_argument_list: list = None, output_base_path: str = '', work_path: str = '', work_options_hash: str = '') -> None:
+        self.argv: list = argv
+        self.cwd: str = cwd
+        self.spec_path: str = spec_path
+        self.isSpecFallback: bool = bool(spec_path)
+        self.command_length: int = command_length
+        self.command_limit: int = command_limit
+        self.input_path_dict: dict = input_path_dict or {}
+        self.fingerprint_argument_list: list = fingerprint_argument_list or []
+        self.output_base_path: str = output_base_path
+        self.environment_key: str = ''
+        self.work_path: str = work_path
+        self.work_options_hash: str = work_options_hash
+
+    def __repr__(self) -> str:
+        return f'BuildCommand(argc={len(self.argv)}, spec_path={self.spec_path!r}, length={self.command_length}/{self.command_limit})'
+
+
+def get_command_line_limit() -> int:
+    """
+    当前系统可用的命令行长度
+
+    返回:
+    - int: Windows 为字符数; 其他系统为字节数, 已扣除当前环境变量占用的空间
+    """
+    if App.OS == OsType.WINDOWS:
+        return WINDOWS_COMMAND_LINE_LIMIT - 1
+    try:
+        arg_max = os.sysconf('SC_ARG_MAX')
+    except (AttributeError, ValueError, OSError):
+        arg_max = POSIX_ARG_MAX_DEFAULT
+    if arg_max <= 0:
+        arg_max = POSIX_ARG_MAX_DEFAULT
+    # execve 的参数与环境变量共用 ARG_MAX, 每个字符串还占用一个指针
+    environ_size = sum(len(os.fsencode(key)) + len(os.fsencode(value)) + 2 + 8 for key, value in os.environ.items())
+    return arg_max - environ_size - POSIX_RESERVED_SIZE
+
+
+def measure_command_line(argv: list) -> int:
+    """
+    计算参数列表占用的命令行长度, 计算方式与 get_command_line_limit() 一致
+
+    参数:
+    - argv(list[str]): 参数列表
+
+    返回:
+    - int: 长度. 在非 Windows 系统中, 存在超过 MAX_ARG_STRLEN 的单个参数时返回 sys.maxsize
+    """
+    if App.OS == OsType.WINDOWS:
+        return len(subprocess.list2cmdline(argv))
+    length = 0
+    for argument in argv:
+        size = len(os.fsencode(argument)) + 1
+        if size > POSIX_ARG_STRLEN_LIMIT:
+            return sys.maxsize
+        length += size + 8
+    return length
+
+
+def plan_build_command(pyinstaller_struct: PyinstallerStruct, cwd: str, command_limit: int = None,
+                       isForceSpec: bool = False, spec_folder_path: str = '', workpath_manager=None) -> BuildCommand:
+    """
+    生成打包命令, 命令行超过限制时改用 spec 文件. 需先调用 pyinstaller_struct.set_implement_path()
+
+    参数:
+    - pyinstaller_struct(PyinstallerStruct): 结构
+    - cwd(str): 执行目录, 相对路径以此为准
+    - command_limit(int): 命令行长度限制, 默认为 get_command_line_limit()
+    - isForceSpec(bool): 是否总是使用 spec 文件. 生成的 spec 文件中全部为绝对路径, 不依赖 --specpath 与执行目录
+    - spec_folder_path(str): spec 文件所在文件夹, 默认为 SpecFileGenerator 的缓存文件夹
+    - workpath_manager(WorkpathManager): 工作文件夹管理器. 指定时, 结构中的 --workpath 或(未设置时)管理器分配的项目工作文件夹在选项变化时被清空
+
+    返回:
+    - BuildCommand: 打包命令
+    """
+    if command_limit is None:
+        command_limit = get_command_line_limit()
+    implement_list = pyinstaller_struct.get_implement_argument_list()
+    work_path = work_options_hash = managed_work_path = ''
+    if workpath_manager is not None:
+        work_path = pyinstaller_struct.workpath_option.command_args
+        if not work_path:
+            work_path = managed_work_path = workpath_manager.get_workpath(pyinstaller_struct, cwd)
+        elif not os.path.isabs(work_path):
+            work_path = os.path.normpath(os.path.join(cwd, work_path))
+        work_options_hash = workpath_manager.options_hash(pyinstaller_struct, cwd)
+    argv = implement_list + pyinstaller_struct.get_argument_list()
+    if managed_work_path:
+        argv.append(f'--workpath={managed_work_path}')
+    command_length = measure_command_line(argv)
+    input_path_dict = pyinstaller_struct.get_input_path_dict(cwd)
+    fingerprint_argument_list = [argument for item in pyinstaller_struct.get_struct_list()
+                                 if item.name not in BUILD_STRUCT_NAMES or item.name in FINGERPRINT_BUILD_STRUCT_NAMES for argument in item.arguments]
+    output_base_path = get_output_base_path(pyinstaller_struct, cwd)
+    if command_length <= command_limit and not isForceSpec:
+        return BuildCommand(argv, cwd, command_length=command_length, command_limit=command_limit, input_path_dict=input_path_dict,
+                            fingerprint_argument_list=fingerprint_argument_list, output_base_path=output_base_path,
+                            work_path=work_path, work_options_hash=work_options_hash)
+    generator = SpecFileGenerator()
+    spec_path = generator.generate(pyinstaller_struct, cwd, spec_folder_path)
+    if not isForceSpec:
+        lg.info(f'命令行长度 {command_length} 超过限制 {command_limit}, 改用 spec 文件: {spec_path}')
+    argv = implement_list + [spec_path] + generator.get_build_argument_list(pyinstaller_struct, managed_work_path)
+    return BuildCommand(argv, cwd, spec_path, command_length, command_limit, input_path_dict, fingerprint_argument_list, output_base_path,
+                        work_path, work_options_hash)
+
+
+def get_output_base_path(pyinstaller_struct: PyinstallerStruct, cwd: str) -> str:
+    """
+    打包结果路径, 与 PyInstaller 一致: --distpath 默认为执行目录下的 dist, --name 默认为脚本文件名
+
+    参数:
+    - pyinstaller_struct(PyinstallerStruct): 结构
+    - cwd(str): 执行目录
+
+    返回:
+    - str: 不含扩展名的路径, 单文件模式在 Windows 中需加 .exe, macOS 窗口程序另有 .app
+    """
+    dist_path = pyinstaller_struct.output_folder_path.command_args or 'dist'
+    name = pyinstaller_struct.output_file_name.command_args
+    if not name:
+        script = pyinstaller_struct.python_file_path.command_args
+        name = os.path.splitext(os.path.basename(script))[0] if script else 'main'
+    return os.path.normpath(os.path.join(cwd, dist_path, name))
+
+
+def check_input_paths(build_command: BuildCommand, timeout: float = None) -> list:
+    """
+    并发检查打包命令的输入路径, 阻塞直到完成, 应在工作线程中调用
+
+    参数:
+    - build_command(BuildCommand): 打包命令
+    - timeout(float): 超时时间(秒), 默认不限制
+
+    返回:
+    - list[tuple[str, str]]: 不存在的路径 [(结构名称, 路径)]
+    """
+    path_dict = build_command.input_path_dict
+    if not path_dict:
+        return []
+    stat_dict = PathStatCache().preflight([path for path_list in path_dict.values() for path in path_list], timeout)
+    return [(name, path) for name, path_list in path_dict.items() for path in path_list if not stat_dict[path].isExists]
@@ -0,0 +1,114 @@
+"""
+解释器探测
+
+通过一次进程启动, 在目标解释器中运行内嵌脚本, 以 JSON 形式一次性返回解释器的全部信息:
+python版本, 实现, 平台, prefix, site-packages 文件夹, 已安装的 pyinstaller 版本及入口
+
+函数:
+- probe_interpreter(python_path: str, timeout: float = 30) -> dict: 探测解释器信息
+- parse_probe_output(output: str) -> dict: 解析探测脚本输出
+
+变量:
+- PROBE_SCRIPT: 内嵌探测脚本
+- PROBE_MARKER: 探测结果行前缀, 用于跳过 sitecustomize 等产生的无关输出
+- CREATION_FLAGS: 子进程创建标志, 仅 Windows 下隐藏控制台窗口
+"""
+import json
+import subprocess
+
+PROBE_MARKER = '__PYTOEXE_PROBE__'
+
+PROBE_SCRIPT = r'''
+import os, sys, json, platform, sysconfig
+info = {
+    'python_version': platform.python_version(),
+    'implementation': platform.python_implementation(),
+    'platform': sys.platform,
+    'machine': platform.machine(),
+    'executable': sys.executable,
+    'prefix': sys.prefix,
+    'base_prefix': getattr(sys, 'base_prefix', sys.prefix),
+    'site_packages': [],
+    'pyinstaller_version': '',
+    'pyinstaller_entry_point': '',
+    'pyinstaller_path': '',
+}
+try:
+    import site
+    dirs = list(site.getsitepackages()) if hasattr(site, 'getsitepackages') else []
+    if site.ENABLE_USER_SITE and os.path.isdir(site.getusersitepackages()):
+        dirs.append(site.getusersitepackages())
+except Exception:
+    dirs = []
+purelib = sysconfig.get_paths().get('purelib', '')
+if purelib and purelib not in dirs:
+    dirs.append(purelib)
+info['site_packages'] = [d for d in dirs if os.path.isdir(d)]
+try:
+    from importlib import metadata
+    dist = metadata.distribution('pyinstaller')
+    info['pyinstaller_version'] = dist.version
+    for ep in dist.entry_points:
+        if ep.group == 'console_scripts' and ep.name == 'pyinstaller':
+            info['pyinstaller_entry_point'] = ep.value
+except Exception:
+    try:
+        import PyInstaller
+        info['pyinstaller_version'] = PyInstaller.__version__
+    except Exception:
+        pass
+if info['pyinstaller_version']:
+    scripts = sysconfig.get_paths().get('scripts', '')
+    for name in ('pyinstaller.exe', 'pyinstaller'):
+        path = os.path.join(scripts, name)
+        if scripts and os.path.isfile(path):
+            info['pyinstaller_path'] = path
+            break
+print('__PYTOEXE_PROBE__' + json.dumps(info))
+'''
+
+CREATION_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def parse_probe_output(output: str) -> dict:
+    """
+    解析探测脚本输出, 只读取带有 PROBE_MARKER 前缀的行
+
+    参数:
+    - output(str): 探测进程的标准输出
+
+    返回:
+    - dict: 探测结果, 解析失败时返回空字典
+    """
+    for line in output.splitlines():
+        if not line.startswith(PROBE_MARKER):
+            continue
+        try:
+            data = json.loads(line[len(PROBE_MARKER):])
+        except json.JSONDecodeError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return {}
+
+
+def probe_interpreter(python_path: str, timeout: float = 30) -> dict:
+    """
+    探测解释器信息, 整个过程只启动一次进程
+
+    参数:
+    - python_path(str): 解释器路径
+    - timeout(float): 超时时间(秒), 默认 30
+
+    返回:
+    - dict: 如 {'python_version': '3.11.7', 'implementation': 'CPython', 'platform': 'win32', 'prefix': '...',
+        'site_packages': [...], 'pyinstaller_version': '6.3.0', 'pyinstaller_entry_point': 'PyInstaller.__main__:_console_script_run',
+        'pyinstaller_path': '...'}, 探测失败时返回空字典
+    """
+    if not python_path:
+        return {}
+    try:
+        result = subprocess.run([python_path, '-c', PROBE_SCRIPT], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, timeout=timeout, creationflags=CREATION_FLAGS)
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    return parse_probe_output(result.stdout)
@@ -0,0 +1,304 @@
+"""
+打包阶段耗时统计
+
+根据 PyinstallerLogParser 产生的阶段事件计算每个阶段的耗时, 并按项目保存历史记录, 用于发现耗时的变化, 如:
+    Analysis 从 40.0s 增加到 3m00s, 新增参数: --collect-all=torch
+
+阶段的开始时间使用 PyInstaller 日志中记录的毫秒数, 无法解析时使用读取到该行的时间. 一个阶段持续到下一个阶段事件,
+同一阶段多次出现(如钩子加载与模块依赖图交替)时累加. 第一个事件之前的时间(解释器启动与导入 PyInstaller)计入 startup.
+
+历史记录保存在 APP_WORKSPACE_PATH/.build_profile/<项目键>.json 中, 每个项目保留最近 MAX_RECORD_COUNT 次打包.
+项目键由打包结果路径(执行目录, --distpath 与 --name)生成.
+
+类:
+- BuildProfile: 一次打包的阶段耗时
+- BuildProfileHistory: 历史记录(单例)
+
+函数:
+- get_project_key(output_base_path: str) -> str: 项目键
+- profile_build(build_command: BuildCommand, event_list: list, start_time: float, end_time: float, return_code: int) -> BuildProfile: 计算阶段耗时
+- find_regressions(current: BuildProfile, previous: BuildProfile) -> list[str]: 与上一次打包对比, 返回明显变慢的阶段说明
+- format_profile(profile: BuildProfile) -> str: 单次打包的阶段耗时文本
+- format_comparison(profile_list: list) -> str: 多次打包的阶段耗时对比表
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+import unicodedata
+
+from system.Parser_Pyinstaller_Log import PyinstallerPhase, PyinstallerLogEvent
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+BUILD_PROFILE_FOLDER_NAME: str = '.build_profile'
+MAX_RECORD_COUNT: int = 50
+REGRESSION_RATIO: float = 1.5
+""" 阶段耗时达到上一次的 1.5 倍 """
+REGRESSION_MIN_SECONDS: float = 5.0
+""" 且增加超过 5 秒时视为变慢 """
+
+PHASE_LABEL_DICT: dict = {
+    PyinstallerPhase.STARTUP: '启动',
+    PyinstallerPhase.HOOKS: '钩子加载',
+    PyinstallerPhase.ANALYSIS: 'Analysis',
+    PyinstallerPhase.MODULE_GRAPH: '模块依赖图',
+    PyinstallerPhase.BINARY_SCAN: '二进制依赖扫描',
+    PyinstallerPhase.PYZ: 'PYZ',
+    PyinstallerPhase.PKG: 'PKG',
+    PyinstallerPhase.EXE: 'EXE',
+    PyinstallerPhase.COLLECT: 'COLLECT',
+    PyinstallerPhase.UPX: 'UPX',
+}
+""" 统计的阶段, COMPLETE 之后的时间不计入 """
+
+
+class BuildProfile(object):
+    """
+    一次打包的阶段耗时
+
+    属性:
+    - name(str): 输出名称
+    - project_key(str): 项目键
+    - started(float): 开始时间(time.time())
+    - total(float): 总耗时(秒)
+    - phase_dict(dict): {阶段: 耗时(秒)}, 只包含出现过的阶段, 顺序与 PyinstallerPhase.SEQUENCE 一致
+    - argument_list(list[str]): 影响打包结果的参数, 用于说明两次打包之间的差异
+    - return_code(int): 进程返回码
+    """
+    __slots__ = ('name', 'project_key', 'started', 'total', 'phase_dict', 'argument_list', 'return_code')
+
+    def __init__(self, name: str, project_key: str, started: float, total: float, phase_dict: dict, argument_list: list, return_code: int) -> None:
+        self.name: str = name
+        self.project_key: str = project_key
+        self.started: float = started
+        self.total: float = total
+        self.phase_dict: dict = phase_dict
+        self.argument_list: list = argument_list
+        self.return_code: int = return_code
+
+    def __repr__(self) -> str:
+        return f'BuildProfile({self.name!r}, total={self.total:.1f}s, phases={len(self.phase_dict)}, return_code={self.return_code})'
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BuildProfile':
+        return cls(data.get('name', ''), data.get('project_key', ''), data.get('started', 0.0), data.get('total', 0.0),
+                   dict(data.get('phase_dict') or {}), list(data.get('argument_list') or []), data.get('return_code', 0))
+
+
+def get_project_key(output_base_path: str) -> str:
+    """ 打包结果路径 -> 项目键 """
+    return hashlib.sha256(os.path.normcase(os.path.abspath(output_base_path)).encode('utf-8')).hexdigest()[:16]
+
+
+def profile_build(build_command, event_list: list, start_time: float, end_time: float, return_code: int) -> BuildProfile:
+    """
+    计算阶段耗时
+
+    参数:
+    - build_command(BuildCommand): 打包命令
+    - event_list(list[PyinstallerLogEvent]): 本次打包的事件, 只使用阶段事件
+    - start_time(float): 进程启动时间(time.time())
+    - end_time(float): 进程结束时间(time.time())
+    - return_code(int): 进程返回码
+
+    返回:
+    - BuildProfile: 阶段耗时
+    """
+    total = max(0.0, end_time - start_time)
+    mark_list = []
+    for event in event_list:
+        if event.kind != PyinstallerLogEvent.PHASE:
+            continue
+        offset = event.elapsed_ms / 1000 if event.elapsed_ms is not None else event.timestamp - start_time
+        mark_list.append((min(max(offset, 0.0), total), event.phase))
+    duration_dict = {}
+    previous_offset, previous_phase = 0.0, PyinstallerPhase.STARTUP
+    for offset, phase in mark_list + [(total, PyinstallerPhase.COMPLETE)]:
+        if previous_phase in PHASE_LABEL_DICT:
+            duration_dict[previous_phase] = duration_dict.get(previous_phase, 0.0) + max(0.0, offset - previous_offset)
+        previous_offset, previous_phase = offset, phase
+    phase_dict = {phase: round(duration_dict[phase], 3) for phase in PyinstallerPhase.SEQUENCE if phase in duration_dict}
+    return BuildProfile(os.path.basename(build_command.output_base_path), get_project_key(build_command.output_base_path), start_time,
+                        round(total, 3), phase_dict, list(build_command.fingerprint_argument_list), return_code)
+
+
+def find_regressions(current: BuildProfile, previous: BuildProfile) -> list:
+    """
+    与上一次打包对比, 找出耗时达到 REGRESSION_RATIO 倍且增加超过 REGRESSION_MIN_SECONDS 秒的阶段
+
+    参数:
+    - current(BuildProfile): 本次打包
+    - previous(BuildProfile): 上一次打包
+
+    返回:
+    - list[str]: 如 ['Analysis 从 40.0s 增加到 3m00s, 新增参数: --collect-all=torch']
+    """
+    added_list = [argument for argument in current.argument_list if argument not in previous.argument_list]
+    removed_list = [argument for argument in previous.argument_list if argument not in current.argument_list]
+    change_text = ''
+    if added_list:
+        change_text += f', 新增参数: {" ".join(added_list)}'
+    if removed_list:
+        change_text += f', 删除参数: {" ".join(removed_list)}'
+    message_list = []
+    for phase, label in PHASE_LABEL_DICT.items():
+        new, old = current.phase_dict.get(phase, 0.0), previous.phase_dict.get(phase, 0.0)
+        if new - old >= REGRESSION_MIN_SECONDS and new >= old * REGRESSION_RATIO:
+            message_list.append(f'{label} 从 {_format_seconds(old)} 增加到 {_format_seconds(new)}{change_text}')
+    return message_list
+
+
+def format_profile(profile: BuildProfile) -> str:
+    """
+    单次打包的阶段耗时文本, 每个阶段一行, 含占比
+
+    参数:
+    - profile(BuildProfile): 阶段耗时
+
+    返回:
+    - str: 以换行符结尾
+    """
+    line_list = [f'打包耗时 {_format_seconds(profile.total)}:']
+    for phase, seconds in profile.phase_dict.items():
+        ratio = seconds / profile.total * 100 if profile.total else 0.0
+        line_list.append(f'  {_pad(PHASE_LABEL_DICT[phase], 16)}{_format_seconds(seconds):>9}  {ratio:5.1f}%')
+    return '\n'.join(line_list) + '\n'
+
+
+def format_comparison(profile_list: list) -> str:
+    """
+    多次打包的阶段耗时对比表, 每列一次打包, 由旧到新
+
+    参数:
+    - profile_list(list[BuildProfile]): 由旧到新的记录
+
+    返回:
+    - str: 以换行符结尾, 无记录时为 ''
+    """
+    if not profile_list:
+        return ''
+    phase_list = [phase for phase in PHASE_LABEL_DICT if any(phase in profile.phase_dict for profile in profile_list)]
+    header = _pad('', 16) + ''.join(f'{time.strftime("%m-%d %H:%M", time.localtime(profile.started)):>13}' for profile in profile_list)
+    line_list = [f'最近 {len(profile_list)} 次打包耗时 ({profile_list[-1].name}):', header]
+    for phase in phase_list:
+        line_list.append(_pad(PHASE_LABEL_DICT[phase], 16) + ''.join(
+            f'{_format_seconds(profile.phase_dict[phase]) if phase in profile.phase_dict else "-":>13}' for profile in profile_list))
+    line_list.append(_pad('合计', 16) + ''.join(
+        f'{_format_seconds(profile.total) + ("" if profile.return_code == 0 else "!"):>13}' for profile in profile_list))
+    return '\n'.join(line_list) + '\n'
+
+
+def _pad(text: str, width: int) -> str:
+    """ 按显示宽度左对齐, 中文字符占两列 """
+    display_width = sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+    return text + ' ' * max(0, width - display_width)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 60:
+        return f'{seconds:.1f}s'
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f'{minutes}m{seconds:02d}s'
+
+
+class BuildProfileHistory(object):
+    """
+    打包阶段耗时的历史记录(单例), 线程安全
+
+    参数:
+    - exe_folder_path(str): 历史记录文件夹所在路径, 默认为 APP_WORKSPACE_PATH
+
+    属性:
+    - folder_path(str): 历史记录文件夹路径
+
+    方法:
+    - add(profile: BuildProfile) -> BuildProfile | None: 添加记录, 返回同一项目中上一次成功的记录
+    - get_recent(project_key: str, count: int = 10) -> list[BuildProfile]: 最近的记录, 由旧到新
+    - clear(project_key: str = '') -> None: 删除记录, 不指定项目时删除全部
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, exe_folder_path: str = APP_WORKSPACE_PATH) -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__folder_path: str = os.path.join(exe_folder_path, BUILD_PROFILE_FOLDER_NAME)
+        self.__lock = threading.Lock()
+
+    @property
+    def folder_path(self) -> str:
+        return self.__folder_path
+
+    def add(self, profile: BuildProfile) -> BuildProfile | None:
+        """
+        添加记录, 超过 MAX_RECORD_COUNT 时删除最旧的记录
+
+        参数:
+        - profile(BuildProfile): 本次打包
+
+        返回:
+        - BuildProfile | None: 同一项目中上一次成功的记录, 用于 find_regressions(), 无时返回 None
+        """
+        with self.__lock:
+            record_list = self.__load(profile.project_key)
+            previous = next((record for record in reversed(record_list) if record.get('return_code') == 0), None)
+            record_list.append(profile.to_dict())
+            self.__save(profile.project_key, record_list[-MAX_RECORD_COUNT:])
+        return BuildProfile.from_dict(previous) if previous is not None else None
+
+    def get_recent(self, project_key: str, count: int = 10) -> list:
+        with self.__lock:
+            record_list = self.__load(project_key)
+        return [BuildProfile.from_dict(record) for record in record_list[-count:]] if count > 0 else []
+
+    def clear(self, project_key: str = '') -> None:
+        with self.__lock:
+            if project_key:
+                path_list = [self.__get_path(project_key)]
+            elif os.path.isdir(self.__folder_path):
+                path_list = [os.path.join(self.__folder_path, file_name) for file_name in os.listdir(self.__folder_path)]
+            else:
+                path_list = []
+            for path in path_list:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def __get_path(self, project_key: str) -> str:
+        return os.path.join(self.__folder_path, f'{project_key}.json')
+
+    def __load(self, project_key: str) -> list:
+        path = self.__get_path(project_key)
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            lg.exception(f'读取打包耗时记录失败: {path}')
+            return []
+        return [record for record in data if isinstance(record, dict)] if isinstance(data, list) else []
+
+    def __save(self, project_key: str, record_list: list) -> None:
+        path = self.__get_path(project_key)
+        try:
+            os.makedirs(self.__folder_path, exist_ok=True)
+            temp_path = f'{path}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(record_list, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError:
+            lg.exception(f'保存打包耗时记录失败: {path}')
@@ -0,0 +1,218 @@
+"""
+conda 环境读取
+
+不启动 conda 可执行文件, 直接读取 environments.txt, .condarc 中的 envs_dirs, 以及各环境的 conda-meta/history 与 python 可执行文件,
+得到 conda 环境列表. 只有在找不到 conda 根目录时, 才退回执行 `conda env list --json`.
+
+函数:
+- find_conda_root_list() -> list: 获取 conda 根目录列表
+- find_envs_dir_list(conda_root_list: list = None) -> list: 获取环境文件夹列表(envs_dirs)
+- find_python_executable(env_path: str) -> str: 获取环境中的 python 可执行文件路径
+- read_conda_env_list() -> list: 获取 conda 环境列表, 元素为 (环境名, 环境路径)
+"""
+import os
+import glob
+import json
+import subprocess
+
+from system.Probe_Interpreter import CREATION_FLAGS
+
+_USER_PATH = os.path.expanduser('~')
+_USER_CONDA_FOLDER = os.path.join(_USER_PATH, '.conda')
+_ENVIRONMENTS_TXT_PATH = os.path.join(_USER_CONDA_FOLDER, 'environments.txt')
+_CONDA_ROOT_NAMES = ('miniconda3', 'anaconda3', 'miniforge3', 'mambaforge', 'micromamba', 'miniconda', 'anaconda')
+
+
+def _isCondaEnv(path: str) -> bool:
+    """ 含有 conda-meta/history 的文件夹才是有效的 conda 环境 """
+    return os.path.isfile(os.path.join(path, 'conda-meta', 'history'))
+
+
+def _read_environments_txt() -> list:
+    """ 读取 ~/.conda/environments.txt 中记录的环境路径 """
+    if not os.path.exists(_ENVIRONMENTS_TXT_PATH):
+        return []
+    try:
+        with open(_ENVIRONMENTS_TXT_PATH, 'r', encoding='utf-8') as f:
+            return [os.path.normpath(line.strip()) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def _read_condarc_envs_dirs(condarc_path: str) -> list:
+    """
+    读取 .condarc 中的 envs_dirs, 只解析该键, 不依赖 yaml. 支持以下两种写法:
+    envs_dirs:
+      - D:/conda_envs
+    envs_dirs: [D:/conda_envs, ~/envs]
+    """
+    if not os.path.isfile(condarc_path):
+        return []
+    try:
+        with open(condarc_path, 'r', encoding='utf-8') as f:
+            line_list = f.read().splitlines()
+    except OSError:
+        return []
+    result = []
+    isInEnvsDirs = False
+    for line in line_list:
+        content = line.split('#', 1)[0].rstrip()
+        if not content.strip():
+            continue
+        if content.startswith('envs_dirs:'):
+            value = content[len('envs_dirs:'):].strip()
+            if value.startswith('[') and value.endswith(']'):
+                result.extend(item.strip().strip('\'"') for item in value[1:-1].split(',') if item.strip())
+                isInEnvsDirs = False
+            else:
+                isInEnvsDirs = True
+            continue
+        if isInEnvsDirs:
+            if content.lstrip().startswith('- '):
+                result.append(content.lstrip()[2:].strip().strip('\'"'))
+            elif not content.startswith((' ', '\t')):
+                isInEnvsDirs = False
+    return [os.path.normpath(os.path.expandvars(os.path.expanduser(path))) for path in result]
+
+
+def find_conda_root_list() -> list:
+    """
+    获取 conda 根目录列表, 根据环境变量, 常见安装位置, 以及 environments.txt 中记录的环境推断
+
+    返回:
+    - list: 如 ['C:/Users/username/miniconda3']
+    """
+    candidate_list = []
+    conda_exe = os.environ.get('CONDA_EXE', '') or os.environ.get('MAMBA_EXE', '')
+    if conda_exe:
+        candidate_list.append(os.path.dirname(os.path.dirname(conda_exe)))
+    for key in ('CONDA_ROOT', 'MAMBA_ROOT_PREFIX'):
+        if os.environ.get(key):
+            candidate_list.append(os.environ[key])
+    conda_prefix = os.environ.get('CONDA_PREFIX', '')
+    if conda_prefix:
+        candidate_list.append(conda_prefix)
+        if os.path.basename(os.path.dirname(conda_prefix)) == 'envs':
+            candidate_list.append(os.path.dirname(os.path.dirname(conda_prefix)))
+    for name in _CONDA_ROOT_NAMES:
+        candidate_list.append(os.path.join(_USER_PATH, name))
+    for env_path in _read_environments_txt():
+        if os.path.basename(os.path.dirname(env_path)) == 'envs':
+            candidate_list.append(os.path.dirname(os.path.dirname(env_path)))
+        elif os.path.isdir(os.path.join(env_path, 'envs')):
+            candidate_list.append(env_path)
+    result = []
+    for path in candidate_list:
+        path = os.path.normpath(path)
+        if path not in result and _isCondaEnv(path) and not os.path.basename(os.path.dirname(path)) == 'envs':
+            result.append(path)
+    return result
+
+
+def find_envs_dir_list(conda_root_list: list = None) -> list:
+    """
+    获取环境文件夹列表, 包括各 conda 根目录下的 envs, ~/.conda/envs, 以及 .condarc 中的 envs_dirs
+
+    参数:
+    - conda_root_list(list): conda 根目录列表, 为 None 时自动查找
+
+    返回:
+    - list: 存在的环境文件夹列表
+    """
+    if conda_root_list is None:
+        conda_root_list = find_conda_root_list()
+    condarc_path_list = [
+        os.environ.get('CONDARC', ''),
+        os.path.join(_USER_PATH, '.condarc'),
+        os.path.join(_USER_CONDA_FOLDER, '.condarc'),
+        os.path.join(_USER_CONDA_FOLDER, 'condarc'),
+        os.path.join(_USER_PATH, '.config', 'conda', '.condarc'),
+        os.path.join(_USER_PATH, '.config', 'conda', 'condarc'),
+    ]
+    condarc_path_list.extend(os.path.join(root, '.condarc') for root in conda_root_list)
+    candidate_list = []
+    for condarc_path in condarc_path_list:
+        if condarc_path:
+            candidate_list.extend(_read_condarc_envs_dirs(condarc_path))
+    candidate_list.extend(os.path.join(root, 'envs') for root in conda_root_list)
+    candidate_list.append(os.path.join(_USER_CONDA_FOLDER, 'envs'))
+    result = []
+    for path in candidate_list:
+        path = os.path.normpath(path)
+        if path not in result and os.path.isdir(path):
+            result.append(path)
+    return result
+
+
+def find_python_executable(env_path: str) -> str:
+    """
+    获取环境中的 python 可执行文件路径, 不启动解释器
+
+    参数:
+    - env_path(str): 环境路径
+
+    返回:
+    - str: Windows: <env>/python.exe(venv 为 <env>/Scripts/python.exe), Linux/MacOS: <env>/bin/python 或 <env>/bin/python3.X, 未找到时返回 ''
+    """
+    for name in ('python.exe', os.path.join('Scripts', 'python.exe'), os.path.join('bin', 'python'), os.path.join('bin', 'python3')):
+        python_path = os.path.join(env_path, name)
+        if os.path.isfile(python_path):
+            return python_path
+    candidate_list = sorted(glob.glob(os.path.join(env_path, 'bin', 'python3.*')))
+    candidate_list = [path for path in candidate_list if not path.endswith('-config')]
+    return candidate_list[0] if candidate_list else ''
+
+
+def _conda_env_name(env_path: str, conda_root_list: list, envs_dir_list: list) -> str:
+    """ 与 conda 一致的命名规则: 根目录为 base, envs_dirs 中的环境为文件夹名, 其余为完整路径 """
+    if conda_root_list and env_path == conda_root_list[0]:
+        return 'base'
+    if env_path in conda_root_list:
+        return os.path.basename(env_path)
+    if os.path.dirname(env_path) in envs_dir_list:
+        return os.path.basename(env_path)
+    return env_path
+
+
+def _read_conda_env_list_from_cli() -> list:
+    """ 找不到 conda 根目录时的后备方案, 执行 `conda env list --json` """
+    try:
+        result = subprocess.run(['conda', 'env', 'list', '--json'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, timeout=60, creationflags=CREATION_FLAGS, shell=os.name == 'nt')
+        env_path_list = json.loads(result.stdout).get('envs', [])
+    except (OSError, subprocess.SubprocessError, json.JSONDecodeError, AttributeError):
+        return []
+    env_path_list = [os.path.normpath(path) for path in env_path_list]
+    conda_root_list = [path for path in env_path_list if os.path.isdir(os.path.join(path, 'envs'))][:1]
+    envs_dir_list = [os.path.join(root, 'envs') for root in conda_root_list]
+    return [(_conda_env_name(path, conda_root_list, envs_dir_list), path) for path in env_path_list]
+
+
+def read_conda_env_list() -> list:
+    """
+    获取 conda 环境列表, 只读取文件, 不启动 conda. 找不到 conda 根目录时退回 `conda env list --json`
+
+    返回:
+    - list: 元素为 (环境名, 环境路径), 如 [('base', 'C:/Users/username/miniconda3'), ('py311', 'C:/Users/username/miniconda3/envs/py311')]
+    """
+    conda_root_list = find_conda_root_list()
+    if not conda_root_list:
+        return _read_conda_env_list_from_cli()
+    envs_dir_list = find_envs_dir_list(conda_root_list)
+    env_path_list = list(conda_root_list)
+    for envs_dir in envs_dir_list:
+        try:
+            entry_list = sorted(os.scandir(envs_dir), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        env_path_list.extend(os.path.normpath(entry.path) for entry in entry_list if entry.is_dir())
+    env_path_list.extend(_read_environments_txt())
+    result = []
+    seen_set = set()
+    for env_path in env_path_list:
+        key = os.path.normcase(env_path)
+        if key in seen_set or not _isCondaEnv(env_path):
+            continue
+        seen_set.add(key)
+        result.append((_conda_env_name(env_path, conda_root_list, envs_dir_list), env_path))
+    return result
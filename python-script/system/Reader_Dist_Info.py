@@ -0,0 +1,212 @@
+"""
+dist-info 元数据读取
+
+不启动解释器, 直接读取 site-packages 中的 `<name>-<version>.dist-info` (或 `.egg-info`) 元数据,
+得到已安装包的版本, console_scripts 入口, 以及 console_scripts 可执行文件路径.
+
+函数:
+- find_site_packages_list(python_path: str) -> list: 根据解释器路径查找 site-packages 文件夹
+- find_dist_info_path(site_packages_list: list, dist_name: str) -> str: 查找包的 dist-info/egg-info 路径
+- read_dist_info(python_path: str, dist_name: str, script_name: str = '', site_packages_list: list = None) -> dict: 读取包的版本, 入口及脚本路径
+- read_pyinstaller_dist_info(python_path: str, site_packages_list: list = None) -> dict: 读取 pyinstaller 的版本, 入口及脚本路径
+"""
+import os
+import re
+import glob
+
+_NORMALIZE_PATTERN = re.compile(r'[-_.]+')
+_INFO_SUFFIXES = ('.dist-info', '.egg-info')
+
+
+def _normalize_name(name: str) -> str:
+    """ PEP 503 包名规范化, 如 PyInstaller, py_installer -> pyinstaller, py-installer """
+    return _NORMALIZE_PATTERN.sub('-', name).lower()
+
+
+def find_site_packages_list(python_path: str) -> list:
+    """
+    根据解释器路径查找 site-packages 文件夹, 不启动解释器
+
+    参数:
+    - python_path(str): 解释器路径
+
+    返回:
+    - list: Windows: <prefix>/Lib/site-packages, Linux/MacOS: <prefix>/lib/pythonX.Y/site-packages
+    """
+    if not python_path:
+        return []
+    current = os.path.dirname(python_path)
+    parent = os.path.dirname(current)
+    result = []
+    for prefix in (current, parent):
+        result.extend(glob.glob(os.path.join(prefix, 'Lib', 'site-packages')))
+        result.extend(glob.glob(os.path.join(prefix, 'lib', 'python*', 'site-packages')))
+    return sorted(set(result))
+
+
+def find_dist_info_path(site_packages_list: list, dist_name: str) -> str:
+    """
+    查找包的 dist-info/egg-info 路径, 存在多个时(如残留的旧版本)取最近修改的一个
+
+    参数:
+    - site_packages_list(list): site-packages 文件夹列表
+    - dist_name(str): 包名, 如 'pyinstaller'
+
+    返回:
+    - str: 如 '.../site-packages/pyinstaller-6.3.0.dist-info', 未找到时返回 ''
+    """
+    target_name = _normalize_name(dist_name)
+    candidate_list = []
+    for site_packages in site_packages_list:
+        try:
+            entry_list = list(os.scandir(site_packages))
+        except OSError:
+            continue
+        for entry in entry_list:
+            if not entry.name.endswith(_INFO_SUFFIXES):
+                continue
+            stem = entry.name.rsplit('.', 1)[0]
+            if _normalize_name(stem.split('-', 1)[0]) != target_name:
+                continue
+            try:
+                candidate_list.append((entry.stat().st_mtime_ns, entry.path))
+            except OSError:
+                continue
+    if not candidate_list:
+        return ''
+    return max(candidate_list)[1]
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+    except OSError:
+        return ''
+
+
+def _read_version(info_path: str) -> str:
+    """ 读取 METADATA(dist-info) 或 PKG-INFO(egg-info) 头部中的 Version 字段 """
+    if os.path.isfile(info_path):
+        # 旧版 setuptools 会生成单文件形式的 egg-info
+        metadata_path = info_path
+    elif info_path.endswith('.dist-info'):
+        metadata_path = os.path.join(info_path, 'METADATA')
+    else:
+        metadata_path = os.path.join(info_path, 'PKG-INFO')
+    for line in _read_text(metadata_path).splitlines():
+        if not line.strip():
+            # 头部结束, 之后为包描述
+            break
+        if line.startswith('Version:'):
+            return line[len('Version:'):].strip()
+    return ''
+
+
+def _read_console_scripts(info_path: str) -> dict:
+    """ 读取 entry_points.txt 中的 [console_scripts] 段, 返回 脚本名 -> 入口 """
+    if not os.path.isdir(info_path):
+        return {}
+    result = {}
+    isInConsoleScripts = False
+    for line in _read_text(os.path.join(info_path, 'entry_points.txt')).splitlines():
+        line = line.strip()
+        if not line or line.startswith(('#', ';')):
+            continue
+        if line.startswith('['):
+            isInConsoleScripts = line == '[console_scripts]'
+            continue
+        if isInConsoleScripts and '=' in line:
+            name, value = line.split('=', 1)
+            result[name.strip()] = value.strip()
+    return result
+
+
+def _find_script_in_record(info_path: str, script_name: str) -> str:
+    """
+    在 RECORD(dist-info) 或 installed-files.txt(egg-info) 中查找脚本的安装路径.
+    记录中的路径相对于 site-packages(dist-info) 或 egg-info 文件夹, 如 ../../Scripts/pyinstaller.exe
+    """
+    if not os.path.isdir(info_path):
+        return ''
+    if info_path.endswith('.dist-info'):
+        record_path = os.path.join(info_path, 'RECORD')
+        base_path = os.path.dirname(info_path)
+    else:
+        record_path = os.path.join(info_path, 'installed-files.txt')
+        base_path = info_path
+    name_set = {script_name, f'{script_name}.exe'}
+    for line in _read_text(record_path).splitlines():
+        relative_path = line.split(',', 1)[0].strip()
+        if os.path.basename(relative_path.replace('\\', '/')) not in name_set:
+            continue
+        script_path = os.path.normpath(os.path.join(base_path, relative_path))
+        if os.path.isfile(script_path):
+            return script_path
+    return ''
+
+
+def _find_script_in_scripts_dir(python_path: str, script_name: str) -> str:
+    """
+    RECORD 中没有记录脚本时(如 conda 安装的包), 在解释器对应的脚本文件夹中查找.
+    Windows conda/系统解释器: <prefix>/Scripts, venv: 与解释器同一文件夹; Linux/MacOS: 与解释器同一文件夹(bin)
+    """
+    folder = os.path.dirname(python_path)
+    for scripts_dir in (folder, os.path.join(folder, 'Scripts')):
+        for name in (f'{script_name}.exe', script_name):
+            script_path = os.path.join(scripts_dir, name)
+            if os.path.isfile(script_path):
+                return script_path
+    return ''
+
+
+def read_dist_info(python_path: str, dist_name: str, script_name: str = '', site_packages_list: list = None) -> dict:
+    """
+    读取包的版本, console_scripts 入口及脚本路径, 不执行任何代码
+
+    参数:
+    - python_path(str): 解释器路径
+    - dist_name(str): 包名, 如 'pyinstaller'
+    - script_name(str): console_scripts 脚本名, 默认与包名相同
+    - site_packages_list(list): site-packages 文件夹列表, 为 None 时根据解释器路径查找
+
+    返回:
+    - dict: {'version': '6.3.0', 'entry_point': 'PyInstaller.__main__:_console_script_run', 'script_path': '...'},
+        未安装时返回空字典, 其中 entry_point, script_path 可能为 ''
+    """
+    if site_packages_list is None:
+        site_packages_list = find_site_packages_list(python_path)
+    info_path = find_dist_info_path(site_packages_list, dist_name)
+    if not info_path:
+        return {}
+    version = _read_version(info_path)
+    if not version:
+        return {}
+    script_name = script_name or dist_name
+    script_path = _find_script_in_record(info_path, script_name) or _find_script_in_scripts_dir(python_path, script_name)
+    return {
+        'version': version,
+        'entry_point': _read_console_scripts(info_path).get(script_name, ''),
+        'script_path': script_path,
+    }
+
+
+def read_pyinstaller_dist_info(python_path: str, site_packages_list: list = None) -> dict:
+    """
+    读取 pyinstaller 的版本, 入口及脚本路径, 键名与 probe_interpreter() 的返回值一致, 可直接合并
+
+    参数:
+    - python_path(str): 解释器路径
+    - site_packages_list(list): site-packages 文件夹列表, 为 None 时根据解释器路径查找
+
+    返回:
+    - dict: {'pyinstaller_version': '6.3.0', 'pyinstaller_entry_point': '...', 'pyinstaller_path': '...'}, 未安装时返回空字典
+    """
+    data = read_dist_info(python_path, 'pyinstaller', 'pyinstaller', site_packages_list)
+    if not data:
+        return {}
+    return {
+        'pyinstaller_version': data['version'],
+        'pyinstaller_entry_point': data['entry_point'],
+        'pyinstaller_path': data['script_path'],
+    }
@@ -0,0 +1,400 @@
+"""
+批量打包
+
+按清单并行执行多个 PyInstaller 打包任务, 不依赖 GUI.
+- 并行: 同时运行的 PyInstaller 进程数由 max_workers 限制, 每个进程由一个工作线程启动并读取输出
+- 隔离: 每个任务使用独立的工作文件夹, 其中包含 --workpath(build), spec 文件(spec)与日志文件. 执行目录通过 subprocess 的 cwd 传递,
+  不读取也不修改进程的当前工作目录. 任务总是使用 SpecFileGenerator 生成的 spec 文件执行, 其中的路径已按任务的执行目录转换为绝对路径;
+  直接传递 --specpath 时, PyInstaller 会按 spec 文件所在文件夹解析 --add-data 等相对路径
+- 状态: 任务状态变化与输出行通过回调通知, 回调在工作线程中调用. 输出由 ProcessOutputStream 按块读取并解析为 PyinstallerLogEvent
+- 耗时: 每个任务的阶段耗时保存到 BuildProfileHistory, 与上一次成功的打包相比明显变慢的阶段记录在 regression_list 中
+- 增量: 任务的工作文件夹在多次执行之间保留, 由 WorkpathManager 记录选项的哈希值, 选项变化时才清空, PyInstaller 的增量缓存可以复用
+- 缓存: 指定 BuildResultCache 时, 输入未变化的任务直接恢复上次的打包结果, 不启动 PyInstaller
+
+清单为 JSON 文件, 其中的相对路径按清单所在文件夹解析:
+{
+    "max_workers": 8,                       // 可选, 默认为 CPU 数
+    "work_root": "batch-build",             // 可选, 工作文件夹根目录, 默认为清单所在文件夹下的 batch-build
+    "jobs": [
+        {"project": "tools/a.ptproj"},                                      // 项目文件, 环境使用项目中保存的环境
+        {"name": "b", "command": "pyinstaller -F b.py", "cwd": "tools/b"},  // 命令, cwd 默认为清单所在文件夹
+        {"project": "tools/c.ptproj", "python": "C:/Python311/python.exe"}  // python / pyinstaller 覆盖项目中的环境
+    ]
+}
+
+类:
+- BatchJobStatus: 任务状态
+- BatchJob: 打包任务
+- BatchBuildRunner: 批量打包执行器
+"""
+import os
+import json
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from system.Struct_Pyinstaller import *
+from system.Loader_Pyinstaller_Struct import PyinstallerStructLoader
+from system.Manager_Project_File import ProjectFileManager, ProjectFileError
+from system.Planner_Build_Command import BuildCommand, plan_build_command, check_input_paths, get_output_base_path
+from system.Cache_Build_Result import BuildResultCache, get_environment_key
+from system.Manager_Workpath import WorkpathManager
+from system.Parser_Pyinstaller_Log import PyinstallerLogParser
+from system.Stream_Process_Output import ProcessOutputStream
+from system.Profiler_Build_Phase import BuildProfileHistory, profile_build, find_regressions
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+BATCH_WORK_ROOT_NAME: str = 'batch-build'
+BATCH_LOG_NAME: str = 'build.log'
+
+
+class BatchManifestError(Exception):
+    """ 清单格式错误 """
+
+
+class BatchJobStatus(object):
+    """
+    任务状态
+
+    - PENDING: 等待执行
+    - RUNNING: 正在执行
+    - SUCCEEDED: 打包成功
+    - FAILED: 打包失败, 或输入路径不存在, 或无法启动进程
+    - CANCELLED: 已取消
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+class BatchJob(object):
+    """
+    打包任务
+
+    属性:
+    - name(str): 任务名称, 在同一批次中唯一, 用作工作文件夹名称
+    - cwd(str): 执行目录
+    - pyinstaller_struct(PyinstallerStruct): 任务独占的结构
+    - work_folder_path(str): 工作文件夹, 包含 build, spec 文件夹与日志文件
+    - log_path(str): 日志文件路径
+    - build_command(BuildCommand): 打包命令, 开始执行前生成
+    - status(str): BatchJobStatus
+    - return_code(int | None): 进程返回码
+    - message(str): 失败原因
+    - elapsed(float): 耗时(秒)
+    - log_parser(PyinstallerLogParser): 日志解析器, 记录警告数量与不存在的模块
+    - event_list(list[PyinstallerLogEvent]): 阶段变化与警告事件
+    - build_profile(BuildProfile | None): 阶段耗时, 进程未启动或命中打包缓存时为 None
+    - regression_list(list[str]): 与上一次成功的打包相比明显变慢的阶段
+    """
+    __slots__ = ('name', 'cwd', 'pyinstaller_struct', 'work_folder_path', 'log_path', 'build_command', 'status', 'return_code', 'message', 'elapsed',
+                 'log_parser', 'event_list', 'build_profile', 'regression_list')
+
+    def __init__(self, name: str, cwd: str, pyinstaller_struct: PyinstallerStruct, work_folder_path: str) -> None:
+        self.name: str = name
+        self.cwd: str = cwd
+        self.pyinstaller_struct: PyinstallerStruct = pyinstaller_struct
+        self.work_folder_path: str = work_folder_path
+        self.log_path: str = os.path.join(work_folder_path, BATCH_LOG_NAME)
+        self.build_command: BuildCommand | None = None
+        self.status: str = BatchJobStatus.PENDING
+        self.return_code: int | None = None
+        self.message: str = ''
+        self.elapsed: float = 0.0
+        self.log_parser: PyinstallerLogParser = PyinstallerLogParser()
+        self.event_list: list = []
+        self.build_profile = None
+        self.regression_list: list = []
+
+    def __repr__(self) -> str:
+        return f'BatchJob({self.name!r}, status={self.status!r}, return_code={self.return_code})'
+
+
+class BatchBuildRunner(object):
+    """
+    批量打包执行器
+
+    参数:
+    - max_workers(int): 同时运行的 PyInstaller 进程数, 默认为 CPU 数
+    - work_root(str): 工作文件夹根目录, 默认为当前工作目录下的 batch-build
+    - build_cache(BuildResultCache): 打包结果缓存, 为 None 时不使用
+
+    属性:
+    - job_list(list[BatchJob]): 全部任务
+    - max_workers(int): 同时运行的进程数
+
+    方法:
+    - from_manifest(manifest_path: str, max_workers: int = None, build_cache: BuildResultCache = None) -> BatchBuildRunner: 由清单文件创建执行器(类方法)
+    - add_job(name: str, pyinstaller_struct: PyinstallerStruct, cwd: str, implement_path: str = '') -> BatchJob: 添加任务, 结构会被拷贝
+    - run(on_status=None, on_output=None) -> list: 执行全部任务, 阻塞直到完成. on_status(job), on_output(job, line) 在工作线程中调用
+    - cancel() -> None: 取消未开始的任务并结束正在运行的进程, 可在任意线程调用
+    """
+
+    def __init__(self, max_workers: int = None, work_root: str = '', build_cache: BuildResultCache = None) -> None:
+        self.__max_workers: int = max(1, max_workers or os.cpu_count() or 1)
+        self.__work_root: str = os.path.abspath(work_root or BATCH_WORK_ROOT_NAME)
+        self.__build_cache: BuildResultCache = build_cache
+        self.__job_list: list = []
+        self.__process_dict: dict = {}
+        """ 任务名称 -> 正在运行的进程 """
+        self.__lock = threading.Lock()
+        self.__isCancelled: bool = False
+
+    @property
+    def job_list(self) -> list:
+        return list(self.__job_list)
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    @classmethod
+    def from_manifest(cls, manifest_path: str, max_workers: int = None, build_cache: BuildResultCache = None) -> 'BatchBuildRunner':
+        """
+        由清单文件创建执行器, 清单格式见模块说明
+
+        参数:
+        - manifest_path(str): 清单文件路径
+        - max_workers(int): 同时运行的进程数, 优先于清单中的设置
+        - build_cache(BuildResultCache): 打包结果缓存, 为 None 时不使用
+
+        返回:
+        - BatchBuildRunner: 已添加全部任务的执行器
+
+        异常:
+        - BatchManifestError: 清单格式错误, 或任务的项目文件无法读取
+        """
+        manifest_path = os.path.abspath(manifest_path)
+        manifest_folder = os.path.dirname(manifest_path)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise BatchManifestError(f'无法读取清单: {e}')
+        if not isinstance(manifest, dict) or not isinstance(manifest.get('jobs'), list):
+            raise BatchManifestError('清单缺少 jobs 列表')
+
+        def resolve(path: str) -> str:
+            return os.path.normpath(os.path.join(manifest_folder, os.path.expanduser(path))) if path else ''
+
+        runner = cls(max_workers or manifest.get('max_workers'), resolve(manifest.get('work_root') or BATCH_WORK_ROOT_NAME), build_cache)
+        project_file_manager = ProjectFileManager()
+        for index, entry in enumerate(manifest['jobs'], 1):
+            if not isinstance(entry, dict):
+                raise BatchManifestError(f'第 {index} 个任务格式错误')
+            implement_path = resolve(entry.get('pyinstaller') or entry.get('python') or '')
+            if entry.get('project'):
+                project_path = resolve(entry['project'])
+                cwd = resolve(entry.get('cwd') or '') or os.path.dirname(project_path)
+                pyinstaller_struct = PyinstallerStruct()
+                pyinstaller_struct.set_base_path(cwd)
+                try:
+                    project_file = project_file_manager.load(project_path)
+                    project_file.apply(pyinstaller_struct)
+                except (OSError, ProjectFileError) as e:
+                    raise BatchManifestError(f'第 {index} 个任务无法读取项目文件 {project_path}: {e}')
+                if not implement_path:
+                    environment = project_file.environment
+                    implement_path = environment.get('path_pyinstaller') or environment.get('path_python') or project_file.implement_path
+                name = entry.get('name') or os.path.splitext(os.path.basename(project_path))[0]
+            elif entry.get('command'):
+                cwd = resolve(entry.get('cwd') or '') or manifest_folder
+                loader = PyinstallerStructLoader()
+                loader.set_base_path(cwd)
+                pyinstaller_struct = loader.read_command(entry['command'])
+                if not implement_path:
+                    implement_path = loader.implement_path
+                name = entry.get('name') or pyinstaller_struct.output_file_name.command_args \
+                    or os.path.splitext(os.path.basename(pyinstaller_struct.python_file_path.command_args))[0] or f'job{index}'
+            else:
+                raise BatchManifestError(f'第 {index} 个任务缺少 project 或 command')
+            runner.add_job(name, pyinstaller_struct, cwd, implement_path)
+        return runner
+
+    def add_job(self, name: str, pyinstaller_struct: PyinstallerStruct, cwd: str, implement_path: str = '') -> BatchJob:
+        """
+        添加任务. 结构会被拷贝, 并设置任务独占的 --workpath 与 --noconfirm(无人值守时 PyInstaller 不能等待确认)
+
+        参数:
+        - name(str): 任务名称, 与已有任务重名时自动添加序号
+        - pyinstaller_struct(PyinstallerStruct): 结构
+        - cwd(str): 执行目录
+        - implement_path(str): 执行器路径, pyinstaller 或 python 解释器, 为空时使用 PATH 中的 pyinstaller
+
+        返回:
+        - BatchJob: 任务
+        """
+        name_set = {job.name for job in self.__job_list}
+        unique_name = name
+        suffix = 2
+        while unique_name in name_set:
+            unique_name = f'{name}-{suffix}'
+            suffix += 1
+        cwd = os.path.abspath(cwd)
+        work_folder_path = os.path.join(self.__work_root, unique_name)
+        job_struct = pyinstaller_struct.copy()
+        job_struct.set_base_path(cwd)
+        with job_struct.batch():
+            job_struct.workpath_option.set_args(os.path.join(work_folder_path, 'build'))
+            job_struct.noconfirm_option.set_on()
+        job_struct.set_implement_path(implement_path)
+        job = BatchJob(unique_name, cwd, job_struct, work_folder_path)
+        self.__job_list.append(job)
+        return job
+
+    def run(self, on_status=None, on_output=None) -> list:
+        """
+        执行全部任务, 阻塞直到完成. 打包命令与 spec 文件在启动前统一生成, 工作线程只负责输入路径检查与进程
+
+        参数:
+        - on_status(callable): 任务状态变化时调用, 参数为 BatchJob
+        - on_output(callable): 任务输出一行时调用, 参数为 (BatchJob, str)
+
+        返回:
+        - list[BatchJob]: 全部任务
+        """
+        self.__isCancelled = False
+        # 输出文件夹相同的任务会互相覆盖, 只执行第一个
+        output_dict = {}
+        runnable_list = []
+        for job in self.__job_list:
+            output_path = os.path.normcase(get_output_base_path(job.pyinstaller_struct, job.cwd))
+            if output_path in output_dict:
+                self.__set_status(job, BatchJobStatus.FAILED, on_status, f'输出文件夹与任务 {output_dict[output_path]} 相同')
+                continue
+            output_dict[output_path] = job.name
+            runnable_list.append(job)
+        planned_list = []
+        for job in runnable_list:
+            # spec 文件无法写入(如工作文件夹无权限)只影响该任务
+            try:
+                job.pyinstaller_struct.refresh_list_files()
+                job.build_command = plan_build_command(job.pyinstaller_struct, job.cwd, isForceSpec=True,
+                                                       spec_folder_path=os.path.join(job.work_folder_path, 'spec'), workpath_manager=WorkpathManager())
+            except OSError as e:
+                lg.exception(f'无法生成打包命令: {job.name}')
+                self.__set_status(job, BatchJobStatus.FAILED, on_status, f'无法生成 spec 文件: {e}')
+                continue
+            if self.__build_cache is not None:
+                job.build_command.environment_key = get_environment_key(job.pyinstaller_struct.implement_path)
+            planned_list.append(job)
+        lg.info(f'批量打包开始: {len(self.__job_list)} 个任务, 并行数 {self.__max_workers}')
+        executor = ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix='BatchBuild')
+        try:
+            future_list = [executor.submit(self.__run_job, job, on_status, on_output) for job in planned_list]
+            for future in future_list:
+                future.result()
+        except KeyboardInterrupt:
+            # 未开始的任务直接标记为取消, 正在运行的进程被结束, 等待工作线程退出
+            self.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+        succeeded_count = sum(job.status == BatchJobStatus.SUCCEEDED for job in self.__job_list)
+        lg.info(f'批量打包结束: 成功 {succeeded_count}/{len(self.__job_list)}')
+        return list(self.__job_list)
+
+    def cancel(self) -> None:
+        with self.__lock:
+            self.__isCancelled = True
+            process_list = list(self.__process_dict.values())
+        for process in process_list:
+            if process.poll() is None:
+                process.terminate()
+
+    def __run_job(self, job: BatchJob, on_status, on_output) -> None:
+        try:
+            self.__execute(job, on_status, on_output)
+        except Exception as e:
+            lg.exception(f'批量打包任务异常: {job.name}')
+            self.__set_status(job, BatchJobStatus.FAILED, on_status, str(e))
+
+    def __execute(self, job: BatchJob, on_status, on_output) -> None:
+        if self.__isCancelled:
+            self.__set_status(job, BatchJobStatus.CANCELLED, on_status)
+            return
+        start_time = time.perf_counter()
+        self.__set_status(job, BatchJobStatus.RUNNING, on_status)
+        os.makedirs(job.work_folder_path, exist_ok=True)
+        with open(job.log_path, 'w', encoding='utf-8') as log_file:
+            log_file.write(f'cwd: {job.cwd}\nargv: {job.build_command.argv!r}\n\n')
+            missing_list = check_input_paths(job.build_command)
+            if missing_list:
+                message = '; '.join(f'{name} -> {path}' for name, path in missing_list)
+                log_file.write(f'路径不存在: {message}\n')
+                job.elapsed = time.perf_counter() - start_time
+                self.__set_status(job, BatchJobStatus.FAILED, on_status, f'路径不存在: {message}')
+                return
+            cache_key = ''
+            if self.__build_cache is not None:
+                cache_key, restored_path = self.__build_cache.lookup(job.build_command)
+                if restored_path:
+                    log_file.write(f'输入未变化, 已从打包缓存恢复: {restored_path}\n')
+                    job.return_code = 0
+                    job.elapsed = time.perf_counter() - start_time
+                    self.__set_status(job, BatchJobStatus.SUCCEEDED, on_status, '命中打包缓存')
+                    return
+            if WorkpathManager().prepare(job.build_command.work_path, job.build_command.work_options_hash):
+                log_file.write(f'打包选项已变化, 已清空工作文件夹: {job.build_command.work_path}\n')
+            process_start_time = time.time()
+            try:
+                process = subprocess.Popen(job.build_command.argv, cwd=job.cwd, stdin=subprocess.DEVNULL,
+                                           creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),
+                                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            except OSError as e:
+                log_file.write(f'无法启动打包进程: {e}\n')
+                job.elapsed = time.perf_counter() - start_time
+                self.__set_status(job, BatchJobStatus.FAILED, on_status, f'无法启动打包进程: {e}')
+                return
+            try:
+                with self.__lock:
+                    self.__process_dict[job.name] = process
+                if self.__isCancelled:
+                    process.terminate()
+
+                def on_batch(batch):
+                    log_file.write(batch.text)
+                    job.event_list.extend(batch.event_list)
+                    if on_output is not None:
+                        for line in batch.line_list:
+                            on_output(job, line)
+
+                ProcessOutputStream(on_batch, job.log_parser).pump(process.stdout)
+                job.return_code = process.wait()
+                job.build_profile = profile_build(job.build_command, job.event_list, process_start_time, time.time(), job.return_code)
+                previous_profile = BuildProfileHistory().add(job.build_profile)
+                if job.return_code == 0 and previous_profile is not None:
+                    job.regression_list = find_regressions(job.build_profile, previous_profile)
+                    for regression in job.regression_list:
+                        log_file.write(f'耗时增加: {regression}\n')
+            finally:
+                # 输出回调, 日志写入或耗时统计出错时不留下孤立的打包进程
+                if process.poll() is None:
+                    process.terminate()
+                    process.wait()
+                process.stdout.close()
+                with self.__lock:
+                    self.__process_dict.pop(job.name, None)
+            if job.return_code == 0 and cache_key and self.__build_cache.store(cache_key, job.build_command.output_base_path):
+                log_file.write('已保存到打包缓存\n')
+        job.elapsed = time.perf_counter() - start_time
+        if self.__isCancelled and job.return_code != 0:
+            self.__set_status(job, BatchJobStatus.CANCELLED, on_status)
+        elif job.return_code == 0:
+            self.__set_status(job, BatchJobStatus.SUCCEEDED, on_status)
+        else:
+            self.__set_status(job, BatchJobStatus.FAILED, on_status, f'返回码 {job.return_code}')
+
+    def __set_status(self, job: BatchJob, status: str, on_status, message: str = '') -> None:
+        job.status = status
+        job.message = message
+        if on_status is not None:
+            try:
+                on_status(job)
+            except Exception:
+                lg.exception(f'批量打包状态回调执行失败: {job.name}')
@@ -0,0 +1,204 @@
+import time
+import heapq
+
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+
+
+class ProbeScheduler(QObject):
+    """
+    解释器探测调度器
+
+    为每个环境记录下一次复查时间, 代替按固定间隔对所有环境排队检测. 复查结果未变化时复查间隔指数增长(直至上限),
+    发生变化时恢复为初始间隔. 同一环境的排队请求会被合并, 当前选中的环境始终最先派发.
+    同时运行的探测数不超过 max_running, 因此环境数量增多时, 轮询开销仍然可控.
+
+    调度器只负责决定 "何时探测哪个环境", 不执行探测. 派发的探测完成后, 需要调用 finish() 报告结果.
+
+    参数:
+    - base_interval(float): 初始复查间隔(秒), 默认 60
+    - max_interval(float): 最大复查间隔(秒), 默认 1800
+    - max_running(int): 同时运行的最大探测数, 默认 16
+    - tick_ms(int): 调度检查间隔(毫秒), 默认 500
+
+    信号:
+    - signal_probe_due(list): 需要探测的环境, 元素为 (键, 是否为强制请求), 按优先级排列.
+        强制请求(request() 提交)需要直接探测, 复查可先检查缓存指纹, 指纹未变化时直接报告未变化
+
+    属性:
+    - pending_count(int): 等待派发的探测数
+    - running_count(int): 已派发但尚未完成的探测数
+    - scheduled_count(int): 参与定期复查的环境数
+    - priority_key(str): 当前优先的环境键
+
+    方法:
+    - register(key: str) -> None: 加入定期复查
+    - unregister(key: str) -> None: 移除环境, 包括排队中的请求
+    - request(key: str) -> None: 立即请求探测, 同一环境的请求会被合并
+    - set_priority_key(key: str) -> None: 设置优先环境(当前选中的环境)
+    - finish(key: str, isChanged: bool) -> None: 报告探测完成, 根据是否变化调整复查间隔
+    - set_interval_factor(factor: float) -> None: 设置复查间隔倍数, 如窗口隐藏时延长复查间隔
+    - stop() -> None: 停止调度
+    """
+    signal_probe_due = pyqtSignal(list)
+
+    def __init__(self, base_interval: float = 60, max_interval: float = 1800, max_running: int = 16, tick_ms: int = 500):
+        super().__init__()
+        self.__base_interval: float = base_interval
+        self.__max_interval: float = max(base_interval, max_interval)
+        self.__max_running: int = max(1, max_running)
+        self.__interval_dict: dict = {}
+        """ 键 -> 当前复查间隔 """
+        self.__due_dict: dict = {}
+        """ 键 -> 下一次复查时间 """
+        self.__due_heap: list = []
+        """ (复查时间, 键) 小顶堆, 复查时间与 __due_dict 不一致的元素已过期, 出堆时忽略 """
+        self.__pending_dict: dict = {}
+        """ 键 -> 是否为强制请求, 等待派发 """
+        self.__running_set: set = set()
+        self.__rerun_set: set = set()
+        """ 运行中又收到强制请求的键, 完成后重新排队 """
+        self.__priority_key: str = ''
+        self.__interval_factor: float = 1
+        self.__timer_tick = QTimer(self)
+        self.__timer_tick.setInterval(tick_ms)
+        self.__timer_tick.timeout.connect(self.__tick)
+        self.__timer_tick.start()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self.__pending_dict)
+
+    @property
+    def running_count(self) -> int:
+        return len(self.__running_set)
+
+    @property
+    def scheduled_count(self) -> int:
+        return len(self.__due_dict)
+
+    @property
+    def priority_key(self) -> str:
+        return self.__priority_key
+
+    def register(self, key: str) -> None:
+        """
+        加入定期复查, 已加入的环境不会重置复查时间
+
+        参数:
+        - key(str): 环境键(一般为解释器路径)
+        """
+        if not key or key in self.__due_dict:
+            return
+        self.__interval_dict[key] = self.__base_interval
+        self.__set_due(key, time.monotonic() + self.__base_interval * self.__interval_factor)
+
+    def unregister(self, key: str) -> None:
+        """
+        移除环境, 排队中的请求一并移除, 正在运行的探测不再占用名额(由调用方负责取消)
+
+        参数:
+        - key(str): 环境键
+        """
+        self.__interval_dict.pop(key, None)
+        self.__due_dict.pop(key, None)
+        self.__pending_dict.pop(key, None)
+        self.__running_set.discard(key)
+        self.__rerun_set.discard(key)
+        if key == self.__priority_key:
+            self.__priority_key = ''
+
+    def request(self, key: str) -> None:
+        """
+        立即请求探测, 在下一次调度检查时派发. 已在排队中的请求会被合并, 正在运行时完成后重新排队
+
+        参数:
+        - key(str): 环境键
+        """
+        if not key:
+            return
+        if key in self.__running_set:
+            self.__rerun_set.add(key)
+            return
+        self.__pending_dict[key] = True
+        if key == self.__priority_key:
+            self.__tick()
+
+    def set_priority_key(self, key: str) -> None:
+        """
+        设置优先环境, 优先环境的探测始终最先派发, 且复查间隔不会增长. 设置后立即安排一次复查
+
+        参数:
+        - key(str): 环境键, 为空时取消优先
+        """
+        if key == self.__priority_key:
+            return
+        self.__priority_key = key
+        if key in self.__due_dict:
+            self.__interval_dict[key] = self.__base_interval
+            self.__set_due(key, time.monotonic())
+            self.__tick()
+
+    def finish(self, key: str, isChanged: bool) -> None:
+        """
+        报告探测完成, 未变化时复查间隔加倍(直至上限, 优先环境除外), 变化时恢复初始间隔
+
+        参数:
+        - key(str): 环境键
+        - isChanged(bool): 探测结果是否与之前不同
+        """
+        self.__running_set.discard(key)
+        if key in self.__due_dict:
+            interval = self.__interval_dict.get(key, self.__base_interval)
+            if isChanged or key == self.__priority_key:
+                interval = self.__base_interval
+            else:
+                interval = min(interval * 2, self.__max_interval)
+            self.__interval_dict[key] = interval
+            self.__set_due(key, time.monotonic() + interval * self.__interval_factor)
+        if key in self.__rerun_set:
+            self.__rerun_set.discard(key)
+            self.__pending_dict[key] = True
+
+    def set_interval_factor(self, factor: float) -> None:
+        """
+        设置复查间隔倍数, 对已安排的复查立即生效. 强制请求不受影响
+
+        参数:
+        - factor(float): 倍数, 如窗口隐藏时为 30, 显示时为 1
+        """
+        factor = max(1, factor)
+        if factor == self.__interval_factor:
+            return
+        self.__interval_factor = factor
+        now = time.monotonic()
+        for key, due_time in list(self.__due_dict.items()):
+            new_due_time = now + self.__interval_dict.get(key, self.__base_interval) * factor
+            # 间隔延长时推迟复查, 缩短时只提前不推迟
+            if factor > 1 or new_due_time < due_time:
+                self.__set_due(key, new_due_time)
+
+    def stop(self) -> None:
+        """ 停止调度, 程序关闭时调用 """
+        self.__timer_tick.stop()
+
+    def __set_due(self, key: str, due_time: float) -> None:
+        self.__due_dict[key] = due_time
+        heapq.heappush(self.__due_heap, (due_time, key))
+
+    def __tick(self) -> None:
+        now = time.monotonic()
+        while self.__due_heap and self.__due_heap[0][0] <= now:
+            due_time, key = heapq.heappop(self.__due_heap)
+            if self.__due_dict.get(key) != due_time or key in self.__running_set:
+                continue
+            # 已有强制请求时保留强制标记
+            self.__pending_dict.setdefault(key, False)
+        free_count = self.__max_running - len(self.__running_set)
+        if free_count <= 0 or not self.__pending_dict:
+            return
+        key_list = sorted(self.__pending_dict, key=lambda _key: (_key != self.__priority_key, not self.__pending_dict[_key]))
+        due_list = []
+        for key in key_list[:free_count]:
+            due_list.append((key, self.__pending_dict.pop(key)))
+            self.__running_set.add(key)
+        self.signal_probe_due.emit(due_list)
@@ -0,0 +1,430 @@
+"""
+pyinstaller 选项模式
+
+在目标解释器中运行内嵌脚本, 内省 PyInstaller 自身的 argparse 解析器, 得到该版本支持的全部命令行选项.
+每个 PyInstaller 版本只内省一次, 结果按版本缓存在内存和磁盘中, 切换不同版本的环境时直接使用缓存.
+
+类:
+- OptionKind: 选项类别
+- OptionRecord(option_strings, dest, kind, choices, isRepeatable): 选项记录
+- PyinstallerOptionSchema(version, action_list): 选项模式, 可由任一别名查找选项记录
+- OptionSchemaManager(exe_folder_path, cache_name): 选项模式管理器(单例)
+
+变量:
+- SCHEMA_SCRIPT: 内嵌内省脚本
+- SCHEMA_MARKER: 内省结果行前缀, 用于跳过无关输出
+- BUILTIN_ACTION_LIST: 内置选项列表(PyInstaller 6.3), 内省失败或未安装 PyInstaller 时使用
+"""
+import os
+import json
+import threading
+import subprocess
+
+from system.Probe_Interpreter import CREATION_FLAGS
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+SCHEMA_MARKER = '__PYTOEXE_SCHEMA__'
+
+SCHEMA_SCRIPT = r'''
+import sys, json, argparse
+try:
+    import PyInstaller
+    import PyInstaller.__main__ as pyi_main
+    if hasattr(pyi_main, 'generate_parser'):
+        parser = pyi_main.generate_parser()
+    else:
+        import PyInstaller.building.build_main as build_main
+        import PyInstaller.building.makespec as makespec
+        parser = argparse.ArgumentParser()
+        getattr(pyi_main, '__add_options')(parser)
+        getattr(build_main, '__add_options')(parser)
+        getattr(makespec, '__add_options')(parser)
+except Exception as e:
+    print('__PYTOEXE_SCHEMA__' + json.dumps({'error': repr(e)}))
+    sys.exit(0)
+actions = []
+for action in parser._actions:
+    if not action.option_strings:
+        continue
+    actions.append({
+        'option_strings': list(action.option_strings),
+        'dest': action.dest,
+        'nargs': action.nargs if isinstance(action.nargs, (int, str)) else None,
+        'choices': [str(choice) for choice in action.choices] if action.choices is not None else [],
+        'action': type(action).__name__,
+        'isRepeatable': isinstance(action, argparse._AppendAction) or isinstance(action.default, list),
+    })
+print('__PYTOEXE_SCHEMA__' + json.dumps({'version': getattr(PyInstaller, '__version__', ''), 'actions': actions}))
+'''
+
+
+def _builtin_action(action: str, option_strings: list, dest: str, nargs=None, choices: list = None, isRepeatable: bool = False) -> dict:
+    return {'option_strings': option_strings, 'dest': dest, 'nargs': nargs, 'choices': choices or [], 'action': action, 'isRepeatable': isRepeatable}
+
+
+BUILTIN_ACTION_LIST = [
+    _builtin_action('_StoreFalseAction', ['-D', '--onedir'], 'onefile', 0),
+    _builtin_action('_StoreTrueAction', ['-F', '--onefile'], 'onefile', 0),
+    _builtin_action('_StoreAction', ['--specpath'], 'specpath'),
+    _builtin_action('_StoreAction', ['-n', '--name'], 'name'),
+    _builtin_action('_StoreAction', ['--contents-directory'], 'contents_directory'),
+    _builtin_action('SourceDestAction', ['--add-data'], 'datas', isRepeatable=True),
+    _builtin_action('SourceDestAction', ['--add-binary'], 'binaries', isRepeatable=True),
+    _builtin_action('_AppendAction', ['-p', '--paths'], 'pathex', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--hidden-import', '--hiddenimport'], 'hiddenimports', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--collect-submodules'], 'collect_submodules', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--collect-data', '--collect-datas'], 'collect_data', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--collect-binaries'], 'collect_binaries', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--collect-all'], 'collect_all', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--copy-metadata'], 'copy_metadata', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--recursive-copy-metadata'], 'recursive_copy_metadata', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--additional-hooks-dir'], 'hookspath', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--runtime-hook'], 'runtime_hooks', isRepeatable=True),
+    _builtin_action('_AppendAction', ['--exclude-module'], 'excludes', isRepeatable=True),
+    _builtin_action('_StoreAction', ['--splash'], 'splash'),
+    _builtin_action('_AppendAction', ['-d', '--debug'], 'debug', choices=['all', 'imports', 'bootloader', 'noarchive'], isRepeatable=True),
+    _builtin_action('_AppendAction', ['--python-option'], 'python_options', isRepeatable=True),
+    _builtin_action('_StoreTrueAction', ['-s', '--strip'], 'strip', 0),
+    _builtin_action('_StoreTrueAction', ['--noupx'], 'noupx', 0),
+    _builtin_action('_AppendAction', ['--upx-exclude'], 'upx_exclude', isRepeatable=True),
+    _builtin_action('_StoreTrueAction', ['-c', '--console', '--nowindowed'], 'console', 0),
+    _builtin_action('_StoreFalseAction', ['-w', '--windowed', '--noconsole'], 'console', 0),
+    _builtin_action('_StoreAction', ['--hide-console'], 'hide_console', choices=['hide-early', 'hide-late', 'minimize-early', 'minimize-late']),
+    _builtin_action('_AppendAction', ['-i', '--icon'], 'icon_file', isRepeatable=True),
+    _builtin_action('_StoreTrueAction', ['--disable-windowed-traceback'], 'disable_windowed_traceback', 0),
+    _builtin_action('_StoreAction', ['--version-file'], 'version_file'),
+    _builtin_action('_StoreAction', ['-m', '--manifest'], 'manifest'),
+    _builtin_action('_AppendAction', ['-r', '--resource'], 'resources', isRepeatable=True),
+    _builtin_action('_StoreTrueAction', ['--uac-admin'], 'uac_admin', 0),
+    _builtin_action('_StoreTrueAction', ['--uac-uiaccess'], 'uac_uiaccess', 0),
+    _builtin_action('_StoreTrueAction', ['--argv-emulation'], 'argv_emulation', 0),
+    _builtin_action('_StoreAction', ['--osx-bundle-identifier'], 'bundle_identifier'),
+    _builtin_action('_StoreAction', ['--target-architecture', '--target-arch'], 'target_arch'),
+    _builtin_action('_StoreAction', ['--codesign-identity'], 'codesign_identity'),
+    _builtin_action('_StoreAction', ['--osx-entitlements-file'], 'entitlements_file'),
+    _builtin_action('_StoreAction', ['--runtime-tmpdir'], 'runtime_tmpdir'),
+    _builtin_action('_StoreTrueAction', ['--bootloader-ignore-signals'], 'bootloader_ignore_signals', 0),
+    _builtin_action('_StoreAction', ['--distpath'], 'distpath'),
+    _builtin_action('_StoreAction', ['--workpath'], 'workpath'),
+    _builtin_action('_StoreTrueAction', ['-y', '--noconfirm'], 'noconfirm', 0),
+    _builtin_action('_StoreAction', ['--upx-dir'], 'upx_dir'),
+    _builtin_action('_StoreTrueAction', ['--clean'], 'clean_build', 0),
+    _builtin_action('_StoreAction', ['--log-level'], 'loglevel', choices=['TRACE', 'DEBUG', 'INFO', 'WARN', 'DEPRECATION', 'ERROR', 'FATAL']),
+]
+_SCHEMA_CACHE_VERSION = 1
+
+
+class OptionKind(object):
+    """
+    选项类别
+
+    - SWITCH: 开关, 不带参数, 如 --clean
+    - FLAG: 状态标志, 不带参数, 与其他标志共用同一目标, 互斥, 如 --onefile/--onedir
+    - CHOICE: 带参数, 参数只能从给定值中选择, 如 --log-level
+    - SINGLE: 带参数, 只取最后一次, 如 --distpath
+    - MULTI: 带参数, 可重复, 如 --hidden-import
+    - REMOVED: 已移除的选项, 仍被解析器接受但只会报错
+    """
+    SWITCH = 'switch'
+    FLAG = 'flag'
+    CHOICE = 'choice'
+    SINGLE = 'single'
+    MULTI = 'multi'
+    REMOVED = 'removed'
+
+
+class OptionRecord(object):
+    """
+    选项记录
+
+    参数:
+    - option_strings(tuple): 选项的全部别名, 如 ('-p', '--paths')
+    - dest(str): argparse 中的目标名, 如 'pathex'
+    - kind(str): 选项类别, OptionKind 之一
+    - choices(tuple): 可选值, 无限制时为空
+    - isRepeatable(bool): 是否可重复
+
+    属性:
+    - option_strings, dest, kind, choices, isRepeatable
+    - takes_value(bool): 是否需要参数
+    """
+    __slots__ = ('__option_strings', '__dest', '__kind', '__choices', '__isRepeatable')
+
+    def __init__(self, option_strings: tuple, dest: str, kind: str, choices: tuple = (), isRepeatable: bool = False):
+        self.__option_strings: tuple = tuple(option_strings)
+        self.__dest: str = dest
+        self.__kind: str = kind
+        self.__choices: tuple = tuple(choices)
+        self.__isRepeatable: bool = isRepeatable
+
+    @property
+    def option_strings(self) -> tuple:
+        return self.__option_strings
+
+    @property
+    def dest(self) -> str:
+        return self.__dest
+
+    @property
+    def kind(self) -> str:
+        return self.__kind
+
+    @property
+    def choices(self) -> tuple:
+        return self.__choices
+
+    @property
+    def isRepeatable(self) -> bool:
+        return self.__isRepeatable
+
+    @property
+    def takes_value(self) -> bool:
+        return self.__kind in (OptionKind.CHOICE, OptionKind.SINGLE, OptionKind.MULTI)
+
+    def __repr__(self) -> str:
+        return f'OptionRecord({self.__option_strings!r}, {self.__dest!r}, {self.__kind!r})'
+
+
+class PyinstallerOptionSchema(object):
+    """
+    pyinstaller 选项模式
+
+    由内省得到的 argparse 选项列表生成选项记录, 并建立 别名 -> 选项记录 的字典
+
+    参数:
+    - version(str): PyInstaller 版本, 内置模式为空
+    - action_list(list): 选项列表, 元素为 SCHEMA_SCRIPT 输出的字典
+
+    属性:
+    - version(str): PyInstaller 版本
+    - isBuiltin(bool): 是否为内置模式
+    - record_list(list): 选项记录列表, 按解析器中的顺序排列
+    - action_list(list): 原始选项列表, 用于持久化
+
+    方法:
+    - find(option: str) -> OptionRecord | None: 由任一别名查找选项记录
+    """
+
+    def __init__(self, version: str, action_list: list, isBuiltin: bool = False):
+        self.__version: str = version
+        self.__isBuiltin: bool = isBuiltin
+        self.__action_list: list = action_list
+        self.__record_list: list = []
+        self.__option_record_dict: dict = {}
+        dest_count_dict = {}
+        for action in action_list:
+            if action.get('nargs') == 0:
+                dest_count_dict[action.get('dest')] = dest_count_dict.get(action.get('dest'), 0) + 1
+        for action in action_list:
+            kind = self.__classify(action, dest_count_dict)
+            if kind is None:
+                continue
+            record = OptionRecord(action['option_strings'], action.get('dest', ''), kind, action.get('choices', []), action.get('isRepeatable', False))
+            self.__record_list.append(record)
+            for option in record.option_strings:
+                self.__option_record_dict[option] = record
+
+    @property
+    def version(self) -> str:
+        return self.__version
+
+    @property
+    def isBuiltin(self) -> bool:
+        return self.__isBuiltin
+
+    @property
+    def record_list(self) -> list:
+        return list(self.__record_list)
+
+    @property
+    def action_list(self) -> list:
+        return self.__action_list
+
+    def find(self, option: str) -> OptionRecord | None:
+        """
+        由任一别名查找选项记录
+
+        参数:
+        - option(str): 选项, 如 '-p', '--paths'
+
+        返回:
+        - OptionRecord | None: 选项记录, 不存在时返回 None
+        """
+        return self.__option_record_dict.get(option)
+
+    def __classify(self, action: dict, dest_count_dict: dict) -> str | None:
+        """ 根据 argparse 选项确定类别, --help/--version 不参与构建, 返回 None """
+        action_name: str = action.get('action', '')
+        if not action.get('option_strings') or action_name in ('_HelpAction', '_VersionAction'):
+            return None
+        if action_name.startswith('_Removed'):
+            return OptionKind.REMOVED
+        if action.get('nargs') == 0:
+            # 多个无参数选项共用同一目标时, 为互斥的状态标志, 如 --onefile/--onedir
+            if dest_count_dict.get(action.get('dest'), 0) > 1:
+                return OptionKind.FLAG
+            return OptionKind.SWITCH
+        if action.get('choices'):
+            return OptionKind.CHOICE
+        if action.get('isRepeatable'):
+            return OptionKind.MULTI
+        return OptionKind.SINGLE
+
+    def __copy__(self) -> 'PyinstallerOptionSchema':
+        return self
+
+    def __deepcopy__(self, memo) -> 'PyinstallerOptionSchema':
+        # 模式创建后不再修改, 复制结构时共用同一模式
+        return self
+
+    def __repr__(self) -> str:
+        return f'PyinstallerOptionSchema({self.__version or "builtin"!r}, {len(self.__record_list)} options)'
+
+
+class OptionSchemaManager(object):
+    """
+    选项模式管理器(单例)
+
+    每个 PyInstaller 版本只内省一次, 结果缓存在内存中并持久化到磁盘. 不同版本的环境之间切换时, get() 只查找内存, 不启动进程.
+    内省失败的版本在本次运行中不再重试, 使用内置模式
+
+    参数:
+    - exe_folder_path(str): 缓存文件所在文件夹路径, 默认为 APP_WORKSPACE_PATH
+    - cache_name(str): 缓存文件名, 默认为 '.option_schema_cache'
+
+    属性:
+    - builtin_schema(PyinstallerOptionSchema): 内置模式
+
+    方法:
+    - get(pyinstaller_version: str) -> PyinstallerOptionSchema: 获取已缓存的模式, 不存在时返回内置模式, 不启动进程
+    - has(pyinstaller_version: str) -> bool: 是否已缓存该版本的模式
+    - load(python_path: str, pyinstaller_version: str, timeout: float = 30) -> PyinstallerOptionSchema:
+        获取模式, 未缓存时在目标解释器中内省, 会阻塞, 应在线程中调用
+    """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__isInitialized = False
+        return cls.__instance
+
+    def __init__(self, exe_folder_path: str = APP_WORKSPACE_PATH, cache_name: str = '.option_schema_cache') -> None:
+        if self.__isInitialized:
+            return
+        self.__isInitialized = True
+        self.__cache_path: str = os.path.join(exe_folder_path, cache_name)
+        self.__lock = threading.Lock()
+        self.__load_lock = threading.Lock()
+        """ 内省锁, 同一时间只内省一个版本, 避免同一版本重复内省 """
+        self.__builtin_schema = PyinstallerOptionSchema('', BUILTIN_ACTION_LIST, isBuiltin=True)
+        self.__schema_dict: dict = {}
+        """ PyInstaller 版本 -> PyinstallerOptionSchema """
+        self.__failed_set: set = set()
+        self.__load_cache_file()
+
+    @property
+    def builtin_schema(self) -> PyinstallerOptionSchema:
+        return self.__builtin_schema
+
+    def get(self, pyinstaller_version: str) -> PyinstallerOptionSchema:
+        """
+        获取已缓存的模式, 只查找内存
+
+        参数:
+        - pyinstaller_version(str): PyInstaller 版本
+
+        返回:
+        - PyinstallerOptionSchema: 该版本的模式, 未缓存时返回内置模式
+        """
+        with self.__lock:
+            return self.__schema_dict.get(pyinstaller_version, self.__builtin_schema)
+
+    def has(self, pyinstaller_version: str) -> bool:
+        with self.__lock:
+            return pyinstaller_version in self.__schema_dict
+
+    def load(self, python_path: str, pyinstaller_version: str, timeout: float = 30) -> PyinstallerOptionSchema:
+        """
+        获取模式, 未缓存时在目标解释器中内省 PyInstaller 的解析器并写入缓存. 会启动进程, 应在线程中调用
+
+        参数:
+        - python_path(str): 解释器路径
+        - pyinstaller_version(str): 该解释器中的 PyInstaller 版本
+        - timeout(float): 超时时间(秒), 默认 30
+
+        返回:
+        - PyinstallerOptionSchema: 该版本的模式, 内省失败时返回内置模式
+        """
+        if not python_path or not pyinstaller_version:
+            return self.__builtin_schema
+        with self.__load_lock:
+            with self.__lock:
+                if pyinstaller_version in self.__schema_dict:
+                    return self.__schema_dict[pyinstaller_version]
+                if pyinstaller_version in self.__failed_set:
+                    return self.__builtin_schema
+            action_list = self.__introspect(python_path, timeout)
+            with self.__lock:
+                if action_list is None:
+                    self.__failed_set.add(pyinstaller_version)
+                    return self.__builtin_schema
+                schema = PyinstallerOptionSchema(pyinstaller_version, action_list)
+                self.__schema_dict[pyinstaller_version] = schema
+            self.__save_cache_file()
+            lg.info(f'PyInstaller {pyinstaller_version} 选项模式已生成: {len(schema.record_list)} 个选项')
+            return schema
+
+    def __introspect(self, python_path: str, timeout: float) -> list | None:
+        """ 在目标解释器中运行 SCHEMA_SCRIPT, 返回选项列表, 失败时返回 None """
+        try:
+            result = subprocess.run([python_path, '-c', SCHEMA_SCRIPT], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    text=True, timeout=timeout, creationflags=CREATION_FLAGS)
+        except (OSError, subprocess.SubprocessError):
+            lg.exception(f'PyInstaller 选项内省失败: {python_path}')
+            return None
+        for line in result.stdout.splitlines():
+            if not line.startswith(SCHEMA_MARKER):
+                continue
+            try:
+                data = json.loads(line[len(SCHEMA_MARKER):])
+            except json.JSONDecodeError:
+                break
+            if not isinstance(data, dict) or not isinstance(data.get('actions'), list):
+                lg.warning(f'PyInstaller 选项内省失败: {python_path} {data.get("error", "") if isinstance(data, dict) else ""}')
+                return None
+            return data['actions']
+        lg.warning(f'PyInstaller 选项内省无输出: {python_path}')
+        return None
+
+    def __load_cache_file(self) -> None:
+        """ 加载缓存文件, 文件损坏或版本不一致时忽略 """
+        if not os.path.exists(self.__cache_path):
+            return
+        try:
+            with open(self.__cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            lg.warning('选项模式缓存文件损坏, 已忽略')
+            return
+        if not isinstance(data, dict) or data.get('version') != _SCHEMA_CACHE_VERSION:
+            return
+        for pyinstaller_version, action_list in data.get('schemas', {}).items():
+            if isinstance(action_list, list):
+                self.__schema_dict[pyinstaller_version] = PyinstallerOptionSchema(pyinstaller_version, action_list)
+
+    def __save_cache_file(self) -> None:
+        with self.__lock:
+            data = {
+                'version': _SCHEMA_CACHE_VERSION,
+                'schemas': {version: schema.action_list for version, schema in self.__schema_dict.items()},
+            }
+        temp_path = f'{self.__cache_path}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.__cache_path)
+        except OSError:
+            lg.exception('选项模式缓存写入失败')
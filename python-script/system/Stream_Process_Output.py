@@ -0,0 +1,151 @@
+"""
+子进程输出流
+
+按块读取子进程的输出(不按行阻塞读取), 增量解码后按固定的时间间隔成批交给回调, 避免每行一次信号与一次 TextBrowser 追加.
+- 读取: 读取线程每次读取管道中已有的数据(最多 CHUNK_SIZE 字节), 不等待换行
+- 解析: 完整的行交给解析器(如 PyinstallerLogParser), 得到结构化事件; 未结束的行保留到下一块
+- 分批: 调用线程每隔 interval 秒将期间的原始文本, 完整的行与事件作为一个 OutputBatch 交给回调. 原始文本保留换行符, 可直接追加显示
+
+类:
+- OutputBatch: 一批输出
+- ProcessOutputStream: 输出流
+"""
+import codecs
+import locale
+import threading
+
+CHUNK_SIZE: int = 65536
+DEFAULT_INTERVAL: float = 0.05
+""" 默认每 50 毫秒交付一批, 界面每秒最多更新 20 次 """
+
+
+class OutputBatch(object):
+    """
+    一批输出
+
+    属性:
+    - text(str): 原始文本, 换行符统一为 '\\n', 最后一行可能不完整
+    - line_list(list[str]): 本批中结束的行, 不含换行符
+    - event_list(list): 解析器产生的事件
+    """
+    __slots__ = ('text', 'line_list', 'event_list')
+
+    def __init__(self, text: str, line_list: list, event_list: list) -> None:
+        self.text: str = text
+        self.line_list: list = line_list
+        self.event_list: list = event_list
+
+    def __repr__(self) -> str:
+        return f'OutputBatch(chars={len(self.text)}, lines={len(self.line_list)}, events={len(self.event_list)})'
+
+
+class ProcessOutputStream(object):
+    """
+    子进程输出流
+
+    参数:
+    - on_batch(callable): 交付一批输出时调用, 参数为 OutputBatch, 在调用 pump() 的线程中执行
+    - parser(object): 解析器, 需提供 parse_line(line: str) -> list 方法, 为 None 时不解析
+    - interval(float): 交付间隔(秒)
+    - encoding(str): 子进程输出的编码, 默认与 subprocess 的文本模式一致(locale.getpreferredencoding)
+
+    属性:
+    - line_count(int): 已读取的完整行数
+    - event_list(list): 全部事件
+
+    方法:
+    - pump(stream) -> None: 读取二进制流直到结束, 阻塞, 期间按间隔交付
+    - feed(data: bytes) -> None: 写入一块数据, 可在任意线程调用
+    - flush(isFinal: bool = False) -> None: 立即交付已读取的数据, isFinal 为 True 时将未结束的行作为完整的行
+    """
+
+    def __init__(self, on_batch, parser=None, interval: float = DEFAULT_INTERVAL, encoding: str = '') -> None:
+        self.__on_batch = on_batch
+        self.__parser = parser
+        self.__interval: float = interval
+        self.__decoder = codecs.getincrementaldecoder(encoding or locale.getpreferredencoding(False))(errors='replace')
+        self.__lock = threading.Lock()
+        self.__text_list: list = []
+        self.__line_list: list = []
+        self.__event_list: list = []
+        self.__all_event_list: list = []
+        self.__partial_line: str = ''
+        self.__isCarriageReturnPending: bool = False
+        self.__line_count: int = 0
+
+    @property
+    def line_count(self) -> int:
+        return self.__line_count
+
+    @property
+    def event_list(self) -> list:
+        with self.__lock:
+            return list(self.__all_event_list)
+
+    def pump(self, stream) -> None:
+        """
+        读取二进制流直到结束. 读取在内部线程中进行, 调用线程每隔 interval 秒交付一次, 结束时交付剩余数据
+
+        参数:
+        - stream: 二进制流, 如 Popen(stdout=PIPE) 的 stdout(不能使用 text=True)
+        """
+        reader = threading.Thread(target=self.__read, args=(stream,), name='ProcessOutputStream', daemon=True)
+        reader.start()
+        while reader.is_alive():
+            reader.join(self.__interval)
+            self.flush()
+        self.feed(b'', isFinal=True)
+        self.flush(isFinal=True)
+
+    def feed(self, data: bytes, isFinal: bool = False) -> None:
+        text = self.__decoder.decode(data, final=isFinal)
+        if self.__isCarriageReturnPending:
+            text = '\r' + text
+            self.__isCarriageReturnPending = False
+        if text.endswith('\r') and not isFinal:
+            # '\r\n' 可能被分在两块中
+            text = text[:-1]
+            self.__isCarriageReturnPending = True
+        if not text:
+            return
+        text = text.replace('\r\n', '\n')
+        line_list = (self.__partial_line + text).split('\n')
+        self.__partial_line = line_list.pop()
+        event_list = []
+        if self.__parser is not None:
+            for line in line_list:
+                event_list.extend(self.__parser.parse_line(line))
+        with self.__lock:
+            self.__text_list.append(text)
+            self.__line_list.extend(line_list)
+            self.__event_list.extend(event_list)
+            self.__line_count += len(line_list)
+
+    def flush(self, isFinal: bool = False) -> None:
+        with self.__lock:
+            if isFinal and self.__partial_line:
+                line = self.__partial_line
+                self.__partial_line = ''
+                self.__line_list.append(line)
+                self.__line_count += 1
+                if self.__parser is not None:
+                    self.__event_list.extend(self.__parser.parse_line(line))
+            if not self.__text_list and not self.__line_list:
+                return
+            batch = OutputBatch(''.join(self.__text_list), self.__line_list, self.__event_list)
+            self.__all_event_list.extend(self.__event_list)
+            self.__text_list = []
+            self.__line_list = []
+            self.__event_list = []
+        self.__on_batch(batch)
+
+    def __read(self, stream) -> None:
+        read = getattr(stream, 'read1', stream.read)
+        while True:
+            try:
+                data = read(CHUNK_SIZE)
+            except (OSError, ValueError):
+                break
+            if not data:
+                break
+            self.feed(data)
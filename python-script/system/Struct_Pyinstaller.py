@@ -6,12 +6,13 @@ pyinstaller数据结构类
 - SwitchStruct(name:str, cmd_option:str): 开关类, 用于存储开关参数
 - StateStruct(name:str, cmd_option:str): 状态类, 用于存储状态参数, 例如:  --onefile --console --debug 等
 - SingleInfoStruct(name:str, cmd_option:str): 单信息类, 用于存储单信息参数, 例如:  --distpath=E:\Programm 等
+- ListStruct(name:str, cmd_option:str): 列表类, 多信息类与相对地址类的基类, 参数有序去重, 命令行延迟生成, 可引用外部列表文件
 - MultiInfoStruct(name:str, cmd_option:str): 多信息类, 用于存储多信息参数, 例如:  --add-data=1.txt;E:\Programm 等
 - RelPathStruct(name:str, cmd_option:str): 相对地址类, 用于存储相对地址参数, 例如:  --add-data="Programm;." 等
 - PyinstallerStruct(name:str, cmd_option:str): pyinstaller数据结构类
 
 函数: 
-- 无
+- split_source_dest(value:str): 拆分 --add-data / --add-binary 的参数
 
 变量: 
 - 无
@@ -21,9 +22,45 @@ pyinstaller数据结构类
 
 """
 import os
+import re
 import pprint
-import copy
-from .Signal_Event import EventSignal
+import functools
+import contextlib
+from DToolslib import EventSignal
+
+from system.Cache_Path_Stat import PathStatCache
+
+
+_SOURCE_DEST_PATTERN = re.compile(rf'(^\w:[/\\])|[:{re.escape(os.pathsep)}]')
+""" 与 PyInstaller 的 SourceDestAction 一致, 忽略盘符中的冒号 """
+_GLOB_CHARACTERS = ('*', '?', '[')
+_PYTHON_NAME_PATTERN = re.compile(r'python(\d+(\.\d+)*)?')
+
+
+def split_source_dest(value: str) -> tuple:
+    """
+    拆分 --add-data / --add-binary 的参数
+
+    参数:
+    - value(str): 如 'E:\\res;res' 或 'res:res'
+
+    返回:
+    - tuple[str, str]: (源路径, 目标路径), 无分隔符时目标路径为 '.'
+    """
+    for match in _SOURCE_DEST_PATTERN.finditer(value):
+        if match.group(1) is not None:
+            continue
+        return value[:match.start()], value[match.end():] or '.'
+    return value, '.'
+
+
+def _emit_once(func):
+    """ 方法执行期间的所有变更只在方法结束时发射一次信号, 保证信号发射时命令行已更新 """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._hold_changes():
+            return func(self, *args, **kwargs)
+    return wrapper
 
 
 class BasicStruct(object):
@@ -35,31 +72,49 @@ class BasicStruct(object):
     - cmd_option: 命令行选项
 
     信号: 
-    - signal_isChanged: 数据变更信号
+    - signal_isChanged(str): 数据变更信号(实例信号), 参数为结构名称. 一次方法调用只发射一次
 
     属性: 
     - name: 结构名称
     - command_option: 命令行选项
     - command_args: 命令行参数
     - command: 命令行
+    - arguments: 参数列表, 不含引号, 可直接传给 subprocess, 子类实现
+    - revision: 修订号, 每次数据变更时递增, 用于增量渲染命令行
 
     方法: 
+    - snapshot() -> tuple: 获取不可变快照, 数据未变更时返回同一对象
+    - restore(snapshot:tuple): 恢复到快照
+    - change_clock() -> int: 全局变更计数, 任一结构变更时递增(类方法)
+    - _mark_changed():  递增修订号, 不发射信号
+    - _emit_changed():  递增修订号并发射数据变更信号, 子类变更数据后调用
+    - _hold_changes():  上下文管理器, 期间的变更在退出时合并为一次信号
     - _set_command_option(command_option:str|list):  设置命令行选项
-    - _set_args(para:str):  设置命令行参数, 直接覆盖添加
-    - _add_args(para:str):  添加命令行参数, 在原有基础添加
+    - _set_args(para:str|list):  设置命令行参数, 直接覆盖添加. 可重复的参数按顺序去重
+    - _add_args(para:str) -> bool:  添加命令行参数, 在原有基础添加, 已存在时不添加
+    - _extend_args(para_list:Iterable[str]) -> list:  批量添加命令行参数, 只发射一次信号, 返回实际添加的参数
+    - _remove_args(para:str) -> int:  移除命令行参数, 返回移除的位置, 不存在时返回 -1
     - _clear_args():  清空命令行参数
     """
-    signal_isChanged = EventSignal()
+    signal_isChanged = EventSignal(str)
+    __change_clock: int = 0
 
     def __init__(self, name: str, cmd_option: str | list, isRepeatable: bool = False):
         super().__init__()
+        self.__hold_count = 0
+        self.__isPending = False
+        self.__revision = 0
+        self.__snapshot: tuple | None = None
+        self.__snapshot_revision = -1
         self.__name = name
         self.__command_option: str | list = cmd_option  # 例如:  '--distpath' 或  ['-D', '--distpath']
         if isRepeatable:
             self.__command_args: list = []  # 例如:  ["E:\\10_Programm"] (可重复)
         else:
             self.__command_args: str = ''  # 例如:  "E:\\10_Programm" (不可重复)
-        self._command = ''
+        self.__command_args_set: set = set()
+        """ 可重复参数的成员集合, 与 __command_args 一起构成有序集合, 用于 O(1) 去重 """
+        self.__command = ''
 
     @property
     def name(self) -> str:
@@ -77,30 +132,148 @@ class BasicStruct(object):
     def command(self) -> str:
         return self._command
 
+    @property
+    def arguments(self) -> list:
+        return []
+
+    @property
+    def revision(self) -> int:
+        return self.__revision
+
+    @property
+    def _command(self) -> str:
+        return self.__command
+
+    @_command.setter
+    def _command(self, command: str) -> None:
+        # 命令行可能在发射信号后才更新, 此处同样递增修订号, 保证渲染缓存不会保留旧命令
+        if command == self.__command:
+            return
+        self.__command = command
+        self._mark_changed()
+
+    @classmethod
+    def change_clock(cls) -> int:
+        return BasicStruct.__change_clock
+
+    def snapshot(self) -> tuple:
+        """ 
+        获取不可变快照. 数据未变更时返回同一个元组, 因此多个快照之间共用未变更结构的数据
+        """
+        if self.__snapshot is None or self.__snapshot_revision != self.__revision:
+            self.__snapshot = self._capture()
+            self.__snapshot_revision = self.__revision
+        return self.__snapshot
+
+    @_emit_once
+    def restore(self, snapshot: tuple) -> None:
+        """ 
+        恢复到快照, 与当前数据一致时不做任何操作
+
+        参数:
+        - snapshot: 由 snapshot() 获取的快照
+        """
+        if snapshot is self.snapshot() or snapshot == self.__snapshot:
+            return
+        self._apply(snapshot)
+        self._emit_changed()
+        self.__snapshot = snapshot
+        self.__snapshot_revision = self.__revision
+
+    def _capture(self) -> tuple:
+        """ 生成快照, 子类在末尾追加自身的数据 """
+        command_args = tuple(self.__command_args) if isinstance(self.__command_args, list) else self.__command_args
+        return (self.__command_option, command_args, self._command)
+
+    def _apply(self, snapshot: tuple) -> None:
+        """ 由快照恢复数据, 不发射信号 """
+        command_option, command_args, command = snapshot[:3]
+        self.__command_option = command_option
+        if isinstance(self.__command_args, list):
+            self.__command_args = list(command_args)
+            self.__command_args_set = set(command_args)
+        else:
+            self.__command_args = command_args
+        self.__command = command
+
+    def _mark_changed(self) -> None:
+        BasicStruct.__change_clock += 1
+        self.__revision = BasicStruct.__change_clock
+
+    def _emit_changed(self) -> None:
+        self._mark_changed()
+        if self.__hold_count > 0:
+            self.__isPending = True
+            return
+        self.signal_isChanged.emit(self.__name)
+
+    @contextlib.contextmanager
+    def _hold_changes(self):
+        self.__hold_count += 1
+        try:
+            yield
+        finally:
+            self.__hold_count -= 1
+            if self.__hold_count == 0 and self.__isPending:
+                self.__isPending = False
+                self.signal_isChanged.emit(self.__name)
+
     def _set_args(self, para: str | list) -> None:
+        if isinstance(para, list):
+            para = list(dict.fromkeys(para))
         if para == self.__command_args:
             return
         self.__command_args = para
-        self.signal_isChanged.emit()
-
-    def _add_args(self, para: str) -> None:
-        if isinstance(self.__command_args, list):
+        if isinstance(para, list):
+            self.__command_args_set = set(para)
+        self._emit_changed()
+
+    def _add_args(self, para: str) -> bool:
+        if not isinstance(self.__command_args, list) or para in self.__command_args_set:
+            return False
+        self.__command_args.append(para)
+        self.__command_args_set.add(para)
+        self._emit_changed()
+        return True
+
+    def _extend_args(self, para_list) -> list:
+        if not isinstance(self.__command_args, list):
+            return []
+        added_list = []
+        for para in para_list:
+            if para in self.__command_args_set:
+                continue
             self.__command_args.append(para)
-            self.signal_isChanged.emit()
-
+            self.__command_args_set.add(para)
+            added_list.append(para)
+        if added_list:
+            self._emit_changed()
+        return added_list
+
+    def _remove_args(self, para: str) -> int:
+        if not isinstance(self.__command_args, list) or para not in self.__command_args_set:
+            return -1
+        index = self.__command_args.index(para)
+        del self.__command_args[index]
+        self.__command_args_set.discard(para)
+        self._emit_changed()
+        return index
+
+    @_emit_once
     def _clear_args(self) -> None:
         if isinstance(self.__command_args, list):
             self.__command_args.clear()
+            self.__command_args_set.clear()
         else:
             self.__command_args = ''
         self._command = ''
-        self.signal_isChanged.emit()
+        self._emit_changed()
 
     def _set_command_option(self, command_option: str | list) -> None:
         if command_option == self.__command_option:
             return
         self.__command_option = command_option
-        self.signal_isChanged.emit()
+        self._emit_changed()
 
     def __str__(self):
         return f'{self.name}: "{self.command_args}"'
@@ -139,21 +312,34 @@ class SwitchStruct(BasicStruct):
     def isOn(self) -> bool:
         return self.__isOn
 
+    @property
+    def arguments(self) -> list:
+        return [self.command] if self.__isOn else []
+
+    @_emit_once
     def set_on(self) -> None:
         if self.__isOn:
             return
         self.__isOn = True
-        self._command = self.command_option
-        self.signal_isChanged.emit()
+        self._command = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
+        self._emit_changed()
 
+    @_emit_once
     def set_off(self) -> None:
         if not self.__isOn:
             return
         self._clear_args()
 
     def _clear_args(self):
-        super()._clear_args()
         self.__isOn = False
+        super()._clear_args()
+
+    def _capture(self) -> tuple:
+        return super()._capture() + (self.__isOn,)
+
+    def _apply(self, snapshot: tuple) -> None:
+        super()._apply(snapshot)
+        self.__isOn = snapshot[3]
 
 
 class StateStruct(BasicStruct):
@@ -199,6 +385,16 @@ class StateStruct(BasicStruct):
     def isWithOption(self) -> bool:
         return self.__isWithOption
 
+    @property
+    def arguments(self) -> list:
+        if not self.__current_state:
+            return []
+        if self.__isWithOption:
+            option = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
+            return [option, self.__current_state]
+        return [self.__current_state]
+
+    @_emit_once
     def set_state(self, state: str) -> None:
         if isinstance(state, str) and state == self.__current_state:
             return
@@ -213,12 +409,19 @@ class StateStruct(BasicStruct):
             self._set_args(self.__current_state)
         else:
             self.__command = state
-            self.signal_isChanged.emit()  # 上面不用的原因是 _set_args 会调用 signal_isChanged.emit()
+            self._emit_changed()  # 上面不用的原因是 _set_args 会调用 _emit_changed()
 
     def _clear_args(self):
-        super()._clear_args()
         self.__command = ''
         self.__current_state = ''
+        super()._clear_args()
+
+    def _capture(self) -> tuple:
+        return super()._capture() + (self.__current_state, self.__command)
+
+    def _apply(self, snapshot: tuple) -> None:
+        super()._apply(snapshot)
+        self.__current_state, self.__command = snapshot[3:5]
 
 
 class SingleInfoStruct(BasicStruct):
@@ -246,6 +449,16 @@ class SingleInfoStruct(BasicStruct):
     def __init__(self, name: str, cmd_option: str | list) -> None:
         super().__init__(name, cmd_option)
 
+    @property
+    def arguments(self) -> list:
+        if not self.command_args:
+            return []
+        if self.command_option == '':
+            return [self.command_args]
+        option = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
+        return [f'{option}={self.command_args}']
+
+    @_emit_once
     def set_args(self, para: str) -> None:
         if para is None or para == '':
             self._clear_args()
@@ -260,7 +473,171 @@ class SingleInfoStruct(BasicStruct):
         self._command = f'{option}="{self.command_args}"'
 
 
-class MultiInfoStruct(BasicStruct):
+class ListStruct(BasicStruct):
+    """ 
+    列表结构类
+        多信息结构与相对地址结构的基类. 参数为有序集合, 追加与去重均为 O(1); 
+        命令行在读取时按修订号延迟生成, 连续追加不会重复拼接; 可引用外部列表文件(每行一个模块或路径), 在生成命令行时展开
+
+    参数:
+    - name: 结构名称
+    - cmd_option: 命令行选项
+
+    属性:
+    - list_file_list(list): 引用的外部列表文件
+    - expanded_args(list): 展开外部列表文件并去重后的全部参数
+
+    方法: 
+    - add_list_file(file_path:str) -> bool: 引用外部列表文件
+    - remove_list_file(file_path:str) -> bool: 取消引用外部列表文件
+    - check_list_files(path_list: list = None) -> bool: 检查外部列表文件是否变更, 变更时重新读取并递增修订号
+    - _format_args(para:str) -> str: 将输入转换为命令行参数, 子类可重写
+    """
+
+    def __init__(self, name: str, cmd_option: str | list) -> None:
+        super().__init__(name, cmd_option, isRepeatable=True)
+        self.__list_file_list: list = []
+        self.__list_file_state_dict: dict = {}
+        """ {文件路径: (mtime_ns, size, 参数元组)}, 文件不存在时为 (None, None, ()) """
+        self.__command_cache: str = ''
+        self.__command_revision: int = -1
+
+    @property
+    def list_file_list(self) -> list:
+        return list(self.__list_file_list)
+
+    @property
+    def expanded_args(self) -> list:
+        args_list = self.command_args
+        if not self.__list_file_list:
+            return list(args_list)
+        # 外部列表文件中的参数与已有参数去重后追加在末尾
+        args_set = set(args_list)
+        args_list = list(args_list)
+        for file_path in self.__list_file_list:
+            for para in self.__list_file_state_dict.get(file_path, (None, None, ()))[2]:
+                if para not in args_set:
+                    args_set.add(para)
+                    args_list.append(para)
+        return args_list
+
+    @property
+    def arguments(self) -> list:
+        option = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
+        return [f'{option}={para}' for para in self.expanded_args]
+
+    @property
+    def _command(self) -> str:
+        # 参数变更时修订号必然递增, 修订号不变时直接返回缓存
+        if self.__command_revision != self.revision:
+            self.__command_cache = self._render_command()
+            self.__command_revision = self.revision
+        return self.__command_cache
+
+    @_command.setter
+    def _command(self, command: str) -> None:
+        # 命令行由参数生成, 不需要设置
+        pass
+
+    @_emit_once
+    def add_list_file(self, file_path: str) -> bool:
+        """
+        引用外部列表文件, 文件每行一个参数, 空行与 # 开头的行会被忽略. 文件中的参数不会加入 command_args, 只在生成命令行时展开
+
+        参数:
+        - file_path(str): 文件路径
+
+        返回:
+        - bool: 是否添加, 已引用时返回 False
+        """
+        file_path = os.path.abspath(file_path)
+        if file_path in self.__list_file_list:
+            return False
+        self.__list_file_list.append(file_path)
+        self.__load_list_file(file_path)
+        self._emit_changed()
+        return True
+
+    @_emit_once
+    def remove_list_file(self, file_path: str) -> bool:
+        file_path = os.path.abspath(file_path)
+        if file_path not in self.__list_file_list:
+            return False
+        self.__list_file_list.remove(file_path)
+        self.__list_file_state_dict.pop(file_path, None)
+        self._emit_changed()
+        return True
+
+    def check_list_files(self, path_list: list = None) -> bool:
+        """
+        检查外部列表文件是否变更, 只比较修改时间与大小, 变更时重新读取并递增修订号(不发射信号). 访问文件系统, 由调用方在文件变化时或打包前调用
+
+        参数:
+        - path_list(list[str]): 只检查其中的文件, 为 None 时检查全部引用的文件
+
+        返回:
+        - bool: 是否有变更
+        """
+        isChanged = False
+        key_set = None if path_list is None else {os.path.normcase(os.path.abspath(path)) for path in path_list}
+        for file_path in self.__list_file_list:
+            if key_set is not None and os.path.normcase(file_path) not in key_set:
+                continue
+            if self.__stat_list_file(file_path) != self.__list_file_state_dict.get(file_path, (None, None, ()))[:2]:
+                self.__load_list_file(file_path)
+                isChanged = True
+        if isChanged:
+            self._mark_changed()
+        return isChanged
+
+    def _format_args(self, para: str) -> str:
+        return para
+
+    def _render_command(self) -> str:
+        args_list = self.expanded_args
+        if not args_list:
+            return ''
+        option = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
+        return ' '.join([f'{option}="{para}"' for para in args_list])
+
+    def _clear_args(self):
+        self.__list_file_list = []
+        self.__list_file_state_dict = {}
+        super()._clear_args()
+
+    def _capture(self) -> tuple:
+        return super()._capture() + (tuple(self.__list_file_list),)
+
+    def _apply(self, snapshot: tuple) -> None:
+        super()._apply(snapshot)
+        self.__list_file_list = list(snapshot[3])
+        for file_path in self.__list_file_list:
+            if file_path not in self.__list_file_state_dict:
+                self.__load_list_file(file_path)
+
+    def __stat_list_file(self, file_path: str) -> tuple:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return (None, None)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def __load_list_file(self, file_path: str) -> None:
+        mtime_ns, size = self.__stat_list_file(file_path)
+        para_list = []
+        if mtime_ns is not None:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip().strip('"')
+                        if line and not line.startswith('#'):
+                            para_list.append(self._format_args(line))
+            except (OSError, UnicodeDecodeError) as e:
+                print(f'[读取失败][ListStruct][list_file]: {file_path}\t{e}')
+        self.__list_file_state_dict[file_path] = (mtime_ns, size, tuple(dict.fromkeys(para_list)))
+
+
+class MultiInfoStruct(ListStruct):
     """ 
     多信息结构类
         用于存储多信息命令行参数, 允许重复使用, 例如:  --paths="E:\Programm" --paths="C:\Python_includes" 等
@@ -279,40 +656,43 @@ class MultiInfoStruct(BasicStruct):
     - command: 命令行
 
     方法: 
-    - set_args(para:list): 设置命令行参数
-    - append_args(para:str): 追加命令行参数
+    - set_args(para:list): 设置命令行参数, 重复的参数只保留第一个
+    - append_args(para:str): 追加命令行参数, 已存在时忽略
+    - extend_args(para_list:Iterable[str]) -> int: 批量追加命令行参数, 只发射一次信号, 返回实际添加的数量
+    - remove_args(para:str) -> bool: 移除命令行参数
     """
 
     def __init__(self, name, cmd_option: str) -> None:
-        super().__init__(name, cmd_option, isRepeatable=True)
+        super().__init__(name, cmd_option)
 
+    @_emit_once
     def set_args(self, para: list | str) -> None:
         if para is None or para == []:
             self._clear_args()
             return None
         if isinstance(para, str):
-            if '"' in para:
-                para = para.replace('"', '')
             para = [para]
-        elif isinstance(para, list):
-            pass
-        else:
+        elif not isinstance(para, (list, tuple)):
             print(f'[类型错误][MultiInfoStruct][set_args]: 应为 <list> 或 <str>\t实际为{type(para)}')
-        self._set_args(para)
-        option = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
-        self._command = f'{option}="' + f'" {option}="'.join(self.command_args) + '"'
+            return None
+        self._set_args([item.replace('"', '') for item in para if item])
 
+    @_emit_once
     def append_args(self, para: str):
         if para is None or para == '':
             return None
-        if '"' in para:
-            para = para.replace('"', '')
-        self._add_args(para)
-        option = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
-        self._command = f'{option}="' + f' {option}='.join(self.command_args) + '"'
+        self._add_args(para.replace('"', ''))
+
+    @_emit_once
+    def extend_args(self, para_list) -> int:
+        return len(self._extend_args(para.replace('"', '') for para in para_list if para))
 
+    @_emit_once
+    def remove_args(self, para: str) -> bool:
+        return self._remove_args(para.replace('"', '')) >= 0
 
-class RelPathStruct(BasicStruct):
+
+class RelPathStruct(ListStruct):
     """ 
     相对地址结构类
         用于存储相对地址命令行参数, 例如:  --add-data="Programm;." 等
@@ -329,55 +709,95 @@ class RelPathStruct(BasicStruct):
     - command_option: 命令行选项
     - command_args: 命令行参数
     - command: 命令行
-    - command_args_display: 命令行参数显示, 用于UI端显示输入信息
+    - command_args_display: 命令行参数显示, 用于UI端显示输入信息, 与 command_args 一一对应
+    - base_path: 计算相对路径的基准文件夹, 为空时使用当前工作目录
 
     方法: 
-    - set_args(list_para:list): 设置命令行参数
-    - append_args(str_para:str): 追加命令行参数
+    - set_base_path(path:str): 设置计算相对路径的基准文件夹, 只影响之后添加的参数
+    - set_args(list_para:list): 设置命令行参数, 转换后重复的参数只保留第一个
+    - append_args(str_para:str): 追加命令行参数, 已存在时忽略
+    - extend_args(para_list:Iterable[str]) -> int: 批量追加命令行参数, 只发射一次信号, 返回实际添加的数量
+    - remove_args(para:str) -> bool: 移除命令行参数, 可为输入路径或转换后的参数
     """
 
     def __init__(self, name: str, cmd_option: str) -> None:
-        super().__init__(name, cmd_option, isRepeatable=True)
+        super().__init__(name, cmd_option)
         self.__command_args_display = []
+        self.__base_path = ''
 
     @property
     def command_args_display(self) -> list:
         return self.__command_args_display
 
+    @property
+    def base_path(self) -> str:
+        return self.__base_path
+
+    def set_base_path(self, path: str) -> None:
+        self.__base_path = path or ''
+
+    @_emit_once
     def set_args(self, list_para: list | str) -> None:
         if isinstance(list_para, str):
-            if '"' in list_para:
-                list_para = para.replace('"', '')
             list_para = [list_para]
         if list_para is None or list_para == []:
             self._clear_args()
             return None
-        self.__command_args_display = list_para
-        temp_list = []
+        display_dict = {}
         for para in list_para:
-            format_dir = f'{os.path.basename(para)}:{os.path.relpath(para, os.getcwd())}'
-            temp_list.append(format_dir)
-        self._set_args(temp_list)
-        option: str = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
-        self._command = f'"{option}"="' + f'" {option}"='.join(self.command_args) + '"'
+            if para:
+                para = para.replace('"', '')
+                display_dict.setdefault(self._format_args(para), para)
+        self.__command_args_display = list(display_dict.values())
+        self._set_args(list(display_dict))
 
+    @_emit_once
     def append_args(self, para: str):
         if para is None or para == '':
             return None
-        if '"' in para:
-            para = para.replace('"', '')
-        if ':' not in para:
-            format_dir = f'{os.path.basename(para)}:{os.path.relpath(para, os.getcwd())}'
-        else:
-            format_dir = para
-        self._add_args(format_dir)
-        self.__command_args_display.append(para)
-        option: str = self.command_option[0] if isinstance(self.command_option, list) else self.command_option
-        self._command = f'{option}="' + f'" {option}="'.join(self.command_args) + '"'
+        para = para.replace('"', '')
+        if self._add_args(self._format_args(para)):
+            self.__command_args_display.append(para)
+
+    @_emit_once
+    def extend_args(self, para_list) -> int:
+        display_dict = {}
+        for para in para_list:
+            if para:
+                para = para.replace('"', '')
+                display_dict.setdefault(self._format_args(para), para)
+        added_list = self._extend_args(display_dict)
+        self.__command_args_display.extend(display_dict[format_dir] for format_dir in added_list)
+        return len(added_list)
+
+    @_emit_once
+    def remove_args(self, para: str) -> bool:
+        para = para.replace('"', '')
+        index = self._remove_args(para)
+        if index < 0:
+            index = self._remove_args(self._format_args(para))
+        if index < 0:
+            return False
+        del self.__command_args_display[index]
+        return True
+
+    def _format_args(self, para: str) -> str:
+        # 已含有分隔符(: 或 ;)的视为 "源:目标" 格式, 盘符中的冒号不计入
+        body = para[2:] if len(para) > 2 and para[1] == ':' and para[2] in '\\/' else para
+        if ':' in body or ';' in body:
+            return para
+        return f'{os.path.basename(para)}:{os.path.relpath(para, self.__base_path or os.getcwd())}'
 
     def _clear_args(self):
-        super()._clear_args()
         self.__command_args_display = []
+        super()._clear_args()
+
+    def _capture(self) -> tuple:
+        return super()._capture() + (tuple(self.__command_args_display),)
+
+    def _apply(self, snapshot: tuple) -> None:
+        super()._apply(snapshot)
+        self.__command_args_display = list(snapshot[4])
 
 
 class PyinstallerStruct(object):
@@ -389,22 +809,37 @@ class PyinstallerStruct(object):
     - install_mode(str): 安装模式 pyinstaller / python / unspecified
     - implement_path(str): 执行器路径(无引号) 如: 'E:\Python\Python38\Scripts\pyinstaller.exe' 或 'E:\Python\Python38\python.exe'
     - implement_command(str): 执行器命令(含结尾空格), 如: '"E:\Python\Python38\Scripts\pyinstaller.exe" ' 或 '"E:\Python\Python38\python.exe" -m PyInstaller '
+    - struct_sequence(tuple): 全部结构, 顺序与命令行及 snapshot() 一致
     - ...命令行属性
         (python_file_path, output_methode, specpath, output_file_name, contents_directory, add_file_folder_data, add_binary_data, imports_paths, hidden_import, collect_submodules, collect_data, collect_binaries, collect_all, copy_metadata, recursive_copy_metadata, additional_hooks_dir, runtime_hook, exclude_module, add_splash_screen, debug_mode, python_option, strip_option, noupx_option, upx_exclude, console_window_control, hide_console, add_icon, disable_traceback, version_file, add_xml_file, add_resource, uac_admin_apply, uac_uiaccess, argv_emulation, osx_bundle_identifier, target_architecture, codesign_identity, osx_entitlements_file, runtime_tmpdir, ignore_signals, output_folder_path, workpath_option, noconfirm_option, upx_dir, clean_cache, log_level)
 
     信号: 
-    - signal_isChanged: 数据变更信号
+    - signal_isChanged: 数据变更信号(实例信号), 无参数
+    - signal_options_changed(dict): 数据变更信号(实例信号), 参数为变更的差异 {结构名称: (变更前快照, 变更后快照)}.
+        与 signal_isChanged 同时发射, batch() 期间的变更在结束时合并为一次, 变更后又恢复原样的结构不计入差异
 
     方法: 
-    - set_implement_path(implement_path: str): 设置执行器路径
+    - batch(): 上下文管理器, 期间的变更合并为一次信号, 可嵌套
+    - set_implement_path(implement_path: str, isBlocking: bool = True) -> bool | None: 设置执行器路径, 返回路径是否存在
+    - set_base_path(path: str): 设置相对地址类结构的基准文件夹
+    - get_list_file_list() -> list: 获取引用的外部列表文件
+    - refresh_list_files(path_list: list = None) -> bool: 重新检查外部列表文件
     - get_command_list(): 获取命令行参数列表
     - get_command_line(): 获取命令行
+    - get_argument_list(): 获取参数列表, 不含引号与执行器, 用于 subprocess
+    - get_implement_argument_list(): 获取执行器参数列表
+    - get_input_path_dict(cwd:str): 获取需要存在的输入路径, 用于路径检查
     - get_struct_list(): 获取结构列表, 列表元素为存在命令的结构对象 StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
     - get_flattened_struct_command_args(): 获取扁平化的结构命令行参数, 用于平面显示当前结构的命令参数, 例如使用TableWidget
     - get_flattened_dict_command_args(): 获取扁平化的结构命令行参数, 用于生成命令行
     - find_struct_from_option(option:str): 根据命令行选项查找结构
+    - snapshot(): 获取不可变快照
+    - restore(snapshot:tuple): 恢复到快照
+    - copy(): 拷贝结构
+    - set_option_schema(option_schema: PyinstallerOptionSchema): 设置选项模式, 模式中的所有别名均可查找到对应结构
     """
     signal_isChanged = EventSignal()
+    signal_options_changed = EventSignal(dict)
 
     @property
     def install_mode(self):
@@ -418,24 +853,62 @@ class PyinstallerStruct(object):
     def implement_command(self):
         return self.__implement_command
 
-    def set_implement_path(self, implement_path: str):
+    @property
+    def struct_sequence(self) -> tuple:
+        """ 全部结构, 顺序与命令行及 snapshot() 一致 """
+        return self.__sequence
+
+    @property
+    def option_schema(self):
+        return self.__option_schema
+
+    def set_option_schema(self, option_schema) -> None:
+        """
+        设置选项模式(当前环境的 PyInstaller 版本对应的 PyinstallerOptionSchema), 并重新生成 选项-结构 字典.
+        只需查找内存, 切换环境时可直接调用
+
+        参数:
+        - option_schema: PyinstallerOptionSchema | None, 为 None 时只使用结构自身的选项
+        """
+        if option_schema is self.__option_schema:
+            return
+        self.__option_schema = option_schema
+        self.__generate_option_struct_dict()
+
+    def set_implement_path(self, implement_path: str, isBlocking: bool = True) -> bool | None:
         """ 
         置执行器路径, 其中定义了三个属性
         - self.__install_mode: 安装模式 pyinstaller / python / unspecified
         - self.__implement_path: 执行器路径(无引号) 如: 'E:\Python\Python38\Scripts\pyinstaller.exe' 或 'E:\Python\Python38\python.exe'
         - self.__implement_command: 执行器命令(含结尾空格), 如: '"E:\Python\Python38\Scripts\pyinstaller.exe" ' 或 '"E:\Python\Python38\python.exe" -m PyInstaller '
 
+        路径状态由 PathStatCache 提供, 只在第一次使用该路径时访问文件系统; 文件被创建或删除后由 PathStatWatcher 更新缓存.
+        非阻塞时只读取缓存, 尚未检查的路径提交异步检查, 期间按未指定执行器处理, 检查完成后需再次调用. 路径与状态均与上一次相同时直接返回
+
         参数: 
         - implement_path: str, 执行器路径
+        - isBlocking: bool, 缓存中没有该路径时是否同步检查, GUI 线程中应为 False
 
         返回:
-        None
+        bool | None: 路径是否存在, 非阻塞且尚未检查完成时为 None
         """
-        if implement_path and 'pyinstaller.exe' in implement_path and os.path.exists(implement_path):
+        if not implement_path:
+            isExists = False
+        elif isBlocking:
+            isExists = PathStatCache().stat(implement_path).isExists
+        else:
+            path_stat = PathStatCache().get(implement_path)
+            isExists = None if path_stat is None else path_stat.isExists
+        if (implement_path, isExists) == self.__implement_key:
+            return isExists
+        self.__implement_key = (implement_path, isExists)
+        # 按文件名判断, 兼容 pyinstaller / pyinstaller.exe, python3 / python3.11 / python.exe
+        file_name = os.path.splitext(os.path.basename(implement_path))[0].lower() if isExists else ''
+        if file_name == 'pyinstaller':
             self.__install_mode = 'pyinstaller'
             self.__implement_path = implement_path
             self.__implement_command = f'"{implement_path}" '
-        elif implement_path and 'python.exe' in implement_path and os.path.exists(implement_path):
+        elif _PYTHON_NAME_PATTERN.fullmatch(file_name):
             self.__install_mode = 'python'
             self.__implement_path = implement_path
             self.__implement_command = f'"{implement_path}" -m PyInstaller '
@@ -443,6 +916,49 @@ class PyinstallerStruct(object):
             self.__install_mode = 'unspecified'
             self.__implement_path = ''
             self.__implement_command = 'PyInstaller '
+        self.__command_line_cache = None
+        return isExists
+
+    def set_base_path(self, path: str) -> None:
+        """ 
+        设置相对地址类结构计算相对路径的基准文件夹, 不依赖进程的当前工作目录, 多个结构可在同一进程中使用不同的基准
+
+        参数:
+        - path: str, 基准文件夹, 为空时使用当前工作目录
+        """
+        self.__add_file_folder_data.set_base_path(path)
+        self.__add_binary_data.set_base_path(path)
+
+    def get_list_file_list(self) -> list:
+        """ 
+        获取全部结构引用的外部列表文件, 用于监视文件变化
+
+        返回:
+        list[str]: 绝对路径, 有序去重
+        """
+        return list(dict.fromkeys(file_path for item in self.__list_struct_tuple for file_path in item.list_file_list))
+
+    def refresh_list_files(self, path_list: list = None) -> bool:
+        """ 
+        重新检查外部列表文件, 变更时重新读取, 下一次生成命令行时生效(不发射信号). 访问文件系统, 在文件变化时(如 PathStatWatcher 的通知)或打包前调用
+
+        参数:
+        - path_list(list[str]): 只检查其中的文件, 为 None 时检查全部
+
+        返回:
+        bool: 是否有变更
+        """
+        isChanged = False
+        for item in self.__list_struct_tuple:
+            if item.list_file_list and item.check_list_files(path_list):
+                isChanged = True
+        return isChanged
+
+    def invalidate_implement_path(self) -> None:
+        """ 使执行器路径的缓存失效, 下一次 set_implement_path() 时重新检查路径 """
+        if self.__implement_key is not None and self.__implement_key[0]:
+            PathStatCache().invalidate([self.__implement_key[0]])
+        self.__implement_key = None
 
     def get_command_dict(self) -> dict:
         """ 
@@ -451,13 +967,8 @@ class PyinstallerStruct(object):
         返回: 
         dict: 例如 {'output_methode': '-F', 'imports_paths': '-p="E:\\10_Programm" -p="E:\\10_Programm\\test"'}}
         """
-        temp = {
-        }
-        for item in self.__sequence:
-            item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
-            if item.command != '':
-                temp[item.name] = item.command
-        return temp
+        self.__update_render_cache()
+        return {item.name: item.command for item in self.__struct_list_cache}
 
     def get_command_list(self) -> list:
         """ 
@@ -466,30 +977,94 @@ class PyinstallerStruct(object):
         返回: 
         list[str]: 如 ['-c', '-F', 'main.py', '-p="E:\Python\Python38"']
         """
-        temp_list = []
-        for item in self.__sequence:
-            item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
-            if item.command != '':
-                temp_list.append(item.command)
-        return temp_list
+        self.__update_render_cache()
+        return list(self.__command_list_cache)
 
-    def get_command_line(self, implement_path: str) -> str:
+    def get_command_line(self, implement_path: str, isBlocking: bool = True) -> str:
         """ 
-        获取命令行字符串
+        获取命令行字符串. 结构与执行器路径均未变化时直接返回缓存
 
         参数: 
         implement_path: str, 实现路径, 如 'E:\Python\Python38\Scripts\pyinstaller.exe'
+        isBlocking: bool, 见 set_implement_path(), GUI 线程中应为 False
 
         返回:
         str: 如 '"E:\Python\Python38\Scripts\pyinstaller.exe" -c -F main.py -p="E:\Python\Python38"'
         """
-        temp_list = self.get_command_list()
-        if not temp_list:
-            print(f'从 get_command_list() 返回空值, 命令行无参数, 请检查. {temp_list}')
+        self.__update_render_cache()
+        if not self.__command_list_cache:
+            print(f'从 get_command_list() 返回空值, 命令行无参数, 请检查. {self.__command_list_cache}')
             return None
-        self.set_implement_path(implement_path)   # 此处定义了 self.__install_mode, self.__implement_path, self.__implement_command
-        launch_command = self.__implement_command + ' '.join(temp_list)
-        return launch_command
+        self.set_implement_path(implement_path, isBlocking)   # 此处定义了 self.__install_mode, self.__implement_path, self.__implement_command
+        if self.__command_line_cache is None:
+            self.__command_line_cache = self.__implement_command + ' '.join(self.__command_list_cache)
+        return self.__command_line_cache
+
+    def get_argument_list(self) -> list:
+        """ 
+        获取参数列表, 不含引号与执行器, 可直接传给 subprocess, 不经过 shell
+
+        返回:
+        list[str]: 如 ['main.py', '--onefile', '--paths=E:\\Python\\Python38']
+        """
+        self.__update_render_cache()
+        argument_list = []
+        for item in self.__struct_list_cache:
+            argument_list.extend(item.arguments)
+        return argument_list
+
+    def get_implement_argument_list(self) -> list:
+        """ 
+        获取执行器参数列表, 需先调用 set_implement_path()
+
+        返回:
+        list[str]: 如 ['E:\\Python\\Python38\\python.exe', '-m', 'PyInstaller'], 未指定执行器时为 ['pyinstaller']
+        """
+        if self.__install_mode == 'pyinstaller':
+            return [self.__implement_path]
+        if self.__install_mode == 'python':
+            return [self.__implement_path, '-m', 'PyInstaller']
+        return ['pyinstaller']
+
+    def get_input_path_dict(self, cwd: str = '') -> dict:
+        """ 
+        获取打包时需要存在的输入路径, 不访问文件系统. 输出路径(--distpath, --workpath, --specpath)由 PyInstaller 创建, 不包含在内
+
+        - --add-data / --add-binary 只取源路径, 含通配符时取通配符之前的文件夹
+        - --resource 只取文件部分, --icon 的 NONE 与 XML 形式的 --manifest 不是路径
+
+        参数:
+        - cwd(str): 执行目录, 相对路径按此转换为绝对路径, 为空时保留相对路径
+
+        返回:
+        dict: {结构名称: [路径]}, 如 {'python_file_path': ['E:\\test\\main.py'], 'add_icon': ['E:\\test\\app.ico']}
+        """
+        def absolute(path: str) -> str:
+            return os.path.normpath(os.path.join(cwd, path)) if cwd and not os.path.isabs(path) else path
+
+        def glob_base(path: str) -> str:
+            while any(char in os.path.basename(path) for char in _GLOB_CHARACTERS):
+                path = os.path.dirname(path)
+            return path or '.'
+
+        path_dict = {}
+        for item in (self.__python_file_path, self.__add_splash_screen, self.__version_file, self.__osx_entitlements_file, self.__upx_dir):
+            if item.command_args:
+                path_dict[item.name] = [item.command_args]
+        manifest = self.__add_xml_file.command_args
+        if manifest and not manifest.lstrip().startswith('<'):
+            path_dict[self.__add_xml_file.name] = [manifest]
+        for item in (self.__imports_paths, self.__additional_hooks_dir, self.__runtime_hook):
+            if item.command_args or item.list_file_list:
+                path_dict[item.name] = item.expanded_args
+        if icon_list := [icon for icon in self.__add_icon.expanded_args if icon != 'NONE']:
+            path_dict[self.__add_icon.name] = icon_list
+        if resource_list := [resource.split(',', 1)[0] for resource in self.__add_resource.expanded_args]:
+            path_dict[self.__add_resource.name] = resource_list
+        for item in (self.__add_file_folder_data, self.__add_binary_data):
+            if source_list := [glob_base(split_source_dest(para)[0]) for para in item.expanded_args]:
+                path_dict[item.name] = source_list
+        return {name: [absolute(path) for path in path_list] for name, path_list in path_dict.items() if path_list}
 
     def get_struct_list(self) -> list:
         """ 
@@ -498,12 +1073,8 @@ class PyinstallerStruct(object):
         返回:
         list: 如 [StateStruct(...), SwitchStruct(...), RelPathStruct(...), SingleInfoStruct(...), MultiInfoStruct(...)]
         """
-        temp = []
-        for item in self.__sequence:
-            item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
-            if item.command != '':
-                temp.append(item)
-        return temp
+        self.__update_render_cache()
+        return list(self.__struct_list_cache)
 
     def get_flattened_struct_command_args(self) -> dict:
         """ 
@@ -514,18 +1085,18 @@ class PyinstallerStruct(object):
         返回: 
         dict: 包含当前结构中所有有效命令参数的字典, 键名为对象本身
         """
+        self.__update_render_cache()
         temp = {
             'length': 0,
             'data': {}
         }
-        for item in self.__sequence:
+        for item in self.__struct_list_cache:
             item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
-            if item.command != '':
-                temp['data'][item] = item.command_args
-                if isinstance(item.command_args, list):
-                    temp['length'] += len(item.command_args)
-                else:
-                    temp['length'] += 1
+            temp['data'][item] = item.command_args
+            if isinstance(item.command_args, list):
+                temp['length'] += len(item.command_args)
+            else:
+                temp['length'] += 1
         return temp
 
     def find_struct_from_option(self, option: str) -> SingleInfoStruct | StateStruct | RelPathStruct | MultiInfoStruct | SwitchStruct | None:
@@ -540,18 +1111,67 @@ class PyinstallerStruct(object):
         """
         return self.__option_struct_dict.get(option, None)
 
+    @contextlib.contextmanager
+    def batch(self):
+        """ 
+        批量修改, 期间各结构的变更不单独发射信号, 结束时发射一次合并后的差异. 可嵌套, 最外层结束时发射
+
+        示例:
+        with pyinstaller_struct.batch():
+            pyinstaller_struct.hidden_import.append_args('numpy')
+            pyinstaller_struct.clean_cache.set_on()
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__notify_changes()
+
     def clear(self):
-        """ 清空结构 """
-        for i in self.__sequence:
-            i: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
-            i._clear_args()
+        """ 清空结构, 只发射一次信号 """
+        with self.batch():
+            for i in self.__sequence:
+                i: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
+                i._clear_args()
+
+    def snapshot(self) -> tuple:
+        """ 
+        获取整个结构的不可变快照, 元素为各结构的快照, 与 __sequence 一一对应.
+        结构未变更时返回同一对象; 只有变更过的结构会生成新的元组, 其余与之前的快照共用
+
+        返回:
+        tuple: 快照, 可用于 restore()
+        """
+        if self.__snapshot_clock != BasicStruct.change_clock():
+            self.__snapshot_cache = tuple(item.snapshot() for item in self.__sequence)
+            self.__snapshot_clock = BasicStruct.change_clock()
+        return self.__snapshot_cache
+
+    def restore(self, snapshot: tuple) -> None:
+        """ 
+        恢复到快照, 只恢复与快照不一致的结构
+
+        参数:
+        snapshot: tuple, 由 snapshot() 获取的快照
+        """
+        if len(snapshot) != len(self.__sequence):
+            raise ValueError(f'快照长度不一致: {len(snapshot)} != {len(self.__sequence)}')
+        with self.batch():
+            for item, item_snapshot in zip(self.__sequence, snapshot):
+                item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
+                item.restore(item_snapshot)
 
     def copy(self):
-        """ 深拷贝结构 """
-        return copy.deepcopy(self)
+        """ 拷贝结构, 由快照生成新的结构, 不复制信号连接 """
+        new_struct = PyinstallerStruct()
+        new_struct.set_option_schema(self.__option_schema)
+        new_struct.set_base_path(self.__add_file_folder_data.base_path)
+        new_struct.restore(self.snapshot())
+        return new_struct
 
     def __init__(self) -> None:
-        self.__signal_isChanged = EventSignal()
         # -------------------------------------------------------------------------------
         # 开关结构类 9
         # -------------------------------------------------------------------------------
@@ -664,15 +1284,39 @@ class PyinstallerStruct(object):
             self.__clean_cache,
             self.__log_level
         )
+        self.__list_struct_tuple: tuple = tuple(item for item in self.__sequence if isinstance(item, ListStruct))
         # -------------------------------------------------------------------------------
-        # python 解释器路径
+        # 选项-结构 字典
         # -------------------------------------------------------------------------------
+        self.__option_schema = None
         self.__generate_option_struct_dict()
-
-    def __setattr__(self, name, value):
-        if isinstance(value, (SwitchStruct, StateStruct, SingleInfoStruct, MultiInfoStruct, RelPathStruct)):
-            value.signal_isChanged.connect(self.signal_isChanged.emit)
-        return super().__setattr__(name, value)
+        # -------------------------------------------------------------------------------
+        # 渲染缓存
+        # -------------------------------------------------------------------------------
+        self.__snapshot_cache: tuple = ()
+        self.__snapshot_clock: int = -1
+        self.__render_clock: int = -1
+        """ 上一次渲染时的全局变更计数, 与 BasicStruct.change_clock() 一致时缓存有效 """
+        self.__revision_list: list = [-1] * len(self.__sequence)
+        """ 各结构上一次渲染时的修订号, 与 __sequence 一一对应 """
+        self.__segment_list: list = [''] * len(self.__sequence)
+        """ 各结构上一次渲染的命令行片段 """
+        self.__command_list_cache: list = []
+        self.__struct_list_cache: list = []
+        self.__command_line_cache: str | None = None
+        self.__implement_key: tuple | None = None
+        """ 上一次 set_implement_path() 的 (参数, 路径是否存在), 为 None 时需重新检查 """
+        self.__install_mode = 'unspecified'
+        self.__implement_path = ''
+        self.__implement_command = 'PyInstaller '
+        # -------------------------------------------------------------------------------
+        # 变更通知
+        # -------------------------------------------------------------------------------
+        self.__batch_depth: int = 0
+        self.__notified_snapshot: tuple = self.snapshot()
+        """ 上一次发射信号时的快照, 用于计算差异 """
+        for item in self.__sequence:
+            item.signal_isChanged.connect(self.__on_struct_changed)
 
     @property
     def python_file_path(self) -> SingleInfoStruct:
@@ -694,6 +1338,10 @@ class PyinstallerStruct(object):
     def contents_directory(self) -> SingleInfoStruct:
         return self.__contents_directory
 
+    @property
+    def add_file_folder_data(self) -> RelPathStruct:
+        return self.__add_file_folder_data
+
     @property
     def add_binary_data(self) -> RelPathStruct:
         return self.__add_binary_data
@@ -854,9 +1502,56 @@ class PyinstallerStruct(object):
     def log_level(self) -> StateStruct:
         return self.__log_level
 
+    def __on_struct_changed(self, name: str) -> None:
+        if self.__batch_depth > 0:
+            return
+        self.__notify_changes()
+
+    def __notify_changes(self) -> None:
+        """ 
+        与上一次发射信号时的快照比较, 有差异时发射信号. 快照之间共用未变更结构的数据, 比较时相同对象直接跳过
+        """
+        snapshot = self.snapshot()
+        if snapshot is self.__notified_snapshot:
+            return
+        diff = {}
+        for item, old_snapshot, new_snapshot in zip(self.__sequence, self.__notified_snapshot, snapshot):
+            if old_snapshot is not new_snapshot and old_snapshot != new_snapshot:
+                diff[item.name] = (old_snapshot, new_snapshot)
+        self.__notified_snapshot = snapshot
+        if not diff:
+            return
+        self.signal_options_changed.emit(diff)
+        self.signal_isChanged.emit()
+
+    def __update_render_cache(self) -> None:
+        """ 
+        更新渲染缓存. 全局变更计数未变化时直接返回, 否则只重新读取修订号变化的结构的命令行片段.
+        不访问文件系统, 外部列表文件的变更由 refresh_list_files() 读取
+        """
+        change_clock = BasicStruct.change_clock()
+        if change_clock == self.__render_clock:
+            return
+        self.__render_clock = change_clock
+        isChanged = False
+        for index, item in enumerate(self.__sequence):
+            item: StateStruct | SwitchStruct | RelPathStruct | SingleInfoStruct | MultiInfoStruct
+            if item.revision == self.__revision_list[index]:
+                continue
+            self.__revision_list[index] = item.revision
+            if item.command != self.__segment_list[index]:
+                self.__segment_list[index] = item.command
+                isChanged = True
+        if not isChanged:
+            return
+        self.__struct_list_cache = [item for index, item in enumerate(self.__sequence) if self.__segment_list[index]]
+        self.__command_list_cache = [segment for segment in self.__segment_list if segment]
+        self.__command_line_cache = None
+
     def __generate_option_struct_dict(self) -> None:
         """ 
         生成 选项-结构 字典. 一个选项对应一个结构, 但是一个结构可能对应多个选项. 
+        设置了选项模式时, 与结构共用任一别名的选项记录, 其全部别名都对应该结构
         """
         self.__option_struct_dict = {}
         for item in self.__sequence:
@@ -866,6 +1561,14 @@ class PyinstallerStruct(object):
                     self.__option_struct_dict[option] = item
             else:
                 self.__option_struct_dict[item.command_option] = item
+        if self.__option_schema is None:
+            return
+        for record in self.__option_schema.record_list:
+            struct = next((self.__option_struct_dict[option] for option in record.option_strings if option in self.__option_struct_dict), None)
+            if struct is None:
+                continue
+            for option in record.option_strings:
+                self.__option_struct_dict.setdefault(option, struct)
 
     def __dict_struct(self) -> dict:
         temp_dict = {}
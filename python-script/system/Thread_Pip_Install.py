@@ -1,11 +1,21 @@
-
-
 from PyQt5.QtCore import QThread, pyqtSignal
 import subprocess
-import threading
+
+from system.Manager_Probe_Cache import ProbeCacheManager
+from system.Stream_Process_Output import ProcessOutputStream, OutputBatch
 
 
 class ThreadPipInstall(QThread):
+    """
+    pip 安装 pyinstaller 的线程. 输出由 ProcessOutputStream 按块读取, 每隔 50 毫秒发射一次信号
+
+    参数:
+    - python_interpreter_path(str): 解释器路径
+
+    信号:
+    - signal_textbrowser_pip_install(str): 一批输出文本, 含换行符
+    - signal_finished(bool): 安装进程结束
+    """
     signal_textbrowser_pip_install = pyqtSignal(str)
     signal_finished = pyqtSignal(bool)
 
@@ -13,17 +23,21 @@ class ThreadPipInstall(QThread):
         super().__init__()
         self.__python_interpreter_path = python_interpreter_path
 
-    def __read_output(self):
-        while True:
-            output_line = self.__result.stdout.readline()
-            if output_line == '' and self.__result.poll() is not None:
-                break
-            if output_line:
-                self.signal_textbrowser_pip_install.emit(output_line)
-        self.signal_finished.emit(True)
+    def __emit_batch(self, batch: OutputBatch):
+        self.signal_textbrowser_pip_install.emit(batch.text)
 
     def run(self):
-        self.__result = subprocess.Popen(f'"{self.__python_interpreter_path}" -m pip install pyinstaller', creationflags=subprocess.CREATE_NO_WINDOW,
-                                         shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        self.thread_read = threading.Thread(target=self.__read_output)
-        self.thread_read.start()
+        try:
+            process = subprocess.Popen([self.__python_interpreter_path, '-m', 'pip', 'install', 'pyinstaller'],
+                                       creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except OSError as e:
+            self.signal_textbrowser_pip_install.emit(f'无法启动 pip: {e}\n')
+            self.signal_finished.emit(False)
+            return
+        ProcessOutputStream(self.__emit_batch).pump(process.stdout)
+        process.wait()
+        # 安装完成后, 该解释器的探测缓存已过期
+        probe_cache = ProbeCacheManager()
+        probe_cache.invalidate(self.__python_interpreter_path)
+        probe_cache.flush()
+        self.signal_finished.emit(True)
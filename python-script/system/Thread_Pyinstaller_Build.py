@@ -0,0 +1,108 @@
+
+from PyQt5.QtCore import QThread, pyqtSignal
+import time
+import subprocess
+
+from system.Planner_Build_Command import BuildCommand, check_input_paths
+from system.Cache_Build_Result import BuildResultCache, get_environment_key
+from system.Manager_Workpath import WorkpathManager
+from system.Parser_Pyinstaller_Log import PyinstallerLogParser
+from system.Stream_Process_Output import ProcessOutputStream, OutputBatch
+from system.Profiler_Build_Phase import BuildProfile, BuildProfileHistory, profile_build, find_regressions
+
+
+class ThreadPyinstallerBuild(QThread):
+    """
+    打包线程, 参数列表直接传给 subprocess, 不经过 shell. 启动前并发检查全部输入路径, 存在不存在的路径时不启动.
+    使用打包结果缓存时, 输入未变化则直接恢复上次的打包结果, 打包成功后保存结果. 工作文件夹由 WorkpathManager 管理时, 选项变化后先清空工作文件夹.
+    输出由 ProcessOutputStream 按块读取, 每隔 50 毫秒发射一次信号, 同时解析为 PyinstallerLogEvent. 进程结束后统计阶段耗时并保存到 BuildProfileHistory
+
+    参数:
+    - build_command(BuildCommand): 由 plan_build_command() 生成的打包命令
+    - build_cache(BuildResultCache): 打包结果缓存, 为 None 或 build_command.environment_key 为空时不使用
+    - environment(tuple): get_environment_key() 的参数 (执行器路径, python 版本, PyInstaller 版本), 不为空时在线程中生成 build_command.environment_key,
+      避免在 GUI 线程中扫描 site-packages
+
+    属性:
+    - log_parser(PyinstallerLogParser): 日志解析器, 打包结束后可读取警告数量与不存在的模块
+    - build_profile(BuildProfile | None): 阶段耗时, 进程未启动或命中打包缓存时为 None
+    - regression_list(list[str]): 与上一次成功的打包相比明显变慢的阶段
+
+    信号:
+    - signal_textbrowser_build(str): 一批输出文本, 含换行符, 可直接追加显示
+    - signal_build_events(list): 一批 PyinstallerLogEvent(阶段变化与警告), 无事件时不发射
+    - signal_finished(int): 进程返回码, 无法启动时为 -1
+    """
+    signal_textbrowser_build = pyqtSignal(str)
+    signal_build_events = pyqtSignal(list)
+    signal_finished = pyqtSignal(int)
+
+    def __init__(self, build_command: BuildCommand, build_cache: BuildResultCache = None, environment: tuple = ()):
+        super().__init__()
+        self.__build_command = build_command
+        self.__build_cache = build_cache
+        self.__environment = environment
+        self.__process = None
+        self.__log_parser = PyinstallerLogParser()
+        self.__build_profile = None
+        self.__regression_list = []
+
+    @property
+    def log_parser(self) -> PyinstallerLogParser:
+        return self.__log_parser
+
+    @property
+    def build_profile(self) -> BuildProfile | None:
+        return self.__build_profile
+
+    @property
+    def regression_list(self) -> list:
+        return list(self.__regression_list)
+
+    def terminate_build(self):
+        """ 结束打包进程 """
+        if self.__process is not None and self.__process.poll() is None:
+            self.__process.terminate()
+
+    def run(self):
+        missing_list = check_input_paths(self.__build_command)
+        if missing_list:
+            for name, path in missing_list:
+                self.signal_textbrowser_build.emit(f'路径不存在: {name} -> {path}\n')
+            self.signal_finished.emit(-1)
+            return
+        cache_key = ''
+        if self.__build_cache is not None:
+            if self.__environment:
+                self.__build_command.environment_key = get_environment_key(*self.__environment)
+            cache_key, restored_path = self.__build_cache.lookup(self.__build_command)
+            if restored_path:
+                self.signal_textbrowser_build.emit(f'输入未变化, 已从打包缓存恢复: {restored_path}\n')
+                self.signal_finished.emit(0)
+                return
+        if self.__build_command.work_options_hash and WorkpathManager().prepare(self.__build_command.work_path, self.__build_command.work_options_hash):
+            self.signal_textbrowser_build.emit(f'打包选项已变化, 已清空工作文件夹: {self.__build_command.work_path}\n')
+        start_time = time.time()
+        try:
+            self.__process = subprocess.Popen(self.__build_command.argv, cwd=self.__build_command.cwd or None,
+                                              creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),
+                                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except OSError as e:
+            self.signal_textbrowser_build.emit(f'无法启动打包进程: {e}\n')
+            self.signal_finished.emit(-1)
+            return
+        output_stream = ProcessOutputStream(self.__emit_batch, self.__log_parser)
+        output_stream.pump(self.__process.stdout)
+        return_code = self.__process.wait()
+        self.__build_profile = profile_build(self.__build_command, output_stream.event_list, start_time, time.time(), return_code)
+        previous_profile = BuildProfileHistory().add(self.__build_profile)
+        if return_code == 0 and previous_profile is not None:
+            self.__regression_list = find_regressions(self.__build_profile, previous_profile)
+        if return_code == 0 and cache_key and self.__build_cache.store(cache_key, self.__build_command.output_base_path):
+            self.signal_textbrowser_build.emit('已保存到打包缓存\n')
+        self.signal_finished.emit(return_code)
+
+    def __emit_batch(self, batch: OutputBatch):
+        self.signal_textbrowser_build.emit(batch.text)
+        if batch.event_list:
+            self.signal_build_events.emit(batch.event_list)
@@ -0,0 +1,261 @@
+import os
+import shlex
+import typing
+
+from const.Const_Parameter import *
+
+lg: Logger = Log.DataManager
+
+
+class ShellDialect(object):
+    """
+    命令行方言
+
+    - CMD: Windows cmd.exe, 续行符为行尾的 ^, 引号规则与 CommandLineToArgvW 一致
+    - POSIX: sh/bash, 续行符为行尾的 \\, 引号规则与 shlex(posix=True) 一致
+    """
+    CMD = 'cmd'
+    POSIX = 'posix'
+
+
+CMD_FILE_EXTENSIONS: tuple = ('.bat', '.cmd')
+POSIX_FILE_EXTENSIONS: tuple = ('.sh', '.bash')
+COMMAND_SEPARATORS: tuple = ('&&', '||', '&', '|', ';')
+""" 命令分隔符, 同一逻辑行内可能包含多条命令 """
+
+
+def default_dialect() -> str:
+    """ 当前系统的默认方言 """
+    return ShellDialect.CMD if App.OS == OsType.WINDOWS else ShellDialect.POSIX
+
+
+def detect_dialect(file_path: str, sample: str = '') -> str:
+    """
+    判断命令文件的方言. 优先根据扩展名判断, 无法判断时(如 .ocl, .txt)根据内容中的环境变量语句判断, 仍无法判断时使用当前系统的默认方言
+
+    参数:
+    - file_path(str): 文件路径
+    - sample(str): 文件开头的部分内容
+
+    返回:
+    - str: ShellDialect.CMD 或 ShellDialect.POSIX
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in CMD_FILE_EXTENSIONS:
+        return ShellDialect.CMD
+    if extension in POSIX_FILE_EXTENSIONS:
+        return ShellDialect.POSIX
+    for line in sample.splitlines():
+        head = line.lstrip('@ \t').lower()
+        if head.startswith(('set ', 'rem ', '::', 'call ', 'echo off')) or line.rstrip().endswith('^'):
+            return ShellDialect.CMD
+        if head.startswith(('export ', '#!', 'source ')) or line.rstrip().endswith('\\'):
+            return ShellDialect.POSIX
+    return default_dialect()
+
+
+def iter_logical_lines(lines: typing.Iterable[str], dialect: str) -> typing.Iterator[tuple]:
+    """
+    合并续行, 逐个生成逻辑行. 以迭代方式读取, 不需要一次性读入整个文件
+
+    参数:
+    - lines(Iterable[str]): 物理行, 如打开的文件对象
+    - dialect(str): 方言
+
+    生成:
+    - tuple[int, str]: (逻辑行起始行号, 逻辑行内容), 已跳过空行与注释行. POSIX 方言中注释内行尾的 \\ 不续行
+    """
+    continuation = '^' if dialect == ShellDialect.CMD else '\\'
+    buffer: list = []
+    start_line_number = 0
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if not buffer:
+            start_line_number = line_number
+        stripped = line.rstrip(' \t')
+        # 行尾连续的续行符成对时为转义, 如 ^^ 表示字面的 ^, 奇数个时最后一个为续行符
+        count = len(stripped) - len(stripped.rstrip(continuation))
+        # 与 sh 一致, 注释中的反斜杠不是续行符
+        isCommented = dialect != ShellDialect.CMD and _strip_posix_comment(''.join(buffer) + stripped) != ''.join(buffer) + stripped
+        if count % 2 == 1 and not isCommented:
+            buffer.append(stripped[:-1])
+            continue
+        buffer.append(line)
+        logical_line = ''.join(buffer).strip()
+        buffer = []
+        if logical_line and not is_comment(logical_line, dialect):
+            yield start_line_number, logical_line
+    if buffer:
+        logical_line = ''.join(buffer).strip()
+        if logical_line and not is_comment(logical_line, dialect):
+            yield start_line_number, logical_line
+
+
+def is_comment(line: str, dialect: str) -> bool:
+    """ 判断逻辑行是否为注释 """
+    if dialect == ShellDialect.CMD:
+        head = line.lstrip('@ \t').lower()
+        return head.startswith('::') or head == 'rem' or head.startswith(('rem ', 'rem\t'))
+    return line.lstrip().startswith('#')
+
+
+def split_command_line(line: str, dialect: str) -> list:
+    """
+    按方言将一个逻辑行拆分为参数列表, 引号会被去除, 命令分隔符(如 &&)作为独立的参数保留
+
+    参数:
+    - line(str): 逻辑行
+    - dialect(str): 方言
+
+    返回:
+    - list[str]: 参数列表
+    """
+    if dialect == ShellDialect.CMD:
+        return _split_cmd(line)
+    return _split_posix(line)
+
+
+def split_commands(token_list: list) -> list:
+    """
+    按命令分隔符拆分参数列表
+
+    参数:
+    - token_list(list[str]): split_command_line() 的结果
+
+    返回:
+    - list[list[str]]: 每条命令的参数列表, 不含空命令
+    """
+    command_list = []
+    current = []
+    for token in token_list:
+        if token in COMMAND_SEPARATORS:
+            if current:
+                command_list.append(current)
+            current = []
+            continue
+        current.append(token)
+    if current:
+        command_list.append(current)
+    return command_list
+
+
+def _strip_posix_comment(line: str) -> str:
+    """
+    去掉行尾注释. 与 sh 一致, 只有位于单词开头且不在引号内, 未被转义的 # 开始注释, 单词中间的 # (如 a#b)与引号内的 # 保留
+    """
+    quote = ''
+    isWordStart = True
+    index = 0
+    length = len(line)
+    while index < length:
+        char = line[index]
+        if quote == "'":
+            if char == "'":
+                quote = ''
+        elif quote == '"':
+            if char == '\\':
+                index += 1
+            elif char == '"':
+                quote = ''
+        elif char == '\\':
+            index += 1
+            isWordStart = False
+        elif char in ('"', "'"):
+            quote = char
+            isWordStart = False
+        elif char == '#' and isWordStart:
+            return line[:index]
+        else:
+            isWordStart = char.isspace() or char in '&|;'
+        index += 1
+    return line
+
+
+def _split_posix(line: str) -> list:
+    lexer = shlex.shlex(_strip_posix_comment(line), posix=True, punctuation_chars='&|;')
+    lexer.whitespace_split = True
+    lexer.commenters = ''
+    try:
+        return list(lexer)
+    except ValueError:
+        # 引号未闭合, 退回按空白拆分, 不中断整个文件的读取
+        lg.debug(f'引号未闭合, 按空白拆分: {line}')
+        return line.split()
+
+
+def _split_cmd(line: str) -> list:
+    """
+    cmd.exe 规则:
+    - 引号外的 ^ 转义下一个字符
+    - 引号外的 & 与 | 为命令分隔符
+    - 反斜杠仅在双引号前有特殊含义: 2n 个反斜杠加引号为 n 个反斜杠并切换引号状态, 2n+1 个为 n 个反斜杠加字面引号
+    - 引号内的 "" 为字面引号
+    """
+    token_list: list = []
+    buffer: list = []
+    hasToken = False
+    isQuoted = False
+    index = 0
+    length = len(line)
+    while index < length:
+        char = line[index]
+        if char == '\\':
+            end = index
+            while end < length and line[end] == '\\':
+                end += 1
+            count = end - index
+            if end < length and line[end] == '"':
+                buffer.append('\\' * (count // 2))
+                hasToken = True
+                if count % 2 == 1:
+                    buffer.append('"')
+                    end += 1
+                index = end
+                continue
+            buffer.append('\\' * count)
+            hasToken = True
+            index = end
+            continue
+        if char == '"':
+            if isQuoted and index + 1 < length and line[index + 1] == '"':
+                buffer.append('"')
+                index += 2
+                continue
+            isQuoted = not isQuoted
+            hasToken = True
+            index += 1
+            continue
+        if isQuoted:
+            buffer.append(char)
+            index += 1
+            continue
+        if char == '^':
+            if index + 1 < length:
+                buffer.append(line[index + 1])
+                hasToken = True
+            index += 2
+            continue
+        if char in ' \t':
+            if hasToken:
+                token_list.append(''.join(buffer))
+                buffer = []
+                hasToken = False
+            index += 1
+            continue
+        if char in '&|':
+            if hasToken:
+                token_list.append(''.join(buffer))
+                buffer = []
+                hasToken = False
+            end = index
+            while end < length and end - index < 2 and line[end] == char:
+                end += 1
+            token_list.append(line[index:end])
+            index = end
+            continue
+        buffer.append(char)
+        hasToken = True
+        index += 1
+    if hasToken:
+        token_list.append(''.join(buffer))
+    return token_list
@@ -0,0 +1,139 @@
+import os
+
+from system.Reader_Conda_Env import find_conda_root_list, find_envs_dir_list
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QFileSystemWatcher
+
+
+class CondaEnvWatcher(QObject):
+    """
+    conda 环境文件监视器
+
+    通过 QFileSystemWatcher 监视 conda 环境相关文件, 代替定时执行 `conda env list`. 空闲时不占用CPU, 只有文件变化时才通知外部.
+
+    监视对象:
+    - ~/.conda/environments.txt 及 ~/.conda 文件夹: 环境的创建与删除
+    - 各环境文件夹(envs_dirs, 包括 conda 根目录下的 envs): 环境的创建与删除
+    - 各环境的 conda-meta 文件夹: 环境内的包安装与卸载
+    - 额外路径(如 site-packages): 由 set_extra_paths() 指定, 用于感知 pip 安装
+    - 环境列表路径(如 pyenv/venv 文件夹): 由 set_list_paths() 指定, 用于感知其他来源的环境创建与删除
+
+    参数:
+    - debounce_ms(int): 防抖时间(毫秒), 短时间内的多次变化只通知一次, 默认 500
+
+    信号:
+    - signal_env_list_changed(): 环境列表可能发生变化
+    - signal_env_content_changed(list): 环境内容发生变化, 参数为环境路径列表
+
+    方法:
+    - refresh_watch_paths(env_path_list: list = None): 刷新监视路径
+    - set_extra_paths(extra_path_dict: dict): 设置各环境的额外监视路径
+    - set_list_paths(path_list: list): 设置额外的环境列表监视路径
+    """
+    signal_env_list_changed = pyqtSignal()
+    signal_env_content_changed = pyqtSignal(list)
+
+    def __init__(self, debounce_ms: int = 500):
+        super().__init__()
+        self.__user_conda_folder: str = os.path.join(os.path.expanduser('~'), '.conda')
+        self.__environments_txt_path: str = os.path.join(self.__user_conda_folder, 'environments.txt')
+        self.__env_path_list: list = []
+        self.__extra_path_dict: dict = {}
+        """ 环境路径 -> 额外监视路径列表 """
+        self.__list_path_list: list = []
+        """ 额外的环境列表监视路径 """
+        self.__watch_path_dict: dict = {}
+        """ 监视路径 -> 环境路径, 空字符串表示该路径变化时影响环境列表 """
+        self.__isEnvListChanged: bool = False
+        self.__changed_env_set: set = set()
+        self.__watcher = QFileSystemWatcher(self)
+        self.__watcher.fileChanged.connect(self.__on_path_changed)
+        self.__watcher.directoryChanged.connect(self.__on_path_changed)
+        self.__timer_debounce = QTimer(self)
+        self.__timer_debounce.setSingleShot(True)
+        self.__timer_debounce.setInterval(debounce_ms)
+        self.__timer_debounce.timeout.connect(self.__emit_signal)
+        self.refresh_watch_paths()
+
+    def refresh_watch_paths(self, env_path_list: list = None) -> None:
+        """
+        刷新监视路径, 新出现的环境将被加入监视, 已删除的路径将被移除
+
+        参数:
+        - env_path_list(list): 当前已知的环境路径列表, 为 None 时沿用上一次的列表
+        """
+        if env_path_list is not None:
+            self.__env_path_list = list(env_path_list)
+        watch_path_dict = {}
+        if os.path.exists(self.__environments_txt_path):
+            watch_path_dict[self.__environments_txt_path] = ''
+        if os.path.isdir(self.__user_conda_folder):
+            watch_path_dict[self.__user_conda_folder] = ''
+        env_path_list = list(self.__env_path_list) + [env_path for env_path in self.__extra_path_dict if env_path not in self.__env_path_list]
+        conda_root_list = find_conda_root_list()
+        for envs_folder in find_envs_dir_list(conda_root_list):
+            watch_path_dict[envs_folder] = ''
+        for list_path in self.__list_path_list:
+            if os.path.isdir(list_path):
+                watch_path_dict[list_path] = ''
+        env_path_list.extend(conda_root_list)
+        for env_path in env_path_list:
+            conda_meta = os.path.join(env_path, 'conda-meta')
+            if os.path.isdir(conda_meta):
+                watch_path_dict.setdefault(conda_meta, env_path)
+            for extra_path in self.__extra_path_dict.get(env_path, []):
+                if os.path.isdir(extra_path):
+                    watch_path_dict.setdefault(extra_path, env_path)
+        removed_list = [path for path in self.__watch_path_dict if path not in watch_path_dict]
+        added_list = [path for path in watch_path_dict if path not in self.__watch_path_dict]
+        # QFileSystemWatcher 在文件被替换后会自动移除监视, 需要重新添加
+        watched_set = set(self.__watcher.files()) | set(self.__watcher.directories())
+        added_list.extend(path for path in watch_path_dict if path in self.__watch_path_dict and path not in watched_set)
+        if removed_list:
+            self.__watcher.removePaths(removed_list)
+        if added_list:
+            self.__watcher.addPaths(added_list)
+        self.__watch_path_dict = watch_path_dict
+
+    def set_extra_paths(self, extra_path_dict: dict) -> None:
+        """
+        设置各环境的额外监视路径, 如 site-packages, 用于感知 pip 安装. 会覆盖之前的设置
+
+        参数:
+        - extra_path_dict(dict): 环境路径 -> 额外监视路径列表, 如 {'C:/miniconda3/envs/py311': ['C:/miniconda3/envs/py311/Lib/site-packages']}
+        """
+        extra_path_dict = {env_path: list(path_list) for env_path, path_list in extra_path_dict.items()}
+        if extra_path_dict == self.__extra_path_dict:
+            return
+        self.__extra_path_dict = extra_path_dict
+        self.refresh_watch_paths()
+
+    def set_list_paths(self, path_list: list) -> None:
+        """
+        设置额外的环境列表监视路径, 路径变化时发射 signal_env_list_changed. 会覆盖之前的设置
+
+        参数:
+        - path_list(list): 文件夹列表, 如 ['~/.pyenv/versions', '~/.virtualenvs']
+        """
+        path_list = [os.path.normpath(path) for path in path_list]
+        if path_list == self.__list_path_list:
+            return
+        self.__list_path_list = path_list
+        self.refresh_watch_paths()
+
+    def __on_path_changed(self, path: str) -> None:
+        env_path = self.__watch_path_dict.get(path, '')
+        if env_path:
+            self.__changed_env_set.add(env_path)
+        else:
+            self.__isEnvListChanged = True
+        self.__timer_debounce.start()
+
+    def __emit_signal(self) -> None:
+        self.refresh_watch_paths()
+        if self.__isEnvListChanged:
+            self.__isEnvListChanged = False
+            self.signal_env_list_changed.emit()
+        if self.__changed_env_set:
+            changed_env_list = list(self.__changed_env_set)
+            self.__changed_env_set.clear()
+            self.signal_env_content_changed.emit(changed_env_list)
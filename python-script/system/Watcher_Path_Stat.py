@@ -0,0 +1,96 @@
+import os
+
+from system.Cache_Path_Stat import PathStatCache
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QFileSystemWatcher
+
+
+class PathStatWatcher(QObject):
+    """
+    路径状态监视器
+
+    通过 QFileSystemWatcher 监视 PathStatCache 中各路径所在的文件夹, 文件夹内容变化(创建, 删除, 重命名)时重新检查其中已缓存的路径.
+    所在文件夹不存在的路径(如尚未打包的输出文件)监视最近的已存在的上级文件夹.
+    只监视文件夹而不是每个文件, 同一文件夹下的多个选项只占用一个监视.
+    同时将 PathStatCache 在工作线程中的状态变化通知转到主线程.
+
+    参数:
+    - debounce_ms(int): 防抖时间(毫秒), 短时间内的多次变化只重新检查一次, 默认 300
+
+    信号:
+    - signal_path_changed(list): 路径状态发生变化, 参数为规范化的路径列表, 在主线程中发射
+
+    方法:
+    - refresh_watch_paths() -> None: 按当前缓存的路径刷新监视的文件夹
+    """
+    signal_path_changed = pyqtSignal(list)
+    _signal_stat_changed = pyqtSignal(list)
+    """ 内部信号, PathStatCache 的监听器在工作线程中调用, 通过队列连接转到主线程 """
+
+    def __init__(self, debounce_ms: int = 300):
+        super().__init__()
+        self.__cache = PathStatCache()
+        self.__watch_folder_set: set = set()
+        self.__folder_key_set: set = set()
+        """ 仅为确定监视对象而检查的文件夹, 不再以其上级文件夹作为监视对象 """
+        self.__changed_folder_set: set = set()
+        self.__watcher = QFileSystemWatcher(self)
+        self.__watcher.directoryChanged.connect(self.__on_folder_changed)
+        self.__timer_debounce = QTimer(self)
+        self.__timer_debounce.setSingleShot(True)
+        self.__timer_debounce.setInterval(debounce_ms)
+        self.__timer_debounce.timeout.connect(self.__refresh_changed_folders)
+        self._signal_stat_changed.connect(self.__on_stat_changed)
+        self.__cache.add_listener(self._signal_stat_changed.emit)
+
+    def refresh_watch_paths(self) -> None:
+        """
+        按当前缓存的路径刷新监视的文件夹. 所在文件夹不存在时向上查找, 监视最近的已存在的上级文件夹,
+        上级文件夹中创建了中间文件夹后再逐级转为监视更深的文件夹. 状态未知的文件夹已提交异步检查, 检查完成后再次刷新
+        """
+        folder_set = set()
+        for path in self.__cache.path_list:
+            if path in self.__folder_key_set:
+                continue
+            folder = os.path.dirname(os.path.abspath(path))
+            while True:
+                self.__folder_key_set.add(os.path.normpath(folder))
+                path_stat = self.__cache.get(folder)
+                if path_stat is None:
+                    break
+                if path_stat.isDir:
+                    folder_set.add(folder)
+                    break
+                parent = os.path.dirname(folder)
+                if parent == folder:
+                    break
+                folder = parent
+        removed_list = list(self.__watch_folder_set - folder_set)
+        # QFileSystemWatcher 在文件夹被删除后会自动移除监视, 需要重新添加
+        watched_set = set(self.__watcher.directories())
+        added_list = [folder for folder in folder_set if folder not in watched_set]
+        if removed_list:
+            self.__watcher.removePaths([folder for folder in removed_list if folder in watched_set])
+        if added_list:
+            self.__watcher.addPaths(added_list)
+        self.__watch_folder_set = folder_set
+
+    def __on_folder_changed(self, folder: str) -> None:
+        self.__changed_folder_set.add(os.path.normpath(folder))
+        self.__timer_debounce.start()
+
+    def __refresh_changed_folders(self) -> None:
+        changed_folder_set = self.__changed_folder_set
+        self.__changed_folder_set = set()
+        path_list = [path for path in self.__cache.path_list
+                     if os.path.dirname(os.path.abspath(path)) in changed_folder_set or os.path.abspath(path) in changed_folder_set]
+        self.__cache.request(path_list, isForce=True)
+
+    def __on_stat_changed(self, path_list: list) -> None:
+        # 新创建的文件夹在创建前未被监视, 其中的路径可能已随之创建, 重新检查一次
+        created_folder_list = [path for path in path_list if path in self.__folder_key_set
+                               and (path_stat := self.__cache.get(path)) is not None and path_stat.isDir]
+        if created_folder_list:
+            prefix_tuple = tuple(os.path.join(folder, '') for folder in created_folder_list)
+            self.__cache.request([path for path in self.__cache.path_list if os.path.abspath(path).startswith(prefix_tuple)], isForce=True)
+        self.refresh_watch_paths()
+        self.signal_path_changed.emit(path_list)
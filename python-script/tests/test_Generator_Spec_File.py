@@ -0,0 +1,144 @@
+import os
+import sys
+import types
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from const.Const_Parameter import OsType
+from system.Struct_Pyinstaller import PyinstallerStruct
+from system.Loader_Pyinstaller_Struct import PyinstallerStructLoader
+from system.Generator_Spec_File import SpecFileGenerator, BUILD_STRUCT_NAMES
+
+CWD = os.path.abspath(os.path.join(os.sep, 'project'))
+
+
+def make_struct(argv: list) -> PyinstallerStruct:
+    pyinstaller_struct = PyinstallerStruct()
+    pyinstaller_struct.restore(PyinstallerStructLoader().read_arguments(argv))
+    return pyinstaller_struct
+
+
+class _Call(object):
+    """ 记录 spec 中的 Analysis / EXE 等调用 """
+
+    def __init__(self, kind: str, args: tuple, kwargs: dict) -> None:
+        self.kind = kind
+        self.args = args
+        self.kwargs = kwargs
+        for name in ('pure', 'scripts', 'binaries', 'datas'):
+            setattr(self, name, (kind, name))
+
+
+def run_spec(content: str) -> dict:
+    """ 以记录调用的 Analysis 等执行生成的 spec, 返回 {调用名称: _Call}, 同名调用只保留最后一次 """
+    call_dict = {}
+
+    def recorder(kind):
+        def call(*args, **kwargs):
+            call_dict[kind] = _Call(kind, args, kwargs)
+            return call_dict[kind]
+        return call
+
+    hooks = types.ModuleType('PyInstaller.utils.hooks')
+    hooks.collect_data_files = lambda package: [(f'<data:{package}>', package)]
+    hooks.collect_dynamic_libs = lambda package: [(f'<lib:{package}>', package)]
+    hooks.collect_submodules = lambda package: [f'{package}.sub']
+    hooks.copy_metadata = lambda package, recursive=False: [(f'<meta:{package}:{recursive}>', package)]
+    hooks.collect_all = lambda package: ([(f'<all:{package}>', package)], [], [f'{package}.all'])
+    module_dict = {name: types.ModuleType(name) for name in ('PyInstaller', 'PyInstaller.utils')}
+    module_dict['PyInstaller.utils.hooks'] = hooks
+    saved_dict = {name: sys.modules.get(name) for name in module_dict}
+    sys.modules.update(module_dict)
+    try:
+        namespace = {kind: recorder(kind) for kind in ('Analysis', 'PYZ', 'EXE', 'COLLECT', 'BUNDLE', 'Splash')}
+        exec(compile(content, 'generated.spec', 'exec'), namespace)
+    finally:
+        for name, module in saved_dict.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return call_dict
+
+
+class SpecFileGeneratorTest(unittest.TestCase):
+    """ 生成的 spec 与替代的命令行等价 """
+
+    def render(self, argv: list, os_type: str = OsType.WINDOWS) -> dict:
+        return run_spec(SpecFileGenerator().render(make_struct(argv), CWD, os_type))
+
+    def test_onedir_layout(self):
+        call_dict = self.render(['main.py'])
+        self.assertEqual(call_dict['Analysis'].args[0], [os.path.join(CWD, 'main.py')])
+        self.assertTrue(call_dict['EXE'].kwargs['exclude_binaries'])
+        self.assertEqual(call_dict['EXE'].kwargs['name'], 'main')
+        self.assertEqual(call_dict['COLLECT'].kwargs['name'], 'main')
+        self.assertNotIn(call_dict['Analysis'].binaries, call_dict['EXE'].args)
+
+    def test_onefile_layout(self):
+        call_dict = self.render(['--onefile', '--name=demo', 'main.py'])
+        self.assertNotIn('COLLECT', call_dict)
+        self.assertNotIn('exclude_binaries', call_dict['EXE'].kwargs)
+        self.assertIn(call_dict['Analysis'].binaries, call_dict['EXE'].args)
+        self.assertIn(call_dict['Analysis'].datas, call_dict['EXE'].args)
+        self.assertEqual(call_dict['EXE'].kwargs['name'], 'demo')
+
+    def test_console(self):
+        self.assertTrue(self.render(['main.py'])['EXE'].kwargs['console'])
+        self.assertFalse(self.render(['--windowed', 'main.py'])['EXE'].kwargs['console'])
+        self.assertFalse(self.render(['--noconsole', 'main.py'])['EXE'].kwargs['console'])
+
+    def test_datas_binaries_absolute(self):
+        data_path = os.path.abspath(os.path.join(os.sep, 'shared', 'config.ini'))
+        call_dict = self.render(['main.py', f'--add-data=res{os.pathsep}res', f'--add-data={data_path}{os.pathsep}.',
+                                 f'--add-binary=lib/a.dll{os.pathsep}lib', '--paths=src', '--icon=app.ico'])
+        analysis = call_dict['Analysis'].kwargs
+        self.assertEqual(analysis['datas'], [(os.path.join(CWD, 'res'), 'res'), (data_path, '.')])
+        self.assertEqual(analysis['binaries'], [(os.path.normpath(os.path.join(CWD, 'lib/a.dll')), 'lib')])
+        self.assertEqual(analysis['pathex'], [os.path.join(CWD, 'src')])
+        self.assertEqual(call_dict['EXE'].kwargs['icon'], [os.path.join(CWD, 'app.ico')])
+
+    def test_collect_preamble(self):
+        analysis = self.render(['main.py', '--hidden-import=x', '--collect-data=pkg_a', '--collect-binaries=pkg_b', '--collect-submodules=pkg_c',
+                                '--copy-metadata=pkg_d', '--recursive-copy-metadata=pkg_e', '--collect-all=pkg_f'])['Analysis'].kwargs
+        self.assertEqual(analysis['hiddenimports'], ['x', 'pkg_c.sub', 'pkg_f.all'])
+        self.assertEqual(analysis['datas'], [('<data:pkg_a>', 'pkg_a'), ('<meta:pkg_d:False>', 'pkg_d'), ('<meta:pkg_e:True>', 'pkg_e'),
+                                             ('<all:pkg_f>', 'pkg_f')])
+        self.assertEqual(analysis['binaries'], [('<lib:pkg_b>', 'pkg_b')])
+
+    def test_debug(self):
+        call_dict = self.render(['--debug=all', 'main.py'])
+        self.assertTrue(call_dict['Analysis'].kwargs['noarchive'])
+        self.assertTrue(call_dict['EXE'].kwargs['debug'])
+        self.assertIn([('v', None, 'OPTION')], call_dict['EXE'].args)
+        call_dict = self.render(['--debug=noarchive', 'main.py'])
+        self.assertTrue(call_dict['Analysis'].kwargs['noarchive'])
+        self.assertFalse(call_dict['EXE'].kwargs['debug'])
+        self.assertIn([], call_dict['EXE'].args)
+
+    def test_build_options_not_in_spec(self):
+        argv = ['main.py', '--distpath=out', '--workpath=tmp', '--noconfirm', '--upx-dir=upx', '--clean', '--log-level=WARN']
+        pyinstaller_struct = make_struct(argv)
+        content = SpecFileGenerator().render(pyinstaller_struct, CWD, OsType.WINDOWS)
+        for value in ('out', 'tmp', 'upx', 'WARN'):
+            self.assertNotIn(repr(value), content)
+        self.assertEqual(SpecFileGenerator().options_hash(pyinstaller_struct, CWD), SpecFileGenerator().options_hash(make_struct(['main.py']), CWD))
+        build_argument_list = SpecFileGenerator().get_build_argument_list(pyinstaller_struct)
+        for name in BUILD_STRUCT_NAMES:
+            for argument in getattr(pyinstaller_struct, name).arguments:
+                self.assertIn(argument, build_argument_list)
+
+    def test_macos_windowed_bundle(self):
+        argv = ['--windowed', '--icon=app.icns', '--osx-bundle-identifier=com.example.demo', 'main.py']
+        bundle = self.render(argv, OsType.MACOS)['BUNDLE']
+        self.assertEqual(bundle.args[0].kind, 'COLLECT')
+        self.assertEqual(bundle.kwargs, {'name': 'main.app', 'icon': os.path.join(CWD, 'app.icns'), 'bundle_identifier': 'com.example.demo'})
+        bundle = self.render(['--onefile'] + argv, OsType.MACOS)['BUNDLE']
+        self.assertEqual(bundle.args[0].kind, 'EXE')
+        self.assertNotIn('BUNDLE', self.render(argv, OsType.WINDOWS))
+        self.assertNotIn('BUNDLE', self.render(['main.py'], OsType.MACOS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from system.Struct_Pyinstaller import split_source_dest
+from system.Loader_Spec_File import SpecFileLoader
+
+SPEC_FOLDER = os.path.abspath(os.path.join(os.sep, 'proj'))
+SPEC_PATH = os.path.join(SPEC_FOLDER, 'demo.spec')
+
+
+def spec_path(*part_list: str) -> str:
+    return os.path.normpath(os.path.join(SPEC_FOLDER, *part_list))
+
+
+class SpecFileLoaderTest(unittest.TestCase):
+    """ 静态导入 .spec 文件 """
+
+    def read(self, source: str):
+        return SpecFileLoader().read_source(source, SPEC_PATH)
+
+    def skipped_constructs(self, result) -> list:
+        return [item.construct for item in result.skipped_list]
+
+    def test_literal_lists(self):
+        result = self.read("a = Analysis(['main.py'], hiddenimports=['a', 'b'], excludes=('c',))\n"
+                           "exe = EXE(PYZ(a.pure), a.scripts, [('v', None, 'OPTION')], name='demo', console=True)\n")
+        self.assertTrue(result.isComplete)
+        self.assertEqual(result.arguments, ('--onefile', '--hidden-import=a', '--hidden-import=b', '--exclude-module=c',
+                                            '--python-option=v', '--name=demo', '--console', spec_path('main.py')))
+
+    def test_concatenated_lists(self):
+        result = self.read("hidden = ['numpy']\n"
+                           "hidden += ['scipy']\n"
+                           "a = Analysis(['main.py'], hiddenimports=hidden + ['x'] + [f'mod{y}'])\n")
+        self.assertEqual([argument for argument in result.arguments if argument.startswith('--hidden-import')],
+                         ['--hidden-import=numpy', '--hidden-import=scipy', '--hidden-import=x'])
+        self.assertEqual(self.skipped_constructs(result), ['Analysis(hiddenimports)'])
+        self.assertEqual(result.skipped_list[0].line_number, 3)
+
+    def test_specpath_join(self):
+        result = self.read("import os\n"
+                           "a = Analysis([os.path.join(SPECPATH, 'src', 'main.py')], pathex=[SPECPATH],\n"
+                           "             datas=[(os.path.join(SPECPATH, 'res'), 'res'), ('conf/app.ini', 'conf')])\n")
+        self.assertTrue(result.isComplete)
+        self.assertIn(f'--paths={SPEC_FOLDER}', result.arguments)
+        self.assertIn(f'--add-data={spec_path("res")}:res', result.arguments)
+        self.assertIn(f'--add-data={spec_path("conf/app.ini")}:conf', result.arguments)
+        self.assertEqual(result.arguments[-1], spec_path('src', 'main.py'))
+
+    def test_windows_drive_datas(self):
+        result = self.read("a = Analysis(['main.py'], datas=[('D:\\\\assets\\\\logo.png', 'img'), ('E:/fonts', '')],\n"
+                           "             binaries=[('C:\\\\lib\\\\a.dll', '.')])\n")
+        self.assertTrue(result.isComplete)
+        pyinstaller_struct = result.create_struct()
+        self.assertEqual([split_source_dest(item) for item in pyinstaller_struct.add_file_folder_data.command_args],
+                         [('D:\\assets\\logo.png', 'img'), (os.path.normpath('E:/fonts'), '.')])
+        self.assertEqual([split_source_dest(item) for item in pyinstaller_struct.add_binary_data.command_args],
+                         [('C:\\lib\\a.dll', '.')])
+
+    def test_icon(self):
+        result = self.read("a = Analysis(['main.py'])\n"
+                           "exe = EXE(a.scripts, icon='app.ico')\n")
+        self.assertIn(f'--icon={spec_path("app.ico")}', result.arguments)
+        result = self.read("a = Analysis(['main.py'])\n"
+                           "exe = EXE(a.scripts, icon=['app.ico', 'NONE'])\n")
+        self.assertEqual([argument for argument in result.arguments if argument.startswith('--icon')],
+                         [f'--icon={spec_path("app.ico")}', '--icon=NONE'])
+
+    def test_dynamic_and_merge_skipped(self):
+        result = self.read("import sys\n"
+                           "from PyInstaller.utils.hooks import collect_data_files\n"
+                           "if sys.platform == 'win32':\n"
+                           "    extra = []\n"
+                           "a = Analysis(['main.py'], datas=collect_data_files('pkg'), excludes=['tkinter'])\n"
+                           "MERGE((a, 'main', 'main'))\n")
+        self.assertFalse(result.isComplete)
+        self.assertEqual(self.skipped_constructs(result), ['If', 'Analysis(datas)', 'MERGE'])
+        self.assertEqual([item.line_number for item in result.skipped_list], [3, 5, 6])
+        self.assertIn('--exclude-module=tkinter', result.arguments)
+        self.assertIsNotNone(result.create_struct())
+
+    def test_multiple_analysis(self):
+        result = self.read("a = Analysis(['app.py'], datas=[('a.txt', '.')], hiddenimports=['x'])\n"
+                           "b = Analysis(['tool.py'], datas=[('b.txt', '.')], hiddenimports=['y'])\n"
+                           "MERGE((a, 'app', 'app'), (b, 'tool', 'tool'))\n"
+                           "exe_a = EXE(PYZ(a.pure), a.scripts, [], exclude_binaries=True, name='app', console=True)\n"
+                           "exe_b = EXE(PYZ(b.pure), b.scripts, [], exclude_binaries=True, name='tool', console=False)\n"
+                           "coll = COLLECT(exe_a, a.binaries, a.datas, exe_b, b.binaries, b.datas, name='suite')\n")
+        self.assertEqual(result.arguments, ('--onedir', f'--add-data={spec_path("a.txt")}:.', '--hidden-import=x',
+                                            '--name=app', '--console', spec_path('app.py')))
+        self.assertEqual(self.skipped_constructs(result), ['Analysis', 'MERGE', 'EXE'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from system.Tokenizer_Command_Line import ShellDialect, split_command_line, iter_logical_lines
+
+
+class SplitPosixCommentTest(unittest.TestCase):
+    """ POSIX 方言的注释: 只有位于单词开头且不在引号内的 # 开始注释 """
+
+    def split(self, line: str) -> list:
+        return split_command_line(line, ShellDialect.POSIX)
+
+    def test_comment_at_word_start(self):
+        self.assertEqual(self.split('pyinstaller -F main.py # 单文件'), ['pyinstaller', '-F', 'main.py'])
+        self.assertEqual(self.split('# 整行注释'), [])
+        self.assertEqual(self.split('pyinstaller -F;# 注释'), ['pyinstaller', '-F', ';'])
+
+    def test_hash_inside_word(self):
+        self.assertEqual(self.split('pyinstaller --name=a#b main.py'), ['pyinstaller', '--name=a#b', 'main.py'])
+        self.assertEqual(self.split('pyinstaller --add-data=C#/x:. main.py'), ['pyinstaller', '--add-data=C#/x:.', 'main.py'])
+
+    def test_hash_inside_quotes(self):
+        self.assertEqual(self.split('pyinstaller --name "# not comment" main.py'), ['pyinstaller', '--name', '# not comment', 'main.py'])
+        self.assertEqual(self.split("pyinstaller --name '#x' main.py"), ['pyinstaller', '--name', '#x', 'main.py'])
+        self.assertEqual(self.split('pyinstaller --name "a\\"#b" main.py'), ['pyinstaller', '--name', 'a"#b', 'main.py'])
+
+    def test_escaped_hash(self):
+        self.assertEqual(self.split('pyinstaller --name \\#x main.py'), ['pyinstaller', '--name', '#x', 'main.py'])
+
+
+class IterLogicalLinesTest(unittest.TestCase):
+    """ 续行与注释 """
+
+    def test_posix_continuation(self):
+        lines = ['pyinstaller -F \\\n', '  a.py\n']
+        self.assertEqual(list(iter_logical_lines(lines, ShellDialect.POSIX)), [(1, 'pyinstaller -F   a.py')])
+
+    def test_posix_backslash_in_comment_line(self):
+        lines = ['# comment \\\n', 'pyinstaller -F a.py\n']
+        self.assertEqual(list(iter_logical_lines(lines, ShellDialect.POSIX)), [(2, 'pyinstaller -F a.py')])
+
+    def test_posix_backslash_in_trailing_comment(self):
+        lines = ['pyinstaller -F a.py # 注释 \\\n', 'pyinstaller -D b.py\n']
+        self.assertEqual(list(iter_logical_lines(lines, ShellDialect.POSIX)),
+                         [(1, 'pyinstaller -F a.py # 注释 \\'), (2, 'pyinstaller -D b.py')])
+
+    def test_posix_quoted_hash_continues(self):
+        lines = ['pyinstaller --name "#x" \\\n', 'a.py\n']
+        self.assertEqual(list(iter_logical_lines(lines, ShellDialect.POSIX)), [(1, 'pyinstaller --name "#x" a.py')])
+
+
+if __name__ == '__main__':
+    unittest.main()
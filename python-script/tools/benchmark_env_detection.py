@@ -0,0 +1,329 @@
+"""
+环境检测性能基准
+
+生成 N 个假 conda 环境(每个环境含有可配置延迟的 python/pyinstaller 桩脚本, 以及 pyinstaller 的 dist-info), 外加一个 conda 桩脚本,
+在 offscreen Qt 平台下分别测量 ExecutorInfoManager 与界面检测线程(PythonCondaEnvDetection)的:
+- time_to_first_display: 第一个 conda 环境信息可显示的时间(秒)
+- time_to_complete: 所有环境检测完成的时间(秒)
+- process_spawns: 桩脚本被启动的次数
+- peak_threads: 进程内线程数峰值
+
+每次测量都在独立的子进程中运行, 工作目录(缓存, 索引)与 HOME 均为临时文件夹, 互不影响.
+ExecutorInfoManager 分别测量冷启动(无缓存)与热启动(有缓存).
+
+用法:
+    python tools/benchmark_env_detection.py --envs 1,10,100,500 --python-latency 0.05 --output result.json
+    python tools/benchmark_env_detection.py --envs 100 --baseline baseline.json --tolerance 0.25
+
+指定 --baseline 时, 与基准结果比较 time_to_complete 与 process_spawns, 超出容差时以返回码 1 退出, 可用于 CI 中的性能回归检查.
+仅支持 Linux/MacOS(桩脚本依赖 shebang).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+
+_SCRIPT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SPAWN_LOG_NAME = 'spawn.log'
+_PYTHON_VERSION = '3.11.7'
+_PYINSTALLER_VERSION = '6.3.0'
+_PATH_LIST = ('manager', 'gui')
+
+_STUB_PYTHON = r'''#!{executable}
+import os, sys, json, time
+time.sleep({latency})
+with open({spawn_log!r}, 'a') as f:
+    f.write('python ' + ' '.join(sys.argv[1:2]) + '\n')
+prefix = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+site_packages = os.path.join(prefix, 'lib', 'python3.11', 'site-packages')
+args = sys.argv[1:]
+if len(args) >= 2 and args[0] == '-c' and '__PYTOEXE_PROBE__' in args[1]:
+    info = {{
+        'python_version': {python_version!r}, 'implementation': 'CPython', 'platform': sys.platform, 'machine': 'x86_64',
+        'executable': os.path.abspath(__file__), 'prefix': prefix, 'base_prefix': prefix, 'site_packages': [site_packages],
+        'pyinstaller_version': {pyinstaller_version!r}, 'pyinstaller_entry_point': 'PyInstaller.__main__:_console_script_run',
+        'pyinstaller_path': os.path.join(prefix, 'bin', 'pyinstaller'),
+    }}
+    print('__PYTOEXE_PROBE__' + json.dumps(info))
+elif args[:2] == ['-m', 'PyInstaller'] or args[:2] == ['-m', 'pyinstaller']:
+    print({pyinstaller_version!r})
+elif args[:1] in (['--version'], ['-V']):
+    print('Python ' + {python_version!r})
+else:
+    print({python_version!r})
+'''
+
+_STUB_PYINSTALLER = r'''#!{executable}
+import sys, time
+time.sleep({latency})
+with open({spawn_log!r}, 'a') as f:
+    f.write('pyinstaller\n')
+print({pyinstaller_version!r})
+'''
+
+_STUB_CONDA = r'''#!{executable}
+import os, sys, json, time
+time.sleep({latency})
+with open({spawn_log!r}, 'a') as f:
+    f.write('conda ' + ' '.join(sys.argv[1:]) + '\n')
+root = {root!r}
+env_list = [root] + sorted(os.path.join(root, 'envs', name) for name in os.listdir(os.path.join(root, 'envs')))
+if '--json' in sys.argv:
+    print(json.dumps({{'envs': env_list}}))
+else:
+    print('# conda environments:')
+    print('#')
+    for path in env_list:
+        name = 'base' if path == root else os.path.basename(path)
+        print(f'{{name:<25}} {{path}}')
+'''
+
+
+def _write_stub(path: str, content: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.chmod(path, 0o755)
+
+
+def _create_env(env_path: str, spawn_log: str, python_latency: float, pyinstaller_latency: float) -> None:
+    """ 创建一个假环境: conda-meta/history, bin/python, bin/pyinstaller, pyinstaller 的 dist-info """
+    os.makedirs(os.path.join(env_path, 'conda-meta'), exist_ok=True)
+    with open(os.path.join(env_path, 'conda-meta', 'history'), 'w', encoding='utf-8') as f:
+        f.write('==> 2024-01-01 00:00:00 <==\n')
+    bin_path = os.path.join(env_path, 'bin')
+    os.makedirs(bin_path, exist_ok=True)
+    fmt = dict(executable=sys.executable, spawn_log=spawn_log, python_version=_PYTHON_VERSION, pyinstaller_version=_PYINSTALLER_VERSION)
+    _write_stub(os.path.join(bin_path, 'python'), _STUB_PYTHON.format(latency=python_latency, **fmt))
+    _write_stub(os.path.join(bin_path, 'pyinstaller'), _STUB_PYINSTALLER.format(latency=pyinstaller_latency, **fmt))
+    dist_info = os.path.join(env_path, 'lib', 'python3.11', 'site-packages', f'pyinstaller-{_PYINSTALLER_VERSION}.dist-info')
+    os.makedirs(dist_info, exist_ok=True)
+    with open(os.path.join(dist_info, 'METADATA'), 'w', encoding='utf-8') as f:
+        f.write(f'Metadata-Version: 2.1\nName: pyinstaller\nVersion: {_PYINSTALLER_VERSION}\n\n')
+    with open(os.path.join(dist_info, 'entry_points.txt'), 'w', encoding='utf-8') as f:
+        f.write('[console_scripts]\npyinstaller = PyInstaller.__main__:_console_script_run\n')
+    with open(os.path.join(dist_info, 'RECORD'), 'w', encoding='utf-8') as f:
+        f.write('../../../bin/pyinstaller,,\n')
+
+
+def create_fake_conda(root_folder: str, env_count: int, python_latency: float, pyinstaller_latency: float, conda_latency: float) -> dict:
+    """
+    生成假 conda 安装, 包括 base 环境, env_count 个子环境与 conda 桩脚本
+
+    参数:
+    - root_folder(str): 作为 HOME 的临时文件夹
+    - env_count(int): 子环境数量
+    - python_latency(float): python 桩脚本的延迟(秒)
+    - pyinstaller_latency(float): pyinstaller 桩脚本的延迟(秒)
+    - conda_latency(float): conda 桩脚本的延迟(秒)
+
+    返回:
+    - dict: 子进程使用的环境变量
+    """
+    conda_root = os.path.join(root_folder, 'miniconda3')
+    spawn_log = os.path.join(root_folder, _SPAWN_LOG_NAME)
+    _create_env(conda_root, spawn_log, python_latency, pyinstaller_latency)
+    os.makedirs(os.path.join(conda_root, 'envs'), exist_ok=True)
+    for index in range(env_count):
+        _create_env(os.path.join(conda_root, 'envs', f'env_{index:04d}'), spawn_log, python_latency, pyinstaller_latency)
+    conda_path = os.path.join(conda_root, 'bin', 'conda')
+    _write_stub(conda_path, _STUB_CONDA.format(executable=sys.executable, latency=conda_latency, spawn_log=spawn_log, root=conda_root))
+    os.makedirs(os.path.join(root_folder, '.conda'), exist_ok=True)
+    with open(os.path.join(root_folder, '.conda', 'environments.txt'), 'w', encoding='utf-8') as f:
+        f.write(conda_root + '\n')
+    env = {key: value for key, value in os.environ.items() if not key.startswith(('CONDA', 'MAMBA', 'PYENV', 'VIRTUAL_ENV'))}
+    env.update({
+        'HOME': root_folder,
+        'USERPROFILE': root_folder,
+        'PYENV_ROOT': os.path.join(root_folder, '.pyenv'),
+        'CONDA_EXE': conda_path,
+        # PATH 中只保留 conda 桩脚本, 避免系统解释器被检测到; 桩脚本使用绝对路径的 shebang
+        'PATH': os.path.join(conda_root, 'bin'),
+        'QT_QPA_PLATFORM': 'offscreen',
+    })
+    return env
+
+
+def _count_threads() -> int:
+    """ 进程内线程数, Linux 下包括 Qt 线程, 其他平台只统计 python 线程 """
+    try:
+        with open('/proc/self/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return threading.active_count()
+
+
+def _run_worker(path_type: str, env_count: int, timeout: float) -> dict:
+    """ 在子进程中运行, 测量一种检测路径. sys.argv[1] 为工作目录, 由 const.Const_Parameter 读取 """
+    sys.path.insert(0, _SCRIPT_FOLDER)
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    result = {'time_to_first_display': None, 'time_to_complete': None, 'peak_threads': _count_threads(), 'error': ''}
+    start_time = time.perf_counter()
+
+    def on_progress(done_count: int) -> None:
+        elapsed = time.perf_counter() - start_time
+        if done_count > 0 and result['time_to_first_display'] is None:
+            result['time_to_first_display'] = elapsed
+        if done_count >= env_count + 1 and result['time_to_complete'] is None:
+            result['time_to_complete'] = elapsed
+            app.quit()
+
+    if path_type == 'manager':
+        from system.Manager_Executor_Info import ExecutorInfoManager
+        manager = ExecutorInfoManager()
+
+        def check_manager() -> None:
+            struct_list = [struct for name, struct in manager.executor_struct_dict.items() if name not in ('local', 'special')]
+            on_progress(sum(1 for struct in struct_list if struct.python_version and struct.pyinstaller_version))
+    else:
+        env_list_container = []
+        try:
+            from system.Thread_Conda import PythonCondaEnvDetection
+            thread = PythonCondaEnvDetection(None, True)
+            thread.signal_env_conda_list.connect(lambda env_list: env_list_container.append(env_list))
+            thread.start()
+        except Exception as e:
+            return {**result, 'error': f'界面检测线程不可用: {e!r}'}
+
+        def check_manager() -> None:
+            on_progress(len(env_list_container[-1]) if env_list_container else 0)
+
+    def on_tick() -> None:
+        result['peak_threads'] = max(result['peak_threads'], _count_threads())
+        check_manager()
+        if time.perf_counter() - start_time > timeout:
+            result['error'] = '超时'
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(on_tick)
+    timer.start(10)
+    app.exec_()
+    timer.stop()
+    if path_type == 'manager':
+        manager.shutdown()
+    return result
+
+
+def _measure(path_type: str, home_folder: str, workspace: str, env: dict, env_count: int, timeout: float) -> dict:
+    """ 启动子进程测量一次, 统计桩脚本的启动次数 """
+    spawn_log = os.path.join(home_folder, _SPAWN_LOG_NAME)
+    if os.path.exists(spawn_log):
+        os.remove(spawn_log)
+    command = [sys.executable, os.path.abspath(__file__), workspace, '--worker', path_type, '--envs', str(env_count), '--timeout', str(timeout)]
+    process = subprocess.run(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=timeout + 60)
+    try:
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError):
+        result = {'time_to_first_display': None, 'time_to_complete': None, 'peak_threads': None, 'error': (process.stderr.strip().splitlines() or [''])[-1]}
+    try:
+        with open(spawn_log, 'r', encoding='utf-8') as f:
+            result['process_spawns'] = sum(1 for _ in f)
+    except OSError:
+        result['process_spawns'] = 0
+    return result
+
+
+def run_benchmark(env_count_list: list, path_list: list, python_latency: float, pyinstaller_latency: float, conda_latency: float, timeout: float) -> list:
+    """
+    运行基准测试
+
+    返回:
+    - list: 元素为 {'path': 检测路径, 'envs': 环境数, 'cache': 'cold'/'warm', 各项指标...}
+    """
+    result_list = []
+    for env_count in env_count_list:
+        home_folder = tempfile.mkdtemp(prefix=f'pytoexe_bench_{env_count}_')
+        try:
+            env = create_fake_conda(home_folder, env_count, python_latency, pyinstaller_latency, conda_latency)
+            for path_type in path_list:
+                workspace = os.path.join(home_folder, f'workspace_{path_type}')
+                os.makedirs(workspace, exist_ok=True)
+                cache_list = ['cold', 'warm'] if path_type == 'manager' else ['cold']
+                for cache in cache_list:
+                    result = _measure(path_type, home_folder, workspace, env, env_count, timeout)
+                    result_list.append({'path': path_type, 'envs': env_count, 'cache': cache, **result})
+                    _print_row(result_list[-1])
+        finally:
+            shutil.rmtree(home_folder, ignore_errors=True)
+    return result_list
+
+
+def _print_row(row: dict) -> None:
+    def fmt(value) -> str:
+        return '-' if value is None else (f'{value:.3f}' if isinstance(value, float) else str(value))
+    print(f"{row['path']:<8} envs={row['envs']:<5} {row['cache']:<5} first={fmt(row['time_to_first_display']):>8}s "
+          f"complete={fmt(row['time_to_complete']):>8}s spawns={fmt(row['process_spawns']):>5} "
+          f"threads={fmt(row['peak_threads']):>4} {row['error']}", flush=True)
+
+
+def compare_with_baseline(result_list: list, baseline_list: list, tolerance: float) -> list:
+    """
+    与基准结果比较 time_to_complete 与 process_spawns
+
+    返回:
+    - list: 回归描述列表, 为空表示没有回归
+    """
+    baseline_dict = {(row['path'], row['envs'], row['cache']): row for row in baseline_list}
+    regression_list = []
+    for row in result_list:
+        baseline = baseline_dict.get((row['path'], row['envs'], row['cache']))
+        if baseline is None:
+            continue
+        for key in ('time_to_complete', 'process_spawns'):
+            old_value, new_value = baseline.get(key), row.get(key)
+            if old_value is None:
+                continue
+            if new_value is None or new_value > old_value * (1 + tolerance):
+                regression_list.append(f"{row['path']} envs={row['envs']} {row['cache']} {key}: {old_value} -> {new_value}")
+    return regression_list
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='环境检测性能基准')
+    parser.add_argument('workspace', nargs='?', default='', help='(内部使用) 子进程的工作目录')
+    parser.add_argument('--envs', default='1,10,100,500', help='环境数量列表, 逗号分隔, 默认 1,10,100,500')
+    parser.add_argument('--paths', default=','.join(_PATH_LIST), help='检测路径, manager 和/或 gui, 默认两者')
+    parser.add_argument('--python-latency', type=float, default=0.05, help='python 桩脚本延迟(秒), 默认 0.05')
+    parser.add_argument('--pyinstaller-latency', type=float, default=0.05, help='pyinstaller 桩脚本延迟(秒), 默认 0.05')
+    parser.add_argument('--conda-latency', type=float, default=0.5, help='conda 桩脚本延迟(秒), 默认 0.5')
+    parser.add_argument('--timeout', type=float, default=300, help='单次测量超时(秒), 默认 300')
+    parser.add_argument('--output', default='', help='结果输出 JSON 文件')
+    parser.add_argument('--baseline', default='', help='基准结果 JSON 文件, 指定时检查性能回归')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='回归容差, 默认 0.25 即 25%%')
+    parser.add_argument('--worker', choices=_PATH_LIST, default='', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    env_count_list = [int(item) for item in args.envs.split(',') if item.strip()]
+    if args.worker:
+        print(json.dumps(_run_worker(args.worker, env_count_list[0], args.timeout)))
+        return 0
+    if os.name == 'nt':
+        print('仅支持 Linux/MacOS')
+        return 2
+    path_list = [item.strip() for item in args.paths.split(',') if item.strip() in _PATH_LIST]
+    result_list = run_benchmark(env_count_list, path_list, args.python_latency, args.pyinstaller_latency, args.conda_latency, args.timeout)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result_list, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regression_list = compare_with_baseline(result_list, json.load(f), args.tolerance)
+        for regression in regression_list:
+            print(f'性能回归: {regression}')
+        return 1 if regression_list else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())